@@ -0,0 +1,693 @@
+"""TypingManager를 JSON API로 제공하는 ASGI 앱
+
+Streamlit 없이 모바일/데스크톱 클라이언트가 타이핑 엔진을 쓸 수 있도록
+세션 생성, 문장 불러오기(텍스트/URL/파일), 입력 제출, 진행 상황/통계 조회를 제공합니다.
+프레임워크 없이 ASGI 규격만 사용하므로 어떤 ASGI 서버로도 실행할 수 있습니다::
+
+    uvicorn api:app
+
+레이스/수업 방, 메모리에 올려 둔 세션, 열려 있는 키 입력 기록 파일은 프로세스 안에만 있습니다.
+여러 워커(``--workers N``)나 여러 서버로 늘릴 때는 세션·방 ID 기준으로 같은 워커에 보내는
+고정 라우팅(sticky)을 앞단에 두어야 합니다. 그렇지 않으면 워커마다 같은 세션의 다른 사본을 고치게 됩니다.
+
+엔드포인트::
+
+    POST   /sessions                    세션 생성
+    GET    /sessions/{id}               현재 문장, 진행 상황, 통계
+    DELETE /sessions/{id}               세션 삭제
+    POST   /sessions/{id}/sentences     {"text": ...} | {"url": ...} | {"sentences": [...]}
+    POST   /sessions/{id}/file          파일 본문 그대로 전송 (?name=book.txt.gz&start=0&count=10)
+    POST   /sessions/{id}/input         {"text": "입력한 문장"}
+    GET    /sessions/{id}/progress      진행 상황
+    GET    /sessions/{id}/stats         통계
+    POST   /sessions/{id}/keystrokes    {"events": [[시각(epoch ms), "입력창 값"], ...]} 키 입력 기록
+    GET    /sessions/{id}/keystrokes    키 입력 분석 (글자별 간격, 두 글자 조합, 자주 틀리는 글자)
+    GET    /sessions/{id}/replay        키 입력 재생 화면 목록 (?speed=2&sentence=0)
+    POST   /sessions/{id}/leaderboard   현재 통계를 순위표에 기록 ({"name": ..., "language": ...} 선택)
+    GET    /leaderboard                 순위표 상위 기록 (?language=한국어&mode=직접 입력&limit=10&score=350)
+    POST   /races                       레이스 방 생성 (문장은 /sentences와 같은 형식)
+    GET    /races/{id}                  레이스 방 상태
+    POST   /races/{id}/start            카운트다운 후 레이스 시작
+    WS     /races/{id}/ws?name=이름     레이스 참가 (race.py 참고)
+    POST   /classrooms                  수업 생성, 강사 key 발급 (문장은 /sentences와 같은 형식)
+    GET    /classrooms/{id}             수업 정보 (문장, 학생 수)
+    POST   /classrooms/{id}/sentences   새 문장 세트 올리기 (?key=강사 key)
+    GET    /classrooms/{id}/dashboard   강사 현황판 (?key=&since=버전: 바뀔 때까지 기다림, classroom.py 참고)
+    POST   /sessions/{id}/classroom     수업 참여 ({"room_id": ..., "name": ...})
+    DELETE /sessions/{id}/classroom     수업 나가기
+    GET    /health                      상태 확인
+    GET    /metrics                     운영 지표 (Prometheus 텍스트 형식, 워커 프로세스별)
+
+세션은 메모리 예산(``SESSION_MEMORY_CONFIG``) 안에서 메모리에 올려 두고 처리하며, 바뀐 세션만 ``flush_interval``마다 모아서
+세션 저장소에 기록합니다. 예산을 넘거나 오래 쓰이지 않은 세션은 저장소에 기록하고 메모리에서 내립니다. 여러 프로세스가 같은 저장소를 쓰면 어느 프로세스에서든 세션을 이어갈 수 있습니다.
+"""
+import asyncio
+import io
+import json
+import logging
+import re
+import uuid
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs
+from compression import iter_lines
+from classroom import Classroom, ClassroomHub
+from config import API_CONFIG, CLASSROOM_CONFIG, FILE_CONFIG, INPUT_MODES, KEYLOG_CONFIG, LEADERBOARD_CONFIG, SESSION_MEMORY_CONFIG
+from corpus import CorpusReader, is_corpus_file
+from keystroke_log import KeystrokeWriter, analyze, iter_replay
+from leaderboard import Leaderboard, detect_language
+from metrics import ACTIVE_SESSIONS, CONTENT_TYPE, REGISTRY, SESSION_CACHE
+from race import RaceHub, RaceRoom
+from session_pool import Evicted, SessionPool
+from session_store import BACKEND_ERRORS, SessionStore, create_backend
+from typing_manager import TypingManager
+from url_processor import URLProcessor
+
+logger = logging.getLogger(__name__)
+
+SESSION_ID = r'(?P<session_id>[0-9A-Za-z]{1,64})'
+ROOM_ID = r'(?P<room_id>[0-9a-f]{1,32})'
+
+Response = Tuple[int, Dict[str, Any]]
+# 본문이 문자열이면 JSON 대신 text/plain으로 보냅니다 (/metrics)
+Payload = Union[Dict[str, Any], str, None]
+
+
+class HTTPError(Exception):
+    """HTTP 오류 응답으로 변환되는 예외"""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TypingAPI:
+    """타이핑 세션 JSON API"""
+    def __init__(self, store: Optional[SessionStore] = None,
+                 cached_sessions: int = API_CONFIG["cached_sessions"],
+                 max_body_bytes: int = API_CONFIG["max_body_bytes"], races: Optional[RaceHub] = None,
+                 keylog_dir: str = KEYLOG_CONFIG["directory"], leaderboard: Optional[Leaderboard] = None,
+                 memory_budget: int = SESSION_MEMORY_CONFIG["budget_bytes"],
+                 max_keylog_writers: int = KEYLOG_CONFIG["max_open_writers"]):
+        self.store = store if store is not None else SessionStore(create_backend())
+        self.races = races if races is not None else RaceHub()
+        self.classrooms = ClassroomHub()
+        self.cached_sessions = cached_sessions
+        self.max_body_bytes = max_body_bytes
+        # 요청을 처리하는 동안에는 세션을 고정(pin)하여 내보내지 않습니다
+        self.sessions = SessionPool(memory_budget, max_sessions=cached_sessions)
+        # 아직 세션 저장소에 기록하지 않은 세션
+        self._dirty: Dict[str, TypingManager] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.keylog_dir = Path(keylog_dir)
+        # 세션별 키 입력 기록 파일과 기록 중인 문장 번호 (최근에 쓴 max_keylog_writers개만 열어 둠)
+        self.max_keylog_writers = max_keylog_writers
+        self.keylogs: 'OrderedDict[str, Tuple[KeystrokeWriter, Optional[int]]]' = OrderedDict()
+        # 처음 사용할 때 순위표 파일을 엶
+        self._leaderboard = leaderboard
+        self.routes: List[Tuple[str, re.Pattern, Callable[..., Awaitable[Response]]]] = [
+            ("GET", re.compile(r'/health'), self.health),
+            ("GET", re.compile(r'/metrics'), self.metrics),
+            ("POST", re.compile(r'/sessions'), self.create_session),
+            ("GET", re.compile(rf'/sessions/{SESSION_ID}'), self.get_session),
+            ("DELETE", re.compile(rf'/sessions/{SESSION_ID}'), self.delete_session),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/sentences'), self.load_sentences),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/file'), self.load_file),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/input'), self.submit_input),
+            ("GET", re.compile(rf'/sessions/{SESSION_ID}/progress'), self.get_progress),
+            ("GET", re.compile(rf'/sessions/{SESSION_ID}/stats'), self.get_stats),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/keystrokes'), self.record_keystrokes),
+            ("GET", re.compile(rf'/sessions/{SESSION_ID}/keystrokes'), self.get_keystroke_stats),
+            ("GET", re.compile(rf'/sessions/{SESSION_ID}/replay'), self.get_replay),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/leaderboard'), self.submit_score),
+            ("GET", re.compile(r'/leaderboard'), self.get_leaderboard),
+            ("POST", re.compile(r'/races'), self.create_race),
+            ("GET", re.compile(rf'/races/{ROOM_ID}'), self.get_race),
+            ("POST", re.compile(rf'/races/{ROOM_ID}/start'), self.start_race),
+            ("POST", re.compile(r'/classrooms'), self.create_classroom),
+            ("GET", re.compile(rf'/classrooms/{ROOM_ID}'), self.get_classroom),
+            ("POST", re.compile(rf'/classrooms/{ROOM_ID}/sentences'), self.publish_classroom),
+            ("GET", re.compile(rf'/classrooms/{ROOM_ID}/dashboard'), self.get_dashboard),
+            ("POST", re.compile(rf'/sessions/{SESSION_ID}/classroom'), self.join_classroom),
+            ("DELETE", re.compile(rf'/sessions/{SESSION_ID}/classroom'), self.leave_classroom),
+        ]
+
+    # ASGI 진입점
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "websocket":
+            await self.races.handle_websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] == "OPTIONS" and API_CONFIG["cors_origin"]:
+            await self._send(send, 204, None)
+            return
+        session_id = None
+        try:
+            handler, params = self._match(scope["method"], scope["path"])
+            session_id = params.get("session_id")
+            params["body"] = await self._read_body(receive)
+            params["query"] = {key: values[-1] for key, values
+                               in parse_qs(scope.get("query_string", b"").decode('latin-1')).items()}
+            status, payload = await handler(**params)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except BACKEND_ERRORS as e:
+            status, payload = 503, {"error": f"세션 저장소를 사용할 수 없습니다: {str(e)}"}
+        except Exception:
+            # 처리하지 못한 오류도 연결을 끊지 않고 JSON 오류로 응답합니다
+            logger.exception("요청 처리 중 오류: %s %s", scope["method"], scope["path"])
+            status, payload = 500, {"error": "서버 내부 오류가 발생했습니다."}
+        finally:
+            if session_id is not None:
+                # 처리하며 바뀐 크기를 다시 재고 예산을 넘으면 다른 세션을 내보냄
+                self._spill(self.sessions.release(session_id))
+        await self._send(send, status, payload)
+
+    def _match(self, method: str, path: str) -> Tuple[Callable[..., Awaitable[Response]], Dict[str, Any]]:
+        """경로에 맞는 처리 함수를 찾습니다."""
+        path = path.rstrip('/') or '/'
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict()
+                allowed = True
+        if allowed:
+            raise HTTPError(405, "허용되지 않는 메서드입니다.")
+        raise HTTPError(404, "존재하지 않는 경로입니다.")
+
+    async def _read_body(self, receive: Callable) -> bytes:
+        """요청 본문을 읽습니다. 최대 크기를 넘으면 413 오류를 발생시킵니다."""
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise HTTPError(413, "요청 본문이 너무 큽니다.")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    async def _send(send: Callable, status: int, payload: Payload) -> None:
+        """JSON 응답을 보냅니다."""
+        content_type = "application/json; charset=utf-8"
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), CONTENT_TYPE
+        else:
+            body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = [(b"content-type", content_type.encode('ascii')),
+                   (b"content-length", str(len(body)).encode('ascii'))]
+        if API_CONFIG["cors_origin"]:
+            headers += [(b"access-control-allow-origin", API_CONFIG["cors_origin"].encode('latin-1')),
+                        (b"access-control-allow-methods", b"GET, POST, DELETE, OPTIONS"),
+                        (b"access-control-allow-headers", b"content-type")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        """서버 시작 시 주기적 기록 작업을 시작하고, 종료 시 남은 세션을 기록합니다."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._flush_task = asyncio.create_task(self._flush_periodically())
+                self.races.ensure_ticker()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._flush_task:
+                    self._flush_task.cancel()
+                self.races.stop()
+                await self.flush()
+                self.store.close()
+                for writer, _ in self.keylogs.values():
+                    writer.close()
+                if self._leaderboard is not None:
+                    self._leaderboard.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # 세션 관리
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(API_CONFIG["flush_interval"])
+            self._spill(self.sessions.maybe_sweep())
+            try:
+                await self.flush()
+            except BACKEND_ERRORS:
+                pass  # 다음 주기에 다시 시도
+
+    async def flush(self) -> int:
+        """바뀐 세션을 세션 저장소에 기록하고, 실제로 기록한 수를 반환합니다."""
+        if not self._dirty:
+            return 0
+        pending, self._dirty = self._dirty, {}
+        # 기록하는 동안 바뀔 수 있으므로 바뀐 세션의 상태를 먼저 복사합니다
+        snapshots = {session_id: (manager.to_state(), manager.version)
+                     for session_id, manager in pending.items() if not self.store.is_saved(session_id, manager)}
+
+        def write() -> int:
+            for session_id, (state, version) in snapshots.items():
+                self.store.save_state(session_id, state, version)
+            return len(snapshots)
+
+        try:
+            return await asyncio.to_thread(write)
+        except BACKEND_ERRORS:
+            # 이미 기록된 세션은 버전이 같아 다시 기록되지 않습니다
+            for session_id, manager in pending.items():
+                self._dirty.setdefault(session_id, manager)
+            raise
+
+    def _spill(self, evicted: Evicted) -> None:
+        """메모리에서 내린 세션은 다음 기록 때 저장소에 기록합니다. (바뀌지 않았으면 기록하지 않음)"""
+        for session_id, manager in evicted:
+            self._dirty.setdefault(session_id, manager)
+
+    def _mark_dirty(self, session_id: str, manager: TypingManager) -> None:
+        self._dirty[session_id] = manager
+
+    async def _get_manager(self, session_id: str) -> TypingManager:
+        """세션을 찾습니다. 메모리에 없으면 세션 저장소에서 불러옵니다."""
+        manager = self.sessions.get(session_id, pin=True)
+        if manager is not None:
+            SESSION_CACHE.inc(result="hit")
+        else:
+            manager = self._dirty.get(session_id)
+            if manager is None:
+                SESSION_CACHE.inc(result="miss")
+                manager = await asyncio.to_thread(self.store.load, session_id)
+                if manager is None:
+                    raise HTTPError(404, "세션을 찾을 수 없습니다.")
+            else:
+                SESSION_CACHE.inc(result="hit")
+            self._spill(self.sessions.put(session_id, manager, pin=True))
+        ACTIVE_SESSIONS.touch(session_id)
+        return manager
+
+    def _keylog_path(self, session_id: str) -> Path:
+        return self.keylog_dir / f"{session_id}.{KEYLOG_CONFIG['extension']}"
+
+    def _keylog_writer(self, session_id: str, manager: TypingManager, timestamp_ms: float) -> KeystrokeWriter:
+        """세션의 키 입력 기록 파일을 열고, 현재 문장이 바뀌었으면 문장 시작을 기록합니다.
+
+        클라이언트와 서버의 시계가 다를 수 있으므로 문장 시작 시각도 클라이언트 시각을 씁니다.
+        """
+        writer, index = self.keylogs.pop(session_id, (None, None))
+        if writer is None:
+            writer = KeystrokeWriter(self._keylog_path(session_id), base_ms=timestamp_ms)
+        if index != manager.current_index:
+            index = manager.current_index
+            writer.begin_sentence(index, manager.get_current_sentence(), timestamp_ms)
+        self.keylogs[session_id] = (writer, index)
+        while len(self.keylogs) > self.max_keylog_writers:
+            _, (oldest, _) = self.keylogs.popitem(last=False)
+            oldest.close()
+        return writer
+
+    def _close_keylog(self, session_id: str) -> None:
+        writer, _ = self.keylogs.pop(session_id, (None, None))
+        if writer is not None:
+            writer.close()
+
+    @staticmethod
+    def _parse_json(body: bytes) -> Dict[str, Any]:
+        """요청 본문을 JSON 객체로 변환합니다."""
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "요청 본문은 JSON 객체여야 합니다.")
+        return data
+
+    @staticmethod
+    def session_payload(session_id: str, manager: TypingManager) -> Dict[str, Any]:
+        """세션 응답 본문을 만듭니다."""
+        return {
+            "session_id": session_id,
+            "input_method": manager.current_input_method,
+            "sentence": manager.get_current_sentence(),
+            "progress": manager.get_progress(),
+            "stats": manager.to_dict()
+        }
+
+    def _replace_sentences(self, session_id: str, manager: TypingManager, sentences: List[str]) -> Response:
+        """세션을 초기화하고 새 문장을 불러옵니다."""
+        if not sentences:
+            raise HTTPError(422, "연습할 문장이 없습니다.")
+        self._reset_session(session_id, manager)
+        manager.load_sentences(sentences)
+        self._mark_dirty(session_id, manager)
+        return 200, self.session_payload(session_id, manager)
+
+    def _sync_classroom(self, session_id: str, manager: TypingManager) -> bool:
+        """수업 중인 세션에 새 문장 세트가 올라왔으면 불러오고 True를 반환합니다."""
+        member = self.classrooms.members.get(session_id)
+        if member is None or not member[0].sync(member[1], manager):
+            return False
+        if session_id in self.keylogs:
+            self.keylogs[session_id] = (self.keylogs[session_id][0], None)
+        self._mark_dirty(session_id, manager)
+        return True
+
+    def _reset_session(self, session_id: str, manager: TypingManager) -> None:
+        """입력 방식만 남기고 세션을 초기화합니다."""
+        input_method = manager.current_input_method
+        manager.reset_all()
+        manager.set_input_method(input_method)
+        if session_id in self.keylogs:
+            self.keylogs[session_id] = (self.keylogs[session_id][0], None)
+
+    # 엔드포인트
+    async def health(self, body: bytes, query: Dict[str, str]) -> Response:
+        return 200, {"status": "ok", "sessions": len(self.sessions), "session_bytes": self.sessions.total_bytes,
+                     "pending_writes": len(self._dirty)}
+
+    async def metrics(self, body: bytes, query: Dict[str, str]) -> Tuple[int, str]:
+        return 200, REGISTRY.render()
+
+    async def create_session(self, body: bytes, query: Dict[str, str]) -> Response:
+        data = self._parse_json(body)
+        input_method = data.get("input_method", INPUT_MODES["default"])
+        if input_method not in INPUT_MODES["options"]:
+            raise HTTPError(400, f"지원하지 않는 입력 방식입니다: {input_method}")
+        session_id = uuid.uuid4().hex
+        manager = TypingManager()
+        manager.set_input_method(input_method)
+        self._spill(self.sessions.put(session_id, manager))
+        self._mark_dirty(session_id, manager)
+        ACTIVE_SESSIONS.touch(session_id)
+        return 201, self.session_payload(session_id, manager)
+
+    async def get_session(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        self._sync_classroom(session_id, manager)
+        return 200, self.session_payload(session_id, manager)
+
+    async def delete_session(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        await self._get_manager(session_id)
+        self.sessions.discard(session_id)
+        self._dirty.pop(session_id, None)
+        self._close_keylog(session_id)
+        self.classrooms.leave(session_id)
+        await asyncio.to_thread(self.store.delete, session_id)
+        return 200, {"session_id": session_id, "deleted": True}
+
+    @staticmethod
+    async def _parse_sentences(manager: TypingManager, data: Dict[str, Any]) -> List[str]:
+        """요청의 text, url, sentences 중 하나로 문장 목록을 만듭니다."""
+        if "sentences" in data:
+            if not isinstance(data["sentences"], list) or not all(isinstance(s, str) for s in data["sentences"]):
+                raise HTTPError(400, "sentences는 문자열 목록이어야 합니다.")
+            sentences = list(manager.iter_sentences(data["sentences"]))
+        elif isinstance(data.get("url") or data.get("text"), str):
+            text = data.get("url") or data["text"]
+            if "url" in data and not URLProcessor.is_url(text):
+                raise HTTPError(400, "올바른 URL이 아닙니다.")
+            try:
+                # URL은 네트워크 요청이 필요하므로 별도 스레드에서 처리합니다
+                if URLProcessor.is_url(text):
+                    sentences = await asyncio.to_thread(manager.process_input_text, text)
+                else:
+                    sentences = manager.process_input_text(text)
+            except ValueError as e:
+                raise HTTPError(422, str(e))
+        else:
+            raise HTTPError(400, "text, url, sentences 중 하나가 필요합니다.")
+        return sentences
+
+    async def load_sentences(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        data = self._parse_json(body)
+        if isinstance(data.get("url"), str) and URLProcessor.is_url(data["url"]):
+            return await self._stream_sentences(session_id, manager, data["url"])
+        sentences = await self._parse_sentences(manager, data)
+        # 문장 목록을 직접 보냈으면 유사 중복을 거르지 않습니다
+        dropped = 0 if "sentences" in data else manager.duplicates_dropped
+        status, payload = self._replace_sentences(session_id, manager, sentences)
+        manager.duplicates_dropped = dropped
+        return status, {"duplicates_dropped": dropped, **payload}
+
+    async def _stream_sentences(self, session_id: str, manager: TypingManager, url: str) -> Response:
+        """URL 문장은 첫 문장이 준비되면 바로 응답하고, 나머지는 백그라운드에서 계속 불러옵니다."""
+        self._reset_session(session_id, manager)
+        try:
+            await asyncio.to_thread(manager.load_sentence_stream, manager.iter_input_sentences(url))
+        except ValueError as e:
+            raise HTTPError(422, str(e))
+        self._mark_dirty(session_id, manager)
+        return 200, {"loading": manager.is_loading, "duplicates_dropped": manager.duplicates_dropped,
+                     **self.session_payload(session_id, manager)}
+
+    async def load_file(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        if not body:
+            raise HTTPError(400, "파일 내용이 비어 있습니다.")
+        try:
+            start = max(0, int(query.get("start", FILE_CONFIG["default_start_line"])))
+            count = int(query.get("count", FILE_CONFIG["default_sentences"]))
+        except ValueError:
+            raise HTTPError(400, "start와 count는 정수여야 합니다.")
+        count = min(max(count, FILE_CONFIG["min_sentences"]), FILE_CONFIG["max_sentences"])
+        name = query.get("name", "upload.txt")
+
+        def read() -> List[str]:
+            fileobj = io.BytesIO(body)
+            # 이미 입력한 문장은 건너뛰거나 뒤로 미룹니다
+            if is_corpus_file(fileobj):
+                with CorpusReader(fileobj) as reader:
+                    return manager.take_unseen((reader[i] for i in range(start, len(reader))), count)
+            return manager.take_unseen(islice(manager.iter_sentences(iter_lines(fileobj, name)), start, None), count)
+
+        try:
+            sentences = await asyncio.to_thread(read)
+        except (ValueError, OSError, EOFError) as e:
+            raise HTTPError(422, f"파일을 읽는 중 오류가 발생했습니다: {str(e)}")
+        return self._replace_sentences(session_id, manager, sentences)
+
+    async def submit_input(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        data = self._parse_json(body)
+        text = data.get("text")
+        if not isinstance(text, str):
+            raise HTTPError(400, "text가 필요합니다.")
+        elapsed_ms = data.get("elapsed_ms")
+        if elapsed_ms is not None and (isinstance(elapsed_ms, bool) or not isinstance(elapsed_ms, (int, float))):
+            raise HTTPError(400, "elapsed_ms는 숫자여야 합니다.")
+        if not manager.get_current_sentence():
+            raise HTTPError(409, "먼저 연습할 문장을 불러와주세요.")
+        if self.keylogs.get(session_id, (None, None))[1] is not None:
+            writer, _ = self.keylogs[session_id]
+            writer.end_sentence(writer.last_ms)
+            self.keylogs[session_id] = (writer, None)
+        # elapsed_ms: 클라이언트가 잰 첫 입력부터 제출까지의 시간
+        client_elapsed = None if elapsed_ms is None else elapsed_ms / 1000
+        member = self.classrooms.members.get(session_id)
+        if member is None:
+            accepted = manager.handle_input(text, client_elapsed)
+        elif self._sync_classroom(session_id, manager):
+            accepted = False    # 새 문장 세트가 올라왔으면 불러오기만 하고 채점하지 않음
+        else:
+            # 수업 중이면 현황판 집계도 함께 고침
+            accepted = member[0].submit(member[1], manager, text, client_elapsed)
+        if accepted:
+            self._mark_dirty(session_id, manager)
+        return 200, {"accepted": accepted, **self.session_payload(session_id, manager)}
+
+    async def get_progress(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        return 200, (await self._get_manager(session_id)).get_progress()
+
+    async def get_stats(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        return 200, (await self._get_manager(session_id)).to_dict()
+
+    async def record_keystrokes(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        events = self._parse_json(body).get("events")
+        if not isinstance(events, list) or not all(
+                isinstance(e, list) and len(e) == 2 and isinstance(e[0], (int, float)) and isinstance(e[1], str)
+                for e in events):
+            raise HTTPError(400, "events는 [시각(ms), 입력창 값] 목록이어야 합니다.")
+        if not manager.get_current_sentence():
+            raise HTTPError(409, "먼저 연습할 문장을 불러와주세요.")
+        if not events:
+            return 200, {"recorded": 0}
+        writer = self._keylog_writer(session_id, manager, events[0][0])
+        for timestamp, text in events:
+            writer.record_input(text, timestamp)
+        return 200, {"recorded": len(events)}
+
+    def _existing_keylog(self, session_id: str) -> Path:
+        """기록 중인 내용을 파일에 쓰고 기록 파일 경로를 반환합니다."""
+        if session_id in self.keylogs:
+            self.keylogs[session_id][0].flush()
+        path = self._keylog_path(session_id)
+        if not path.exists():
+            raise HTTPError(404, "키 입력 기록이 없습니다.")
+        return path
+
+    async def get_keystroke_stats(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        await self._get_manager(session_id)
+        path = self._existing_keylog(session_id)
+        try:
+            return 200, await asyncio.to_thread(analyze, path)
+        except ImportError as e:
+            raise HTTPError(501, str(e))
+        except ValueError as e:
+            raise HTTPError(422, str(e))
+
+    async def get_replay(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        await self._get_manager(session_id)
+        path = self._existing_keylog(session_id)
+        try:
+            speed = float(query.get("speed", 1.0))
+            sentence = int(query["sentence"]) if "sentence" in query else None
+        except ValueError:
+            raise HTTPError(400, "speed는 숫자, sentence는 정수여야 합니다.")
+        try:
+            frames = await asyncio.to_thread(lambda: [frame._asdict() for frame in iter_replay(path, speed, sentence=sentence)])
+        except ValueError as e:
+            raise HTTPError(422, str(e))
+        return 200, {"session_id": session_id, "frames": frames}
+
+    @property
+    def leaderboard(self) -> Leaderboard:
+        if self._leaderboard is None:
+            self._leaderboard = Leaderboard()
+        return self._leaderboard
+
+    async def submit_score(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        data = self._parse_json(body)
+        name, language = data.get("name", ""), data.get("language")
+        if not isinstance(name, str) or len(name) > 20:
+            raise HTTPError(400, "name은 20자 이하의 문자열이어야 합니다.")
+        if language is None:
+            language = detect_language(' '.join(manager.current_sentences))
+        if not isinstance(language, str) or not language:
+            raise HTTPError(400, "language는 문자열이어야 합니다.")
+        standing = await asyncio.to_thread(self.leaderboard.submit, session_id, language,
+                                           manager.current_input_method, manager.to_dict(), name)
+        if standing is None:
+            raise HTTPError(422, f"순위표에 올리려면 {LEADERBOARD_CONFIG['min_words']}단어 이상, "
+                                 f"정확도 {LEADERBOARD_CONFIG['min_accuracy']:.0f}% 이상이어야 합니다.")
+        return 200, {"session_id": session_id, "language": language,
+                     "mode": manager.current_input_method, **standing}
+
+    async def get_leaderboard(self, body: bytes, query: Dict[str, str]) -> Response:
+        language = query.get("language", "한국어")
+        mode = query.get("mode", INPUT_MODES["default"])
+        try:
+            limit = int(query.get("limit", 10))
+            score = float(query["score"]) if "score" in query else None
+        except ValueError:
+            raise HTTPError(400, "limit, score는 숫자여야 합니다.")
+        if not 1 <= limit <= LEADERBOARD_CONFIG["top_k"]:
+            raise HTTPError(400, f"limit은 1~{LEADERBOARD_CONFIG['top_k']} 사이여야 합니다.")
+        entries = await asyncio.to_thread(self.leaderboard.top, language, mode, limit)
+        payload = {"language": language, "mode": mode, "entries": entries}
+        if score is not None:
+            payload["standing"] = await asyncio.to_thread(self.leaderboard.rank, language, mode, score)
+        return 200, payload
+
+    def _get_room(self, room_id: str) -> RaceRoom:
+        room = self.races.rooms.get(room_id)
+        if room is None:
+            raise HTTPError(404, "레이스 방을 찾을 수 없습니다.")
+        return room
+
+    async def create_race(self, body: bytes, query: Dict[str, str]) -> Response:
+        sentences = await self._parse_sentences(TypingManager(), self._parse_json(body))
+        if not sentences:
+            raise HTTPError(422, "연습할 문장이 없습니다.")
+        room = self.races.create_room(sentences)
+        self.races.ensure_ticker()
+        return 201, room.summary()
+
+    async def get_race(self, room_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        return 200, self._get_room(room_id).summary()
+
+    async def start_race(self, room_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        room = self._get_room(room_id)
+        room.start()
+        return 200, room.summary()
+
+    def _get_classroom(self, room_id: str, query: Dict[str, str]) -> Classroom:
+        """강사 key를 확인하고 수업을 반환합니다."""
+        if room_id not in self.classrooms.rooms:
+            raise HTTPError(404, "수업을 찾을 수 없습니다.")
+        room = self.classrooms.authorize(room_id, query.get("key"))
+        if room is None:
+            raise HTTPError(403, "강사 key가 올바르지 않습니다.")
+        return room
+
+    async def create_classroom(self, body: bytes, query: Dict[str, str]) -> Response:
+        sentences = await self._parse_sentences(TypingManager(), self._parse_json(body))
+        if not sentences:
+            raise HTTPError(422, "연습할 문장이 없습니다.")
+        room = self.classrooms.create_room(sentences)
+        return 201, {"key": room.key, **room.summary()}
+
+    async def get_classroom(self, room_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        room = self.classrooms.rooms.get(room_id)
+        if room is None:
+            raise HTTPError(404, "수업을 찾을 수 없습니다.")
+        return 200, room.summary()
+
+    async def publish_classroom(self, room_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        room = self._get_classroom(room_id, query)
+        sentences = await self._parse_sentences(TypingManager(), self._parse_json(body))
+        if not sentences:
+            raise HTTPError(422, "연습할 문장이 없습니다.")
+        room.publish(sentences)
+        return 200, room.summary()
+
+    async def get_dashboard(self, room_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        room = self._get_classroom(room_id, query)
+        if "since" in query:
+            try:
+                since = int(query["since"])
+            except ValueError:
+                raise HTTPError(400, "since는 정수여야 합니다.")
+            await room.wait_for_change(since, CLASSROOM_CONFIG["max_wait"])
+        return 200, room.dashboard()
+
+    async def join_classroom(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        manager = await self._get_manager(session_id)
+        data = self._parse_json(body)
+        room_id, name = data.get("room_id"), data.get("name", "")
+        if not isinstance(name, str):
+            raise HTTPError(400, "name은 문자열이어야 합니다.")
+        room = self.classrooms.rooms.get(room_id) if isinstance(room_id, str) else None
+        if room is None:
+            raise HTTPError(404, "수업을 찾을 수 없습니다.")
+        try:
+            student = self.classrooms.join(room, session_id, name)
+        except ValueError as e:
+            raise HTTPError(409, str(e))
+        self._sync_classroom(session_id, manager)
+        return 200, {"room_id": room.id, "student_id": student.id, "name": student.name,
+                     **self.session_payload(session_id, manager)}
+
+    async def leave_classroom(self, session_id: str, body: bytes, query: Dict[str, str]) -> Response:
+        await self._get_manager(session_id)
+        if session_id not in self.classrooms.members:
+            raise HTTPError(404, "참여 중인 수업이 없습니다.")
+        self.classrooms.leave(session_id)
+        return 200, {"session_id": session_id, "left": True}
+
+
+app = TypingAPI()
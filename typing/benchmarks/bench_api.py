@@ -0,0 +1,85 @@
+"""JSON API 처리량 벤치마크
+
+ASGI 앱을 프로세스 안에서 직접 호출하여 네트워크를 제외한 요청 처리 비용을 측정합니다.
+한 프로세스(이벤트 루프 하나)가 코어 하나를 쓰므로 결과는 코어당 처리량입니다.
+실제 서버 처리량은 ``uvicorn api:app --workers N``을 세션 ID 기준 고정 라우팅 뒤에 두고 부하 도구(wrk 등)로 측정하세요.
+
+    python benchmarks/bench_api.py --sessions 1000 --requests 50000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import TypingAPI
+from session_store import SessionStore, create_backend
+from config import SESSION_CONFIG
+
+SENTENCES = [
+    "작은 습관이 모여 큰 변화를 만들어 냅니다.",
+    "Practice makes perfect when you type every day.",
+    "꾸준한 연습이 자신감을 키워줍니다.",
+]
+
+
+async def request(app: TypingAPI, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """ASGI 앱에 요청 하나를 보내고 JSON 응답을 반환합니다."""
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    sent: List[Dict[str, Any]] = []
+
+    async def receive():
+        return {"type": "http.request", "body": data, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "query_string": b""}, receive, send)
+    return json.loads(sent[1]["body"])
+
+
+async def run(args: argparse.Namespace) -> None:
+    backend = create_backend({**SESSION_CONFIG, "backend": args.backend})
+    app = TypingAPI(SessionStore(backend))
+
+    session_ids = []
+    for _ in range(args.sessions):
+        session_id = (await request(app, "POST", "/sessions"))["session_id"]
+        await request(app, "POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        session_ids.append(session_id)
+
+    timings = {}
+    for name, method, suffix, body in (
+        ("입력 제출", "POST", "/input", {"text": SENTENCES[0]}),
+        ("통계 조회", "GET", "/stats", None),
+    ):
+        started = time.perf_counter()
+        for i in range(args.requests):
+            await request(app, method, f"/sessions/{session_ids[i % len(session_ids)]}{suffix}", body)
+        timings[name] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    written = await app.flush()
+    flush_time = time.perf_counter() - started
+    app.store.close()
+
+    for name, elapsed in timings.items():
+        print(f"{name}: {args.requests / elapsed:,.0f} req/s/코어 ({elapsed / args.requests * 1e6:.1f} µs/요청)")
+    print(f"세션 저장소({args.backend}) 기록: {written:,}개 세션, {flush_time * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
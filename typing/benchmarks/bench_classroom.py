@@ -0,0 +1,62 @@
+"""수업 현황판 벤치마크
+
+학생 수별로 입력 제출 한 번에 드는 시간(채점 + 집계)과 현황판을 다시 만드는 시간을 잽니다.
+집계를 바뀐 만큼만 고치므로 제출 시간은 학생 수와 관계없이 거의 같아야 합니다.
+
+    python benchmarks/bench_classroom.py --students 30 300 3000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classroom import ClassroomHub
+from typing_manager import TypingManager
+
+SENTENCES = ["오늘은 다 함께 타자 연습을 합니다.", "The quick brown fox jumps over the lazy dog.",
+             "천천히 정확하게 입력하는 습관이 중요합니다.", "Practice makes perfect."]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, nargs='+', default=[30, 300, 3000], help="학생 수")
+    parser.add_argument("--submits", type=int, default=20000, help="측정할 제출 수")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for count in args.students:
+        hub = ClassroomHub()
+        room = hub.create_room(SENTENCES * 5)
+        room.max_students = count
+        students = []
+        for i in range(count):
+            manager = TypingManager()
+            student = hub.join(room, f"s{i}", f"학생 {i}")
+            room.sync(student, manager)
+            students.append((student, manager))
+
+        submit_time = dashboard_time = 0.0
+        dashboards = 0
+        for n in range(args.submits):
+            student, manager = rng.choice(students)
+            sentence = manager.get_current_sentence()
+            text = sentence if rng.random() < 0.7 else sentence.replace(' ', '  ', 1)[::-1]
+            manager.stats.restart(at=manager.stats.start_time - 5)
+            started = time.perf_counter()
+            room.submit(student, manager, text)
+            submit_time += time.perf_counter() - started
+            if n % 50 == 0:      # 강사 화면이 1초에 한 번, 학생들이 초당 50번 제출하는 경우
+                started = time.perf_counter()
+                room.dashboard()
+                dashboard_time += time.perf_counter() - started
+                dashboards += 1
+        print(f"{count:>6,}명: 제출 {submit_time / args.submits * 1e6:6.1f} µs, "
+              f"현황판 {dashboard_time / dashboards * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
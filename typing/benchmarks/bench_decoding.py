@@ -0,0 +1,81 @@
+"""업로드 파일 디코딩 벤치마크
+
+UTF-8/CP949 텍스트 파일을 만들어 한 번에 디코딩하는 방식과
+스트리밍 디코딩 방식의 처리량과 최대 메모리 사용량을 비교합니다.
+
+    python benchmarks/bench_decoding.py --size-mb 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_decoder import detect_encoding, iter_decoded_lines
+
+SAMPLE_LINES = [
+    "타이핑 연습을 하는 어플입니다.",
+    "꾸준한 연습이 타자 속도를 높여줍니다.",
+    "Practice makes perfect when you type every day.",
+    "새로운 기술을 배우는 것은 언제나 즐거운 일입니다.",
+]
+
+
+def make_file(path: Path, size_mb: float, encoding: str) -> None:
+    """지정한 크기의 텍스트 파일을 만듭니다."""
+    block = ('\n'.join(SAMPLE_LINES * 256) + '\n').encode(encoding)
+    repeat = max(1, int(size_mb * 1024 * 1024 / len(block)))
+    with open(path, 'wb') as f:
+        for _ in range(repeat):
+            f.write(block)
+
+
+def measure(func: Callable[[], int]) -> Tuple[float, int, int]:
+    """실행 시간, 최대 메모리, 반환값(줄 수)을 측정합니다."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def decode_whole(path: Path) -> int:
+    """파일 전체를 읽어 한 번에 디코딩합니다 (기존 방식)."""
+    data = path.read_bytes()
+    text = data.decode(detect_encoding(data[:65536]), errors='replace')
+    return sum(1 for line in text.split('\n') if line.strip())
+
+
+def decode_streaming(path: Path) -> int:
+    """스트리밍으로 디코딩합니다."""
+    with open(path, 'rb') as f:
+        return sum(1 for line in iter_decoded_lines(f) if line.strip())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=100.0, help="테스트 파일 크기 (MB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for encoding in ('utf-8', 'cp949'):
+            path = Path(temp_dir) / f"bench-{encoding}.txt"
+            make_file(path, args.size_mb, encoding)
+            size_mb = path.stat().st_size / 1024 / 1024
+            print(f"[{encoding}] {size_mb:.1f} MB")
+            for name, func in (("전체 디코딩", decode_whole), ("스트리밍", decode_streaming)):
+                elapsed, peak, lines = measure(lambda: func(path))
+                print(f"  {name:8s} {elapsed:6.2f}초  {size_mb / elapsed:7.1f} MB/s  "
+                      f"최대 메모리 {peak / 1024 / 1024:8.1f} MB  ({lines:,}줄)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""한글 자모 비교 벤치마크
+
+입력 이벤트마다 실행되는 단어 상태 계산(`word_states`)과 정규화(`normalize`)의
+호출당 시간을 측정합니다. 입력창 값이 한 글자씩 늘어나는 과정을 그대로 재현합니다.
+
+    python benchmarks/bench_hangul.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import time
+import unicodedata
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hangul import SYLLABLE_KEYS, compose, normalize, to_keys, word_states
+
+SENTENCES = [
+    "오늘은 날씨가 정말 좋아서 공원에서 산책을 하기로 했습니다.",
+    "꾸준한 연습이 자신감을 키워줍니다.",
+    "Practice makes perfect when you type every day.",
+]
+
+
+def composing_states(sentence: str):
+    """입력기가 만들어 내는 중간 입력창 값 (자모 하나씩)"""
+    keys = to_keys(sentence)
+    return [compose(keys[:i]) for i in range(1, len(keys) + 1)]
+
+
+def measure(name: str, function, inputs, repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for args in inputs:
+            function(*args)
+    calls = repeat * len(inputs)
+    print(f"{name}: 호출당 {(time.perf_counter() - started) / calls * 1e6:.1f} µs ({calls:,}회)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    assert all(compose(keys) == chr(0xAC00 + i) for i, keys in enumerate(SYLLABLE_KEYS))
+    print(f"음절 11,172자 조합 확인: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    events = [(typed, sentence) for sentence in SENTENCES for typed in composing_states(sentence)]
+    print(f"입력 이벤트 {len(events):,}개 (문장 {len(SENTENCES)}개)")
+    measure("word_states", word_states, events, args.repeat)
+    measure("normalize (완성형)", normalize, [(sentence,) for sentence in SENTENCES], args.repeat * 50)
+    measure("normalize (NFD)", normalize,
+            [(unicodedata.normalize('NFD', sentence),) for sentence in SENTENCES], args.repeat * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""기록 추이 차트 벤치마크
+
+사용자 한 명의 기록을 여러 해에 걸쳐 만들고, 기록 시간과 기간별 차트 데이터를 만드는 시간, 점 수를 잽니다.
+
+    python benchmarks/bench_history.py --records 1000 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import DAY, HistoryStore
+
+RANGES = {"7일": 7, "30일": 30, "1년": 365, "전체": None}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs='+', default=[1000, 100000, 1000000], help="기록 수")
+    parser.add_argument("--years", type=float, default=5, help="기록이 퍼져 있는 기간 (년)")
+    parser.add_argument("--repeat", type=int, default=5, help="기간마다 반복 횟수")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+    for count in args.records:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = HistoryStore(os.path.join(temp_dir, "history.db"))
+            span = args.years * 365 * DAY
+            stamps = sorted(now - rng.random() * span for _ in range(count))
+            started = time.perf_counter()
+            for i, ts in enumerate(stamps):
+                wpm = 30 + 40 * i / count + rng.gauss(0, 5)
+                store.record("user", {"wpm": wpm, "cpm": wpm * 5, "accuracy": 90 + rng.random() * 10}, ts=ts)
+            record_us = (time.perf_counter() - started) / count * 1e6
+            results = []
+            for label, days in RANGES.items():
+                times = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    resolution, points = store.series("user", "wpm", start=now - days * DAY if days else None)
+                    times.append(time.perf_counter() - started)
+                elapsed = statistics.median(times) * 1000
+                results.append(f"{label} {elapsed:.1f} ms/{len(points)}점({resolution})")
+            store.close()
+            print(f"{count:>9,}개 기록: 기록 {record_us:.0f} µs, " + ", ".join(results))
+
+
+if __name__ == "__main__":
+    main()
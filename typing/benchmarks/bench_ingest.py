@@ -0,0 +1,87 @@
+"""URL 문장 수집 벤치마크
+
+느린 네트워크를 흉내 내는 로컬 HTTP 서버(조각마다 지연)에서 큰 문서를 내려받아,
+한 번에 처리하는 방식(`extract_text_from_url`)과 스트리밍 파이프라인
+(`TypingManager.load_sentence_stream`)의 첫 문장까지 걸리는 시간과 전체 시간을 비교합니다.
+
+    python benchmarks/bench_ingest.py --paragraphs 1500 --chunk-delay 0.005
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing_manager import TypingManager
+from url_processor import URLProcessor
+
+WORDS = ("타자 연습 문장 키보드 손가락 속도 정확도 습관 매일 조금씩 꾸준히 실력 향상 "
+         "글자 단어 화면 입력 시간 결과 기록 목표 도전 성공 노력").split()
+
+
+def build_document(paragraphs: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    body = []
+    for i in range(paragraphs):
+        sentences = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 10))) + '.' for _ in range(3)]
+        body.append(f"<p>{i}번째 문단입니다. {' '.join(sentences)}</p>")
+    return ("<html><head><meta charset='utf-8'><script>var x = 1;</script></head><body>"
+            + '\n'.join(body) + "</body></html>").encode('utf-8')
+
+
+def serve(document: bytes, chunk_size: int, chunk_delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(document)))
+            self.end_headers()
+            for offset in range(0, len(document), chunk_size):
+                self.wfile.write(document[offset:offset + chunk_size])
+                self.wfile.flush()
+                time.sleep(chunk_delay)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=1500, help='INGEST_CONFIG["max_sentences"]보다 적은 문장이 나오도록 설정')
+    parser.add_argument("--chunk-size", type=int, default=16 * 1024, help="서버가 한 번에 보내는 바이트 수")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="조각 사이 지연 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    document = build_document(args.paragraphs, args.seed)
+    server = serve(document, args.chunk_size, args.chunk_delay)
+    url = f"http://127.0.0.1:{server.server_address[1]}/article.html"
+    print(f"문서 {len(document) / 1e6:.1f} MB, 문단 {args.paragraphs:,}개, "
+          f"조각 {args.chunk_size // 1024} KB마다 {args.chunk_delay * 1000:.0f} ms 지연")
+
+    started = time.perf_counter()
+    sentences = TypingManager().process_input_text(url)
+    total = time.perf_counter() - started
+    print(f"한 번에 처리: 첫 문장 {total * 1000:,.0f} ms, 전체 {len(sentences):,}문장 {total * 1000:,.0f} ms")
+
+    manager = TypingManager()
+    started = time.perf_counter()
+    manager.load_sentence_stream(manager.iter_input_sentences(url))
+    first = time.perf_counter() - started
+    manager._feed.wait_for(float('inf'))
+    total = time.perf_counter() - started
+    print(f"스트리밍:     첫 문장 {first * 1000:,.0f} ms, 전체 {len(manager.current_sentences):,}문장 {total * 1000:,.0f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
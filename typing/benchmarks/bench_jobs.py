@@ -0,0 +1,109 @@
+"""백그라운드 작업 벤치마크
+
+큰 HTML 문서를 파싱하는 동안 다른 사용자의 실행(짧은 CPU 작업)이 얼마나 늦어지는지 비교합니다.
+
+- 스크립트 스레드: 파싱이 끝날 때까지 그 실행이 멈춤 (이전 방식)
+- 작업 스레드: 실행은 멈추지 않지만 파싱과 GIL을 다툼
+- 작업 프로세스: GIL을 다투지 않음 (프로세스 시작과 문서 전달 비용이 추가됨)
+
+    python benchmarks/bench_jobs.py --paragraphs 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobs import JobQueue, parse_html_sentences
+
+SYLLABLES = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+
+
+def make_html(paragraphs: int, rng: random.Random) -> str:
+    body = ''.join(
+        "<p>" + ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+                         for _ in range(rng.randint(20, 40))) + ".</p>"
+        for _ in range(paragraphs))
+    return f"<html><body>{body}<script>var x = 1;</script></body></html>"
+
+
+def rerun() -> None:
+    """다른 사용자의 실행 한 번을 흉내 내는 약 1ms의 CPU 작업"""
+    deadline = time.thread_time() + 0.001
+    while time.thread_time() < deadline:
+        pass
+
+
+def measure_reruns(stop: threading.Event) -> list:
+    """stop이 설정될 때까지 5ms마다 실행을 요청하고, 요청부터 실행이 끝날 때까지 걸린 시간(ms)을 기록합니다."""
+    latencies = []
+    while not stop.is_set():
+        time.sleep(0.005)
+        requested = time.perf_counter()
+        # 잠에서 깬 뒤 GIL을 다시 얻을 때까지의 대기도 포함하도록 스레드를 한 번 양보
+        time.sleep(0)
+        rerun()
+        latencies.append((time.perf_counter() - requested) * 1000)
+    return latencies
+
+
+def parse_job(job, html: str) -> int:
+    return len(job.run_cpu(parse_html_sentences, html, 10 ** 9)[0])
+
+
+def run_job(queue: JobQueue, html: str) -> tuple:
+    """작업을 넣고 끝날 때까지 실행 지연을 재서 (작업 시간, 실행 지연 목록)을 반환합니다."""
+    stop = threading.Event()
+    started = time.perf_counter()
+    job = queue.submit("bench", "url", parse_job, html)
+    result = []
+    watcher = threading.Thread(target=lambda: result.extend(measure_reruns(stop)))
+    watcher.start()
+    while not job.done:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    watcher.join()
+    if job.status != "done":
+        raise RuntimeError(job.error)
+    return elapsed, result
+
+
+def describe(name: str, elapsed: float, latencies: list) -> None:
+    p99 = sorted(latencies)[int(len(latencies) * 0.99)] if latencies else float('nan')
+    median = statistics.median(latencies) if latencies else float('nan')
+    print(f"{name}: 작업 {elapsed:5.2f} s, 실행 {len(latencies):5d}번, "
+          f"지연 중앙값 {median:6.2f} ms, p99 {p99:6.2f} ms, 최대 {max(latencies, default=0):7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=20000, help="문서의 문단 수")
+    parser.add_argument("--processes", type=int, default=1, help="파싱 프로세스 수")
+    args = parser.parse_args()
+
+    html = make_html(args.paragraphs, random.Random(0))
+    print(f"문서 {len(html) / 1e6:.1f}M 글자")
+
+    started = time.perf_counter()
+    parse_html_sentences(html, 10 ** 9)
+    blocked = time.perf_counter() - started
+    print(f"스크립트 스레드: 실행이 {blocked:5.2f} s 동안 멈춤")
+
+    thread_queue = JobQueue(io_workers=1, cpu_workers=0)
+    describe("작업 스레드  ", *run_job(thread_queue, html))
+    thread_queue.shutdown()
+
+    process_queue = JobQueue(io_workers=1, cpu_workers=args.processes)
+    run_job(process_queue, "<p>준비</p>")   # 프로세스 시작 비용은 첫 작업에서 한 번만 냄
+    describe("작업 프로세스", *run_job(process_queue, html))
+    process_queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
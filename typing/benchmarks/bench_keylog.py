@@ -0,0 +1,101 @@
+"""키 입력 기록 벤치마크
+
+가상의 연습 기록(한글/영어 문장, 한글 조합, 오타와 수정)을 수백만 건 생성해
+파일 크기(이벤트당 바이트), 기록 속도, 순수 Python 디코딩과 NumPy 디코딩 속도,
+분석(글자별 간격, 두 글자 조합, 자주 틀리는 글자) 시간을 측정합니다.
+
+    python benchmarks/bench_keylog.py --events 2000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keystroke_log import (KeystrokeLog, KeystrokeWriter, digraph_timing, error_hotspots,
+                           key_latency, np)
+
+SENTENCES = [
+    "작은 습관이 모여 큰 변화를 만들어 냅니다.",
+    "Practice makes perfect when you type every day.",
+    "꾸준한 연습이 자신감을 키워줍니다.",
+    "The quick brown fox jumps over the lazy dog.",
+]
+
+
+def write_log(path: str, target_events: int, seed: int) -> int:
+    """가상 기록을 쓰고 입력 이벤트(입력창 값 변경) 수를 반환합니다."""
+    rng = random.Random(seed)
+    events = 0
+    with KeystrokeWriter(path) as writer:
+        now = writer.base_ms
+        index = 0
+        while events < target_events:
+            sentence = SENTENCES[index % len(SENTENCES)]
+            writer.begin_sentence(index, sentence, now)
+            typed = ""
+            for char in sentence:
+                now += int(rng.expovariate(1 / 180))
+                if rng.random() < 0.03:  # 오타 후 수정
+                    writer.record_input(typed + "x", now)
+                    now += int(rng.expovariate(1 / 250))
+                    writer.record_input(typed, now)
+                    now += int(rng.expovariate(1 / 180))
+                    events += 2
+                if '가' <= char <= '힣':  # 조합 중간 상태 한 번
+                    writer.record_input(typed + "ㅎ", now)
+                    now += int(rng.expovariate(1 / 90))
+                    events += 1
+                typed += char
+                writer.record_input(typed, now)
+                events += 1
+            now += 500
+            writer.end_sentence(now)
+            index += 1
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000_000, help="생성할 입력 이벤트 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-python", action="store_true", help="순수 Python 디코딩 측정 생략")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.keys")
+        started = time.perf_counter()
+        events = write_log(path, args.events, args.seed)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+        print(f"기록: 입력 이벤트 {events:,}건, {size / 1e6:.1f} MB (이벤트당 {size / events:.2f} 바이트, "
+              f"목표 문장 포함), {events / elapsed:,.0f} 이벤트/초")
+
+        with KeystrokeLog(path) as log:
+            if not args.skip_python:
+                started = time.perf_counter()
+                records = sum(1 for _ in log.iter_events())
+                elapsed = time.perf_counter() - started
+                print(f"순수 Python 디코딩: 레코드 {records:,}개, {elapsed:.2f}초 ({records / elapsed:,.0f} 레코드/초)")
+            if np is None:
+                print("numpy가 없어 NumPy 디코딩과 분석은 건너뜁니다.")
+                return
+            started = time.perf_counter()
+            arrays = log.arrays()
+            elapsed = time.perf_counter() - started
+            print(f"NumPy 디코딩: 레코드 {len(arrays.kinds):,}개, {elapsed:.2f}초 "
+                  f"({len(arrays.kinds) / elapsed:,.0f} 레코드/초)")
+
+        for name, function in (("글자별 간격", key_latency), ("두 글자 조합", digraph_timing),
+                               ("자주 틀리는 글자", error_hotspots)):
+            started = time.perf_counter()
+            rows = function(arrays)
+            print(f"{name}: {time.perf_counter() - started:.2f}초, {len(rows)}개 항목")
+
+
+if __name__ == "__main__":
+    main()
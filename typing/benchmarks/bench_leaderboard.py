@@ -0,0 +1,81 @@
+"""순위표 벤치마크
+
+사용자 최고 기록 수백만 건을 순위표 파일에 넣은 뒤, 시작 시 색인을 다시 만드는 시간과
+순위/백분위 조회, 상위 기록 조회, 기록 제출(SQLite 기록 포함) 속도를 측정합니다.
+
+    python benchmarks/bench_leaderboard.py --users 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import Leaderboard
+
+BOARDS = [("한국어", "직접 입력"), ("한국어", "AI 생성 문장"), ("English", "직접 입력"), ("English", "파일 업로드")]
+
+
+def populate(path: str, users: int, seed: int) -> None:
+    """순위표 파일에 가상의 최고 기록을 한 번에 넣습니다."""
+    rng = random.Random(seed)
+    board = Leaderboard(path)
+
+    def rows():
+        for i in range(users):
+            language, mode = BOARDS[i % len(BOARDS)]
+            cpm = max(30.0, rng.gauss(300, 90))
+            yield (language, mode, f"user{i}", f"user{i}", board._points(cpm), cpm / 5, cpm, 95.0, time.time())
+
+    with board._conn:
+        board._conn.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows())
+    board.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--submits", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.db")
+        started = time.perf_counter()
+        populate(path, args.users, args.seed)
+        print(f"기록 {args.users:,}건 넣기: {time.perf_counter() - started:.2f}초, "
+              f"파일 {os.path.getsize(path) / 1e6:.1f} MB")
+
+        started = time.perf_counter()
+        board = Leaderboard(path)
+        print(f"시작 시 색인 만들기: {time.perf_counter() - started:.2f}초 (순위표 {len(board.boards)}개)")
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        for _ in range(args.queries):
+            language, mode = rng.choice(BOARDS)
+            board.rank(language, mode, rng.uniform(50, 600))
+        print(f"순위/백분위 조회: {(time.perf_counter() - started) / args.queries * 1e6:.1f} µs/회")
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            board.top("한국어", "직접 입력", 100)
+        print(f"상위 100명 조회: {(time.perf_counter() - started) / 1000 * 1e6:.0f} µs/회")
+
+        started = time.perf_counter()
+        for i in range(args.submits):
+            cpm = rng.uniform(100, 700)
+            board.submit(f"user{rng.randrange(args.users)}", "한국어", "직접 입력",
+                         {"total_words": 50, "accuracy": 97.0, "cpm": cpm, "wpm": cpm / 5})
+        print(f"기록 제출: {(time.perf_counter() - started) / args.submits * 1e3:.2f} ms/회")
+        print(f"예: 350타 → {board.rank('한국어', '직접 입력', 350)}")
+        board.close()
+
+
+if __name__ == "__main__":
+    main()
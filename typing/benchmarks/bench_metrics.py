@@ -0,0 +1,64 @@
+"""운영 지표 기록 비용 벤치마크
+
+항상 켜 두는 카운터/히스토그램 기록 한 번의 비용을 스레드 수별로 측정하고,
+지표 출력(render) 시간을 측정합니다.
+
+    python benchmarks/bench_metrics.py --operations 1000000 --threads 1 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Registry
+
+
+def run(threads: int, operations: int, function) -> float:
+    """threads개 스레드가 나누어 function을 operations번 호출하고 호출당 ns를 반환합니다."""
+    per_thread = operations // threads
+
+    def work():
+        for _ in range(per_thread):
+            function()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench_total", "벤치마크 카운터")
+    labelled = registry.counter("bench_labelled_total", "라벨 있는 카운터", ["kind"])
+    histogram = registry.histogram("bench_seconds", "벤치마크 히스토그램")
+    cases = {
+        "빈 함수 호출": lambda: None,
+        "counter.inc()": counter.inc,
+        "counter.inc(kind=)": lambda: labelled.inc(kind="a"),
+        "histogram.observe()": lambda: histogram.observe(0.042),
+    }
+    for threads in args.threads:
+        for name, function in cases.items():
+            print(f"스레드 {threads}개, {name:<20} {run(threads, args.operations, function):6.0f} ns/회")
+    for i in range(1000):
+        labelled.inc(kind=str(i))
+    started = time.perf_counter()
+    text = registry.render()
+    print(f"render: 지표 {len(text.splitlines()):,}줄, {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""오프라인 n-gram 문장 생성기 벤치마크
+
+모델 크기, 학습/로드 시간, 문장 생성 속도를 측정합니다.
+코퍼스를 지정하지 않으면 템플릿으로 만든 합성 문장을 사용합니다.
+
+    python benchmarks/bench_ngram.py --sentences 200000
+    python benchmarks/bench_ngram.py --corpus practice.corpus --language 한국어
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AI_CONFIG
+from ngram_generator import NGramModel, iter_training_sentences
+
+SUBJECTS = ["작은 습관이", "꾸준한 연습이", "새로운 도전이", "매일의 배움이", "긍정적인 생각이", "작은 친절이"]
+MIDDLES = ["모여", "쌓여", "이어져", "반복되어", "자라나"]
+OBJECTS = ["큰 변화를", "깊은 통찰을", "단단한 자신감을", "새로운 기회를", "의미 있는 성장을"]
+ENDINGS = ["만들어 냅니다.", "가져다 줍니다.", "선물합니다.", "이끌어 냅니다."]
+EXTRAS = ["", "결국", "언젠가", "우리 삶에", "천천히", "분명히"]
+
+
+def synthetic_sentences(count: int, seed: int = 0) -> Iterator[str]:
+    """템플릿을 조합하여 합성 학습 문장을 만듭니다."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        words: List[str] = [rng.choice(SUBJECTS), rng.choice(MIDDLES), rng.choice(EXTRAS),
+                            rng.choice(OBJECTS), rng.choice(EXTRAS), rng.choice(ENDINGS)]
+        yield ' '.join(word for word in words if word)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", nargs='*', help="학습에 사용할 코퍼스/텍스트 파일")
+    parser.add_argument("--language", choices=AI_CONFIG["languages"], default=None)
+    parser.add_argument("--sentences", type=int, default=200_000, help="합성 학습 문장 수")
+    parser.add_argument("--generate", type=int, default=20_000, help="생성할 문장 수")
+    args = parser.parse_args()
+
+    if args.corpus:
+        sentences = iter_training_sentences(args.corpus, args.language)
+    else:
+        sentences = synthetic_sentences(args.sentences)
+
+    started = time.perf_counter()
+    model = NGramModel.train(sentences)
+    train_time = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "model.bin"
+        model.save(path)
+        size_kb = path.stat().st_size / 1024
+        started = time.perf_counter()
+        model = NGramModel.load(path)
+        load_time = time.perf_counter() - started
+
+    rng = random.Random(1)
+    generated = 0
+    started = time.perf_counter()
+    for _ in range(args.generate):
+        if model.generate(rng=rng):
+            generated += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"학습 문장 {model.metadata['sentences']:,}개, 어휘 {len(model.vocab):,}개, "
+          f"문맥 {len(model.context_keys):,}개, 전이 {len(model.next_ids):,}개")
+    print(f"모델 크기 {size_kb:,.1f} KB | 학습 {train_time:.2f}초 | 로드 {load_time * 1000:.1f} ms")
+    print(f"생성 시도 {args.generate:,}회 중 조건 충족 {generated:,}개 | "
+          f"시도당 {elapsed / args.generate * 1e6:.1f} µs | "
+          f"성공 문장당 {elapsed / max(generated, 1) * 1e6:.1f} µs "
+          f"({generated / elapsed:,.0f} 문장/초)")
+
+
+if __name__ == "__main__":
+    main()
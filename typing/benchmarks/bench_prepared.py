@@ -0,0 +1,86 @@
+"""준비된 문장(PreparedSentence) 벤치마크
+
+입력 제출과 화면 다시 그리기마다 문장을 나누고 타자수를 세고 HTML을 만들던 이전 방식과,
+문장을 불러올 때 한 번 준비해 두고 재사용하는 방식의 실행당 비용을 비교합니다.
+
+    python benchmarks/bench_prepared.py --sentences 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CSS_CLASSES
+from hangul import normalize
+from typing_manager import PreparedSentence, TypingStats
+
+SYLLABLES = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+ENGLISH = "the quick brown fox jumps over lazy dog while typing practice sentences every day".split()
+
+
+def make_sentence(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        return ' '.join(rng.choice(ENGLISH) for _ in range(rng.randint(8, 14))) + '.'
+    return ' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+                    for _ in range(rng.randint(5, 10))) + '.'
+
+
+def old_submit(sentence: str, input_words: list) -> int:
+    """이전 방식: 제출마다 목표 문장을 정규화해 나누고 입력 단어의 타자수를 한 글자씩 셈"""
+    target_words = normalize(sentence).split()
+    correct = sum(1 for i, word in enumerate(input_words) if i < len(target_words) and word == target_words[i])
+    return correct + sum(map(TypingStats.count_keystrokes, input_words))
+
+
+def new_submit(prepared: PreparedSentence, input_words: list) -> int:
+    words, costs = prepared.words, prepared.costs
+    correct = sum(1 for i, word in enumerate(input_words) if i < len(words) and word == words[i])
+    return correct + sum(costs[i] if i < len(words) and word == words[i] else TypingStats.count_keystrokes(word)
+                         for i, word in enumerate(input_words))
+
+
+def old_render(sentence: str) -> str:
+    """이전 방식: 다시 그릴 때마다 단어 span HTML을 새로 만듦"""
+    return ' '.join([f'<span class="{CSS_CLASSES["word"]}" id="word-{i}">{word}</span>'
+                     for i, word in enumerate(sentence.split())])
+
+
+def measure(func, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        func(*item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=1000, help="문장 수")
+    parser.add_argument("--rounds", type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sentences = [normalize(make_sentence(rng)) for _ in range(args.sentences)]
+    started = time.perf_counter()
+    prepared = [PreparedSentence(sentence) for sentence in sentences]
+    prepare_us = (time.perf_counter() - started) / len(sentences) * 1e6
+    # 대부분 맞히고 가끔 틀린 입력
+    inputs = [[word if rng.random() < 0.9 else word[::-1] + 'x' for word in p.words] for p in prepared]
+
+    rounds = range(args.rounds)
+    old_s = min(measure(old_submit, list(zip(sentences, inputs))) for _ in rounds)
+    new_s = min(measure(new_submit, list(zip(prepared, inputs))) for _ in rounds)
+    old_r = min(measure(old_render, [(s,) for s in sentences]) for _ in rounds)
+    new_r = min(measure(lambda p: p.html, [(p,) for p in prepared]) for _ in rounds)
+    size = sum(p.size_bytes for p in prepared) / len(prepared)
+    print(f"준비: 문장당 {prepare_us:.1f} µs, {size:.0f}바이트 (불러올 때 한 번)")
+    print(f"입력 제출 채점: 이전 {old_s:.1f} µs → {new_s:.1f} µs ({100 * (1 - new_s / old_s):.0f}% 감소)")
+    print(f"문장 HTML:      이전 {old_r:.1f} µs → {new_r:.2f} µs")
+    print(f"실행당 합계:    이전 {old_s + old_r:.1f} µs → {new_s + new_r:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
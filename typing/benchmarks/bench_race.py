@@ -0,0 +1,135 @@
+"""레이스 방송 부하 생성기
+
+한 프로세스(이벤트 루프 하나) 안에서 방 여러 개와 참가자 수백 명을 흉내 내어
+ASGI 웹소켓 처리기(`RaceHub.handle_websocket`)에 진행 메시지를 보내고,
+방송 주기 처리 시간, 이벤트 루프 지연, 송수신 메시지 수를 측정합니다.
+네트워크 비용은 제외되므로 결과는 서버 코드 자체의 한계를 보여줍니다.
+
+    python benchmarks/bench_race.py --rooms 20 --racers 300 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from race import RaceHub
+
+SENTENCES = [
+    "작은 습관이 모여 큰 변화를 만들어 냅니다.",
+    "Practice makes perfect when you type every day.",
+    "꾸준한 연습이 자신감을 키워줍니다.",
+] * 3
+
+
+class Counters:
+    def __init__(self):
+        self.received = 0
+        self.sent = 0
+        self.sent_bytes = 0
+
+
+async def racer(hub: RaceHub, room_id: str, index: int, counters: Counters,
+                keys_per_second: float, deadline: float) -> None:
+    """참가자 한 명: 글자를 입력할 때마다 진행 메시지를, 문장을 끝내면 제출 메시지를 보냅니다."""
+    incoming: asyncio.Queue = asyncio.Queue()
+    rng = random.Random(index)
+
+    async def send(message: Dict) -> None:
+        if message["type"] == "websocket.send":
+            counters.sent += 1
+            counters.sent_bytes += len(message["text"])
+
+    scope = {"type": "websocket", "path": f"/races/{room_id}/ws", "query_string": f"name=racer{index}".encode()}
+    incoming.put_nowait({"type": "websocket.connect"})
+    connection = asyncio.create_task(hub.handle_websocket(scope, incoming.get, send))
+
+    await asyncio.sleep(rng.random())
+    loop = asyncio.get_running_loop()
+    for sentence in SENTENCES:
+        for length in range(1, len(sentence) + 1):
+            if loop.time() >= deadline:
+                break
+            await asyncio.sleep(rng.expovariate(keys_per_second))
+            incoming.put_nowait({"type": "websocket.receive",
+                                 "text": json.dumps({"type": "progress", "typed": sentence[:length]})})
+            counters.received += 1
+        else:
+            incoming.put_nowait({"type": "websocket.receive", "text": json.dumps({"type": "submit", "text": sentence})})
+            counters.received += 1
+            continue
+        break
+    await asyncio.sleep(max(0.0, deadline - loop.time()))
+    incoming.put_nowait({"type": "websocket.disconnect"})
+    await connection
+
+
+async def run(args: argparse.Namespace) -> None:
+    hub = RaceHub(tick_interval=args.tick)
+    tick_times: List[float] = []
+    original_tick = hub.tick
+
+    def timed_tick(now=None) -> int:
+        started = time.perf_counter()
+        delivered = original_tick(now)
+        tick_times.append(time.perf_counter() - started)
+        return delivered
+
+    hub.tick = timed_tick
+    counters = Counters()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + args.seconds
+
+    rooms = [hub.create_room(SENTENCES) for _ in range(args.rooms)]
+    for room in rooms:
+        room.start(countdown=0)
+
+    # 이벤트 루프 지연 측정: 10ms마다 깨어나 늦어진 정도를 기록
+    lags: List[float] = []
+
+    async def monitor() -> None:
+        while loop.time() < deadline:
+            expected = loop.time() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(loop.time() - expected)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        monitor(),
+        *(racer(hub, room.id, r * args.racers + i, counters, args.keys_per_second, deadline)
+          for r, room in enumerate(rooms) for i in range(args.racers))
+    )
+    elapsed = time.perf_counter() - started
+    hub.stop()
+
+    def percentile(values: List[float], q: float) -> float:
+        return sorted(values)[min(len(values) - 1, int(len(values) * q))] * 1000 if values else 0.0
+
+    total = args.rooms * args.racers
+    print(f"방 {args.rooms}개 × 참가자 {args.racers}명 = {total:,}개 연결, {elapsed:.1f}초")
+    print(f"수신: {counters.received / elapsed:,.0f} 메시지/초 | "
+          f"송신: {counters.sent / elapsed:,.0f} 메시지/초, {counters.sent_bytes / elapsed / 1e6:.1f} MB/s")
+    print(f"방송 주기 {args.tick * 1000:.0f} ms, {len(tick_times)}회: "
+          f"처리 시간 평균 {statistics.mean(tick_times) * 1000:.2f} ms, p99 {percentile(tick_times, 0.99):.2f} ms")
+    print(f"이벤트 루프 지연: p50 {percentile(lags, 0.5):.2f} ms, p99 {percentile(lags, 0.99):.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=20)
+    parser.add_argument("--racers", type=int, default=300, help="방 하나의 참가자 수")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--keys-per-second", type=float, default=5.0, help="참가자 한 명의 초당 입력 글자 수")
+    parser.add_argument("--tick", type=float, default=0.2, help="방송 주기 (초)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
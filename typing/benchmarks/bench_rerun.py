@@ -0,0 +1,55 @@
+"""Streamlit 실행 범위별 비용 비교
+
+실행 중인 앱의 지표(`typing_streamlit_rerun_seconds`, `typing_streamlit_rerun_cpu_seconds`)를 읽어
+전체 스크립트 실행(app)과 타이핑 영역만 다시 실행(fragment)의 평균 시간/CPU를 비교합니다.
+앱을 띄우고 몇 문장을 입력한 뒤 실행합니다. ``UI_CONFIG["typing_fragment"] = False``로 띄워
+같은 방법으로 측정하면 입력 제출마다 전체를 다시 실행할 때와 비교할 수 있습니다::
+
+    streamlit run main.py
+    python benchmarks/bench_rerun.py --url http://127.0.0.1:9464/metrics
+"""
+import argparse
+import re
+import urllib.request
+from typing import Dict, Tuple
+
+SAMPLE = re.compile(r'^(?P<name>\w+)_(?P<kind>sum|count)\{scope="(?P<scope>\w+)"\} (?P<value>\S+)$')
+
+
+def read_means(text: str) -> Dict[Tuple[str, str], Tuple[float, int]]:
+    """(지표 이름, 범위) → (평균, 횟수)"""
+    sums: Dict[Tuple[str, str, str], float] = {}
+    for line in text.splitlines():
+        match = SAMPLE.match(line)
+        if match and match["name"].startswith("typing_streamlit_rerun"):
+            sums[(match["name"], match["scope"], match["kind"])] = float(match["value"])
+    means = {}
+    for (name, scope, kind), value in sums.items():
+        if kind == "count" and value:
+            means[(name, scope)] = (sums[(name, scope, "sum")] / value, int(value))
+    return means
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:9464/metrics")
+    args = parser.parse_args()
+
+    with urllib.request.urlopen(args.url) as response:
+        means = read_means(response.read().decode('utf-8'))
+    if not means:
+        print("아직 기록된 실행이 없습니다. 앱에서 문장을 몇 개 입력한 뒤 다시 실행하세요.")
+        return
+    for scope in ("app", "fragment"):
+        wall = means.get(("typing_streamlit_rerun_seconds", scope))
+        cpu = means.get(("typing_streamlit_rerun_cpu_seconds", scope))
+        if wall and cpu:
+            print(f"{scope:<9} {wall[1]:>6,}회  평균 {wall[0] * 1000:7.1f} ms, CPU {cpu[0] * 1000:7.1f} ms")
+    app = means.get(("typing_streamlit_rerun_cpu_seconds", "app"))
+    fragment = means.get(("typing_streamlit_rerun_cpu_seconds", "fragment"))
+    if app and fragment:
+        print(f"입력 제출당 CPU: 전체 실행 대비 {100 * (1 - fragment[0] / app[0]):.0f}% 감소")
+
+
+if __name__ == "__main__":
+    main()
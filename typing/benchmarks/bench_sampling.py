@@ -0,0 +1,95 @@
+"""무작위 추출 벤치마크
+
+텍스트 파일 한 번 읽기에서 k개를 뽑는 세 가지 방법의 시간과 최대 메모리를 비교하고,
+코퍼스 색인으로 k개의 위치만 읽는 시간을 잽니다.
+
+- 전부 읽기: 모든 문장을 리스트에 모은 뒤 random.sample (메모리가 파일에 비례)
+- Algorithm R: 항목마다 난수를 하나씩 뽑는 기본 저장소 추출
+- Algorithm L: 다음에 바꿀 항목까지 건너뛸 개수를 바로 계산 (sampling.reservoir_sample)
+
+    python benchmarks/bench_sampling.py --sentences 1000000 --k 150
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import CorpusReader, CorpusWriter
+from sampling import make_rng, reservoir_sample, sample_sequence
+
+
+def sentences(count: int):
+    for i in range(count):
+        yield f"연습 문장 번호 {i}번은 무작위 추출 벤치마크를 위한 문장입니다."
+
+
+def collect_all(items, k: int, rng: random.Random) -> list:
+    items = list(items)
+    return rng.sample(items, min(k, len(items)))
+
+
+def algorithm_r(items, k: int, rng: random.Random) -> list:
+    reservoir = []
+    for i, item in enumerate(items):
+        if i < k:
+            reservoir.append(item)
+        else:
+            j = rng.randrange(i + 1)
+            if j < k:
+                reservoir[j] = item
+    return reservoir
+
+
+def measure(name: str, func, count: int, k: int) -> None:
+    started = time.perf_counter()
+    func(sentences(count), k, make_rng(0))
+    elapsed = time.perf_counter() - started
+    # tracemalloc은 실행을 느리게 하므로 메모리는 따로 한 번 더 실행하여 잼
+    tracemalloc.start()
+    func(sentences(count), k, make_rng(0))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name}: {elapsed:6.3f} s (생성만 빼면 {elapsed - baseline(count):6.3f} s), 최대 메모리 {peak / 1e6:7.2f} MB")
+
+
+def baseline(count: int, cache={}) -> float:
+    """문장을 만들어 읽기만 하는 시간"""
+    if count not in cache:
+        started = time.perf_counter()
+        for _ in sentences(count):
+            pass
+        cache[count] = time.perf_counter() - started
+    return cache[count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=1000000, help="문장 수")
+    parser.add_argument("--k", type=int, default=150, help="뽑을 문장 수 (문장 수 x lookahead)")
+    args = parser.parse_args()
+
+    print(f"문장 {args.sentences:,}개에서 {args.k}개 뽑기 (읽기만 {baseline(args.sentences):.3f} s)")
+    measure("전부 읽기  ", collect_all, args.sentences, args.k)
+    measure("Algorithm R", algorithm_r, args.sentences, args.k)
+    measure("Algorithm L", reservoir_sample, args.sentences, args.k)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "bench.corpus"
+        with CorpusWriter(path) as writer:
+            writer.add_many(sentences(args.sentences))
+        with CorpusReader(path) as reader:
+            started = time.perf_counter()
+            sample_sequence(reader, args.k, make_rng(0))
+            elapsed = time.perf_counter() - started
+        print(f"코퍼스 색인: {elapsed * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""코퍼스 검색 색인 벤치마크
+
+임의로 만든 한글/영어 문장으로 색인된 코퍼스를 만들고, 색인 생성 시간과 크기, 색인을 여는 시간,
+드문/흔한 검색어별 검색 시간을 잽니다.
+
+    python benchmarks/bench_search.py --sentences 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import CorpusReader, CorpusWriter
+from search_index import SearchIndex, open_index, search, tokenize
+
+SYLLABLES = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+ENGLISH = ("the of and to in is was for on that with as by at from this have not are but "
+           "practice keyboard typing quickly sentence random language river mountain").split()
+QUERIES = ["타자 연습", "연습", "오늘", "keyboard practice", "the", "river mountain"]
+
+
+def make_sentence(rng: random.Random) -> str:
+    """한글 문장(대부분)과 영어 문장을 섞어 만듭니다. 일부 단어는 자주 나오도록 치우치게 고릅니다."""
+    if rng.random() < 0.3:
+        return ' '.join(rng.choice(ENGLISH) for _ in range(rng.randint(6, 14))).capitalize() + '.'
+    words = []
+    for _ in range(rng.randint(4, 9)):
+        if rng.random() < 0.15:
+            words.append(rng.choice(["타자", "연습", "오늘", "매일", "문장"]))
+        else:
+            words.append(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return ' '.join(words) + '.'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=1_000_000, help="코퍼스 문장 수")
+    parser.add_argument("--repeat", type=int, default=20, help="검색어마다 반복 횟수")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "bench.corpus"
+        sentences = [make_sentence(rng) for _ in range(args.sentences)]
+
+        started = time.perf_counter()
+        with CorpusWriter(path) as writer:
+            writer.add_many(sentences)
+        plain = time.perf_counter() - started
+        plain_size = path.stat().st_size
+
+        started = time.perf_counter()
+        with CorpusWriter(path, index=SearchIndex()) as writer:
+            writer.add_many(sentences)
+        indexed = time.perf_counter() - started
+        rare = next(word for sentence in sentences[len(sentences) // 2:] for word in sentence.split()
+                    if len(word) >= 3 and '가' <= word[0] <= '힣')   # 드문 한글 단어
+        del sentences
+        index_size = path.stat().st_size - plain_size
+        print(f"코퍼스 생성: 색인 없이 {plain:.1f}초, 색인 포함 {indexed:.1f}초 "
+              f"(색인 {index_size / 1024 / 1024:.1f} MB, 코퍼스 {plain_size / 1024 / 1024:.1f} MB)")
+
+        with CorpusReader(path) as reader:
+            started = time.perf_counter()
+            index = open_index(reader)
+            print(f"색인 열기: {(time.perf_counter() - started) * 1000:.0f} ms ({index.num_terms:,}개 term)")
+            for query in QUERIES + [rare]:
+                times = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    hits = search(index, reader, query)
+                    times.append(time.perf_counter() - started)
+                matches = max((len(index.postings_for(term)) for term in tokenize(query)), default=0)
+                print(f"  {query!r:20} 중앙값 {statistics.median(times) * 1000:7.2f} ms "
+                      f"(가장 흔한 term이 든 문장 {matches:,}개, 결과 {len(hits)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""입력한 문장 기록(Bloom 필터) 벤치마크
+
+문장 수별로 기록/확인 시간, 문장당 크기, 세션 상태로 저장할 때의 크기, 실제 오탐률을 잽니다.
+
+    python benchmarks/bench_seen.py --sentences 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seen_filter import SeenFilter
+from session_store import encode_state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs='+', default=[1000, 10000, 100000], help="기록할 문장 수")
+    parser.add_argument("--probes", type=int, default=100000, help="오탐률을 잴 처음 보는 문장 수")
+    args = parser.parse_args()
+
+    for count in args.sentences:
+        seen = SeenFilter()
+        typed = [f"오늘 연습한 {i}번째 문장입니다." for i in range(count)]
+        started = time.perf_counter()
+        for sentence in typed:
+            seen.add(sentence)
+        add_us = (time.perf_counter() - started) / count * 1e6
+
+        probes = [f"처음 보는 {i}번째 문장입니다." for i in range(args.probes)]
+        started = time.perf_counter()
+        false_positives = sum(sentence in seen for sentence in probes)
+        check_us = (time.perf_counter() - started) / len(probes) * 1e6
+
+        state_bytes = len(encode_state({"seen": seen.to_state()}))
+        print(f"{count:>9,}문장: 기록 {add_us:.1f} µs, 확인 {check_us:.1f} µs, "
+              f"문장당 {seen.size_bytes / count:.2f}바이트 (저장 시 {state_bytes / count:.2f}바이트), "
+              f"필터 {len(seen.layers)}개, 오탐률 {false_positives / len(probes):.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""터미널 클라이언트 시작 시간과 키 입력 지연 벤치마크
+
+가상 터미널(pty)에서 `terminal_client.py`를 실행하여 첫 화면이 나올 때까지의 시간,
+키 하나를 보낸 뒤 화면이 갱신될 때까지의 시간, 종료 후 최대 메모리(RSS)를 잽니다.
+화면 그리기를 뺀 `TerminalSession.feed`만의 처리 시간도 따로 잽니다.
+
+    python benchmarks/bench_terminal.py --runs 5 --keys 200
+"""
+import argparse
+import fcntl
+import os
+import pty
+import select
+import statistics
+import struct
+import sys
+import termios
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from terminal_client import TerminalSession
+from typing_manager import TypingManager
+
+SENTENCE = "타자 연습은 매일 조금씩 꾸준히 하는 것이 가장 좋습니다."
+
+
+def read_until(fd: int, marker: bytes, timeout: float = 10.0) -> bytes:
+    """marker가 나올 때까지 읽습니다."""
+    data = b''
+    deadline = time.perf_counter() + timeout
+    while marker not in data:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise TimeoutError(f"{marker!r}가 출력되지 않았습니다.")
+        data += os.read(fd, 65536)
+    return data
+
+
+def drain(fd: int, quiet: float = 0.002) -> None:
+    while select.select([fd], [], [], quiet)[0]:
+        os.read(fd, 65536)
+
+
+def run_client(keys: int):
+    """클라이언트를 pty에서 실행하고 (시작 시간, 키 입력 지연 목록, 최대 RSS KB)를 반환합니다."""
+    started = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.environ.update(TERM="xterm-256color", LANG="C.UTF-8", LC_ALL="C.UTF-8")
+        os.execv(sys.executable, [sys.executable, os.path.join(ROOT, "terminal_client.py"), "--text", SENTENCE])
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", 30, 100, 0, 0))
+    read_until(fd, "WPM".encode())
+    startup = time.perf_counter() - started
+    drain(fd)
+
+    latencies = []
+    for i in range(keys):
+        key = '\x7f' if i % 20 == 19 else SENTENCE[i % len(SENTENCE)]
+        sent = time.perf_counter()
+        os.write(fd, key.encode('utf-8'))
+        select.select([fd], [], [], 5.0)
+        latencies.append(time.perf_counter() - sent)
+        drain(fd)
+
+    os.write(fd, b'\x1b')
+    _, _, usage = os.wait4(pid, 0)
+    os.close(fd)
+    return startup, latencies, usage.ru_maxrss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="클라이언트 실행 횟수")
+    parser.add_argument("--keys", type=int, default=200, help="실행마다 보낼 키 수")
+    args = parser.parse_args()
+
+    startups, latencies, rss = [], [], []
+    for _ in range(args.runs):
+        startup, run_latencies, max_rss = run_client(args.keys)
+        startups.append(startup)
+        latencies.extend(run_latencies)
+        rss.append(max_rss)
+    latencies.sort()
+    print(f"시작 시간: 중앙값 {statistics.median(startups) * 1000:,.0f} ms (최소 {min(startups) * 1000:,.0f} ms)")
+    print(f"키 입력 → 화면 갱신: 중앙값 {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print(f"최대 RSS: {max(rss) / 1024:.1f} MB")
+
+    manager = TypingManager()
+    manager.load_sentences([SENTENCE] * 10)
+    session = TerminalSession(manager)
+    count = 0
+    started = time.perf_counter()
+    for _ in range(200):
+        for char in SENTENCE:
+            session.feed(char)
+        session.feed('\r')
+        count += len(SENTENCE) + 1
+    elapsed = time.perf_counter() - started
+    print(f"TerminalSession.feed (화면 제외): 키당 {elapsed / count * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""수업 모드: 강사가 올린 문장 세트를 학생들이 연습하고, 강사는 실시간 현황판을 봅니다.
+
+학생은 API 세션(``TypingManager``)으로 수업에 참여하며, 입력을 제출할 때마다 학생 행과
+반 전체 집계(WPM/정확도 분포, 문장별 진행 인원, 자주 틀린 단어)를 바뀐 만큼만 고칩니다.
+학생 수와 관계없이 제출 한 번의 집계 비용은 일정하고, 현황판은 바뀌었을 때만 다시 만듭니다.
+
+강사는 수업을 만들 때 받은 key로 현황판을 보고 새 문장 세트를 올립니다.
+새 세트를 올리면 집계를 새로 시작하며, 학생 세션은 다음 요청 때 새 문장을 불러옵니다.
+수업은 프로세스 메모리에 있으므로 여러 워커로 실행할 때는 레이스처럼 고정 라우팅이 필요합니다.
+"""
+import asyncio
+import secrets
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from config import CLASSROOM_CONFIG
+from hangul import normalize
+from typing_manager import TypingManager, split_client_timing
+
+CLASSROOM_INPUT_METHOD = "수업"
+
+
+class Histogram:
+    """고정 폭 구간별 인원 수. 값을 옮길 때 두 구간만 고칩니다."""
+    __slots__ = ("width", "counts")
+
+    def __init__(self, width: float, bins: int):
+        self.width = width
+        self.counts = [0] * bins
+
+    def _bin(self, value: float) -> int:
+        return min(max(int(value // self.width), 0), len(self.counts) - 1)
+
+    def move(self, old: Optional[float], new: Optional[float]) -> None:
+        if old is not None:
+            self.counts[self._bin(old)] -= 1
+        if new is not None:
+            self.counts[self._bin(new)] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q(0~1) 분위수가 속한 구간의 가운데 값"""
+        total = sum(self.counts)
+        if not total:
+            return None
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= q * total:
+                return (i + 0.5) * self.width
+        return (len(self.counts) - 0.5) * self.width
+
+
+class Student:
+    """수업에 참여한 학생 한 명의 현재 문장 세트 기록"""
+    __slots__ = ("id", "name", "session_id", "loaded_version", "completed", "words", "correct",
+                 "keystrokes", "seconds", "wpm", "accuracy", "last_active")
+
+    def __init__(self, student_id: int, name: str, session_id: str):
+        self.id = student_id
+        self.name = name
+        self.session_id = session_id
+        self.loaded_version = 0          # 학생 세션에 불러온 문장 세트 버전
+        self.last_active = time.time()
+        self.reset()
+
+    def reset(self) -> None:
+        self.completed = self.words = self.correct = self.keystrokes = 0
+        self.seconds = 0.0
+        self.wpm: Optional[float] = None        # 아직 제출하지 않았으면 None (분포에 넣지 않음)
+        self.accuracy: Optional[float] = None
+
+    def row(self, total: int) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name, "completed": self.completed,
+                "progress": round(self.completed / total * 100, 1) if total else 0.0,
+                "wpm": self.wpm, "accuracy": self.accuracy, "cpm": round(self.keystrokes / self.seconds * 60, 1)
+                if self.seconds else None}
+
+
+class Classroom:
+    """강사 한 명과 학생들이 같은 문장 세트를 연습하는 수업"""
+    def __init__(self, room_id: str, sentences: List[str], key: str,
+                 max_students: int = CLASSROOM_CONFIG["max_students"]):
+        self.id = room_id
+        self.key = key
+        self.max_students = max_students
+        self.students: Dict[int, Student] = {}
+        self.last_activity = time.time()
+        self.version = 0                 # 집계가 바뀔 때마다 증가
+        self.set_version = 0
+        self._next_id = 1
+        self._dashboard: Optional[Dict[str, Any]] = None
+        self._changed = asyncio.Event()
+        self.publish(sentences)
+
+    def publish(self, sentences: List[str]) -> None:
+        """새 문장 세트를 올리고 집계를 새로 시작합니다."""
+        if not sentences:
+            raise ValueError("문장이 비어있습니다.")
+        self.sentences = list(sentences)
+        self.set_version += 1
+        self.wpm = Histogram(CLASSROOM_CONFIG["wpm_bin"], CLASSROOM_CONFIG["wpm_bins"])
+        self.accuracy = Histogram(CLASSROOM_CONFIG["accuracy_bin"], int(100 // CLASSROOM_CONFIG["accuracy_bin"]) + 1)
+        self.wpm_sum = self.accuracy_sum = 0.0
+        self.reported = 0                                 # 한 번이라도 제출한 학생 수
+        self.progress = [0] * (len(self.sentences) + 1)   # 완료한 문장 수별 학생 수
+        self.progress[0] = len(self.students)
+        self.missed: Counter = Counter()
+        for student in self.students.values():
+            student.reset()
+        self._touch()
+
+    def _touch(self) -> None:
+        self.version += 1
+        self.last_activity = time.time()
+        self._dashboard = None
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def join(self, session_id: str, name: str) -> Student:
+        if len(self.students) >= self.max_students:
+            raise ValueError("수업 정원이 찼습니다.")
+        name = ' '.join(name.split())[:CLASSROOM_CONFIG["max_name_length"]] or f"학생 {self._next_id}"
+        student = Student(self._next_id, name, session_id)
+        self._next_id += 1
+        self.students[student.id] = student
+        self.progress[0] += 1
+        self._touch()
+        return student
+
+    def leave(self, student: Student) -> None:
+        if self.students.pop(student.id, None) is None:
+            return
+        self._move(student, None, None)
+        self.progress[student.completed] -= 1
+        self._touch()
+
+    def sync(self, student: Student, manager: TypingManager) -> bool:
+        """학생 세션에 현재 문장 세트를 불러옵니다. 새로 불러왔으면 True를 반환합니다."""
+        if student.loaded_version == self.set_version and manager.current_input_method == CLASSROOM_INPUT_METHOD:
+            return False
+        manager.reset_all()
+        manager.set_input_method(CLASSROOM_INPUT_METHOD)
+        manager.load_sentences(list(self.sentences))
+        student.loaded_version = self.set_version
+        return True
+
+    def _move(self, student: Student, wpm: Optional[float], accuracy: Optional[float]) -> None:
+        """학생의 WPM/정확도를 바꾸고 분포와 합계를 같이 고칩니다."""
+        if student.wpm is None and wpm is not None:
+            self.reported += 1
+        elif student.wpm is not None and wpm is None:
+            self.reported -= 1
+        self.wpm.move(student.wpm, wpm)
+        self.accuracy.move(student.accuracy, accuracy)
+        self.wpm_sum += (wpm or 0.0) - (student.wpm or 0.0)
+        self.accuracy_sum += (accuracy or 0.0) - (student.accuracy or 0.0)
+        student.wpm, student.accuracy = wpm, accuracy
+
+    def submit(self, student: Student, manager: TypingManager, text: str,
+               client_elapsed: Optional[float] = None) -> bool:
+        """학생의 입력을 채점하고 집계에 반영합니다. 새 문장 세트를 불러왔으면 채점하지 않고 False를 반환합니다."""
+        if self.sync(student, manager):
+            return False
+        prepared = manager.get_prepared()
+        stats = manager.stats
+        before = (stats.word_stats.total, stats.word_stats.correct, stats.total_keystrokes)
+        if prepared is None or not manager.handle_input(text, client_elapsed):
+            return False
+
+        words = normalize(split_client_timing(text)[0]).split()
+        self.missed.update(word for i, word in enumerate(prepared.words) if i >= len(words) or words[i] != word)
+        student.words += stats.word_stats.total - before[0]
+        student.correct += stats.word_stats.correct - before[1]
+        student.keystrokes += stats.total_keystrokes - before[2]
+        student.seconds += stats.elapsed_times[-1]
+        student.last_active = time.time()
+        if student.completed < len(self.sentences):
+            self.progress[student.completed] -= 1
+            student.completed += 1
+            self.progress[student.completed] += 1
+        minutes = student.seconds / 60
+        self._move(student, round(student.words / minutes, 1) if minutes > 0 else 0.0,
+                   round(student.correct / student.words * 100, 1) if student.words else 0.0)
+        self._touch()
+        return True
+
+    def dashboard(self) -> Dict[str, Any]:
+        """강사 현황판. 집계가 바뀌었을 때만 다시 만듭니다."""
+        if self._dashboard is None:
+            total = len(self.sentences)
+            reported = self.reported
+
+            def distribution(histogram: Histogram, value_sum: float) -> Dict[str, Any]:
+                return {"mean": round(value_sum / reported, 1) if reported else None,
+                        "median": histogram.percentile(0.5), "p90": histogram.percentile(0.9),
+                        "bin_width": histogram.width, "counts": list(histogram.counts)}
+
+            self._dashboard = {
+                "room_id": self.id,
+                "version": self.version,
+                "set_version": self.set_version,
+                "sentences": total,
+                "students": [student.row(total) for student in self.students.values()],
+                "class": {"students": len(self.students), "reported": reported,
+                          "finished": self.progress[total],
+                          "wpm": distribution(self.wpm, self.wpm_sum),
+                          "accuracy": distribution(self.accuracy, self.accuracy_sum)},
+                "progress": list(self.progress),
+                "missed_words": self.missed.most_common(CLASSROOM_CONFIG["missed_words"])
+            }
+        return self._dashboard
+
+    async def wait_for_change(self, since: int, timeout: float) -> None:
+        """집계 버전이 since보다 커지거나 timeout이 지날 때까지 기다립니다. (현황판 롱 폴링)"""
+        if self.version > since:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def summary(self) -> Dict[str, Any]:
+        """학생에게 보여 줄 수업 정보 (현황판 제외)"""
+        return {"room_id": self.id, "set_version": self.set_version, "sentences": self.sentences,
+                "students": len(self.students)}
+
+
+class ClassroomHub:
+    """한 프로세스의 모든 수업과 세션별 참여 정보를 관리하는 클래스"""
+    def __init__(self, room_ttl: float = CLASSROOM_CONFIG["room_ttl"]):
+        self.room_ttl = room_ttl
+        self.rooms: Dict[str, Classroom] = {}
+        self.members: Dict[str, Tuple[Classroom, Student]] = {}
+
+    def create_room(self, sentences: List[str]) -> Classroom:
+        self.sweep()
+        room = Classroom(uuid.uuid4().hex[:12], sentences, secrets.token_urlsafe(16))
+        self.rooms[room.id] = room
+        return room
+
+    def authorize(self, room_id: str, key: Optional[str]) -> Optional[Classroom]:
+        """강사 key가 맞으면 수업을 반환합니다."""
+        room = self.rooms.get(room_id)
+        if room is None or not key or not secrets.compare_digest(room.key, key):
+            return None
+        return room
+
+    def join(self, room: Classroom, session_id: str, name: str) -> Student:
+        """세션을 수업에 참여시킵니다. 이미 참여했으면 그대로 반환합니다. (문장은 Classroom.sync로 불러옴)"""
+        member = self.members.get(session_id)
+        if member is not None:
+            if member[0] is room:
+                return member[1]
+            self.leave(session_id)
+        student = room.join(session_id, name)
+        self.members[session_id] = (room, student)
+        return student
+
+    def leave(self, session_id: str) -> None:
+        member = self.members.pop(session_id, None)
+        if member is not None:
+            member[0].leave(member[1])
+
+    def sweep(self, now: Optional[float] = None) -> None:
+        """오래 쓰이지 않은 수업을 지웁니다."""
+        now = time.time() if now is None else now
+        for room_id, room in list(self.rooms.items()):
+            if now - room.last_activity > self.room_ttl:
+                for student in list(room.students.values()):
+                    self.members.pop(student.session_id, None)
+                del self.rooms[room_id]
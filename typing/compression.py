@@ -0,0 +1,85 @@
+"""압축 파일(.gz, .bz2, .xz, .zip)을 스트리밍으로 풀어 읽는 기능
+
+압축을 메모리에 전부 풀지 않고, 스트림에서 조금씩 읽어 문장 처리로 넘깁니다.
+"""
+import bz2
+import gzip
+import lzma
+import zipfile
+from pathlib import PurePath
+from typing import BinaryIO, Iterator, Optional, Sequence, Tuple
+from config import COMPRESSION_CONFIG
+from text_decoder import iter_decoded_lines
+
+# 파일 앞부분의 매직 넘버와 압축 형식
+MAGIC_NUMBERS = [
+    (b'\x1f\x8b', 'gz'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'PK\x03\x04', 'zip'),
+]
+BZ2_MAGIC = b'BZh'
+BZ2_BLOCK_MAGIC = b'1AY&SY'
+
+# 단일 스트림 압축 형식과 여는 함수
+STREAM_OPENERS = {
+    'gz': lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode='rb'),
+    'bz2': lambda fileobj: bz2.BZ2File(fileobj, mode='rb'),
+    'xz': lambda fileobj: lzma.LZMAFile(fileobj, mode='rb'),
+}
+
+
+def detect_compression(fileobj: BinaryIO) -> Optional[str]:
+    """매직 넘버로 압축 형식을 감지합니다. 파일 위치는 유지됩니다."""
+    position = fileobj.tell()
+    try:
+        head = fileobj.read(10)
+    finally:
+        fileobj.seek(position)
+
+    for magic, kind in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return kind
+    if head.startswith(BZ2_MAGIC) and head[3:4].isdigit() and head[4:10] == BZ2_BLOCK_MAGIC:
+        return 'bz2'
+    return None
+
+
+def _inner_name(name: str) -> str:
+    """'book.txt.gz'처럼 압축 확장자가 붙은 이름에서 원래 이름을 구합니다."""
+    path = PurePath(name)
+    if path.suffix.lower().lstrip('.') in COMPRESSION_CONFIG["extensions"]:
+        return path.stem
+    return name
+
+
+def iter_members(fileobj: BinaryIO, name: str,
+                 extensions: Sequence[str] = COMPRESSION_CONFIG["member_extensions"]
+                 ) -> Iterator[Tuple[str, BinaryIO]]:
+    """파일에 담긴 (이름, 읽기 스트림)을 차례로 반환합니다.
+
+    압축되지 않은 파일은 그대로, gz/bz2/xz는 풀어내는 스트림 하나를,
+    zip은 확장자가 extensions에 해당하는 항목마다 스트림을 반환합니다.
+    """
+    kind = detect_compression(fileobj)
+    if kind == 'zip':
+        suffixes = tuple(f".{ext.lower()}" for ext in extensions)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(suffixes):
+                    continue
+                if info.filename.startswith('__MACOSX/'):
+                    continue
+                with archive.open(info) as member:
+                    yield info.filename, member
+    elif kind in STREAM_OPENERS:
+        with STREAM_OPENERS[kind](fileobj) as stream:
+            yield _inner_name(name), stream
+    else:
+        yield name, fileobj
+
+
+def iter_lines(fileobj: BinaryIO, name: str,
+               extensions: Sequence[str] = COMPRESSION_CONFIG["member_extensions"]) -> Iterator[str]:
+    """압축 여부와 관계없이 파일의 텍스트를 줄 단위로 반환합니다."""
+    for _, stream in iter_members(fileobj, name, extensions):
+        yield from iter_decoded_lines(stream)
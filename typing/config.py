@@ -1,4 +1,5 @@
 """타이핑 앱 설정"""
+import os
 
 # 기본 문장 설정
 DEFAULT_SENTENCES = """타이핑 연습을 하는 어플입니다.
@@ -18,6 +19,10 @@ AI_CONFIG = {
     "temperature": 1.2,
     "max_tokens": 200,
     "sentences_per_set": 5,
+    "min_words": 7,             # 생성 문장의 최소/최대 단어 수 (프롬프트 조건과 동일)
+    "max_words": 12,
+    "timeout": 10.0,            # 원격 생성 요청 제한 시간 (초), 초과 시 오프라인 생성으로 대체
+    "offline_fallback": True,
     "languages": ["한국어", "English"],
     "default_language": "한국어",
     "prompts": {
@@ -44,19 +49,229 @@ AI_CONFIG = {
     }
 }
 
+# 오프라인 n-gram 문장 생성 설정
+NGRAM_CONFIG = {
+    "order": 3,                     # 앞 두 단어로 다음 단어를 예측
+    "max_attempts": 100,            # 문장 하나당 최대 생성 시도 횟수
+    "eos_retries": 5,               # 최소 길이 전에 문장 끝이 나오면 다시 뽑는 횟수
+    "min_language_ratio": 0.8,      # 학습 시 언어 판별 기준 (문자 중 해당 언어 비율)
+    "models": {
+        "한국어": "models/ngram_ko.bin",
+        "English": "models/ngram_en.bin"
+    }
+}
+
 # 파일 업로드 설정
 FILE_CONFIG = {
-    "allowed_types": ["txt"],
+    "allowed_types": ["txt", "gz", "bz2", "xz", "zip", "corpus"],
     "default_start_line": 0,
     "min_sentences": 1,
     "max_sentences": 50,
-    "default_sentences": 10
+    "default_sentences": 10,
+    "sample_seed": 0               # 무작위 추출 기본 시드 (0이면 매번 다르게 뽑음)
+}
+
+# 유사 중복 문장 제거 설정
+DEDUP_CONFIG = {
+    "enabled": True,
+    "threshold": 0.7,        # 추정 자카드 유사도가 이 값 이상이면 중복으로 처리
+    "num_perm": 64,          # MinHash 순열 수
+    "shingle_size": 3,       # 문자 n-gram 크기
+    "max_entries": 100000,   # 메모리에 보관할 최근 문장 서명 수
+    "bucket_size": 4,        # LSH 버킷마다 비교할 최근 문장 수
+    "max_hashes": 0          # 코퍼스 빌더가 완전 중복 확인에 보관할 최근 문장 해시 수 (0이면 전체 보관)
+}
+
+# 브라우저 측정 시간 검증 설정
+TIMING_CONFIG = {
+    "marker": "\u2063",               # 입력 값과 브라우저 측정 시간(ms)을 구분하는 보이지 않는 문자
+    "min_elapsed": 0.2,               # 이보다 짧은 측정 시간은 무시 (초)
+    "tolerance": 0.5,                 # 서버에서 잰 시간보다 이만큼까지 길어도 허용 (초)
+    "max_keystrokes_per_second": 25,  # 이보다 빠른 입력 속도는 측정 오류로 처리
+    "recent_elapsed": 100             # 문장별 시간을 따로 보관할 최근 문장 수 (이전 문장은 합계만 보관)
+}
+
+# URL 문장 수집 설정
+INGEST_CONFIG = {
+    "chunk_size": 16 * 1024,       # 한 번에 내려받아 처리할 바이트 수
+    "timeout": 10,                 # 연결/읽기 제한 시간 (초)
+    "max_sentences": 5000,         # 한 번에 불러올 최대 문장 수
+    "recent_sentences": 10000,     # 문장 분리 단계에서 완전 중복 확인에 기억할 최근 문장 수
+    "first_sentence_timeout": 30   # 첫 문장을 기다릴 최대 시간 (초)
+}
+
+# 백그라운드 작업 대기열 (jobs.py, Streamlit 앱의 URL/파일/AI 생성 작업)
+JOBS_CONFIG = {
+    "io_workers": int(os.getenv("TYPING_JOB_THREADS", "8")),            # 내려받기/API 호출/파일 읽기 스레드 수
+    "cpu_workers": int(os.getenv("TYPING_JOB_PROCESSES", str(min(os.cpu_count() or 1, 4)))),  # HTML 파싱 프로세스 수 (0: 스레드에서 파싱)
+    "start_method": "spawn",       # 파싱 프로세스 시작 방식
+    "stream_url": True,            # URL 문장을 나오는 대로 넘겨 첫 문장부터 연습 (False: 전체를 파싱 프로세스에서 처리)
+    "per_user": 2,                 # 사용자(세션)별로 끝나지 않은 작업 최대 수
+    "max_pending": 64,             # 전체 대기/실행 중인 작업 최대 수
+    "report_every": 200,           # track이 진행 상황을 알리는 간격 (항목 수)
+    "cancel_check_interval": 0.2,  # 파싱 결과를 기다리며 취소를 확인하는 간격 (초)
+    "poll_interval": 0.5,          # 화면에서 작업 상태를 다시 읽는 간격 (초)
+    "max_document_chars": 20_000_000   # 내려받을 URL 문서 최대 크기 (글자 수)
+}
+
+# 사용자가 이미 입력한 문장 기록 (seen_filter.py, 세션 상태에 함께 저장)
+SEEN_CONFIG = {
+    "enabled": os.getenv("TYPING_SEEN_FILTER", "1") != "0",
+    "policy": os.getenv("TYPING_SEEN_POLICY", "deprioritize"),  # skip: 건너뜀, deprioritize: 뒤로 미룸
+    "capacity": 2000,        # 첫 필터에 기록할 문장 수 (차면 2배 크기의 필터를 덧붙임)
+    "error_rate": 0.01,      # 첫 필터의 오탐률 (처음 보는 문장을 입력한 문장으로 잘못 판단할 확률)
+    "growth": 2,             # 덧붙이는 필터의 용량 배수
+    "tightening": 0.5,       # 덧붙이는 필터의 오탐률 배수
+    "max_deferred": 1000,    # 뒤로 미뤄 둘 최대 문장 수
+    "lookahead": 4           # 파일/검색 결과/오프라인 생성에서 필요한 문장 수의 몇 배까지 살펴볼지
+}
+
+# 피드/사이트맵 구독 설정 (feeds.py)
+FEEDS_CONFIG = {
+    "db_path": os.getenv("TYPING_FEEDS_DB", "feeds.db"),     # 구독 목록, 읽은 항목, 조건부 요청 헤더
+    "corpus_dir": os.getenv("TYPING_FEEDS_DIR", "corpora"),  # 구독별 코퍼스 파일 위치
+    "interval": 24 * 3600,          # 기본 새로 고침 간격 (초)
+    "max_items": 50,                # 한 번 새로 고칠 때 내려받을 최대 새 항목 수
+    "max_sentences_per_item": 500,  # 항목(기사) 하나에서 가져올 최대 문장 수
+    "max_sitemap_depth": 2,         # 사이트맵 색인을 따라 들어갈 최대 깊이
+    "user_agent": "typing-practice-feeds/1.0"
+}
+
+# 업로드 파일 디코딩 설정
+DECODING_CONFIG = {
+    "chunk_size": 64 * 1024,           # 한 번에 읽어 디코딩할 바이트 수
+    "sniff_bytes": 64 * 1024,          # 인코딩 감지에 사용할 앞부분 바이트 수
+    "max_line_chars": 64 * 1024,       # 줄바꿈 없는 긴 줄을 나눌 기준 길이
+    "min_hangul_ratio": 0.5,           # CP949로 판단할 비ASCII 문자 중 한글 비율
+    "fallback_encoding": "utf-8"       # 감지 실패 시 사용할 인코딩 (깨진 문자는 대체)
+}
+
+# 압축 파일 설정
+COMPRESSION_CONFIG = {
+    "extensions": ["gz", "bz2", "xz", "zip"],
+    "member_extensions": ["txt"]               # zip 파일에서 읽을 항목의 확장자
+}
+
+# 코퍼스 설정
+CORPUS_CONFIG = {
+    "extension": "corpus",
+    "block_size": 256,                         # 블록 하나에 담을 문장 수
+    "codec": "zlib",                           # 블록 압축 방식 (none, zlib, bz2, lzma)
+    "source_extensions": ["txt", "html", "htm"],
+    "chunk_bytes": 4 * 1024 * 1024,            # 작업 프로세스에 한 번에 넘길 크기
+    "progress_interval": 0.5                   # 진행 상황 출력 간격 (초)
+}
+
+# 코퍼스 검색 설정
+SEARCH_CONFIG = {
+    "index": os.getenv("TYPING_SEARCH_INDEX", "1") != "0",  # 코퍼스를 만들거나 이어 쓸 때 검색 색인도 만듦
+    "max_results": 20,           # 검색 결과 최대 문장 수
+    "min_should_match": 0.75,    # 문장에 들어 있어야 할 검색어 term 비율
+    "k1": 1.2,                   # BM25 매개변수
+    "b": 0.75,
+    "phrase_pool": 2,            # 검색어가 그대로 들어 있는지 확인할 후보 수 (max_results의 배수)
+    "max_upload_sentences": 1_000_000  # 텍스트 파일 업로드에서 색인할 최대 문장 수
+}
+
+# 세션 저장소 설정 (여러 앱 프로세스가 같은 저장소를 쓰면 재시작/이동 후에도 세션 유지)
+SESSION_CONFIG = {
+    "backend": os.getenv("TYPING_SESSION_BACKEND", "memory"),   # memory, sqlite, redis
+    "sqlite_path": os.getenv("TYPING_SESSION_DB", "sessions.db"),
+    "redis_url": os.getenv("TYPING_SESSION_REDIS", "redis://localhost:6379/0"),
+    "key_prefix": "typing:session:",
+    "ttl": 7 * 24 * 3600,          # 마지막 저장 후 보관 시간 (초)
+    "query_param": "sid",          # 세션 ID를 담는 URL 쿼리 파라미터
+    "compress_level": 6,
+    "socket_timeout": 2.0,
+    "tracked_sessions": 10_000,    # 변경 여부 판단용 버전을 보관할 최대 세션 수
+    "purge_every": 1000            # 이만큼 기록할 때마다 만료된 세션을 지움 (0이면 지우지 않음)
+}
+
+# 프로세스 메모리에 올려 둘 세션 설정 (session_pool.py)
+SESSION_MEMORY_CONFIG = {
+    "budget_bytes": int(os.getenv("TYPING_SESSION_MEMORY_MB", "256")) * 1024 * 1024,  # 세션 전체 메모리 예산
+    "idle_ttl": 30 * 60,           # 이 시간 동안 쓰이지 않은 세션은 메모리에서 내보냄 (초)
+    "sweep_interval": 60,          # 오래 쓰이지 않은 세션을 확인하는 간격 (초)
+    # memory 저장소를 쓸 때 내보낸 세션을 기록할 파일 (sqlite/redis 저장소는 그 저장소에 기록)
+    "spill_path": os.getenv("TYPING_SESSION_SPILL", "session_spill.db")
+}
+
+# 키 입력 기록 설정
+KEYLOG_CONFIG = {
+    "directory": os.getenv("TYPING_KEYLOG_DIR", "keylogs"),   # 세션별 기록 파일(.keys) 저장 위치
+    "extension": "keys",
+    "buffer_bytes": 64 * 1024,     # 이만큼 모이면 파일에 기록
+    "max_open_writers": 256,       # API 서버가 동시에 열어 둘 최대 기록 파일 수 (오래 쓰지 않은 파일부터 닫음)
+    "max_latency_ms": 2000,        # 분석 시 이보다 긴 간격은 쉬는 시간으로 보고 제외
+    "min_digraph_count": 5,        # 두 글자 조합 분석에 필요한 최소 출현 횟수
+    "top_n": 20
+}
+
+# JSON API 서버 설정 (uvicorn api:app)
+API_CONFIG = {
+    "max_body_bytes": 20 * 1024 * 1024,   # 요청 본문 최대 크기 (파일 업로드 포함)
+    "cached_sessions": 10_000,            # 메모리에 올려 둘 최대 세션 수 (나머지는 세션 저장소에서 불러옴)
+    "flush_interval": 1.0,                # 변경된 세션을 세션 저장소에 모아서 기록하는 간격 (초)
+    "cors_origin": os.getenv("TYPING_API_CORS_ORIGIN", "")   # 비어 있으면 CORS 헤더를 보내지 않음
+}
+
+# 순위표 설정 (leaderboard.py)
+LEADERBOARD_CONFIG = {
+    "path": os.getenv("TYPING_LEADERBOARD_DB", "leaderboard.db"),
+    "score": "cpm",                # 순위 기준 (TypingStats.to_dict의 키)
+    "resolution": 10,              # 점수를 0.1 단위 구간으로 나누어 집계
+    "max_score": 3000,             # 이보다 높은 점수는 마지막 구간에 포함
+    "top_k": 100,                  # 순위표마다 메모리에 보관할 상위 기록 수
+    "min_words": 20,               # 순위표에 올리기 위한 최소 입력 단어 수
+    "min_accuracy": 80.0           # 순위표에 올리기 위한 최소 정확도 (%)
+}
+
+# 기록 추이 설정 (history.py)
+HISTORY_CONFIG = {
+    "path": os.getenv("TYPING_HISTORY_DB", "history.db"),
+    "max_points": 300,             # 차트 하나에 보낼 최대 점 수
+    "lttb_max_input": 20000,       # 기록이 이보다 많으면 일/주 집계로 차트를 그림
+    "utc_offset": 9 * 3600,        # 일/주 구간을 나눌 시간대 (초, 기본값: 한국 시간)
+    "ranges": {"최근 7일": 7, "최근 30일": 30, "최근 1년": 365, "전체": None}
+}
+
+# 운영 지표 설정 (metrics.py, Prometheus 텍스트 형식)
+METRICS_CONFIG = {
+    "enabled": os.getenv("TYPING_METRICS", "1") != "0",
+    "host": os.getenv("TYPING_METRICS_HOST", "127.0.0.1"),
+    "port": int(os.getenv("TYPING_METRICS_PORT", "9464")),   # Streamlit 앱의 별도 지표 HTTP 서버
+    "path": "/metrics",
+    "buckets": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),   # 히스토그램 구간 (초)
+    "active_window": 300           # 이 시간 안에 요청이 있었던 세션을 활성 세션으로 집계 (초)
+}
+
+# 멀티플레이 레이스 설정 (api.py의 /races 웹소켓)
+RACE_CONFIG = {
+    "tick_interval": 0.2,          # 진행 상황을 모아서 방송하는 간격 (초)
+    "countdown": 3.0,              # 시작 요청 후 레이스가 시작될 때까지의 시간 (초)
+    "max_racers": 500,             # 방 하나의 최대 참가자 수
+    "max_name_length": 20,
+    "max_message_bytes": 4096,     # 클라이언트 메시지 최대 크기
+    "room_ttl": 3600               # 참가자가 없는 방을 지우기까지의 시간 (초)
+}
+
+# 수업 모드 설정 (classroom.py, api.py의 /classrooms)
+CLASSROOM_CONFIG = {
+    "max_students": 500,           # 수업 하나의 최대 학생 수
+    "max_name_length": 20,
+    "wpm_bin": 10,                 # 현황판 WPM 분포 구간 폭
+    "wpm_bins": 20,                # WPM 분포 구간 수 (마지막 구간은 그 이상 모두)
+    "accuracy_bin": 5,             # 현황판 정확도 분포 구간 폭 (%)
+    "missed_words": 20,            # 현황판에 표시할 자주 틀린 단어 수
+    "max_wait": 25.0,              # 현황판 롱 폴링 최대 대기 시간 (초)
+    "room_ttl": 4 * 3600           # 활동이 없는 수업을 지우기까지의 시간 (초)
 }
 
 # UI 설정
 UI_CONFIG = {
     "text_area_height": 200,
     "page_layout": "wide",
+    "typing_fragment": True,       # 입력 제출 시 타이핑 영역만 다시 실행 (False면 전체 스크립트)
     "font_size": {
         "target_text": "24px",
         "input_text": "18px",
@@ -65,6 +280,7 @@ UI_CONFIG = {
     "colors": {
         "correct": "#28a745",
         "incorrect": "#dc3545",
+        "partial": "#6c757d",
         "background": "#f8f9fa"
     },
     "padding": {
@@ -78,5 +294,6 @@ CSS_CLASSES = {
     "word": "word",
     "correct": "correct",
     "incorrect": "incorrect",
+    "partial": "partial",
     "target_text": "target-text"
 } 
\ No newline at end of file
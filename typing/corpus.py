@@ -0,0 +1,308 @@
+"""색인된 문장 코퍼스 파일 읽기/쓰기
+
+파일 구조::
+
+    MAGIC | 블록 0 | 블록 1 | ... | 메타데이터(JSON) | 블록 오프셋 | 누적 문장 수 | 트레일러
+
+각 블록은 ``block_size``개의 문장을 줄바꿈으로 이어 붙인 UTF-8 데이터를
+블록별로 따로 압축한 것이며(``codec``), 파일 끝의 색인으로 N번째 문장이 들어 있는
+블록 하나만 읽고 풀어서 바로 접근할 수 있습니다.
+
+이어 쓰기(``append=True``)는 마지막 블록이 덜 찼으면 그 블록만 다시 기록하고
+색인을 새로 붙이므로, 기존 블록을 다시 압축하지 않고 문장을 추가할 수 있습니다.
+
+새 파일은 옆의 임시 파일(``<이름>.tmp``)에 쓰고 닫을 때 ``os.replace``로 바꿔치기하므로,
+쓰는 도중 예외가 나거나 프로세스가 죽어도 기존 파일은 그대로 남고, 그동안 연 ``CorpusReader``도 기존 내용을 읽습니다.
+이어 쓸 때는 기존 블록을 압축된 그대로 임시 파일에 복사합니다.
+
+``index``로 검색 색인(``search_index.SearchIndex``)을 넘기면 추가하는 문장을 함께 색인하여
+블록들 뒤에 기록하고 위치를 ``metadata["index"]``에 남깁니다.
+
+``encode_block``으로 다른 프로세스에서 미리 압축한 블록은 ``add_block``으로 그대로 기록할 수 있습니다.
+이때 그 블록 문장만으로 만든 색인 조각을 함께 넘기면 검색 색인 뒤에 이어 붙입니다.
+"""
+import bz2
+import json
+import lzma
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from config import CORPUS_CONFIG
+
+MAGIC = b'TYPCORP1'
+FORMAT_VERSION = 1
+# 메타데이터 시작 위치, 메타데이터 길이, 블록 수, MAGIC
+TRAILER = struct.Struct('<QQQ8s')
+
+# 블록 압축 방식별 (압축 함수, 해제 함수)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (bytes, bytes),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+def to_le_bytes(values: array) -> bytes:
+    """배열을 리틀 엔디언 바이트로 변환합니다."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_le_bytes(typecode: str, data: bytes) -> array:
+    """리틀 엔디언 바이트를 배열로 변환합니다."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_block(sentences: List[str], codec: str) -> bytes:
+    """문장들을 블록 하나로 이어 붙여 압축합니다."""
+    return CODECS[codec][0]('\n'.join(sentences).encode('utf-8'))
+
+
+def is_corpus_file(fileobj: BinaryIO) -> bool:
+    """파일이 코퍼스 형식인지 확인합니다. 파일 위치는 유지됩니다."""
+    position = fileobj.tell()
+    try:
+        fileobj.seek(0)
+        return fileobj.read(len(MAGIC)) == MAGIC
+    finally:
+        fileobj.seek(position)
+
+
+class CorpusWriter:
+    """문장을 블록 단위로 모아 코퍼스 파일을 작성하는 클래스
+
+    append가 참이고 파일이 있으면 기존 코퍼스 뒤에 이어 씁니다. 이때 블록 크기와 압축 방식은
+    기존 파일의 값을 따르고, metadata는 기존 메타데이터에 덮어씁니다. 이어 쓸 때 index를 넘기면
+    기존 색인을 불러와 이어 만듭니다.
+    """
+    def __init__(self, path: Union[str, Path], block_size: int = CORPUS_CONFIG["block_size"],
+                 metadata: Optional[Dict[str, Any]] = None, codec: str = CORPUS_CONFIG["codec"],
+                 append: bool = False, index: Optional[Any] = None):
+        if block_size < 1:
+            raise ValueError("블록 크기는 1 이상이어야 합니다.")
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {codec}")
+        self.block_size = block_size
+        self.codec = codec
+        self.metadata = dict(metadata or {})
+        self.index = index
+        self._block: List[str] = []
+        self._offsets = array('Q', [len(MAGIC)])
+        self._counts = array('Q', [0])
+        self.count = 0
+        self.path = Path(path)
+        self._temp_path = self.path.with_name(self.path.name + '.tmp')
+        self._file = open(self._temp_path, 'w+b')
+        try:
+            if append and self.path.exists() and self.path.stat().st_size > 0:
+                with open(self.path, 'rb') as source:
+                    self._reopen(source)
+            else:
+                self._file.write(MAGIC)
+        except Exception:
+            self.abort()
+            raise
+
+    def _reopen(self, source: BinaryIO) -> None:
+        """기존 색인을 읽고, 다 찬 블록은 임시 파일에 그대로 복사하고 덜 찬 마지막 블록은 다시 모아 둡니다."""
+        reader = CorpusReader(source)
+        existing = {key: value for key, value in reader.metadata.items()
+                    if key not in ("version", "codec", "block_size", "count", "index")}
+        self.metadata = {**existing, **self.metadata}
+        self.codec = reader.metadata["codec"]
+        self.block_size = reader.metadata["block_size"]
+        self._offsets = array('Q', reader._offsets)
+        self._counts = array('Q', reader._counts)
+        self.count = self._counts[-1]
+        if self.index is not None:
+            self.index.load(reader)
+        num_blocks = len(self._offsets) - 1
+        if num_blocks and self._counts[-1] - self._counts[-2] < self.block_size:
+            self._block = list(reader._read_block(num_blocks - 1))
+            self._offsets.pop()
+            self._counts.pop()
+        source.seek(0)
+        remaining = self._offsets[-1]
+        while remaining:
+            chunk = source.read(min(remaining, 1 << 20))
+            if not chunk:
+                raise ValueError("코퍼스 파일이 손상되었습니다.")
+            self._file.write(chunk)
+            remaining -= len(chunk)
+
+    def add(self, sentence: str) -> None:
+        """문장 하나를 추가합니다."""
+        sentence = ' '.join(sentence.split())
+        if not sentence:
+            return
+        self._block.append(sentence)
+        if self.index is not None:
+            self.index.add(sentence)
+        self.count += 1
+        if len(self._block) >= self.block_size:
+            self._flush_block()
+
+    def add_many(self, sentences: Iterable[str]) -> None:
+        """여러 문장을 추가합니다."""
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add_block(self, data: bytes, count: int, index: Optional[Any] = None) -> None:
+        """encode_block으로 압축한 블록(count개 문장)을 그대로 기록합니다.
+
+        문장은 add처럼 공백이 정리되어 있어야 하며, 검색 색인을 만드는 중이면
+        그 블록 문장만으로 만든 색인 조각을 index로 넘겨야 합니다.
+        """
+        if self._block:
+            raise ValueError("모으던 블록을 기록하기 전에는 압축된 블록을 추가할 수 없습니다.")
+        if self.index is not None:
+            if index is None:
+                raise ValueError("검색 색인을 만드는 중에는 블록의 색인 조각이 필요합니다.")
+            self.index.extend(index)
+        self.count += count
+        self._write_block(data)
+
+    def _flush_block(self) -> None:
+        """모인 문장을 블록으로 기록합니다."""
+        if not self._block:
+            return
+        self._write_block(encode_block(self._block, self.codec))
+        self._block = []
+
+    def _write_block(self, data: bytes) -> None:
+        """압축된 블록을 파일에 쓰고 색인에 위치를 남깁니다."""
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+        self._counts.append(self.count)
+
+    def close(self) -> None:
+        """남은 블록과 색인을 기록하고 파일을 닫은 뒤 기존 파일과 바꿔치기합니다."""
+        if self._file.closed:
+            return
+        self._flush_block()
+        metadata = dict(self.metadata)
+        if self.index is not None:
+            metadata["index"] = self.index.write(self._file)
+        footer_offset = self._file.tell()
+        metadata = {
+            **metadata,
+            "version": FORMAT_VERSION,
+            "codec": self.codec,
+            "block_size": self.block_size,
+            "count": self.count
+        }
+        meta_bytes = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+        self._file.write(meta_bytes)
+        self._file.write(to_le_bytes(self._offsets))
+        self._file.write(to_le_bytes(self._counts))
+        self._file.write(TRAILER.pack(footer_offset, len(meta_bytes), len(self._offsets) - 1, MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self) -> None:
+        """쓰던 내용을 버립니다. 기존 파일은 그대로 남습니다."""
+        if not self._file.closed:
+            self._file.close()
+            self._temp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'CorpusWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CorpusReader:
+    """코퍼스 파일에서 N번째 문장을 바로 읽는 클래스"""
+    def __init__(self, source: Union[str, Path, BinaryIO]):
+        if isinstance(source, (str, Path)):
+            self._file = open(source, 'rb')
+            self._owns_file = True
+        else:
+            self._file = source
+            self._owns_file = False
+        self._cached_block_index = -1
+        self._cached_block: List[str] = []
+        self._read_index()
+
+    def _read_index(self) -> None:
+        """파일 끝의 메타데이터와 색인을 읽습니다."""
+        self._file.seek(0)
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("코퍼스 파일 형식이 아닙니다.")
+
+        self._file.seek(-TRAILER.size, 2)
+        footer_offset, meta_len, num_blocks, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != MAGIC:
+            raise ValueError("코퍼스 파일이 손상되었습니다.")
+
+        self._file.seek(footer_offset)
+        self.metadata: Dict[str, Any] = json.loads(self._file.read(meta_len).decode('utf-8'))
+        if self.metadata.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 코퍼스 버전입니다: {self.metadata.get('version')}")
+        if self.metadata.get("codec") not in CODECS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {self.metadata.get('codec')}")
+        self._decompress = CODECS[self.metadata["codec"]][1]
+
+        index_size = (num_blocks + 1) * 8
+        self._offsets = from_le_bytes('Q', self._file.read(index_size))
+        self._counts = from_le_bytes('Q', self._file.read(index_size))
+
+    def __len__(self) -> int:
+        return self._counts[-1]
+
+    def _read_block(self, block_index: int) -> List[str]:
+        """블록 하나를 읽고 풀어서 문장 리스트로 반환합니다. 마지막 블록은 캐시됩니다."""
+        if block_index != self._cached_block_index:
+            start, end = self._offsets[block_index], self._offsets[block_index + 1]
+            self._file.seek(start)
+            data = self._decompress(self._file.read(end - start))
+            self._cached_block = data.decode('utf-8').split('\n')
+            self._cached_block_index = block_index
+        return self._cached_block
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("문장 번호가 범위를 벗어났습니다.")
+        block_index = bisect_right(self._counts, index) - 1
+        return self._read_block(block_index)[index - self._counts[block_index]]
+
+    def slice(self, start: int, count: int) -> List[str]:
+        """start번째부터 최대 count개의 문장을 반환합니다."""
+        start = max(0, min(start, len(self)))
+        end = min(start + count, len(self))
+        return [self[index] for index in range(start, end)]
+
+    def __iter__(self) -> Iterator[str]:
+        for block_index in range(len(self._offsets) - 1):
+            yield from self._read_block(block_index)
+
+    def close(self) -> None:
+        """직접 연 파일이면 닫습니다."""
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'CorpusReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,375 @@
+"""txt/html 파일 디렉토리로부터 색인된 코퍼스를 만드는 명령줄 도구
+
+사용 예::
+
+    python corpus_builder.py data/news data/books -o practice.corpus --workers 8
+"""
+import argparse
+import hashlib
+import multiprocessing
+import multiprocessing.pool
+import os
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+from compression import detect_compression, iter_members
+from config import COMPRESSION_CONFIG, CORPUS_CONFIG, DECODING_CONFIG, DEDUP_CONFIG, SEARCH_CONFIG
+from corpus import CODECS, CorpusWriter, encode_block
+from search_index import SearchIndex
+from text_decoder import detect_encoding, iter_decoded_chunks, iter_decoded_lines
+from url_processor import URLProcessor
+
+
+class ChunkTask(NamedTuple):
+    """작업 프로세스에 넘기는 작업 단위
+
+    일반 파일은 바이트 구간(start~end)만 넘기고 작업 프로세스가 직접 읽습니다.
+    압축 파일은 풀어낼 항목 이름을 member로 넘기고 작업 프로세스가 그 항목을 직접 풀어 처리합니다.
+    """
+    path: str
+    start: int
+    end: int
+    encoding: str = 'utf-8'
+    is_html: bool = False
+    member: Optional[str] = None
+
+# ([(문장, MinHash 서명)], 처리한 바이트 수)
+ChunkResult = Tuple[List[Tuple[str, bytes]], int]
+# (압축된 블록, 문장 수, 블록 문장들의 색인 조각)
+BlockResult = Tuple[bytes, int, Optional[SearchIndex]]
+
+HTML_EXTENSIONS = ('.html', '.htm')
+
+
+@dataclass
+class BuildReport:
+    """코퍼스 생성 결과"""
+    files: int = 0
+    input_bytes: int = 0
+    processed_bytes: int = 0
+    sentences: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    elapsed: float = 0.0
+    workers: int = 1
+
+    @property
+    def mb_per_sec(self) -> float:
+        """전체 처리량 (MB/s)"""
+        return self.processed_bytes / 1024 / 1024 / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec_per_core(self) -> float:
+        """코어당 처리량 (MB/s)"""
+        return self.mb_per_sec / self.workers
+
+
+def collect_files(inputs: Iterable[str],
+                  extensions: Sequence[str] = (CORPUS_CONFIG["source_extensions"]
+                                               + COMPRESSION_CONFIG["extensions"])) -> List[Path]:
+    """입력 경로들에서 처리할 파일 목록을 정렬된 순서로 모읍니다."""
+    suffixes = {f".{ext.lower()}" for ext in extensions}
+    files: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.extend(sorted(
+                p for p in path.rglob('*') if p.is_file() and p.suffix.lower() in suffixes
+            ))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise ValueError(f"입력 경로를 찾을 수 없습니다: {item}")
+    return files
+
+
+def make_tasks(files: Iterable[Path], chunk_bytes: int = CORPUS_CONFIG["chunk_bytes"]) -> Iterator[ChunkTask]:
+    """큰 텍스트 파일은 바이트 구간으로 나누어 작업 단위를 만듭니다.
+
+    인코딩은 파일 앞부분으로 한 번만 감지하여 모든 구간에 사용합니다.
+    HTML 파일과 UTF-16/32 파일은 구간 경계가 깨지지 않도록 파일 전체를 하나의 작업으로 처리합니다.
+    압축 파일은 항목 목록만 읽고 항목마다 작업을 만들며, 인코딩은 작업 프로세스가 풀어낸 내용으로 감지합니다.
+    """
+    for path in files:
+        size = path.stat().st_size
+        with open(path, 'rb') as f:
+            if detect_compression(f) is not None:
+                members = [name for name, _ in iter_members(f, path.name, CORPUS_CONFIG["source_extensions"])]
+                yield from _member_tasks(path, size, members)
+                continue
+            encoding = detect_encoding(f.read(DECODING_CONFIG["sniff_bytes"]))
+        is_html = path.suffix.lower() in HTML_EXTENSIONS
+        if is_html or size <= chunk_bytes or encoding.startswith(('utf-16', 'utf-32')):
+            yield ChunkTask(str(path), 0, size, encoding, is_html=is_html)
+            continue
+        for start in range(0, size, chunk_bytes):
+            yield ChunkTask(str(path), start, min(start + chunk_bytes, size), encoding)
+
+
+def _member_tasks(path: Path, size: int, members: List[str]) -> Iterator[ChunkTask]:
+    """압축 파일의 항목마다 작업을 만듭니다.
+
+    항목별 압축 크기는 알 수 없으므로 진행률에는 파일 크기 전체를 마지막 항목에 반영합니다.
+    처리할 항목이 없어도 진행률에 반영되도록 빈 작업을 하나 만듭니다.
+    """
+    if not members:
+        yield ChunkTask(str(path), 0, size, member='')
+        return
+    for i, name in enumerate(members):
+        yield ChunkTask(str(path), 0, size if i == len(members) - 1 else 0,
+                        is_html=name.lower().endswith(HTML_EXTENSIONS), member=name)
+
+
+def read_chunk(path: str, start: int, end: int) -> bytes:
+    """구간에서 시작하는 줄들을 읽습니다.
+
+    앞 구간에 걸친 줄은 건너뛰고, 마지막 줄은 구간 밖까지 이어서 읽으므로
+    모든 줄이 정확히 한 구간에만 속합니다.
+    """
+    with open(path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        if position >= end:
+            return b''
+        data = f.read(end - position)
+        if data and not data.endswith(b'\n'):
+            data += f.readline()
+        return data
+
+
+def _split_text(text: str, is_html: bool) -> List[str]:
+    """URLProcessor 규칙으로 텍스트를 필터링하고 문장으로 나눕니다."""
+    if is_html:
+        paragraphs = URLProcessor.extract_paragraphs(text)
+    else:
+        paragraphs = URLProcessor.extract_paragraphs_from_text(text)
+    return URLProcessor.split_sentences('\n'.join(paragraphs))
+
+
+def _member_sentences(task: ChunkTask, batch_bytes: int = CORPUS_CONFIG["chunk_bytes"]) -> List[str]:
+    """압축 파일의 항목 하나를 스트리밍으로 풀면서 문장으로 나눕니다.
+
+    텍스트 항목은 batch_bytes 단위로 줄을 모아 처리하므로 풀어낸 내용 전체를 메모리에 올리지 않습니다.
+    """
+    sentences: List[str] = []
+    with open(task.path, 'rb') as raw:
+        for name, stream in iter_members(raw, Path(task.path).name, CORPUS_CONFIG["source_extensions"]):
+            if name != task.member:
+                continue
+            if task.is_html:
+                sentences.extend(_split_text(''.join(iter_decoded_chunks(stream)), True))
+                continue
+            batch: List[str] = []
+            batch_chars = 0
+            for line in iter_decoded_lines(stream):
+                batch.append(line)
+                batch_chars += len(line) + 1
+                if batch_chars >= batch_bytes:
+                    sentences.extend(_split_text('\n'.join(batch), False))
+                    batch, batch_chars = [], 0
+            if batch:
+                sentences.extend(_split_text('\n'.join(batch), False))
+    return sentences
+
+
+def process_chunk(task: ChunkTask) -> ChunkResult:
+    """작업 단위를 URLProcessor 규칙으로 필터링/분리하고 문장별 서명을 계산합니다.
+
+    문장은 CorpusWriter.add와 같이 공백을 정리해 두므로 그대로 블록으로 묶을 수 있습니다.
+    """
+    if task.member is not None:
+        sentences = _member_sentences(task)
+    else:
+        encoding = task.encoding
+        if task.start > 0 and encoding == 'utf-8-sig':
+            encoding = 'utf-8'
+        text = read_chunk(task.path, task.start, task.end).decode(encoding, errors='replace')
+        sentences = _split_text(text, task.is_html)
+    sentences = [sentence for sentence in (' '.join(s.split()) for s in sentences) if sentence]
+    processed = task.end - task.start
+
+    if DEDUP_CONFIG["enabled"]:
+        dedup_filter = URLProcessor.create_dedup_filter()
+        return [(s, dedup_filter.signature(s).tobytes()) for s in sentences], processed
+    return [(s, b'') for s in sentences], processed
+
+
+def process_block(sentences: List[str], codec: str, index: bool) -> BlockResult:
+    """중복을 걸러낸 문장들을 블록 하나로 압축하고, index가 참이면 그 문장들만의 색인 조각을 만듭니다."""
+    shard = None
+    if index:
+        shard = SearchIndex()
+        shard.add_many(sentences)
+    return encode_block(sentences, codec), len(sentences), shard
+
+
+def _run_tasks(tasks: Iterable[ChunkTask], pool: Optional[multiprocessing.pool.Pool],
+               max_pending: int) -> Iterator[ChunkResult]:
+    """작업을 입력 순서대로 처리한 결과를 반환합니다.
+
+    처리 결과가 메모리에 쌓이지 않도록 동시에 대기하는 작업 수를 max_pending으로 제한합니다.
+    """
+    if pool is None:
+        yield from map(process_chunk, tasks)
+        return
+    pending: deque = deque()
+    for task in tasks:
+        pending.append(pool.apply_async(process_chunk, (task,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def _print_progress(stream: TextIO, report: BuildReport, final: bool = False) -> None:
+    """진행 상황과 처리량을 한 줄로 출력합니다."""
+    percent = report.processed_bytes / report.input_bytes * 100 if report.input_bytes else 100.0
+    stream.write(
+        f"\r{percent:5.1f}% | {report.processed_bytes / 1024 / 1024:,.1f} MB | "
+        f"{report.sentences:,} 문장 | {report.mb_per_sec:.2f} MB/s "
+        f"({report.mb_per_sec_per_core:.2f} MB/s/core x {report.workers})"
+    )
+    if final:
+        stream.write('\n')
+    stream.flush()
+
+
+def build_corpus(inputs: Iterable[str], output: str, workers: Optional[int] = None,
+                 chunk_bytes: int = CORPUS_CONFIG["chunk_bytes"],
+                 block_size: int = CORPUS_CONFIG["block_size"],
+                 codec: str = CORPUS_CONFIG["codec"],
+                 progress: Optional[TextIO] = sys.stderr,
+                 index: bool = SEARCH_CONFIG["index"],
+                 max_hashes: int = DEDUP_CONFIG["max_hashes"]) -> BuildReport:
+    """입력 파일들을 병렬로 처리하여 코퍼스 파일을 만듭니다. index가 참이면 검색 색인도 함께 만듭니다.
+
+    메인 프로세스는 순서대로 중복만 판정하고, 읽기/압축 해제/문장 분리/서명 계산과
+    블록 압축/색인 조각 생성은 작업 프로세스가 맡습니다.
+
+    완전 중복은 기본적으로 모든 문장의 8바이트 해시로 확인합니다. max_hashes를 주면 최근 max_hashes개의
+    해시만 보관하여 메모리를 일정하게 유지하는 대신, 그보다 멀리 떨어진 중복은 유사 중복 필터가 남은 만큼만 걸러냅니다.
+    """
+    files = collect_files(inputs)
+    report = BuildReport(
+        files=len(files),
+        input_bytes=sum(path.stat().st_size for path in files),
+        workers=max(1, workers or os.cpu_count() or 1)
+    )
+    # 문장 해시 (max_hashes가 있으면 가장 오래 쓰이지 않은 것부터 버림)
+    seen_hashes: Dict[bytes, None] = OrderedDict() if max_hashes else {}
+    dedup_filter = URLProcessor.create_dedup_filter() if DEDUP_CONFIG["enabled"] else None
+
+    started = last_report = time.perf_counter()
+    tasks = make_tasks(files, chunk_bytes)
+    metadata = {"sources": [str(path) for path in files]}
+    max_pending = report.workers * 2
+
+    with CorpusWriter(output, block_size=block_size, metadata=metadata, codec=codec,
+                      index=SearchIndex() if index else None) as writer:
+        pool = multiprocessing.Pool(report.workers) if report.workers > 1 else None
+        pending_blocks: deque = deque()
+        block: List[str] = []
+
+        def submit_block() -> None:
+            """모은 문장을 블록으로 압축하도록 넘기고, 끝난 블록은 순서대로 기록합니다."""
+            if block:
+                args = (list(block), codec, index)
+                if pool is None:
+                    writer.add_block(*process_block(*args))
+                else:
+                    pending_blocks.append(pool.apply_async(process_block, args))
+                block.clear()
+            while pending_blocks and (len(pending_blocks) >= max_pending or pending_blocks[0].ready()):
+                writer.add_block(*pending_blocks.popleft().get())
+
+        try:
+            for sentences, processed in _run_tasks(tasks, pool, max_pending=max_pending):
+                for sentence, signature in sentences:
+                    digest = hashlib.blake2b(sentence.encode('utf-8'), digest_size=8).digest()
+                    if digest in seen_hashes:
+                        if max_hashes:
+                            seen_hashes.move_to_end(digest)
+                        report.exact_duplicates += 1
+                        continue
+                    seen_hashes[digest] = None
+                    if max_hashes and len(seen_hashes) > max_hashes:
+                        seen_hashes.popitem(last=False)
+                    if dedup_filter and dedup_filter.check_signature(array('I', signature)):
+                        report.near_duplicates += 1
+                        continue
+                    block.append(sentence)
+                    report.sentences += 1
+                    if len(block) >= block_size:
+                        submit_block()
+
+                report.processed_bytes += processed
+                now = time.perf_counter()
+                report.elapsed = now - started
+                if progress and now - last_report >= CORPUS_CONFIG["progress_interval"]:
+                    _print_progress(progress, report)
+                    last_report = now
+
+            submit_block()
+            while pending_blocks:
+                writer.add_block(*pending_blocks.popleft().get())
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+    report.elapsed = time.perf_counter() - started
+    if progress:
+        _print_progress(progress, report, final=True)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="txt/html 파일(및 .gz/.bz2/.xz/.zip 압축 파일)로 타이핑 연습용 코퍼스를 만듭니다.")
+    parser.add_argument("inputs", nargs='+', help="입력 파일 또는 디렉토리")
+    parser.add_argument("-o", "--output", required=True, help=f"출력 파일 (.{CORPUS_CONFIG['extension']})")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="작업 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--chunk-mb", type=float, default=CORPUS_CONFIG["chunk_bytes"] / 1024 / 1024,
+                        help="작업 단위 크기 (MB)")
+    parser.add_argument("--block-size", type=int, default=CORPUS_CONFIG["block_size"],
+                        help="블록당 문장 수")
+    parser.add_argument("--codec", choices=sorted(CODECS), default=CORPUS_CONFIG["codec"],
+                        help="블록 압축 방식")
+    parser.add_argument("--no-index", action="store_true", help="검색 색인을 만들지 않습니다")
+    parser.add_argument("--max-hashes", type=int, default=DEDUP_CONFIG["max_hashes"],
+                        help="완전 중복 확인에 보관할 최근 문장 해시 수 (0이면 전체 보관)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않습니다")
+    args = parser.parse_args(argv)
+
+    try:
+        report = build_corpus(
+            args.inputs, args.output,
+            workers=args.workers,
+            chunk_bytes=max(1, int(args.chunk_mb * 1024 * 1024)),
+            block_size=args.block_size,
+            codec=args.codec,
+            progress=None if args.quiet else sys.stderr,
+            index=SEARCH_CONFIG["index"] and not args.no_index,
+            max_hashes=max(0, args.max_hashes)
+        )
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+
+    print(
+        f"{report.files}개 파일, {report.sentences:,}개 문장 저장 "
+        f"(완전 중복 {report.exact_duplicates:,}개, 유사 중복 {report.near_duplicates:,}개 제거) -> {args.output}\n"
+        f"{report.elapsed:.2f}초, {report.mb_per_sec:.2f} MB/s, "
+        f"코어당 {report.mb_per_sec_per_core:.2f} MB/s ({report.workers}개 프로세스)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
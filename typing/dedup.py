@@ -0,0 +1,181 @@
+"""유사 중복 문장 제거 기능 (Shingle + MinHash/LSH)"""
+import hashlib
+import operator
+import re
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class NearDuplicateFilter:
+    """MinHash/LSH로 유사 중복 문장을 스트리밍 방식으로 걸러내는 클래스
+
+    최근 ``max_entries``개 문장의 서명만 보관하므로 입력이 수백만 문장이어도
+    메모리 사용량이 일정하게 유지됩니다. LSH 버킷마다 최근 ``bucket_size``개 문장을 보관하므로
+    서로 다른 문장이 같은 버킷에 들어가도 앞서 등록된 문장과의 비교를 놓치지 않습니다.
+    """
+    EMPTY_BIN = 0xFFFFFFFF
+    # 빈 구간을 채울 때 거리별로 값을 섞는 상수 (황금비 기반)
+    DENSIFY_MIX = 0x9E3779B1
+
+    # 비교 전 제거할 문자 (공백/문장 부호)
+    NORMALIZE_PATTERN = re.compile(r'[\s.,!?()\[\]{}":;\'-]+')
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64,
+                 shingle_size: int = 3, max_entries: int = 100_000, seed: int = 1,
+                 bucket_size: int = 4):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("유사도 임계값은 0보다 크고 1 이하여야 합니다.")
+        if num_perm < 1 or shingle_size < 1 or max_entries < 1 or bucket_size < 1:
+            raise ValueError("num_perm, shingle_size, max_entries, bucket_size는 1 이상이어야 합니다.")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.bucket_size = bucket_size
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        self._hasher = hashlib.blake2b(digest_size=8, key=seed.to_bytes(8, 'little'))
+        # 밴드별 {버킷 키: 등록 순서대로의 문장 번호}
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._entries: "OrderedDict[int, Tuple[bytes, Tuple[int, ...]]]" = OrderedDict()
+        self._next_id = 0
+
+        self.seen = 0
+        self.dropped = 0
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """임계값 (1/b)^(1/r)이 목표 유사도에 가장 가까운 밴드 구성을 고릅니다."""
+        best = (num_perm, 1)
+        best_error = float('inf')
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            error = abs((1 / bands) ** (1 / rows) - threshold)
+            if error < best_error:
+                best, best_error = (bands, rows), error
+        return best
+
+    def _shingles(self, text: str) -> List[bytes]:
+        """정규화된 텍스트의 문자 n-gram 목록을 반환합니다."""
+        normalized = self.NORMALIZE_PATTERN.sub('', text.lower())
+        size = self.shingle_size
+        if len(normalized) <= size:
+            grams = {normalized}
+        else:
+            grams = {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+        return [gram.encode('utf-8') for gram in grams]
+
+    def signature(self, text: str) -> array:
+        """문장의 MinHash 서명을 계산합니다.
+
+        n-gram마다 해시를 한 번만 계산하는 one-permutation hashing 방식으로,
+        해시 값에 따라 num_perm개 구간 중 하나를 고르고 구간별 최솟값을 남깁니다.
+        비어 있는 구간은 오른쪽의 가장 가까운 구간 값으로 채웁니다(densification).
+        """
+        num_bins = self.num_perm
+        values = [self.EMPTY_BIN] * num_bins
+        for shingle in self._shingles(text):
+            hasher = self._hasher.copy()
+            hasher.update(shingle)
+            hashed = int.from_bytes(hasher.digest(), 'little')
+            bin_index, value = hashed % num_bins, hashed >> 32
+            if value < values[bin_index]:
+                values[bin_index] = value
+        self._densify(values)
+        return array('I', values)
+
+    def _densify(self, values: List[int]) -> None:
+        """빈 구간을 오른쪽(순환)의 가장 가까운 채워진 구간 값으로 채웁니다."""
+        num_bins = len(values)
+        empty_count = values.count(self.EMPTY_BIN)
+        if empty_count == 0 or empty_count == num_bins:
+            return
+        start = next(i for i, value in enumerate(values) if value != self.EMPTY_BIN)
+        next_value, distance = values[start], 0
+        for step in range(1, num_bins):
+            index = (start - step) % num_bins
+            if values[index] != self.EMPTY_BIN:
+                next_value, distance = values[index], 0
+            else:
+                distance += 1
+                values[index] = (next_value ^ (distance * self.DENSIFY_MIX)) & 0xFFFFFFFF
+
+    def _band_keys(self, signature: array) -> Tuple[int, ...]:
+        """서명을 밴드 단위로 나누어 해시 키를 만듭니다."""
+        rows = self.rows
+        return tuple(
+            hash((band, signature[band * rows:(band + 1) * rows].tobytes()))
+            for band in range(self.bands)
+        )
+
+    def _similarity(self, signature: array, other: bytes) -> float:
+        """두 서명의 일치 비율(추정 자카드 유사도)을 계산합니다."""
+        other_sig = array('I')
+        other_sig.frombytes(other)
+        return sum(map(operator.eq, signature, other_sig)) / self.num_perm
+
+    def is_duplicate(self, text: str) -> bool:
+        """유사 문장이 이미 있으면 True를, 없으면 문장을 등록하고 False를 반환합니다."""
+        return self.check_signature(self.signature(text))
+
+    def check_signature(self, signature: array) -> bool:
+        """미리 계산된 서명으로 중복 여부를 확인하고, 새 서명이면 등록합니다.
+
+        서명 계산은 다른 프로세스에서 하고 LSH 조회만 한 곳에서 할 때 사용합니다.
+        """
+        self.seen += 1
+        keys = self._band_keys(signature)
+
+        checked = set()
+        for table, key in zip(self._tables, keys):
+            for entry_id in table.get(key, ()):
+                if entry_id in checked:
+                    continue
+                checked.add(entry_id)
+                if self._similarity(signature, self._entries[entry_id][0]) >= self.threshold:
+                    self.dropped += 1
+                    return True
+
+        self._add(signature, keys)
+        return False
+
+    def _add(self, signature: array, keys: Tuple[int, ...]) -> None:
+        """서명을 등록하고, 한도를 넘으면 가장 오래된 서명을 제거합니다.
+
+        버킷이 bucket_size개를 넘으면 그 버킷에서 가장 오래된 문장 번호를 뺍니다.
+        """
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (signature.tobytes(), keys)
+        for table, key in zip(self._tables, keys):
+            bucket = table.setdefault(key, [])
+            bucket.append(entry_id)
+            if len(bucket) > self.bucket_size:
+                del bucket[0]
+
+        if len(self._entries) > self.max_entries:
+            old_id, (_, old_keys) = self._entries.popitem(last=False)
+            # 가장 오래된 문장이므로 버킷에 남아 있다면 맨 앞에 있습니다
+            for table, key in zip(self._tables, old_keys):
+                bucket = table.get(key)
+                if bucket and bucket[0] == old_id:
+                    del bucket[0]
+                    if not bucket:
+                        del table[key]
+
+    def filter(self, sentences: Iterable[str]) -> Iterator[str]:
+        """유사 중복이 아닌 문장만 차례로 반환합니다."""
+        for sentence in sentences:
+            if not self.is_duplicate(sentence):
+                yield sentence
+
+    def reset(self) -> None:
+        """등록된 서명과 통계를 초기화합니다."""
+        for table in self._tables:
+            table.clear()
+        self._entries.clear()
+        self.seen = self.dropped = 0
@@ -0,0 +1,345 @@
+"""RSS/Atom 피드와 사이트맵 구독
+
+구독한 피드(또는 사이트맵)를 주기적으로 새로 고쳐, 처음 보는 항목의 본문만 내려받아
+`URLProcessor`의 추출/필터/문장 분리 규칙을 거친 뒤 구독별 코퍼스 파일 뒤에 이어 붙입니다.
+
+- 피드 문서는 ETag/Last-Modified 조건부 요청으로 받아, 바뀌지 않았으면(304) 아무것도 내려받지 않습니다.
+- 읽은 항목 목록과 조건부 요청 헤더는 SQLite 파일에 보관하므로 재시작해도 유지됩니다.
+- 코퍼스는 다시 만들지 않고 `CorpusWriter(append=True)`로 이어 쓰며, 검색 색인에도 새 문장만 더합니다.
+
+::
+
+    python feeds.py add https://example.com/rss.xml --interval 3600
+    python feeds.py refresh          # 새로 고칠 때가 된 구독만
+    python feeds.py run              # 계속 실행하며 주기적으로 새로 고침
+"""
+import argparse
+import gzip
+import re
+import sqlite3
+import sys
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+import requests
+from config import DEDUP_CONFIG, FEEDS_CONFIG, INGEST_CONFIG, SEARCH_CONFIG
+from corpus import CorpusWriter
+from metrics import FEED_FETCHES, FEED_ITEMS
+from search_index import SearchIndex
+from url_processor import URLProcessor
+
+
+class FeedItem(NamedTuple):
+    """피드 항목 (id는 guid/id, 없으면 링크)"""
+    id: str
+    url: str
+
+
+class Subscription(NamedTuple):
+    url: str
+    corpus: str
+    interval: int
+    checked: float
+    sentences: int
+
+
+class RefreshReport(NamedTuple):
+    url: str
+    status: str           # "updated", "not_modified", "error"
+    new_items: int = 0
+    sentences: int = 0
+    failed: int = 0
+    error: str = ""
+
+
+def _local(tag: str) -> str:
+    """네임스페이스를 뺀 태그 이름"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element: ElementTree.Element, name: str) -> str:
+    for child in element:
+        if _local(child.tag) == name and child.text:
+            return child.text.strip()
+    return ""
+
+
+def parse_feed(data: bytes) -> Tuple[str, List[FeedItem]]:
+    """RSS/Atom/사이트맵 문서를 읽어 (종류, 문서 순서대로의 항목)을 반환합니다.
+
+    종류는 "rss", "atom", "sitemap", "sitemapindex" 중 하나이며, 사이트맵 색인의 항목은 하위 사이트맵입니다.
+    """
+    if data[:2] == b'\x1f\x8b':  # sitemap.xml.gz
+        data = gzip.decompress(data)
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as e:
+        raise ValueError(f"피드 문서를 읽을 수 없습니다: {str(e)}")
+
+    kind = _local(root.tag)
+    items = []
+    if kind in ("rss", "RDF"):
+        for element in root.iter():
+            if _local(element.tag) == "item":
+                link = _child_text(element, "link")
+                if link:
+                    items.append(FeedItem(_child_text(element, "guid") or link, link))
+        return "rss", items
+    if kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            links = [link for link in entry if _local(link.tag) == "link"]
+            link = next((l.get("href") for l in links if l.get("rel", "alternate") == "alternate"), None)
+            if link:
+                items.append(FeedItem(_child_text(entry, "id") or link, link))
+        return "atom", items
+    if kind in ("urlset", "sitemapindex"):
+        for element in root:
+            location = _child_text(element, "loc")
+            if location:
+                items.append(FeedItem(location, location))
+        return "sitemap" if kind == "urlset" else "sitemapindex", items
+    raise ValueError(f"지원하지 않는 피드 형식입니다: {kind}")
+
+
+class FeedManager:
+    """피드 구독 목록과 새로 고침 (여러 스레드에서 사용 가능)"""
+    def __init__(self, db_path: str = FEEDS_CONFIG["db_path"], corpus_dir: str = FEEDS_CONFIG["corpus_dir"],
+                 session: Optional[requests.Session] = None):
+        self.corpus_dir = Path(corpus_dir)
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", FEEDS_CONFIG["user_agent"])
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS feeds (url TEXT PRIMARY KEY, corpus TEXT NOT NULL, "
+                "interval INTEGER NOT NULL, checked REAL NOT NULL DEFAULT 0, sentences INTEGER NOT NULL DEFAULT 0)"
+            )
+            # 피드와 하위 사이트맵의 조건부 요청 헤더
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen (feed TEXT NOT NULL, item TEXT NOT NULL, fetched REAL NOT NULL, "
+                "PRIMARY KEY (feed, item))"
+            )
+
+    # 구독 관리
+    def subscribe(self, url: str, interval: int = FEEDS_CONFIG["interval"], corpus: Optional[str] = None) -> Subscription:
+        """피드를 구독합니다. 이미 구독 중이면 간격만 바꿉니다."""
+        if not URLProcessor.is_url(url):
+            raise ValueError(f"올바른 URL이 아닙니다: {url}")
+        if interval < 60:
+            raise ValueError("새로 고침 간격은 60초 이상이어야 합니다.")
+        if corpus is None:
+            slug = re.sub(r'[^0-9A-Za-z]+', '_', url.split('://', 1)[-1]).strip('_')[:80]
+            corpus = str(self.corpus_dir / f"{slug}.corpus")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO feeds (url, corpus, interval) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET interval = excluded.interval", (url, corpus, interval))
+        return self.get(url)
+
+    def unsubscribe(self, url: str) -> None:
+        """구독과 읽은 항목 기록을 지웁니다. 코퍼스 파일은 남겨 둡니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM feeds WHERE url = ?", (url,))
+            self._conn.execute("DELETE FROM seen WHERE feed = ?", (url,))
+            self._conn.execute("DELETE FROM documents WHERE url = ?", (url,))
+
+    def get(self, url: str) -> Subscription:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, corpus, interval, checked, sentences FROM feeds WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            raise ValueError(f"구독하지 않은 피드입니다: {url}")
+        return Subscription(*row)
+
+    def subscriptions(self) -> List[Subscription]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, corpus, interval, checked, sentences FROM feeds ORDER BY url").fetchall()
+        return [Subscription(*row) for row in rows]
+
+    def due(self, now: Optional[float] = None) -> List[Subscription]:
+        """새로 고칠 때가 된 구독 목록"""
+        now = time.time() if now is None else now
+        return [sub for sub in self.subscriptions() if sub.checked + sub.interval <= now]
+
+    # 내려받기
+    def _fetch_document(self, url: str, conditional: bool) -> Optional[bytes]:
+        """피드 문서를 조건부 요청으로 내려받습니다. 바뀌지 않았으면 None을 반환합니다."""
+        headers = {}
+        if conditional:
+            with self._lock:
+                row = self._conn.execute("SELECT etag, last_modified FROM documents WHERE url = ?", (url,)).fetchone()
+            if row and row[0]:
+                headers["If-None-Match"] = row[0]
+            if row and row[1]:
+                headers["If-Modified-Since"] = row[1]
+        try:
+            response = self.session.get(url, headers=headers, timeout=INGEST_CONFIG["timeout"])
+            if response.status_code == 304:
+                FEED_FETCHES.inc(result="not_modified")
+                return None
+            response.raise_for_status()
+        except requests.RequestException as e:
+            FEED_FETCHES.inc(result="error")
+            raise ValueError(f"피드를 가져오는데 실패했습니다: {str(e)}")
+        FEED_FETCHES.inc(result="modified")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (url, etag, last_modified) VALUES (?, ?, ?)",
+                (url, response.headers.get("ETag"), response.headers.get("Last-Modified")))
+        return response.content
+
+    def _collect_items(self, url: str, conditional: bool, depth: int = 0) -> Optional[List[FeedItem]]:
+        """피드의 항목을 오래된 것부터 반환합니다. 사이트맵 색인은 하위 사이트맵까지 따라갑니다."""
+        data = self._fetch_document(url, conditional)
+        if data is None:
+            return None
+        kind, items = parse_feed(data)
+        if kind == "sitemapindex":
+            collected = []
+            if depth < FEEDS_CONFIG["max_sitemap_depth"]:
+                for child in items:
+                    collected.extend(self._collect_items(child.url, conditional, depth + 1) or [])
+            return collected
+        # 피드는 최신 항목이 먼저 나오므로 뒤집어서 코퍼스에 시간 순서대로 쌓음
+        return list(reversed(items)) if kind in ("rss", "atom") else items
+
+    def _unseen(self, feed: str, items: List[FeedItem]) -> List[FeedItem]:
+        with self._lock:
+            seen = {row[0] for row in self._conn.execute("SELECT item FROM seen WHERE feed = ?", (feed,))}
+        unseen = list({item.id: item for item in items if item.id not in seen}.values())
+        # 한 번에 너무 많으면 최신 항목부터
+        return unseen[-FEEDS_CONFIG["max_items"]:]
+
+    def refresh(self, url: str, force: bool = False) -> RefreshReport:
+        """피드를 새로 고치고 새 항목의 문장을 코퍼스에 이어 붙입니다. force면 조건부 요청을 하지 않습니다."""
+        subscription = self.get(url)
+        try:
+            items = self._collect_items(url, conditional=not force)
+        except ValueError as e:
+            self._mark_checked(url, 0)
+            return RefreshReport(url, "error", error=str(e))
+        if items is None:
+            self._mark_checked(url, 0)
+            return RefreshReport(url, "not_modified")
+
+        unseen = self._unseen(url, items)
+        fetched: List[str] = []
+        sentences = failed = 0
+        if unseen:
+            Path(subscription.corpus).parent.mkdir(parents=True, exist_ok=True)
+            # 여러 기사에 반복되는 문장(안내 문구 등)은 구독 새로 고침 단위로 한 번만 남김
+            dedup = URLProcessor.create_dedup_filter() if DEDUP_CONFIG["enabled"] else None
+            index = SearchIndex() if SEARCH_CONFIG["index"] else None
+            with CorpusWriter(subscription.corpus, metadata={"source": url}, append=True, index=index) as writer:
+                for item in unseen:
+                    try:
+                        item_sentences = list(islice(URLProcessor.iter_sentences_from_url(item.url),
+                                                     FEEDS_CONFIG["max_sentences_per_item"]))
+                    except ValueError:
+                        failed += 1  # 다음에 피드가 바뀌면 다시 시도
+                        FEED_ITEMS.inc(result="error")
+                        continue
+                    if dedup is not None:
+                        item_sentences = list(dedup.filter(item_sentences))
+                    writer.add_many(item_sentences)
+                    sentences += len(item_sentences)
+                    fetched.append(item.id)
+                    FEED_ITEMS.inc(result="ok")
+        # 코퍼스를 닫은 뒤에 읽은 항목으로 기록
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO seen (feed, item, fetched) VALUES (?, ?, ?)",
+                                   [(url, item_id, now) for item_id in fetched])
+        self._mark_checked(url, sentences)
+        return RefreshReport(url, "updated", len(fetched), sentences, failed)
+
+    def _mark_checked(self, url: str, sentences: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE feeds SET checked = ?, sentences = sentences + ? WHERE url = ?",
+                               (time.time(), sentences, url))
+
+    def refresh_due(self, now: Optional[float] = None) -> List[RefreshReport]:
+        """새로 고칠 때가 된 구독을 모두 새로 고칩니다."""
+        return [self.refresh(subscription.url) for subscription in self.due(now)]
+
+    def run_forever(self, poll: float = 60.0) -> None:
+        """poll초마다 새로 고칠 때가 된 구독을 확인합니다."""
+        while True:
+            for report in self.refresh_due():
+                print(format_report(report), flush=True)
+            time.sleep(poll)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        self.session.close()
+
+
+def format_report(report: RefreshReport) -> str:
+    if report.status == "error":
+        return f"{report.url}: 오류 - {report.error}"
+    if report.status == "not_modified":
+        return f"{report.url}: 바뀐 내용 없음"
+    failed = f", 실패 {report.failed}개" if report.failed else ""
+    return f"{report.url}: 새 항목 {report.new_items}개, 문장 {report.sentences}개 추가{failed}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="RSS/Atom 피드, 사이트맵 구독")
+    parser.add_argument("--db", default=FEEDS_CONFIG["db_path"])
+    parser.add_argument("--corpus-dir", default=FEEDS_CONFIG["corpus_dir"])
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="구독 추가")
+    add.add_argument("url")
+    add.add_argument("--interval", type=int, default=FEEDS_CONFIG["interval"], help="새로 고침 간격 (초)")
+    add.add_argument("--corpus", help="코퍼스 파일 경로 (기본: corpus-dir 아래 URL 이름)")
+    remove = commands.add_parser("remove", help="구독 삭제")
+    remove.add_argument("url")
+    commands.add_parser("list", help="구독 목록")
+    refresh = commands.add_parser("refresh", help="새로 고칠 때가 된 구독 새로 고침")
+    refresh.add_argument("url", nargs="?", help="이 구독만 바로 새로 고침")
+    refresh.add_argument("--force", action="store_true", help="조건부 요청 없이 다시 확인")
+    run = commands.add_parser("run", help="계속 실행하며 주기적으로 새로 고침")
+    run.add_argument("--poll", type=float, default=60.0, help="확인 간격 (초)")
+    args = parser.parse_args(argv)
+
+    manager = FeedManager(args.db, args.corpus_dir)
+    try:
+        if args.command == "add":
+            subscription = manager.subscribe(args.url, args.interval, args.corpus)
+            print(f"구독: {subscription.url} → {subscription.corpus}")
+        elif args.command == "remove":
+            manager.unsubscribe(args.url)
+        elif args.command == "list":
+            for sub in manager.subscriptions():
+                checked = time.strftime('%Y-%m-%d %H:%M', time.localtime(sub.checked)) if sub.checked else "-"
+                print(f"{sub.url}  {sub.interval}초마다, 마지막 확인 {checked}, 문장 {sub.sentences:,}개 → {sub.corpus}")
+        elif args.command == "refresh":
+            reports = [manager.refresh(args.url, args.force)] if args.url else manager.refresh_due()
+            for report in reports:
+                print(format_report(report))
+        else:
+            manager.run_forever(args.poll)
+    except ValueError as e:
+        print(f"오류: {str(e)}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""한글 자모 단위 입력 비교
+
+한글 음절 11,172자를 자판 입력 순서의 자모(호환 자모)로 분해한 표를 미리 만들어 두고,
+입력 정규화(NFC/NFD, 낱자모 조합)와 조합 중인 글자의 부분 일치 판정에 사용합니다.
+같은 표를 `static/hangul_tables.js`로 생성하여 브라우저의 실시간 체크에서도 사용합니다::
+
+    python hangul.py --js static/hangul_tables.js
+"""
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from typing import Dict, List, Optional
+
+SYLLABLE_BASE, SYLLABLE_COUNT = 0xAC00, 11172
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 두 번 눌러 입력하는 겹모음/겹받침 (쌍자음은 Shift로 한 번에 입력하므로 나누지 않음)
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+VOWELS = frozenset(JUNGSEONG)
+
+
+def _keys(jamo: str) -> str:
+    return COMPOUND_JAMO.get(jamo, jamo)
+
+
+# 음절 번호 → 자판 입력 순서의 자모 문자열 (예: '값' → 'ㄱㅏㅂㅅ')
+SYLLABLE_KEYS: List[str] = [
+    _keys(CHOSEONG[index // 588]) + _keys(JUNGSEONG[index // 28 % 21]) + _keys(JONGSEONG[index % 28])
+    for index in range(SYLLABLE_COUNT)
+]
+# 자모 문자열 → 음절
+COMPOSE: Dict[str, str] = {keys: chr(SYLLABLE_BASE + index) for index, keys in enumerate(SYLLABLE_KEYS)}
+
+# 조합형 자모(U+1100대) → 호환 자모. NFC로 합쳐지지 않고 남은 낱자모에 사용합니다
+_CONJOINING = {
+    **{0x1100 + i: jamo for i, jamo in enumerate(CHOSEONG)},
+    **{0x1161 + i: jamo for i, jamo in enumerate(JUNGSEONG)},
+    **{0x11A8 + i: jamo for i, jamo in enumerate(JONGSEONG[1:])},
+}
+# str.translate 한 번으로 자모 문자열을 만드는 표
+_KEY_TABLE = {
+    **{SYLLABLE_BASE + index: keys for index, keys in enumerate(SYLLABLE_KEYS)},
+    **{code: _keys(jamo) for code, jamo in _CONJOINING.items()},
+    **{ord(jamo): keys for jamo, keys in COMPOUND_JAMO.items()},
+}
+_JAMO_RUN = re.compile('[ㄱ-ㆎᄀ-ᇿ]')
+_SPACES = re.compile(r'\s+')
+
+
+def to_keys(text: str) -> str:
+    """텍스트를 자판 입력 순서의 자모 문자열로 변환합니다. 한글이 아닌 글자는 그대로 둡니다."""
+    return unicodedata.normalize('NFC', text).translate(_KEY_TABLE)
+
+
+def compose(keys: str) -> str:
+    """자모 문자열을 입력기처럼 음절로 조합합니다.
+
+    받침 뒤에 모음이 오면 받침을 다음 음절의 초성으로 넘깁니다 ('ㅇㅏㄴㅣ' → '아니').
+    """
+    result = []
+    i, length = 0, len(keys)
+    while i < length:
+        for size in range(min(5, length - i), 1, -1):
+            syllable = COMPOSE.get(keys[i:i + size])
+            if syllable and not (i + size < length and keys[i + size] in VOWELS):
+                result.append(syllable)
+                i += size
+                break
+        else:
+            result.append(keys[i])
+            i += 1
+    return ''.join(result)
+
+
+def normalize(text: str) -> str:
+    """입력기마다 다른 한글 표현(NFD, 조합형/호환 낱자모)을 완성형 음절로 통일하고 공백을 정리합니다."""
+    text = _SPACES.sub(' ', unicodedata.normalize('NFC', text).strip())
+    if not _JAMO_RUN.search(text):
+        return text
+    return ' '.join(compose(to_keys(word)) for word in text.split(' '))
+
+
+def is_partial(typed: str, target: str) -> bool:
+    """입력 중인 단어가 목표 단어의 자모 단위 앞부분인지 확인합니다 ('아' → '안', '안' → '아니')."""
+    return to_keys(target).startswith(to_keys(typed))
+
+
+def word_states(input_text: str, target_text: str, composing: Optional[bool] = None) -> List[str]:
+    """목표 문장의 단어별 상태('correct', 'partial', 'incorrect', '')를 반환합니다.
+
+    마지막 입력 단어는 입력이 공백으로 끝나지 않았다면 조합 중으로 보고 부분 일치를 허용합니다.
+    """
+    if composing is None:
+        composing = bool(input_text) and not input_text[-1].isspace()
+    typed_words = normalize(input_text).split()
+    target_words = target_text.split()
+    states = [""] * len(target_words)
+    for i, (typed, target) in enumerate(zip(typed_words, target_words)):
+        typed_keys, target_keys = to_keys(typed), to_keys(target)
+        if typed_keys == target_keys:
+            states[i] = "correct"
+        elif composing and i == len(typed_words) - 1 and target_keys.startswith(typed_keys):
+            states[i] = "partial"
+        else:
+            states[i] = "incorrect"
+    return states
+
+
+def char_states(input_text: str, target_text: str, composing: Optional[bool] = None) -> List[str]:
+    """목표 문장의 글자별 상태('correct', 'partial', 'incorrect', '')를 반환합니다.
+
+    마지막 입력 글자는 조합 중이면 다음 글자의 초성으로 넘어갈 받침까지 부분 일치로 봅니다 ('안' → '아니').
+    """
+    if composing is None:
+        composing = bool(input_text) and not input_text[-1].isspace()
+    typed = unicodedata.normalize('NFC', input_text)
+    if _JAMO_RUN.search(typed):
+        typed = compose(to_keys(typed))
+    states = [""] * len(target_text)
+    last = len(typed) - 1
+    for i, (typed_char, target_char) in enumerate(zip(typed, target_text)):
+        if typed_char == target_char:
+            states[i] = "correct"
+        elif composing and i == last and to_keys(target_text[i:i + 2]).startswith(to_keys(typed_char)):
+            states[i] = "partial"
+        else:
+            states[i] = "incorrect"
+    return states
+
+
+def javascript_tables() -> str:
+    """브라우저용 자모 표 스크립트를 생성합니다."""
+    tables = {
+        "base": SYLLABLE_BASE,
+        "count": SYLLABLE_COUNT,
+        "choseong": [_keys(jamo) for jamo in CHOSEONG],
+        "jungseong": [_keys(jamo) for jamo in JUNGSEONG],
+        "jongseong": [_keys(jamo) for jamo in JONGSEONG],
+        "compound": COMPOUND_JAMO,
+        "conjoining": {str(code): _keys(jamo) for code, jamo in _CONJOINING.items()},
+    }
+    return (
+        "// hangul.py로 생성한 파일입니다. 직접 수정하지 마세요.\n"
+        f"const HANGUL_TABLES = {json.dumps(tables, ensure_ascii=False, separators=(',', ':'))};\n"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="한글 자모 표 생성/확인")
+    parser.add_argument("--js", help="브라우저용 자모 표를 이 경로에 생성")
+    parser.add_argument("text", nargs="*", help="자모로 분해해 볼 텍스트")
+    args = parser.parse_args(argv)
+    if args.js:
+        with open(args.js, 'w', encoding='utf-8') as f:
+            f.write(javascript_tables())
+        print(f"생성 완료: {args.js}")
+    for text in args.text:
+        print(f"{text} → {to_keys(text)} → {compose(to_keys(text))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
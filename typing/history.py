@@ -0,0 +1,181 @@
+"""사용자별 타자 기록 추이 (장기 기록 차트)
+
+문장 세트를 마칠 때마다 WPM/CPM/정확도를 SQLite 파일에 한 줄씩 기록하고, 같은 트랜잭션에서
+일/주 단위 집계(개수, 합계, 최소, 최대)도 갱신합니다. 차트용 데이터는 기간 안의 기록 수에 따라
+
+- ``max_points`` 이하: 기록 그대로
+- ``lttb_max_input`` 이하: 기록을 LTTB(Largest-Triangle-Three-Buckets)로 줄임
+- 그보다 많으면: 일 또는 주 단위 집계 (구간 수가 ``max_points``를 넘으면 다시 LTTB)
+
+로 만들므로 기록이 아무리 많아도 ``max_points``개 이하의 점만 브라우저로 보냅니다::
+
+    python history.py USER_ID --metric wpm --days 365
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from config import HISTORY_CONFIG
+
+METRICS = ("wpm", "cpm", "accuracy")
+DAY = 86400
+WEEK = 7 * DAY
+# 1970-01-01은 목요일이므로 주 단위 구간은 1969-12-29(월요일)을 기준으로 나눕니다
+PERIOD_ORIGINS = {DAY: 0, WEEK: -3 * DAY}
+PERIOD_NAMES = {DAY: "day", WEEK: "week"}
+
+
+class SeriesPoint(NamedTuple):
+    """차트의 점 하나. 집계 구간이면 value는 평균, low/high는 구간 안의 최소/최대입니다."""
+    ts: float
+    value: float
+    low: float
+    high: float
+
+
+def bucket_start(ts: float, period: int, utc_offset: float = HISTORY_CONFIG["utc_offset"]) -> float:
+    """기록 시각이 속한 일/주 구간의 시작 시각 (utc_offset 시간대의 자정 기준)"""
+    origin = PERIOD_ORIGINS[period] - utc_offset
+    return (ts - origin) // period * period + origin
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """모양을 유지하며 threshold개의 점을 고르고 고른 점의 위치를 반환합니다.
+
+    첫 점과 마지막 점은 항상 남기고, 나머지는 구간마다 앞에서 고른 점, 다음 구간의 평균점과
+    만드는 삼각형이 가장 큰 점을 고릅니다.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    selected = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+        ax, ay = xs[a], ys[a]
+        best, best_area = next_start - 1, -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def downsample(points: List[SeriesPoint], max_points: int) -> List[SeriesPoint]:
+    """점이 max_points개를 넘으면 LTTB로 줄입니다."""
+    if len(points) <= max_points:
+        return points
+    chosen = lttb([p.ts for p in points], [p.value for p in points], max_points)
+    return [points[i] for i in chosen]
+
+
+class HistoryStore:
+    """사용자별 기록과 일/주 집계를 SQLite 파일에 보관하는 클래스 (여러 스레드에서 사용 가능)"""
+    def __init__(self, path: str = HISTORY_CONFIG["path"]):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history (user TEXT NOT NULL, ts REAL NOT NULL, "
+                "wpm REAL NOT NULL, cpm REAL NOT NULL, accuracy REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS history_user_ts ON history (user, ts)")
+            columns = ', '.join(f"{m}_sum REAL NOT NULL, {m}_min REAL NOT NULL, {m}_max REAL NOT NULL"
+                                for m in METRICS)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollups (user TEXT NOT NULL, period INTEGER NOT NULL, "
+                f"bucket REAL NOT NULL, count INTEGER NOT NULL, {columns}, PRIMARY KEY (user, period, bucket))"
+            )
+
+    def record(self, user: str, stats: Dict[str, float], ts: Optional[float] = None) -> None:
+        """문장 세트 하나의 통계(TypingStats.to_dict())를 기록하고 일/주 집계를 갱신합니다."""
+        ts = time.time() if ts is None else ts
+        values = {m: float(stats.get(m, 0.0)) for m in METRICS}
+        updates = ', '.join(f"{m}_sum = {m}_sum + excluded.{m}_sum, {m}_min = min({m}_min, excluded.{m}_min), "
+                            f"{m}_max = max({m}_max, excluded.{m}_max)" for m in METRICS)
+        rollup_values = [values[m] for m in METRICS for _ in range(3)]
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO history (user, ts, wpm, cpm, accuracy) VALUES (?, ?, ?, ?, ?)",
+                               (user, ts, values["wpm"], values["cpm"], values["accuracy"]))
+            for period in (DAY, WEEK):
+                self._conn.execute(
+                    f"INSERT INTO rollups VALUES (?, ?, ?, 1, {', '.join('?' * len(rollup_values))}) "
+                    f"ON CONFLICT (user, period, bucket) DO UPDATE SET count = count + 1, {updates}",
+                    (user, period, bucket_start(ts, period), *rollup_values))
+
+    def count(self, user: str, start: float = 0.0, end: float = float('inf')) -> int:
+        """기간 안의 기록 수의 상한. 기록 대신 일 단위 집계를 더하므로 기록이 많아도 빠릅니다."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM rollups WHERE user = ? AND period = ? AND bucket BETWEEN ? AND ?",
+                (user, DAY, bucket_start(start, DAY), end)).fetchone()[0]
+
+    def series(self, user: str, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+               max_points: int = HISTORY_CONFIG["max_points"]) -> Tuple[str, List[SeriesPoint]]:
+        """기간 안의 기록을 차트용으로 최대 max_points개의 점으로 만들어 (해상도, 점 목록)을 반환합니다.
+
+        해상도는 "raw"(기록 그대로), "lttb"(기록을 줄임), "day"/"week"(집계 구간 평균) 중 하나입니다.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"지원하지 않는 지표입니다: {metric}")
+        start = 0.0 if start is None else start
+        end = float('inf') if end is None else end
+        if self.count(user, start, end) <= HISTORY_CONFIG["lttb_max_input"]:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT ts, {metric} FROM history WHERE user = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (user, start, end)).fetchall()
+            points = [SeriesPoint(ts, value, value, value) for ts, value in rows]
+            return ("raw" if len(points) <= max_points else "lttb"), downsample(points, max_points)
+
+        with self._lock:
+            for period in (DAY, WEEK):
+                buckets = self._conn.execute(
+                    "SELECT COUNT(*) FROM rollups WHERE user = ? AND period = ? AND bucket BETWEEN ? AND ?",
+                    (user, period, bucket_start(start, period), end)).fetchone()[0]
+                if buckets <= max_points:
+                    break
+            rows = self._conn.execute(
+                f"SELECT bucket, {metric}_sum / count, {metric}_min, {metric}_max FROM rollups "
+                "WHERE user = ? AND period = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                (user, period, bucket_start(start, period), end)).fetchall()
+        return PERIOD_NAMES[period], downsample([SeriesPoint(*row) for row in rows], max_points)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="사용자별 기록 추이를 차트용 점으로 출력합니다.")
+    parser.add_argument("user", help="사용자(세션) ID")
+    parser.add_argument("--metric", choices=METRICS, default="wpm", help="지표")
+    parser.add_argument("--days", type=float, default=None, help="최근 며칠 (기본값: 전체)")
+    parser.add_argument("--max-points", type=int, default=HISTORY_CONFIG["max_points"], help="최대 점 수")
+    parser.add_argument("--db", default=HISTORY_CONFIG["path"], help="기록 파일")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    start = time.time() - args.days * DAY if args.days else None
+    resolution, points = store.series(args.user, args.metric, start=start, max_points=args.max_points)
+    store.close()
+    print(f"{len(points)}개 점 ({resolution})")
+    for point in points:
+        day = time.strftime('%Y-%m-%d %H:%M', time.localtime(point.ts))
+        band = f" ({point.low:.1f}~{point.high:.1f})" if point.low != point.high else ""
+        print(f"{day}  {point.value:.1f}{band}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""Streamlit 실행 스레드 밖에서 돌리는 백그라운드 작업 대기열
+
+URL 내려받기, 큰 파일 읽기, AI 문장 생성처럼 오래 걸리는 일은 크기가 정해진 스레드 풀에서,
+HTML 파싱처럼 CPU를 많이 쓰는 일은 프로세스 풀에서 실행하여 다른 사용자의 실행과 GIL을 다투지 않게 합니다.
+``submit``은 바로 ``Job`` 핸들을 반환하며, 화면은 핸들의 상태와 진행률을 주기적으로 읽고 취소할 수 있습니다.
+사용자(세션)마다 끝나지 않은 작업 수를 제한하여 한 사용자가 풀을 독차지하지 못하게 합니다.
+
+작업 함수는 첫 인자로 ``Job``을 받아 ``job.report``/``job.track``으로 진행 상황을 알리고,
+취소되면 그 자리에서 ``JobCancelled``가 발생합니다. 결과를 한꺼번에 반환하는 대신 ``job.emit``으로
+하나씩 넘기면 화면은 ``job.iter_items``로 작업이 끝나기 전부터 받아 쓸 수 있습니다.
+"""
+import concurrent.futures
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from config import INGEST_CONFIG, JOBS_CONFIG
+from dedup import NearDuplicateFilter
+from metrics import JOB_SECONDS, JOBS_ACTIVE, JOBS_FINISHED
+
+
+class JobCancelled(Exception):
+    """작업이 취소되었을 때 작업 함수 안에서 발생하는 예외"""
+
+
+class Job:
+    """작업 핸들. status는 queued, running, done, failed, cancelled 중 하나입니다."""
+    def __init__(self, queue: 'JobQueue', user: str, kind: str):
+        self.id = uuid.uuid4().hex
+        self.user = user
+        self.kind = kind
+        self.status = "queued"
+        self.progress: Optional[float] = None    # 0~1, 알 수 없으면 None
+        self.message = ""
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.created = time.monotonic()
+        self._queue = queue
+        self._cancel = threading.Event()
+        self._future: Optional[concurrent.futures.Future] = None
+        self._items: List[Any] = []
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """작업을 취소합니다. 아직 시작하지 않았으면 바로 끝내고, 실행 중이면 다음 진행 보고 때 멈춥니다."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._queue._finish(self, "cancelled")
+
+    def report(self, progress: Optional[float] = None, message: Optional[str] = None) -> None:
+        """작업 함수에서 진행 상황을 알립니다. 취소되었으면 JobCancelled를 발생시킵니다."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        if progress is not None:
+            self.progress = min(max(progress, 0.0), 1.0)
+        if message is not None:
+            self.message = message
+
+    def emit(self, item: Any) -> None:
+        """작업 함수에서 결과 항목 하나를 넘깁니다. 취소되었으면 JobCancelled를 발생시킵니다."""
+        self.report()
+        with self._changed:
+            self._items.append(item)
+            self._changed.notify_all()
+
+    @property
+    def emitted(self) -> int:
+        """지금까지 넘긴 항목 수"""
+        return len(self._items)
+
+    def iter_items(self) -> Iterator[Any]:
+        """넘긴 항목을 나오는 대로 반환하고 작업이 끝나면 멈춥니다. 중간에 그만 읽으면 작업을 취소합니다."""
+        index = 0
+        try:
+            while True:
+                with self._changed:
+                    self._changed.wait_for(lambda: len(self._items) > index or self.done)
+                    items, finished = self._items[index:], self.done
+                index += len(items)
+                yield from items
+                if finished:
+                    break
+            if self.status == "failed":
+                raise self.error
+        finally:
+            if not self.done:
+                self.cancel()
+
+    def _notify(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    def track(self, items: Iterable[Any], total: Optional[int] = None, message: str = "",
+              every: int = JOBS_CONFIG["report_every"]) -> Iterator[Any]:
+        """items를 그대로 반환하면서 every개마다 진행 상황을 알리고 취소를 확인합니다."""
+        count = 0
+        for item in items:
+            count += 1
+            if count % every == 0:
+                self.report(count / total if total else None, f"{message} {count:,}개".strip())
+            yield item
+
+    def run_cpu(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """CPU를 많이 쓰는 함수를 프로세스 풀에서 실행하고 결과를 기다립니다. 기다리는 동안 취소를 확인합니다.
+
+        fn과 인자는 다른 프로세스로 보내므로 모듈 최상위 함수와 pickle할 수 있는 값이어야 합니다.
+        """
+        return self._queue._run_cpu(self, fn, args)
+
+
+class JobQueue:
+    """I/O용 스레드 풀과 파싱용 프로세스 풀을 가진 작업 대기열 (여러 스레드에서 사용 가능)"""
+    def __init__(self, io_workers: int = JOBS_CONFIG["io_workers"], cpu_workers: int = JOBS_CONFIG["cpu_workers"],
+                 per_user: int = JOBS_CONFIG["per_user"], max_pending: int = JOBS_CONFIG["max_pending"]):
+        self.cpu_workers = cpu_workers
+        self.per_user = per_user
+        self.max_pending = max_pending
+        self._io = concurrent.futures.ThreadPoolExecutor(io_workers, thread_name_prefix="typing-job")
+        self._cpu: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {}      # 사용자별 끝나지 않은 작업 수
+        self.pending = 0
+
+    def submit(self, user: str, kind: str, fn: Callable[..., Any], *args: Any) -> Job:
+        """작업을 대기열에 넣고 핸들을 반환합니다. 사용자별/전체 한도를 넘으면 ValueError를 발생시킵니다."""
+        with self._lock:
+            if self._active.get(user, 0) >= self.per_user:
+                raise ValueError("이미 진행 중인 작업이 있습니다. 끝나거나 취소한 뒤 다시 시도해주세요.")
+            if self.pending >= self.max_pending:
+                raise ValueError("서버가 바쁩니다. 잠시 후 다시 시도해주세요.")
+            self._active[user] = self._active.get(user, 0) + 1
+            self.pending += 1
+        JOBS_ACTIVE.inc()
+        job = Job(self, user, kind)
+        job._future = self._io.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple) -> None:
+        if job.cancelled:
+            self._finish(job, "cancelled")
+            return
+        job.status = "running"
+        try:
+            result = fn(job, *args)
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = e
+            self._finish(job, "failed")
+        else:
+            if job.cancelled:
+                self._finish(job, "cancelled")
+            else:
+                job.result = result
+                job.progress = 1.0
+                self._finish(job, "done")
+
+    def _finish(self, job: Job, status: str) -> None:
+        with self._lock:
+            if job.done:
+                return
+            job.status = status
+            self.pending -= 1
+            remaining = self._active[job.user] - 1
+            if remaining:
+                self._active[job.user] = remaining
+            else:
+                del self._active[job.user]
+        job._notify()
+        JOBS_ACTIVE.dec()
+        JOBS_FINISHED.inc(kind=job.kind, status=status)
+        JOB_SECONDS.observe(time.monotonic() - job.created, kind=job.kind)
+
+    def _cpu_pool(self) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        with self._lock:
+            if self._cpu is None and self.cpu_workers > 0:
+                # 스레드가 많은 Streamlit/ASGI 프로세스를 fork하지 않도록 spawn으로 시작합니다
+                context = multiprocessing.get_context(JOBS_CONFIG["start_method"])
+                self._cpu = concurrent.futures.ProcessPoolExecutor(self.cpu_workers, mp_context=context)
+            return self._cpu
+
+    def _run_cpu(self, job: Job, fn: Callable[..., Any], args: tuple) -> Any:
+        pool = self._cpu_pool()
+        if pool is None:
+            job.report()
+            return fn(*args)
+        future = pool.submit(fn, *args)
+        while True:
+            try:
+                return future.result(timeout=JOBS_CONFIG["cancel_check_interval"])
+            except concurrent.futures.TimeoutError:
+                if job.cancelled:
+                    future.cancel()
+                    raise JobCancelled()
+            except BrokenProcessPool:
+                # 작업 프로세스가 죽었으면 다음 작업 때 풀을 새로 만듭니다
+                with self._lock:
+                    if self._cpu is pool:
+                        self._cpu = None
+                raise ValueError("문장 처리 프로세스가 비정상 종료되었습니다. 다시 시도해주세요.")
+
+    def active(self, user: str) -> int:
+        """사용자의 끝나지 않은 작업 수"""
+        with self._lock:
+            return self._active.get(user, 0)
+
+    def shutdown(self) -> None:
+        self._io.shutdown(wait=False, cancel_futures=True)
+        if self._cpu is not None:
+            self._cpu.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_html_sentences(html: str, max_sentences: int = INGEST_CONFIG["max_sentences"]) -> Tuple[List[str], int]:
+    """HTML 문서를 문장 목록으로 만들고, 문장 목록과 제외한 유사 중복 문장 수를 반환합니다. (프로세스 풀에서 실행)"""
+    from url_processor import URLProcessor
+    dedup_filter = URLProcessor.create_dedup_filter()
+    sentences = list(islice(URLProcessor.iter_sentences_from_html([html], dedup_filter), max_sentences))
+    return sentences, dedup_filter.dropped
+
+
+def stream_url_sentences(job: Job, url: str, dedup_filter: Optional[NearDuplicateFilter] = None) -> int:
+    """URL 문서를 내려받는 대로 이 스레드에서 파싱하여 문장을 하나씩 넘기고 넘긴 문장 수를 반환합니다.
+
+    첫 문단이 끝나면 바로 연습을 시작할 수 있지만, 파싱하는 동안 같은 프로세스의 다른 실행과 GIL을 다툽니다.
+    제외한 유사 중복 문장 수는 dedup_filter.dropped로 작업이 끝나기 전부터 읽을 수 있습니다.
+    """
+    from url_processor import URLProcessor
+    sentences = islice(URLProcessor.iter_sentences_from_url(url, dedup_filter), INGEST_CONFIG["max_sentences"])
+    for sentence in job.track(sentences, message="불러온 문장"):
+        job.emit(sentence)
+    return job.emitted
+
+
+def fetch_url_sentences(job: Job, url: str) -> Tuple[List[str], int]:
+    """URL 문서를 이 스레드에서 모두 내려받고, 파싱은 프로세스 풀에 맡깁니다. (문장 목록, 제외한 유사 중복 문장 수)를 반환합니다.
+
+    다른 실행과 GIL을 다투지 않지만 문서를 모두 내려받아 파싱할 때까지 연습을 시작할 수 없습니다.
+    """
+    from url_processor import URLProcessor
+    chunks, size = [], 0
+    for chunk in URLProcessor.iter_url_chunks(url):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > JOBS_CONFIG["max_document_chars"]:
+            raise ValueError("문서가 너무 큽니다.")
+        job.report(message=f"내려받는 중... {size // 1024:,} KB")
+    job.report(message="문장을 추출하는 중...")
+    return job.run_cpu(parse_html_sentences, ''.join(chunks))
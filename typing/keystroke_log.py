@@ -0,0 +1,526 @@
+"""키 입력 기록 파일 쓰기/읽기, 분석, 재생
+
+파일 구조::
+
+    MAGIC(8바이트) | 기준 시각(epoch ms, 8바이트) | 레코드 | 레코드 | ...
+
+레코드는 모두 varint 두 개(헤더, 값)로 이루어집니다::
+
+    헤더 = (시간 << 3) | 종류
+    KEY       시간: 직전 레코드와의 간격(ms)   값: 입력한 글자 코드
+    BACKSPACE 시간: 직전 레코드와의 간격(ms)   값: 0
+    SENTENCE  시간: 기준 시각으로부터의 ms      값: 문장 번호      (문장 시작 표시)
+    TARGET    시간: 0                          값: 목표 문장의 글자 코드 (SENTENCE 바로 뒤에 글자 수만큼)
+    END       시간: 직전 레코드와의 간격(ms)   값: 0             (문장 제출 표시)
+
+글자 코드는 ASCII와 한글 완성형 음절이 varint 1~2바이트가 되도록 배치합니다.
+모든 레코드가 varint 두 개이므로 NumPy로 파일 전체를 한 번에 디코딩할 수 있으며,
+추가 기록만 하므로 쓰던 중 중단되어도 마지막 불완전한 레코드만 버리면 됩니다.
+(읽을 때는 무시하고, 이어 쓸 때는 잘라낸 뒤 씁니다)
+"""
+import argparse
+import mmap
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from config import KEYLOG_CONFIG
+
+try:
+    import numpy as np
+except ImportError:  # 분석 기능에만 필요합니다
+    np = None
+
+MAGIC = b'TYPKEYS1'
+HEADER = struct.Struct('<8sQ')
+
+KEY, BACKSPACE, SENTENCE, TARGET, END = range(5)
+KIND_BITS = 3
+# varint의 이어지는 바이트 (이 바이트를 지우면 varint 끝 바이트만 남음)
+CONTINUATION_BYTES = bytes(range(0x80, 0x100))
+
+HANGUL_BASE, HANGUL_COUNT = 0xAC00, 11172
+OTHER_OFFSET = 128 + HANGUL_COUNT
+
+
+def encode_char(char: str) -> int:
+    """글자를 코드로 변환합니다. ASCII는 1바이트, 한글 음절은 2바이트 varint가 됩니다."""
+    code = ord(char)
+    if code < 128:
+        return code
+    if HANGUL_BASE <= code < HANGUL_BASE + HANGUL_COUNT:
+        return 128 + code - HANGUL_BASE
+    return OTHER_OFFSET + code
+
+
+def decode_char(value: int) -> str:
+    """코드를 글자로 변환합니다."""
+    if value < 128:
+        return chr(value)
+    if value < OTHER_OFFSET:
+        return chr(HANGUL_BASE + value - 128)
+    return chr(value - OTHER_OFFSET)
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """0 이상의 정수를 LEB128 varint로 추가합니다."""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def complete_size(f: BinaryIO, chunk_size: int = 1 << 16) -> int:
+    """기록 파일에서 마지막 완전한 레코드(varint 두 개)가 끝나는 위치를 반환합니다."""
+    f.seek(HEADER.size)
+    ends = 0
+    for chunk in iter(lambda: f.read(chunk_size), b''):
+        ends += len(chunk.translate(None, CONTINUATION_BYTES))
+    # 짝이 없는 마지막 varint는 건너뛰고, 그 앞의 varint 끝 바이트를 뒤에서부터 찾습니다
+    skip = ends % 2
+    position = f.seek(0, 2)
+    while position > HEADER.size:
+        start = max(HEADER.size, position - chunk_size)
+        f.seek(start)
+        block = f.read(position - start)
+        for i in range(len(block) - 1, -1, -1):
+            if block[i] < 0x80:
+                if not skip:
+                    return start + i + 1
+                skip -= 1
+        position = start
+    return HEADER.size
+
+
+class KeystrokeWriter:
+    """키 입력 기록 파일에 레코드를 추가하는 클래스"""
+    def __init__(self, path: Union[str, Path], buffer_bytes: int = KEYLOG_CONFIG["buffer_bytes"],
+                 base_ms: Optional[int] = None):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        if path.exists() and path.stat().st_size >= HEADER.size:
+            with open(path, 'rb') as f:
+                magic, self.base_ms = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("키 입력 기록 파일 형식이 아닙니다.")
+            # 쓰던 중 중단된 불완전한 레코드 뒤에 이어 쓰면 이후 레코드가 모두 어긋나므로 잘라냅니다
+            self._file = open(path, 'r+b')
+            self._file.truncate(complete_size(self._file))
+            self._file.seek(0, 2)
+        else:
+            self.base_ms = now_ms() if base_ms is None else int(base_ms)
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, self.base_ms))
+        self._buffer = bytearray()
+        self.last_ms: Optional[int] = None    # 마지막 레코드 시각, 문장이 시작되지 않았으면 None
+        self.typed = ""
+
+    def _record(self, kind: int, timestamp_ms: Optional[int], value: int = 0) -> None:
+        if self.last_ms is None:
+            raise ValueError("begin_sentence를 먼저 호출해야 합니다.")
+        timestamp_ms = now_ms() if timestamp_ms is None else int(timestamp_ms)
+        delta = max(0, timestamp_ms - self.last_ms)
+        self.last_ms += delta
+        write_varint(self._buffer, (delta << KIND_BITS) | kind)
+        write_varint(self._buffer, value)
+
+    def begin_sentence(self, index: int, sentence: str, timestamp_ms: Optional[int] = None) -> None:
+        """새 문장의 시작을 기록합니다."""
+        timestamp_ms = now_ms() if timestamp_ms is None else int(timestamp_ms)
+        # 기준 시각보다 이른 시각(시계가 다른 클라이언트)은 기준 시각으로 기록하되, 간격은 원래 시각으로 계산합니다
+        self.last_ms = timestamp_ms
+        write_varint(self._buffer, (max(0, timestamp_ms - self.base_ms) << KIND_BITS) | SENTENCE)
+        write_varint(self._buffer, index)
+        for char in sentence:
+            write_varint(self._buffer, TARGET)
+            write_varint(self._buffer, encode_char(char))
+        self.typed = ""
+        self._maybe_flush()
+
+    def key(self, char: str, timestamp_ms: Optional[int] = None) -> None:
+        """글자 하나의 입력을 기록합니다."""
+        self._record(KEY, timestamp_ms, encode_char(char))
+        self.typed += char
+
+    def backspace(self, timestamp_ms: Optional[int] = None) -> None:
+        """글자 하나의 삭제를 기록합니다. 지울 글자가 없으면 무시합니다."""
+        if self.typed:
+            self._record(BACKSPACE, timestamp_ms)
+            self.typed = self.typed[:-1]
+
+    def record_input(self, text: str, timestamp_ms: Optional[int] = None) -> None:
+        """입력창의 현재 값을 받아 직전 값과의 차이를 삭제/입력 레코드로 기록합니다.
+
+        한글 조합 중에는 마지막 글자가 바뀌므로 같은 시각의 삭제 + 입력으로 기록됩니다.
+        """
+        common = 0
+        for old, new in zip(self.typed, text):
+            if old != new:
+                break
+            common += 1
+        for _ in range(len(self.typed) - common):
+            self.backspace(timestamp_ms)
+        for char in text[common:]:
+            self.key(char, timestamp_ms)
+        self._maybe_flush()
+
+    def end_sentence(self, timestamp_ms: Optional[int] = None) -> None:
+        """문장 제출을 기록하고 파일에 씁니다."""
+        self._record(END, timestamp_ms)
+        self.last_ms = None
+        self.flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """모인 레코드를 파일에 씁니다."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'KeystrokeWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class KeyEvent(NamedTuple):
+    time_ms: int        # epoch ms
+    kind: int
+    char: str
+    sentence: int       # 파일 안에서 몇 번째 문장 구간인지 (0부터)
+    sentence_index: int  # 연습 세트 안의 문장 번호 (SENTENCE 레코드의 값)
+
+
+class KeystrokeArrays(NamedTuple):
+    """파일 전체를 디코딩한 NumPy 배열"""
+    times: Any          # int64, epoch ms
+    kinds: Any          # uint8
+    values: Any         # int64, 글자 코드 또는 문장 번호
+    segments: Any       # int64, 문장 구간 번호
+    positions: Any      # int64, 입력 후 커서 위치
+    targets: Any        # int64, 모든 목표 문장의 글자 코드
+    target_offsets: Any  # int64, 구간별 targets 시작 위치
+    target_lengths: Any  # int64, 구간별 목표 문장 길이
+
+
+class KeystrokeLog:
+    """키 입력 기록 파일을 메모리 맵으로 읽는 클래스"""
+    def __init__(self, path: Union[str, Path]):
+        self._file = open(path, 'rb')
+        size = Path(path).stat().st_size
+        if size < HEADER.size:
+            self._file.close()
+            raise ValueError("키 입력 기록 파일이 너무 짧습니다.")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.base_ms = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("키 입력 기록 파일 형식이 아닙니다.")
+
+    @property
+    def data_size(self) -> int:
+        return len(self._mmap) - HEADER.size
+
+    def iter_records(self) -> Iterator[Tuple[int, int]]:
+        """(헤더, 값) 쌍을 순서대로 반환합니다. 마지막 불완전한 레코드는 무시합니다."""
+        pending: Optional[int] = None
+        value = shift = 0
+        for byte in self._iter_bytes():
+            value |= (byte & 0x7F) << shift
+            if byte & 0x80:
+                shift += 7
+                continue
+            if pending is None:
+                pending = value
+            else:
+                yield pending, value
+                pending = None
+            value = shift = 0
+
+    def _iter_bytes(self, chunk_size: int = 1 << 16) -> Iterator[int]:
+        """메모리 맵을 조각씩 복사해 읽습니다. 반복 도중 파일을 닫아도 문제가 없습니다."""
+        for offset in range(HEADER.size, len(self._mmap), chunk_size):
+            yield from self._mmap[offset:offset + chunk_size]
+
+    def iter_events(self) -> Iterator[KeyEvent]:
+        """레코드를 절대 시각이 붙은 이벤트로 변환합니다. (NumPy 없이 동작)"""
+        current_ms = self.base_ms
+        segment, sentence_index = -1, -1
+        for header, value in self.iter_records():
+            kind, amount = header & 7, header >> KIND_BITS
+            if kind == SENTENCE:
+                current_ms = self.base_ms + amount
+                segment += 1
+                sentence_index = value
+                yield KeyEvent(current_ms, kind, "", segment, sentence_index)
+                continue
+            if segment < 0:
+                continue
+            current_ms += amount
+            char = decode_char(value) if kind in (KEY, TARGET) else ""
+            yield KeyEvent(current_ms, kind, char, segment, sentence_index)
+
+    def arrays(self) -> KeystrokeArrays:
+        """파일 전체를 NumPy로 한 번에 디코딩합니다."""
+        if np is None:
+            raise ImportError("키 입력 분석에는 numpy가 필요합니다: pip install numpy")
+        raw = np.frombuffer(self._mmap, dtype=np.uint8, offset=HEADER.size)
+        ends = np.flatnonzero(raw < 0x80)
+        # varint 두 개 단위로 자르고, 마지막 불완전한 레코드는 버립니다
+        ends = ends[:len(ends) - len(ends) % 2]
+        if len(ends) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return KeystrokeArrays(empty, empty.astype(np.uint8), empty, empty, empty, empty, empty, empty)
+        raw = raw[:ends[-1] + 1]
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        shifts = (np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)) * 7
+        varints = np.add.reduceat((raw & 0x7F).astype(np.uint64) << shifts.astype(np.uint64), starts)
+        headers, values = varints[0::2].astype(np.int64), varints[1::2].astype(np.int64)
+
+        kinds = (headers & 7).astype(np.uint8)
+        amounts = headers >> KIND_BITS
+        markers = kinds == SENTENCE
+        # 문장 시작 전 레코드(정상 파일에는 없음)는 버립니다
+        if markers.any():
+            first = int(np.argmax(markers))
+            kinds, amounts, values, markers = kinds[first:], amounts[first:], values[first:], markers[first:]
+        else:
+            kinds, amounts, values, markers = kinds[:0], amounts[:0], values[:0], markers[:0]
+
+        # 구간마다 SENTENCE의 절대 시각에서 시작하는 누적합
+        steps = np.where(markers, 0, amounts)
+        cumulative = np.cumsum(steps)
+        marker_index = np.maximum.accumulate(np.where(markers, np.arange(len(kinds)), 0))
+        times = self.base_ms + cumulative + (amounts - cumulative)[marker_index]
+
+        segments = np.cumsum(markers) - 1
+        moves = np.where(kinds == KEY, 1, np.where(kinds == BACKSPACE, -1, 0))
+        moved = np.cumsum(moves)
+        positions = moved - moved[marker_index]
+
+        is_target = kinds == TARGET
+        targets = values[is_target]
+        target_counts = np.cumsum(is_target)
+        target_offsets = target_counts[markers] - is_target[markers]
+        target_lengths = np.bincount(segments[is_target], minlength=int(markers.sum()))
+        return KeystrokeArrays(times, kinds, values, segments, positions,
+                               targets, target_offsets, target_lengths)
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'KeystrokeLog':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _final_keys(arrays: KeystrokeArrays) -> Any:
+    """한글 조합 중간 상태(같은 시각의 삭제 + 입력으로 바로 바뀐 글자)를 제외한 KEY 이벤트 위치를 반환합니다."""
+    kinds, times = arrays.kinds, arrays.times
+    superseded = np.zeros(len(kinds), dtype=bool)
+    superseded[:-2] = ((kinds[1:-1] == BACKSPACE) & (kinds[2:] == KEY) & (times[2:] == times[1:-1]))
+    return np.flatnonzero((kinds == KEY) & ~superseded)
+
+
+def _group_latencies(keys: Any, latencies: Any) -> List[Tuple[int, int, float, float]]:
+    """키별 (키, 횟수, 평균, 중앙값)을 계산합니다."""
+    if len(keys) == 0:
+        return []
+    order = np.lexsort((latencies, keys))
+    keys, latencies = keys[order], latencies[order]
+    unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    sums = np.add.reduceat(latencies, starts)
+    medians = latencies[starts + counts // 2]
+    return list(zip(unique.tolist(), counts.tolist(), (sums / counts).tolist(), medians.tolist()))
+
+
+def _input_latencies(arrays: KeystrokeArrays, max_latency_ms: int) -> Tuple[Any, Any]:
+    """KEY 이벤트별 직전 입력과의 간격을 계산합니다. 문장의 첫 입력과 긴 쉬는 시간은 제외합니다."""
+    kinds, times, segments = arrays.kinds, arrays.times, arrays.segments
+    typing = (kinds == KEY) | (kinds == BACKSPACE)
+    typing_index = np.flatnonzero(typing)
+    # 같은 시각의 입력 묶음(한글 조합의 삭제 + 입력)은 묶음 첫 레코드의 간격을 사용
+    gaps = np.diff(times[typing_index], prepend=times[typing_index[:1]] if len(typing_index) else times[:0])
+    same_segment = np.zeros(len(typing_index), dtype=bool)
+    same_segment[1:] = segments[typing_index[1:]] == segments[typing_index[:-1]]
+    group_start = np.ones(len(typing_index), dtype=bool)
+    group_start[1:] = (gaps[1:] > 0) | ~same_segment[1:]
+    group_index = np.maximum.accumulate(np.where(group_start, np.arange(len(typing_index)), 0))
+    latencies = gaps[group_index]
+    valid = same_segment[group_index] & (latencies <= max_latency_ms)
+    return typing_index[valid], latencies[valid]
+
+
+def key_latency(arrays: KeystrokeArrays, max_latency_ms: int = KEYLOG_CONFIG["max_latency_ms"]) -> List[Dict[str, Any]]:
+    """글자별 입력 간격(직전 입력으로부터의 시간)을 계산합니다. 느린 글자 순으로 정렬합니다."""
+    index, latencies = _input_latencies(arrays, max_latency_ms)
+    final = np.isin(index, _final_keys(arrays))
+    groups = _group_latencies(arrays.values[index[final]], latencies[final])
+    rows = [{"char": decode_char(code), "count": count, "mean_ms": round(mean, 1), "median_ms": median}
+            for code, count, mean, median in groups]
+    return sorted(rows, key=lambda row: row["mean_ms"], reverse=True)
+
+
+def digraph_timing(arrays: KeystrokeArrays, min_count: int = KEYLOG_CONFIG["min_digraph_count"],
+                   max_latency_ms: int = KEYLOG_CONFIG["max_latency_ms"]) -> List[Dict[str, Any]]:
+    """연속으로 입력한 두 글자 조합별 간격을 계산합니다. 느린 조합 순으로 정렬합니다."""
+    keys = _final_keys(arrays)
+    if len(keys) < 2:
+        return []
+    first, second = keys[:-1], keys[1:]
+    latencies = arrays.times[second] - arrays.times[first]
+    valid = (arrays.segments[first] == arrays.segments[second]) & (latencies <= max_latency_ms)
+    first, second, latencies = first[valid], second[valid], latencies[valid]
+    pairs = (arrays.values[first] << 32) | arrays.values[second]
+    rows = [{"digraph": decode_char(pair >> 32) + decode_char(pair & 0xFFFFFFFF), "count": count,
+             "mean_ms": round(mean, 1), "median_ms": median}
+            for pair, count, mean, median in _group_latencies(pairs, latencies) if count >= min_count]
+    return sorted(rows, key=lambda row: row["mean_ms"], reverse=True)
+
+
+def error_hotspots(arrays: KeystrokeArrays) -> List[Dict[str, Any]]:
+    """목표 글자별로 잘못 입력한 비율을 계산합니다. 틀린 횟수 순으로 정렬합니다."""
+    keys = _final_keys(arrays)
+    segments = arrays.segments[keys]
+    positions = arrays.positions[keys] - 1
+    inside = positions < arrays.target_lengths[segments]
+    keys, segments, positions = keys[inside], segments[inside], positions[inside]
+    expected = arrays.targets[arrays.target_offsets[segments] + positions]
+    wrong = arrays.values[keys] != expected
+    if len(expected) == 0:
+        return []
+    unique, inverse = np.unique(expected, return_inverse=True)
+    attempts = np.bincount(inverse)
+    errors = np.bincount(inverse, weights=wrong).astype(np.int64)
+    rows = [{"char": decode_char(code), "attempts": total, "errors": error, "error_rate": round(error / total, 3)}
+            for code, total, error in zip(unique.tolist(), attempts.tolist(), errors.tolist()) if error]
+    return sorted(rows, key=lambda row: (row["errors"], row["error_rate"]), reverse=True)
+
+
+def analyze(path: Union[str, Path], top_n: int = KEYLOG_CONFIG["top_n"]) -> Dict[str, Any]:
+    """기록 파일 하나의 분석 결과를 반환합니다."""
+    with KeystrokeLog(path) as log:
+        arrays = log.arrays()
+    return {
+        "events": int(((arrays.kinds == KEY) | (arrays.kinds == BACKSPACE)).sum()),
+        "sentences": len(arrays.target_lengths),
+        "key_latency": key_latency(arrays)[:top_n],
+        "digraphs": digraph_timing(arrays)[:top_n],
+        "error_hotspots": error_hotspots(arrays)[:top_n]
+    }
+
+
+class ReplayFrame(NamedTuple):
+    delay: float        # 직전 화면으로부터 기다릴 시간 (초)
+    sentence_index: int
+    target: str
+    typed: str
+    submitted: bool
+
+
+def iter_replay(path: Union[str, Path], speed: float = 1.0, max_pause: float = 2.0,
+                sentence: Optional[int] = None) -> Iterator[ReplayFrame]:
+    """기록을 재생할 화면 상태를 순서대로 반환합니다. speed배 빠르게 재생하며, 긴 쉬는 시간은 max_pause초로 줄입니다."""
+    if speed <= 0:
+        raise ValueError("재생 속도는 0보다 커야 합니다.")
+    with KeystrokeLog(path) as log:
+        last_ms: Optional[int] = None
+        pending: Optional[ReplayFrame] = None
+        target, typed, index = [], "", -1
+        for event in log.iter_events():
+            if sentence is not None and event.sentence != sentence:
+                continue
+            if event.kind == SENTENCE:
+                target, typed, index = [], "", event.sentence_index
+                continue
+            if event.kind == TARGET:
+                target.append(event.char)
+                continue
+            if event.kind == KEY:
+                typed += event.char
+            elif event.kind == BACKSPACE:
+                typed = typed[:-1]
+            # 같은 시각의 레코드(한글 조합의 삭제 + 입력)는 한 화면으로 합칩니다
+            if pending is not None and event.time_ms == last_ms and not pending.submitted:
+                pending = pending._replace(typed=typed, submitted=event.kind == END)
+                continue
+            if pending is not None:
+                yield pending
+            delay = 0.0 if last_ms is None else max(0.0, min((event.time_ms - last_ms) / 1000, max_pause)) / speed
+            last_ms = event.time_ms
+            pending = ReplayFrame(delay, index, ''.join(target), typed, event.kind == END)
+        if pending is not None:
+            yield pending
+
+
+def replay_in_terminal(path: Union[str, Path], speed: float = 1.0, sentence: Optional[int] = None) -> None:
+    """터미널에서 기록을 재생합니다."""
+    current_target = None
+    for frame in iter_replay(path, speed, sentence=sentence):
+        time.sleep(frame.delay)
+        if frame.target != current_target:
+            current_target = frame.target
+            print(f"\n[{frame.sentence_index + 1}] {frame.target}")
+        sys.stdout.write("\r\033[K" + frame.typed + (" ⏎\n" if frame.submitted else ""))
+        sys.stdout.flush()
+        if frame.submitted:
+            current_target = None
+    print()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="키 입력 기록 분석/재생")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stats = commands.add_parser("stats", help="글자별 간격, 두 글자 조합, 자주 틀리는 글자 분석")
+    stats.add_argument("path")
+    stats.add_argument("--top", type=int, default=KEYLOG_CONFIG["top_n"])
+    replay = commands.add_parser("replay", help="기록을 터미널에서 재생")
+    replay.add_argument("path")
+    replay.add_argument("--speed", type=float, default=1.0)
+    replay.add_argument("--sentence", type=int, default=None, help="이 구간(0부터)만 재생")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "replay":
+            replay_in_terminal(args.path, args.speed, args.sentence)
+            return 0
+        result = analyze(args.path, args.top)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+
+    print(f"입력 {result['events']:,}회, 문장 {result['sentences']:,}개")
+    print("\n느린 글자 (평균/중앙값 ms, 횟수)")
+    for row in result["key_latency"]:
+        print(f"  {row['char']!r:>6}  {row['mean_ms']:7.1f} {row['median_ms']:7d}  {row['count']:,}")
+    print("\n느린 두 글자 조합")
+    for row in result["digraphs"]:
+        print(f"  {row['digraph']!r:>6}  {row['mean_ms']:7.1f} {row['median_ms']:7d}  {row['count']:,}")
+    print("\n자주 틀리는 글자 (틀림/시도)")
+    for row in result["error_hotspots"]:
+        print(f"  {row['char']!r:>6}  {row['errors']:,}/{row['attempts']:,} ({row['error_rate']:.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""언어/모드별 순위표
+
+`TypingStats.to_dict()` 결과를 받아 사용자별 최고 기록을 SQLite 파일에 보관하고,
+메모리에는 순위표마다 점수 구간별 인원 수(Fenwick 트리)와 상위 K명만 둡니다.
+점수는 ``resolution`` 단위로 나눈 정수 구간에 기록되므로 기록 수와 관계없이
+순위/백분위 조회와 갱신이 O(log 구간 수)이며, 시작 시에는 구간별 인원 수만 집계하여 빠르게 다시 만듭니다::
+
+    python leaderboard.py --language 한국어 --mode "직접 입력"
+"""
+import argparse
+import bisect
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import LEADERBOARD_CONFIG
+
+BoardKey = Tuple[str, str]
+# 상위 K명 정렬 키: (-점수 구간, 기록 시각, 사용자)
+TopKey = Tuple[int, float, str]
+
+
+class FenwickTree:
+    """구간 합 트리. 점수 구간별 인원 수를 누적합으로 조회합니다."""
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> 'FenwickTree':
+        """구간별 개수 목록으로 O(n)에 트리를 만듭니다."""
+        tree = cls(len(counts))
+        data = tree._tree
+        for i, count in enumerate(counts, 1):
+            data[i] += count
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                data[parent] += data[i]
+        tree.total = sum(counts)
+        return tree
+
+    def add(self, index: int, delta: int) -> None:
+        """index(0부터) 구간에 delta를 더합니다."""
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """0..index 구간의 합을 반환합니다. index가 음수면 0입니다."""
+        result = 0
+        i = min(index + 1, self.size)
+        while i > 0:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+
+class Board:
+    """한 언어/모드의 순위표 (점수 구간별 인원 수 + 상위 K명)"""
+    def __init__(self, tree: FenwickTree, top_k: int):
+        self.tree = tree
+        self.top_k = top_k
+        self.top: List[TopKey] = []
+        self.entries: Dict[str, Dict[str, Any]] = {}   # 상위 K명의 기록
+
+    def offer(self, entry: Dict[str, Any]) -> None:
+        """사용자의 새 최고 기록을 상위 K명에 반영합니다. 최고 기록은 오르기만 하므로 항상 정확합니다."""
+        user = entry["user"]
+        key = (-entry["points"], entry["updated"], user)
+        if len(self.top) >= self.top_k and key >= self.top[-1] and user not in self.entries:
+            return
+        old = self.entries.pop(user, None)
+        if old is not None:
+            self.top.remove((-old["points"], old["updated"], user))
+        bisect.insort(self.top, key)
+        self.entries[user] = entry
+        while len(self.top) > self.top_k:
+            del self.entries[self.top.pop()[2]]
+
+
+def detect_language(text: str) -> str:
+    """문장의 한글/영문 비율로 순위표 언어를 정합니다."""
+    hangul = sum(1 for char in text if '가' <= char <= '힣')
+    latin = sum(1 for char in text if char.isascii() and char.isalpha())
+    return "한국어" if hangul >= latin else "English"
+
+
+class Leaderboard:
+    """언어/모드별 순위표 서비스 (여러 스레드에서 사용 가능)
+
+    다른 프로세스가 같은 파일에 기록하면 다음 조회 때 감지하여 메모리 색인을 다시 만듭니다.
+    """
+    def __init__(self, path: str = LEADERBOARD_CONFIG["path"], score: str = LEADERBOARD_CONFIG["score"],
+                 resolution: int = LEADERBOARD_CONFIG["resolution"], max_score: float = LEADERBOARD_CONFIG["max_score"],
+                 top_k: int = LEADERBOARD_CONFIG["top_k"]):
+        self.score = score
+        self.resolution = resolution
+        self.buckets = int(max_score * resolution) + 1
+        self.top_k = top_k
+        self.boards: Dict[BoardKey, Board] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores (language TEXT NOT NULL, mode TEXT NOT NULL, user TEXT NOT NULL, "
+                "name TEXT NOT NULL, points INTEGER NOT NULL, wpm REAL NOT NULL, cpm REAL NOT NULL, "
+                "accuracy REAL NOT NULL, updated REAL NOT NULL, PRIMARY KEY (language, mode, user))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS scores_rank ON scores (language, mode, points DESC, updated)")
+        with self._lock:
+            self._rebuild()
+
+    def _data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _rebuild(self) -> None:
+        """파일에서 구간별 인원 수와 상위 K명을 읽어 메모리 색인을 다시 만듭니다."""
+        counts: Dict[BoardKey, List[int]] = {}
+        for language, mode, points, count in self._conn.execute(
+                "SELECT language, mode, points, COUNT(*) FROM scores GROUP BY language, mode, points"):
+            counts.setdefault((language, mode), [0] * self.buckets)[min(points, self.buckets - 1)] += count
+        self.boards = {key: Board(FenwickTree.from_counts(board_counts), self.top_k)
+                       for key, board_counts in counts.items()}
+        for (language, mode), board in self.boards.items():
+            for entry in self._select_entries(
+                    "WHERE language = ? AND mode = ? ORDER BY points DESC, updated LIMIT ?",
+                    (language, mode, self.top_k)):
+                board.offer(entry)
+        self._version = self._data_version()
+
+    def _sync(self) -> None:
+        if self._data_version() != self._version:
+            self._rebuild()
+
+    def _select_entries(self, where: str, params: Tuple) -> Iterable[Dict[str, Any]]:
+        for user, name, points, wpm, cpm, accuracy, updated in self._conn.execute(
+                f"SELECT user, name, points, wpm, cpm, accuracy, updated FROM scores {where}", params):
+            yield {"user": user, "name": name, "points": points, "wpm": wpm, "cpm": cpm,
+                   "accuracy": accuracy, "updated": updated}
+
+    def _board(self, language: str, mode: str) -> Board:
+        board = self.boards.get((language, mode))
+        if board is None:
+            board = self.boards[(language, mode)] = Board(FenwickTree(self.buckets), self.top_k)
+        return board
+
+    def _points(self, score: float) -> int:
+        return max(0, min(int(round(score * self.resolution)), self.buckets - 1))
+
+    @staticmethod
+    def qualifies(stats: Dict[str, float]) -> bool:
+        """순위표에 올릴 만큼 입력했고 정확도가 기준 이상인지 확인합니다."""
+        return (stats.get("total_words", 0) >= LEADERBOARD_CONFIG["min_words"]
+                and stats.get("accuracy", 0.0) >= LEADERBOARD_CONFIG["min_accuracy"])
+
+    def _standing(self, board: Board, points: int, included: bool) -> Dict[str, Any]:
+        """점수 구간의 순위와 백분위. included면 그 기록 자체는 비교 대상에서 뺍니다."""
+        total = board.tree.total
+        others = total - 1 if included else total
+        below = board.tree.prefix_sum(points - 1)
+        return {
+            "rank": total - board.tree.prefix_sum(points) + 1,
+            "total": total,
+            # 다른 사용자 중 이 점수보다 낮은 비율 ("83%보다 빠름")
+            "percentile": round(100 * below / others, 1) if others > 0 else 0.0,
+            "score": points / self.resolution,
+        }
+
+    def submit(self, user: str, language: str, mode: str, stats: Dict[str, float],
+               name: str = "") -> Optional[Dict[str, Any]]:
+        """통계를 기록하고 현재 순위를 반환합니다. 기준에 못 미치면 None을 반환합니다."""
+        if not self.qualifies(stats):
+            return None
+        points = self._points(stats[self.score])
+        entry = {"user": user, "name": name or user[:8], "points": points, "wpm": stats.get("wpm", 0.0),
+                 "cpm": stats.get("cpm", 0.0), "accuracy": stats.get("accuracy", 0.0), "updated": time.time()}
+        with self._lock:
+            self._sync()
+            board = self._board(language, mode)
+            row = self._best_points(user, language, mode)
+            # 다른 프로세스가 그사이 더 높은 기록을 남겼을 수 있으므로 비교와 기록을 한 문장으로 합니다
+            with self._conn:
+                improved = self._conn.execute(
+                    "INSERT INTO scores (language, mode, user, name, points, wpm, cpm, accuracy, updated) "
+                    "VALUES (:language, :mode, :user, :name, :points, :wpm, :cpm, :accuracy, :updated) "
+                    "ON CONFLICT (language, mode, user) DO UPDATE SET name = excluded.name, "
+                    "points = excluded.points, wpm = excluded.wpm, cpm = excluded.cpm, "
+                    "accuracy = excluded.accuracy, updated = excluded.updated "
+                    "WHERE excluded.points > scores.points",
+                    {**entry, "language": language, "mode": mode}).rowcount > 0
+            if improved:
+                # 그사이 다른 프로세스가 기록했으면 다음 조회 때 data_version으로 감지해 다시 만듭니다
+                if row is not None:
+                    board.tree.add(row, -1)
+                board.tree.add(points, 1)
+                board.offer(entry)
+            best = points if improved else self._best_points(user, language, mode)
+            return {**self._standing(board, best, True), "improved": improved}
+
+    def _best_points(self, user: str, language: str, mode: str) -> Optional[int]:
+        row = self._conn.execute("SELECT points FROM scores WHERE language = ? AND mode = ? AND user = ?",
+                                 (language, mode, user)).fetchone()
+        return row[0] if row else None
+
+    def rank(self, language: str, mode: str, score: float) -> Dict[str, Any]:
+        """주어진 점수가 순위표에서 몇 등이고 몇 %보다 빠른지 반환합니다."""
+        with self._lock:
+            self._sync()
+            return self._standing(self._board(language, mode), self._points(score), False)
+
+    def user_rank(self, user: str, language: str, mode: str) -> Optional[Dict[str, Any]]:
+        """사용자의 최고 기록 순위를 반환합니다. 기록이 없으면 None을 반환합니다."""
+        with self._lock:
+            self._sync()
+            best = self._best_points(user, language, mode)
+            if best is None:
+                return None
+            return self._standing(self._board(language, mode), best, True)
+
+    def top(self, language: str, mode: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """상위 기록을 순위 순으로 반환합니다."""
+        with self._lock:
+            self._sync()
+            board = self._board(language, mode)
+            result = []
+            for _, _, user in board.top[:limit or self.top_k]:
+                entry = board.entries[user]
+                # 같은 점수는 같은 순위
+                result.append({"rank": board.tree.total - board.tree.prefix_sum(entry["points"]) + 1,
+                               "name": entry["name"], "score": entry["points"] / self.resolution,
+                               "wpm": entry["wpm"], "cpm": entry["cpm"], "accuracy": entry["accuracy"]})
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="순위표 조회")
+    parser.add_argument("--path", default=LEADERBOARD_CONFIG["path"])
+    parser.add_argument("--language", default="한국어")
+    parser.add_argument("--mode", default="직접 입력")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+    leaderboard = Leaderboard(args.path)
+    for row in leaderboard.top(args.language, args.mode, args.limit):
+        print(f"{row['rank']:>4}. {row['name']:<12} {row['score']:8.1f}  "
+              f"({row['wpm']:.1f} WPM, {row['cpm']:.1f} CPM, 정확도 {row['accuracy']:.1f}%)")
+    leaderboard.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,40 @@
 import streamlit as st
 import streamlit.components.v1 as components
+import io
+import time
+import uuid
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
-from typing_manager import TypingManager
+from typing_manager import PreparedSentence, TypingManager
+from ngram_generator import NGramModel
+from corpus import CorpusReader, is_corpus_file
+from compression import iter_lines
+from hangul import normalize
+from sampling import make_rng, reservoir_sample, sample_sequence
+from search_index import SearchIndex, search, search_corpus
+from session_pool import SessionPool, SpillStore
+from session_store import BACKEND_ERRORS, SessionStore, create_backend
+from leaderboard import Leaderboard, detect_language
+from history import DAY, HistoryStore
+from jobs import Job, JobQueue, fetch_url_sentences, stream_url_sentences
+from url_processor import URLProcessor
+from metrics import (ACTIVE_SESSIONS, GENERATED_SENTENCES, OPENAI_SECONDS, OPENAI_TOKENS, RERUN_CPU_SECONDS,
+                     RERUN_SECONDS, start_http_server)
 from config import (
     DEFAULT_SENTENCES,
     INPUT_MODES,
     AI_CONFIG,
+    NGRAM_CONFIG,
     FILE_CONFIG,
+    SEARCH_CONFIG,
+    SEEN_CONFIG,
+    SESSION_CONFIG,
+    HISTORY_CONFIG,
+    JOBS_CONFIG,
+    METRICS_CONFIG,
     UI_CONFIG,
     CSS_CLASSES
 )
@@ -28,6 +54,7 @@ def load_styles():
         :root {{
             --correct-color: #28a745;
             --incorrect-color: #dc3545;
+            --partial-color: {UI_CONFIG["colors"]["partial"]};
             --background-color: #f8f9fa;
         }}
         
@@ -45,6 +72,11 @@ def load_styles():
             text-decoration: underline;
         }}
         
+        .{CSS_CLASSES["partial"]} {{
+            color: var(--partial-color);
+            text-decoration: underline dotted;
+        }}
+        
         .{CSS_CLASSES["target_text"]} {{
             background-color: var(--background-color);
             padding: {UI_CONFIG["padding"]["target_text"]};
@@ -55,17 +87,258 @@ def load_styles():
         </style>
     """, unsafe_allow_html=True)
 
-def initialize_session_state():
-    """세션 상태를 초기화합니다."""
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """앱 프로세스에서 공유하는 세션 저장소를 생성합니다."""
+    return SessionStore(create_backend(SESSION_CONFIG))
+
+@st.cache_resource
+def get_session_pool() -> SessionPool:
+    """앱 프로세스의 모든 탭이 공유하는 세션 메모리 예산"""
+    return SessionPool()
+
+@st.cache_resource
+def get_spill_store() -> SpillStore:
+    """메모리에서 내린 세션을 기록하는 저장소"""
+    return SpillStore(get_session_store())
+
+@st.cache_resource
+def start_metrics_server() -> bool:
+    """앱 프로세스의 지표 HTTP 서버를 한 번만 시작합니다. 포트를 쓸 수 없으면 지표는 수집만 합니다."""
+    if not METRICS_CONFIG["enabled"]:
+        return False
+    try:
+        start_http_server()
+    except OSError:
+        return False
+    return True
+
+@st.cache_resource
+def get_leaderboard() -> Leaderboard:
+    """앱 프로세스에서 공유하는 순위표를 엽니다."""
+    return Leaderboard()
+
+def practice_language() -> str:
+    """현재 연습 중인 문장의 순위표 언어를 반환합니다."""
+    if st.session_state.current_input_method == "AI 생성 문장":
+        return st.session_state.current_language
+    return detect_language(' '.join(st.session_state.typing_manager.current_sentences))
+
+def submit_to_leaderboard():
+    """문장 세트를 마치면 누적 통계를 순위표와 기록 추이에 기록합니다."""
+    manager = st.session_state.typing_manager
+    st.session_state.leaderboard_result = get_leaderboard().submit(
+        st.session_state.session_id, practice_language(), manager.current_input_method,
+        manager.stats.to_dict(), name=st.session_state.get("leaderboard_name", "")
+    )
+    get_history().record(st.session_state.session_id, manager.stats.to_dict())
+    # 사이드바의 순위표와 기록 추이 차트는 타이핑 영역 밖에 있으므로 전체를 다시 그림
+    st.session_state.needs_full_rerun = True
+
+def display_leaderboard():
+    """순위표와 내 순위를 사이드바에 표시합니다."""
+    st.sidebar.text_input("순위표 이름", key="leaderboard_name", max_chars=20)
+    result = st.session_state.get("leaderboard_result")
+    if result and result["total"] > 1:
+        st.sidebar.success(f"{result['total']:,}명 중 {result['rank']:,}위 · 다른 사용자 {result['percentile']:.0f}%보다 빠릅니다")
+    language, mode = practice_language(), st.session_state.current_input_method
+    with st.sidebar.expander(f"순위표 ({language} · {mode})"):
+        rows = get_leaderboard().top(language, mode, limit=10)
+        if rows:
+            st.table([{"순위": row["rank"], "이름": row["name"], "CPM": f"{row['cpm']:.1f}",
+                       "WPM": f"{row['wpm']:.1f}", "정확도": f"{row['accuracy']:.1f}%"} for row in rows])
+        else:
+            st.caption("아직 기록이 없습니다.")
+
+@st.cache_resource
+def get_history() -> HistoryStore:
+    """앱 프로세스에서 공유하는 기록 추이 저장소를 엽니다."""
+    return HistoryStore()
+
+def display_history():
+    """내 기록 추이를 차트로 표시합니다. 점 수는 서버에서 HISTORY_CONFIG["max_points"] 이하로 줄입니다."""
+    with st.expander("기록 추이"):
+        col1, col2 = st.columns(2)
+        labels = {"wpm": "WPM", "cpm": "CPM", "accuracy": "정확도 (%)"}
+        metric = col1.selectbox("지표", list(labels), format_func=labels.get, key="history_metric")
+        period = col2.selectbox("기간", list(HISTORY_CONFIG["ranges"]), key="history_range")
+        days = HISTORY_CONFIG["ranges"][period]
+        start = time.time() - days * DAY if days else None
+        resolution, points = get_history().series(st.session_state.session_id, metric, start=start)
+        if not points:
+            st.caption("문장 세트를 마치면 기록이 쌓입니다.")
+            return
+        chart = {"시각": [time.strftime('%Y-%m-%d %H:%M', time.localtime(p.ts)) for p in points],
+                 labels[metric]: [p.value for p in points]}
+        if resolution in ("day", "week"):
+            chart["최저"] = [p.low for p in points]
+            chart["최고"] = [p.high for p in points]
+        st.line_chart(chart, x="시각")
+        captions = {"raw": "모든 기록", "lttb": "기록을 추려서 표시", "day": "일별 평균과 최저/최고", "week": "주별 평균과 최저/최고"}
+        st.caption(f"{captions[resolution]} · {len(points)}개 점")
+
+@st.cache_resource
+def get_jobs() -> JobQueue:
+    """모든 사용자가 함께 쓰는 백그라운드 작업 대기열을 반환합니다."""
+    return JobQueue()
+
+def start_job(kind: str, fn, *args, **options) -> bool:
+    """진행 중인 작업을 취소하고 새 작업을 넣습니다. options는 작업이 끝났을 때 finish_job이 사용합니다."""
+    cancel_job()
+    try:
+        job = get_jobs().submit(st.session_state.session_id, kind, fn, *args)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return False
+    st.session_state.job = job
+    st.session_state.job_options = options
+    return True
+
+def cancel_job():
+    """진행 중인 작업과 연습하는 동안 문장을 넘겨주던 작업을 취소하고 잊습니다."""
+    for key in ("job", "stream_job"):
+        job = st.session_state.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+def job_ready(job: Job) -> bool:
+    """작업 결과를 반영할 수 있는지 확인합니다. 문장을 넘겨주는 작업은 첫 문장이 나오면 바로 반영합니다."""
+    return job.done or (st.session_state.get("job_options", {}).get("stream", False) and job.emitted > 0)
+
+def finish_job(job: Job):
+    """끝난 작업(문장을 넘겨주는 작업은 첫 문장이 나온 작업)의 결과를 타이핑 세션에 반영합니다. (스크립트 스레드에서 실행)"""
+    st.session_state.pop("job", None)
+    options = st.session_state.pop("job_options", {})
+    if job.status == "cancelled":
+        st.sidebar.info("작업을 취소했습니다.")
+        return
+    # 문장을 넘겨주다 실패했으면 받은 문장까지는 연습합니다
+    if job.status == "failed" and not (options.get("stream") and job.emitted):
+        message = str(job.error) if isinstance(job.error, ValueError) else f"오류가 발생했습니다: {str(job.error)}"
+        st.sidebar.error(message)
+        return
+
+    manager = checkout_session()
+    if options.get("stream"):
+        # 첫 문장으로 바로 시작하고, 나머지는 작업이 넘겨주는 대로 연습하는 동안 계속 추가됩니다
+        try:
+            sentences = manager.track_duplicates(job.iter_items(), options.get("dedup_filter"))
+            manager.load_sentence_stream(manager.prefer_unseen(manager.iter_sentences(sentences)))
+        except ValueError as e:
+            st.sidebar.warning(str(e))
+            return
+        if not job.done:
+            st.session_state.stream_job = job
+        st.session_state.practice_started = True
+        update_session_state(manager)
+        return
+    if job.kind == "ai":
+        source, lines = job.result
+        if source == "openai":
+            sentences = list(manager.prefer_unseen(manager.iter_sentences(lines)))
+        else:
+            sentences = manager.take_unseen(lines, options["count"])
+        GENERATED_SENTENCES.inc(len(sentences), source=source)
+    elif job.kind == "url":
+        lines, dropped = job.result
+        sentences = list(manager.prefer_unseen(manager.iter_sentences(lines)))
+    else:
+        sentences = manager.take_unseen(manager.iter_sentences(job.result), options["count"])
+    if not sentences:
+        st.sidebar.warning(options.get("empty_message", "문장이 비어있습니다."))
+        return
+    manager.load_sentences(sentences)
+    if job.kind == "url":
+        manager.duplicates_dropped = dropped
+    st.session_state.practice_started = True
+    update_session_state(manager)
+
+@st.fragment(run_every=JOBS_CONFIG["poll_interval"])
+def display_job():
+    """진행 중인 작업의 진행률과 취소 버튼을 표시합니다. 작업이 끝나면 전체를 다시 실행하여 결과를 반영합니다."""
+    job = st.session_state.get("job")
+    if job is None or job_ready(job):
+        st.rerun()
+    message = job.message or ("대기 중..." if job.status == "queued" else "처리 중...")
+    if job.cancelled:
+        message = "취소하는 중..."
+    if job.progress is None:
+        st.info(message)
+    else:
+        st.progress(job.progress, text=message)
+    if st.button("취소", key=f"cancel_{job.id}", disabled=job.cancelled):
+        job.cancel()
+        st.rerun()
+
+def get_session_id() -> str:
+    """URL의 세션 ID를 반환합니다. 없거나 잘못되었으면 새로 만들어 URL에 기록합니다."""
+    param = SESSION_CONFIG["query_param"]
+    session_id = st.query_params.get(param, "")
+    if not (session_id.isalnum() and len(session_id) <= 64):
+        session_id = uuid.uuid4().hex
+        st.query_params[param] = session_id
+    return session_id
+
+def load_saved_session(session_id: str) -> Optional[TypingManager]:
+    """메모리에서 내렸던 세션이나 세션 저장소의 이전 타이핑 세션을 불러옵니다."""
+    try:
+        return get_spill_store().load(session_id)
+    except BACKEND_ERRORS as e:
+        st.sidebar.warning(f"저장된 세션을 불러오지 못했습니다: {str(e)}")
+        return None
+
+def checkout_session() -> TypingManager:
+    """이번 실행에서 쓸 타이핑 매니저를 세션 풀에서 꺼냅니다. 메모리에서 내려갔으면 다시 불러옵니다.
+
+    실행이 끝나면 persist_session이 session_state에서 빼고 세션 풀에 돌려놓습니다.
+    """
     if 'typing_manager' not in st.session_state:
-        st.session_state.typing_manager = TypingManager()
-        st.session_state.typing_manager.set_input_method(INPUT_MODES["default"])
-        st.session_state.practice_started = False
-        st.session_state.current_input_method = INPUT_MODES["default"]
-        st.session_state.input_key = 0  # input_key도 초기화
+        session_id = st.session_state.session_id
+        pool = get_session_pool()
+        typing_manager = pool.get(session_id, pin=True)
+        if typing_manager is None:
+            typing_manager = load_saved_session(session_id)
+            if typing_manager is None or typing_manager.current_input_method not in INPUT_MODES["options"]:
+                typing_manager = TypingManager()
+                typing_manager.set_input_method(INPUT_MODES["default"])
+            spill(pool.put(session_id, typing_manager, pin=True))
+        st.session_state.typing_manager = typing_manager
+    return st.session_state.typing_manager
+
+def spill(evicted):
+    """메모리에서 내린 다른 세션들을 기록합니다."""
+    if not evicted:
+        return
+    try:
+        get_spill_store().save(evicted)
+    except BACKEND_ERRORS as e:
+        st.sidebar.warning(f"세션을 내보내지 못했습니다: {str(e)}")
+
+def persist_session():
+    """타이핑 세션이 바뀌었으면 세션 저장소에 기록하고 세션 풀에 돌려놓습니다.
+
+    session_state에는 타이핑 매니저를 남기지 않으므로, 오래 쓰이지 않은 탭의 세션은 메모리에서 내려갑니다.
+    """
+    typing_manager = st.session_state.pop('typing_manager', None)
+    if typing_manager is None:
+        return
+    try:
+        get_spill_store().save_resident(st.session_state.session_id, typing_manager)
+    except BACKEND_ERRORS as e:
+        st.sidebar.warning(f"세션을 저장하지 못했습니다: {str(e)}")
+    spill(get_session_pool().release(st.session_state.session_id))
+
+def initialize_session_state():
+    """세션 상태를 초기화합니다. 저장된 세션이 있으면 이어서 연습합니다."""
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = get_session_id()
+        typing_manager = checkout_session()
+        st.session_state.practice_started = bool(typing_manager.current_sentences)
+        st.session_state.current_input_method = typing_manager.current_input_method
+        st.session_state.initial_input_method = typing_manager.current_input_method
     
     # 나머지 상태는 typing_manager에서 관리
-    update_session_state(st.session_state.typing_manager)
+    update_session_state(checkout_session())
 
 def display_progress(current_index: int, total_completed: int, total_sentences: int):
     """진행 상황을 표시합니다."""
@@ -114,17 +387,16 @@ def display_typing_stats(stats: Dict[str, float]):
             delta="CPM"
         )
 
-def display_sentence(sentence: str):
-    """현재 문장을 표시합니다."""
-    words_html = ' '.join([
-        f'<span class="{CSS_CLASSES["word"]}" id="word-{i}">{word}</span>' 
-        for i, word in enumerate(sentence.split())
-    ])
+    if stats.get('latency_ms'):
+        st.caption(f"속도는 브라우저에서 잰 입력 시간 기준입니다 (서버 지연 평균 {stats['latency_ms']:.0f} ms 제외)")
+
+def display_sentence(sentence: PreparedSentence):
+    """현재 문장을 표시합니다. 단어 span HTML은 문장을 불러올 때 미리 만들어 둡니다."""
     st.markdown(
         f'<div class="{CSS_CLASSES["target_text"]}" '
         f'style="padding: {UI_CONFIG["padding"]["target_text"]}; '
         f'font-size: {UI_CONFIG["font_size"]["target_text"]};">'
-        f'{words_html}</div>',
+        f'{sentence.html}</div>',
         unsafe_allow_html=True
     )
 
@@ -143,7 +415,7 @@ def display_welcome_message(mode: str):
         },
         "파일 업로드": {
             "title": "파일 업로드 연습",
-            "description": "텍스트 파일(.txt)을 업로드하고 '연습시작' 버튼을 클릭하여 시작하세요.",
+            "description": "텍스트 파일(.txt 또는 .gz/.bz2/.xz/.zip 압축 파일)이나 코퍼스 파일(.corpus)을 업로드하고 '연습시작' 버튼을 클릭하여 시작하세요.",
             "sub_text": "시작 위치와 연습할 문장 수를 설정할 수 있습니다."
         }
     }
@@ -166,42 +438,148 @@ def handle_input(current_sentence: str):
     input_text = st.session_state[input_key]
     if not input_text:
         return
+    checkout_session()
 
     # 타이핑 매니저를 통한 입력 처리
     if st.session_state.typing_manager.handle_input(input_text):
+        # 문장 세트를 마치면 순위표에 기록
+        if st.session_state.typing_manager.set_completed:
+            submit_to_leaderboard()
+
         # AI 생성 문장 모드에서 새로운 문장 세트 생성
         if (st.session_state.current_input_method == "AI 생성 문장" and 
-            st.session_state.typing_manager.current_index == 0):
-            new_sentences = generate_practice_sentences(
+            st.session_state.typing_manager.set_completed):
+            start_generation(
                 st.session_state.current_language,  # 현재 선택된 언어 사용
-                num_sentences=AI_CONFIG["sentences_per_set"]
+                offline=st.session_state.get("offline_generation", False)
             )
-            st.session_state.typing_manager.load_sentences(new_sentences)
-            st.session_state.current_sentences = new_sentences
 
         # 상태 업데이트
         st.session_state.current_sentence_index = st.session_state.typing_manager.current_index
         st.session_state.input_key = st.session_state.typing_manager.input_key
-        st.session_state.stats = st.session_state.typing_manager.stats
         st.session_state.total_sentences_completed = st.session_state.typing_manager.total_sentences_completed
 
-def generate_practice_sentences(language: str, num_sentences: int = 5) -> List[str]:
-    """AI를 사용하여 연습 문장을 생성합니다."""
-    client = OpenAI()
+@st.cache_resource(max_entries=4, show_spinner=False)
+def index_uploaded_text(file_id: str, _fileobj, name: str) -> Tuple[List[str], SearchIndex]:
+    """업로드한 텍스트 파일의 문장과 검색 색인을 만듭니다. (업로드한 파일마다 한 번)"""
+    _fileobj.seek(0)
+    lines = iter_lines(_fileobj, name)
+    sentences = list(islice(filter(None, map(normalize, lines)), SEARCH_CONFIG["max_upload_sentences"]))
+    index = SearchIndex()
+    index.add_many(sentences)
+    return sentences, index
+
+def search_uploaded_file(fileobj, name: str, file_id: str, query: str, limit: int) -> List[str]:
+    """업로드한 파일에서 검색어와 관련 있는 문장을 찾습니다. 코퍼스는 저장된 색인을 사용합니다."""
+    if is_corpus_file(fileobj):
+        with CorpusReader(fileobj) as reader:
+            hits = search_corpus(reader, query, limit)
+    else:
+        sentences, index = index_uploaded_text(file_id, fileobj, name)
+        hits = search(index, sentences, query, limit)
+    return [hit.sentence for hit in hits]
+
+def read_file_job(job: Job, data: bytes, name: str, file_id: str, start_line: int, count: int,
+                  query: str, sample: bool = False, seed: Optional[int] = None) -> List[str]:
+    """업로드한 파일에서 연습할 문장 후보를 읽습니다. (작업 스레드에서 실행)
+
+    이미 입력한 문장을 건너뛸 수 있도록 count * SEEN_CONFIG["lookahead"]개까지 읽습니다.
+    sample이면 시작 문장 대신 파일 전체에서 seed로 고르게 뽑습니다.
+    """
+    fileobj = io.BytesIO(data)
+    limit = count * SEEN_CONFIG["lookahead"]
+    if query:
+        job.report(message="문장을 검색하는 중...")
+        return search_uploaded_file(fileobj, name, file_id, query, limit)
+    if is_corpus_file(fileobj):
+        # 색인된 코퍼스는 필요한 블록만 읽습니다
+        with CorpusReader(fileobj) as reader:
+            if sample:
+                job.report(message="문장을 뽑는 중...")
+                return sample_sequence(reader, limit, make_rng(seed))
+            end = min(start_line + limit, len(reader))
+            following = (reader[i] for i in range(start_line, end))
+            return list(job.track(following, end - start_line, "읽은 문장"))
+    # 압축을 풀고 인코딩을 감지하여 필요한 문장까지만 조금씩 디코딩합니다
+    sentences = filter(None, map(normalize, iter_lines(fileobj, name)))
+    if sample:
+        # 파일을 끝까지 한 번 읽으며 뽑은 문장만 보관합니다
+        return reservoir_sample(job.track(sentences, message="읽은 문장"), limit, make_rng(seed))
+    sentences = job.track(sentences, start_line + limit, "읽은 문장")
+    return list(islice(sentences, start_line, start_line + limit))
+
+@st.cache_resource
+def load_offline_model(language: str) -> Optional[NGramModel]:
+    """언어별 오프라인 n-gram 모델을 불러옵니다. 모델 파일이 없으면 None을 반환합니다."""
+    model_path = Path(__file__).parent / NGRAM_CONFIG["models"][language]
+    if not model_path.exists():
+        return None
+    return NGramModel.load(model_path)
+
+def generate_offline_sentences(language: str, num_sentences: int = 5) -> List[str]:
+    """로컬 n-gram 모델로 연습 문장을 생성합니다."""
+    model = load_offline_model(language)
+    if model is None:
+        raise ValueError(f"{language} 오프라인 생성 모델이 없습니다. ngram_generator.py로 모델을 학습해주세요.")
+    # 이미 입력한 문장을 건너뛸 수 있도록 더 많이 생성한 뒤 고릅니다
+    generated = model.generate_sentences(num_sentences * SEEN_CONFIG["lookahead"])
+    sentences = st.session_state.typing_manager.take_unseen(generated, num_sentences)
+    if not sentences:
+        raise ValueError("조건에 맞는 문장을 생성하지 못했습니다.")
+    GENERATED_SENTENCES.inc(len(sentences), source="offline")
+    return sentences
+
+def request_ai_text(language: str, num_sentences: int) -> str:
+    """원격 AI에 연습 문장을 요청하고 응답 텍스트를 반환합니다."""
+    client = OpenAI(timeout=AI_CONFIG["timeout"], max_retries=0)
     
     prompt = AI_CONFIG["prompts"][language].format(num_sentences=num_sentences)
     
-    response = client.chat.completions.create(
-        model=AI_CONFIG["model"],
-        temperature=AI_CONFIG["temperature"],
-        max_tokens=AI_CONFIG["max_tokens"],
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
-    
-    text = response.choices[0].message.content
-    return st.session_state.typing_manager.process_input_text(text)
+    # 예외 없이 끝나면 성공("ok")으로 기록
+    with OPENAI_SECONDS.time(outcome="error") as timer:
+        response = client.chat.completions.create(
+            model=AI_CONFIG["model"],
+            temperature=AI_CONFIG["temperature"],
+            max_tokens=AI_CONFIG["max_tokens"],
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        timer.labels["outcome"] = "ok"
+    if response.usage is not None:
+        OPENAI_TOKENS.inc(response.usage.prompt_tokens, kind="prompt")
+        OPENAI_TOKENS.inc(response.usage.completion_tokens, kind="completion")
+    return response.choices[0].message.content
+
+def generate_sentences_job(job: Job, language: str, num_sentences: int,
+                           model: Optional[NGramModel]) -> Tuple[str, List[str]]:
+    """원격 AI로 문장 후보를 생성하여 (출처, 문장 목록)을 반환합니다. (작업 스레드에서 실행)
+
+    원격 호출이 제한 시간을 넘기거나 실패하면 오프라인 모델(model)로 대신 생성합니다.
+    """
+    job.report(message=f"{language} 문장을 생성하는 중...")
+    try:
+        text = request_ai_text(language, num_sentences)
+    except Exception:
+        if model is None:
+            raise
+        job.report(message="오프라인 모델로 생성하는 중...")
+        # 이미 입력한 문장을 건너뛸 수 있도록 더 많이 생성한 뒤 고릅니다
+        return "offline", model.generate_sentences(num_sentences * SEEN_CONFIG["lookahead"])
+    return "openai", text.split('\n')
+
+def start_generation(language: str, offline: bool = False):
+    """연습 문장 세트를 생성합니다. 오프라인 생성은 바로 불러오고, 원격 생성은 백그라운드 작업으로 넣습니다."""
+    num_sentences = AI_CONFIG["sentences_per_set"]
+    if offline:
+        manager = checkout_session()
+        manager.load_sentences(generate_offline_sentences(language, num_sentences))
+        st.session_state.practice_started = True
+        update_session_state(manager)
+        return
+    model = load_offline_model(language) if AI_CONFIG["offline_fallback"] else None
+    start_job("ai", generate_sentences_job, language, num_sentences, model,
+              count=num_sentences, empty_message="조건에 맞는 문장을 생성하지 못했습니다.")
 
 def get_default_text() -> str:
     """기본 연습 문장들을 문자열로 반환합니다."""
@@ -212,11 +590,70 @@ def update_session_state(typing_manager: TypingManager):
     st.session_state.current_sentence_index = typing_manager.current_index
     st.session_state.input_key = typing_manager.input_key
     st.session_state.total_sentences_completed = typing_manager.total_sentences_completed
-    st.session_state.current_sentences = typing_manager.current_sentences
+
+@contextmanager
+def measure_rerun(scope: str):
+    """실행 시간과 스레드 CPU 시간을 지표로 기록합니다. (Streamlit은 실행마다 스레드 하나를 사용)"""
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        RERUN_SECONDS.observe(time.perf_counter() - wall, scope=scope)
+        RERUN_CPU_SECONDS.observe(time.thread_time() - cpu, scope=scope)
+
+def render_typing_area():
+    """현재 문장, 진행률, 통계, 입력창을 그립니다."""
+    if st.session_state.pop("needs_full_rerun", False):
+        st.rerun()
+
+    sentences = st.session_state.typing_manager.current_sentences
+    if not sentences:
+        return
+
+    current_sentence = st.session_state.typing_manager.get_prepared(st.session_state.current_sentence_index)
+    if current_sentence is None:
+        return
+    display_sentence(current_sentence)
+    
+    # 진행률과 통계 표시
+    display_progress(
+        st.session_state.current_sentence_index,
+        st.session_state.total_sentences_completed,
+        len(sentences)
+    )
+    if st.session_state.typing_manager.is_loading:
+        st.caption(f"나머지 문장을 불러오는 중... (현재 {len(sentences)}개)")
+    display_typing_stats(st.session_state.typing_manager.stats.to_dict())
+
+    # 입력창
+    st.text_input(
+        "Type the text above",
+        key=f"typing_input_{st.session_state.input_key}",
+        label_visibility="collapsed",
+        on_change=lambda: handle_input(current_sentence.text)
+    )
+
+def typing_area():
+    """타이핑 영역. 입력을 제출하면 사이드바, 스타일, 스크립트 삽입 없이 이 부분만 다시 실행됩니다."""
+    if st.session_state.get("full_run"):
+        render_typing_area()
+        return
+    # 부분 실행: 전체 실행의 finally가 돌지 않으므로 세션 저장과 측정을 여기서 함
+    with measure_rerun("fragment"):
+        try:
+            checkout_session()
+            render_typing_area()
+        finally:
+            persist_session()
+
+if UI_CONFIG["typing_fragment"]:
+    typing_area = st.fragment(typing_area)
 
 def main():
     st.set_page_config(layout=UI_CONFIG["page_layout"])
+    start_metrics_server()
     initialize_session_state()
+    ACTIVE_SESSIONS.touch(st.session_state.session_id)
     
     # 스타일 로드
     load_styles()
@@ -225,17 +662,18 @@ def main():
     input_method = st.sidebar.radio(
         "모드 선택",
         INPUT_MODES["options"],
-        index=INPUT_MODES["options"].index(INPUT_MODES["default"])
+        index=INPUT_MODES["options"].index(st.session_state.initial_input_method)
     )
 
     # 입력 방식이 변경되면 상태 초기화
     if st.session_state.current_input_method != input_method:
         st.session_state.current_input_method = input_method
+        cancel_job()
+        st.session_state.typing_manager.reset_all()
         st.session_state.typing_manager.set_input_method(input_method)
         st.session_state.current_sentence_index = 0
         st.session_state.input_key = 0
         st.session_state.total_sentences_completed = 0
-        st.session_state.current_sentences = []
         st.session_state.practice_started = False
 
     # 각 모드별 설정
@@ -255,16 +693,27 @@ def main():
             AI_CONFIG["languages"],
             index=AI_CONFIG["languages"].index(AI_CONFIG["default_language"])
         )
+        offline = st.sidebar.checkbox(
+            "오프라인 생성",
+            value=False,
+            help="원격 AI 대신 로컬 n-gram 모델로 문장을 즉시 생성합니다."
+        )
         # 선택된 언어를 session_state에 저장
         st.session_state.current_language = language
+        st.session_state.offline_generation = offline
 
     elif input_method == "파일 업로드":
         uploaded_file = st.sidebar.file_uploader(
-            "텍스트 파일(.txt)",
+            "텍스트 파일(.txt, 압축 파일 포함) 또는 코퍼스(.corpus)",
             type=FILE_CONFIG["allowed_types"],
             key="file_uploader"
         )
 
+        sample = st.sidebar.checkbox(
+            "무작위 추출",
+            help="시작 문장부터 차례로 읽는 대신 파일 전체에서 문장을 고르게 뽑습니다."
+        )
+
         col1, col2 = st.sidebar.columns(2)
         with col1:
             start_line = st.number_input(
@@ -272,6 +721,7 @@ def main():
                 min_value=FILE_CONFIG["default_start_line"],
                 value=FILE_CONFIG["default_start_line"],
                 help="시작할 문장의 위치 (0부터 시작)",
+                disabled=sample,
                 label_visibility="collapsed"
             )
             st.caption("시작 문장")
@@ -287,6 +737,18 @@ def main():
             )
             st.caption("문장 수")
 
+        seed = st.sidebar.number_input(
+            "시드",
+            min_value=0,
+            value=FILE_CONFIG["sample_seed"],
+            help="같은 시드는 같은 문장을 같은 순서로 뽑습니다. 0이면 매번 다르게 뽑습니다."
+        ) if sample else 0
+
+        search_query = st.sidebar.text_input(
+            "검색어",
+            help="입력하면 시작 문장 대신 검색어가 들어 있는 문장으로 연습합니다."
+        ).strip()
+
     # 공통 연습 시작 버튼
     st.sidebar.markdown("---")
     if st.sidebar.button("연습 시작", use_container_width=True):
@@ -294,73 +756,81 @@ def main():
         st.session_state.typing_manager.reset_all()
 
         if input_method == "직접 입력":
-            if text_input:
+            if URLProcessor.is_url(text_input):
+                if JOBS_CONFIG["stream_url"]:
+                    # 작업 스레드에서 내려받는 대로 파싱하여 첫 문장이 나오면 바로 시작합니다
+                    # 제외한 유사 중복 문장 수는 작업이 끝나기 전부터 필터에서 읽습니다
+                    dedup_filter = URLProcessor.create_dedup_filter()
+                    start_job("url", stream_url_sentences, text_input, dedup_filter,
+                              stream=True, dedup_filter=dedup_filter)
+                else:
+                    # 내려받기는 작업 스레드에서, HTML 파싱은 작업 프로세스에서 합니다
+                    start_job("url", fetch_url_sentences, text_input)
+            elif text_input:
                 try:
+                    # 첫 문장이 준비되면 바로 시작하고 나머지는 연습하는 동안 계속 불러옵니다
                     with st.spinner("텍스트 처리 중..."):
-                        sentences = st.session_state.typing_manager.process_input_text(text_input)
-                        if sentences:
-                            st.session_state.typing_manager.load_sentences(sentences)
-                            st.session_state.current_sentences = sentences
-                            st.session_state.practice_started = True
-                        else:
-                            st.sidebar.warning("처리할 텍스트가 없습니다.")
+                        manager = st.session_state.typing_manager
+                        manager.load_sentence_stream(manager.iter_input_sentences(text_input))
+                        st.session_state.practice_started = True
                 except ValueError as e:
                     st.sidebar.error(str(e))
                 except Exception as e:
                     st.sidebar.error(f"오류가 발생했습니다: {str(e)}")
 
         elif input_method == "AI 생성 문장":
-            with st.spinner(f"{language} 문장을 생성하는 중..."):
-                sentences = generate_practice_sentences(language, num_sentences=AI_CONFIG["sentences_per_set"])
-                st.session_state.typing_manager.load_sentences(sentences)
-                st.session_state.current_sentences = sentences
-                st.session_state.practice_started = True
+            try:
                 st.session_state.current_language = language  # 현재 언어 저장
+                start_generation(language, offline=offline)
+            except ValueError as e:
+                st.sidebar.error(str(e))
+            except Exception as e:
+                st.sidebar.error(f"문장 생성 중 오류가 발생했습니다: {str(e)}")
 
         else:  # 파일 업로드
             if not uploaded_file:
                 st.sidebar.warning("파일을 업로드해주세요.")
                 return
                 
-            text_content = uploaded_file.getvalue().decode('utf-8')
-            all_sentences = st.session_state.typing_manager.process_input_text(text_content)
-            start_line = min(start_line, len(all_sentences))
-            
-            end_line = start_line + lines_per_set
-            sentences = all_sentences[start_line:end_line]
-            st.session_state.typing_manager.load_sentences(sentences)
-            st.session_state.current_sentences = sentences
-            st.session_state.practice_started = True
+            # 파일 읽기와 검색은 작업 스레드에서 하고, 이미 입력한 문장은 끝난 뒤 건너뛰거나 뒤로 미룹니다
+            start_job("file", read_file_job, uploaded_file.getvalue(), uploaded_file.name,
+                      uploaded_file.file_id, start_line, lines_per_set, search_query, sample, seed or None,
+                      count=lines_per_set,
+                      empty_message="검색어가 들어 있는 문장이 없습니다." if search_query
+                      else "연습할 문장이 없습니다." if sample
+                      else "시작 위치 이후에 연습할 문장이 없습니다.")
 
         # 공통 초기화
         st.session_state.current_sentence_index = 0
         st.session_state.input_key = 0
         st.session_state.total_sentences_completed = 0
 
+    # 백그라운드 작업이 끝났으면 결과를 반영하고, 진행 중이면 진행률만 표시
+    job = st.session_state.get("job")
+    if job is not None:
+        if not job_ready(job):
+            display_job()
+            return
+        finish_job(job)
+
     # 연습이 시작되지 않았으면 환영 메시지만 표시
     if not st.session_state.practice_started:
         display_welcome_message(input_method)
         return
 
     # 연습이 시작되었으면 타이핑 UI 표시
-    sentences = st.session_state.current_sentences
-    if not sentences:
+    if not st.session_state.typing_manager.current_sentences:
         return
-
-    current_sentence = sentences[st.session_state.current_sentence_index]
-    display_sentence(current_sentence)
-    
-    # 진행률과 통계 표시
-    display_progress(
-        st.session_state.current_sentence_index,
-        st.session_state.total_sentences_completed,
-        len(sentences)
-    )
-    display_typing_stats(st.session_state.typing_manager.stats.to_dict())
-
-    # JavaScript 실시간 체크
-    js_path = Path(__file__).parent / 'static' / 'typing.js'
-    js_code = js_path.read_text()
+    # 타이핑 영역은 부분 실행되어 사이드바에 쓸 수 없으므로 전체 실행 때 표시합니다
+    dropped = st.session_state.typing_manager.duplicates_dropped
+    if dropped:
+        st.sidebar.caption(f"유사 중복 문장 {dropped:,}개를 제외했습니다.")
+    display_leaderboard()
+
+    # JavaScript 실시간 체크 (hangul.py로 생성한 자모 표를 먼저 불러옴)
+    # 부분 실행 때는 다시 삽입하지 않으며, typing.js가 새 입력창을 주기적으로 찾아 연결함
+    static_dir = Path(__file__).parent / 'static'
+    js_code = (static_dir / 'hangul_tables.js').read_text(encoding='utf-8') + (static_dir / 'typing.js').read_text(encoding='utf-8')
     components.html(
         f"""
         <script>
@@ -369,14 +839,15 @@ def main():
         """,
         height=0
     )
-    
-    # 입력창
-    st.text_input(
-        "Type the text above",
-        key=f"typing_input_{st.session_state.input_key}",
-        label_visibility="collapsed",
-        on_change=lambda: handle_input(current_sentence)
-    )
+
+    typing_area()
+    display_history()
 
 if __name__ == "__main__":
-    main()
+    st.session_state.full_run = True
+    with measure_rerun("app"):
+        try:
+            main()
+        finally:
+            st.session_state.full_run = False
+            persist_session()
@@ -0,0 +1,338 @@
+"""프로세스 내 운영 지표 수집과 Prometheus 텍스트 형식 출력
+
+카운터, 게이지, 고정 구간 히스토그램을 제공합니다. 값 하나를 바꿀 때는 지표별 잠금을
+짧게 잡기만 하므로, 요청 처리나 Streamlit 재실행 경로에서 항상 켜 두어도 부담이 적습니다.
+수집한 지표는 별도 HTTP 서버(Streamlit 앱)나 API의 ``GET /metrics``로 내보냅니다::
+
+    curl http://127.0.0.1:9464/metrics
+"""
+import bisect
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from config import METRICS_CONFIG
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric:
+    """지표 공통 부분 (이름, 설명, 라벨)"""
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if not labels and not self.labelnames:
+            return ()
+        try:
+            key = tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            key = ()
+        if len(key) != len(labels) or len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} 지표의 라벨은 {', '.join(self.labelnames) or '없음'}입니다.")
+        return key
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        """(이름 접미사, 라벨 값, 값) 목록을 반환합니다."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, value in self.samples():
+            names = self.labelnames + ("le",) if suffix == "_bucket" else self.labelnames
+            lines.append(f"{self.name}{suffix}{_format_labels(names, key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """증가만 하는 값"""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("카운터는 줄일 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            return [("_total" if not self.name.endswith("_total") else "", key, value)
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(Metric):
+    """늘거나 줄 수 있는 현재 값. 함수를 지정하면 내보낼 때 계산합니다."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {} if labelnames else {(): 0.0}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """내보낼 때마다 function()의 결과를 값으로 사용합니다. (라벨 없는 게이지만)"""
+        if self.labelnames:
+            raise ValueError("라벨이 있는 게이지에는 함수를 지정할 수 없습니다.")
+        self._function = function
+
+    def value(self, **labels: str) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        if self._function is not None:
+            return [("", (), self.value())]
+        with self._lock:
+            return [("", key, value) for key, value in sorted(self._values.items())]
+
+
+class _Timer:
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+class Histogram(Metric):
+    """고정 구간별 관측 횟수와 합계"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = METRICS_CONFIG["buckets"]):
+        super().__init__(name, documentation, labelnames)
+        if "le" in self.labelnames:
+            raise ValueError("히스토그램에는 le 라벨을 쓸 수 없습니다.")
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        # 라벨 값 → [구간별 횟수(마지막은 +Inf), 합계]
+        self._values: Dict[LabelKey, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def time(self, **labels: str) -> _Timer:
+        """with 블록의 실행 시간(초)을 관측합니다."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        with self._lock:
+            snapshot = [(key, list(counts), total[0]) for key, (counts, total) in sorted(self._values.items())]
+        samples = []
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(("_bucket", key + (_format_value(bound),), cumulative))
+            samples.append(("_sum", key, total))
+            samples.append(("_count", key, cumulative))
+        return samples
+
+
+class Registry:
+    """이름으로 지표를 등록하고 한꺼번에 내보냅니다."""
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"이미 다른 형식으로 등록된 지표입니다: {name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = METRICS_CONFIG["buckets"]) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """모든 지표를 Prometheus 텍스트 형식으로 반환합니다."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+
+REGISTRY = Registry()
+
+
+class ActiveSessions:
+    """최근 window초 안에 요청이 있었던 세션 수를 셉니다."""
+    def __init__(self, window: float = METRICS_CONFIG["active_window"]):
+        self.window = window
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str) -> None:
+        with self._lock:
+            self._last_seen[session_id] = time.monotonic()
+
+    def count(self) -> int:
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            for session_id in [s for s, seen in self._last_seen.items() if seen < cutoff]:
+                del self._last_seen[session_id]
+            return len(self._last_seen)
+
+
+# 애플리케이션 지표
+URL_FETCH_SECONDS = REGISTRY.histogram(
+    "typing_url_fetch_seconds", "URL 요청부터 응답 헤더를 받을 때까지의 시간")
+URL_FETCH_BYTES = REGISTRY.counter(
+    "typing_url_fetch_bytes_total", "URL에서 내려받은 본문 바이트 수")
+URL_FETCH_ERRORS = REGISTRY.counter(
+    "typing_url_fetch_errors_total", "실패한 URL 요청 수")
+URL_PARSE_SECONDS = REGISTRY.histogram(
+    "typing_url_parse_seconds", "extract_text_from_url의 HTML 문장 추출 시간")
+OPENAI_SECONDS = REGISTRY.histogram(
+    "typing_openai_request_seconds", "OpenAI 문장 생성 요청 시간", ["outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30))
+OPENAI_TOKENS = REGISTRY.counter(
+    "typing_openai_tokens_total", "OpenAI 사용 토큰 수", ["kind"])
+GENERATED_SENTENCES = REGISTRY.counter(
+    "typing_generated_sentences_total", "생성한 연습 문장 수", ["source"])
+SENTENCES_LOADED = REGISTRY.counter(
+    "typing_sentences_loaded_total", "정리하여 불러온 연습 문장 수")
+NEAR_DUPLICATES_DROPPED = REGISTRY.counter(
+    "typing_near_duplicates_dropped_total", "불러올 때 유사 중복으로 제외한 문장 수")
+SENTENCES_TYPED = REGISTRY.counter(
+    "typing_sentences_typed_total", "입력을 제출한 문장 수", ["timing"])
+CLIENT_OVERHEAD_SECONDS = REGISTRY.histogram(
+    "typing_client_overhead_seconds", "서버 측정 시간에서 브라우저 측정 시간을 뺀 값")
+RERUN_SECONDS = REGISTRY.histogram(
+    "typing_streamlit_rerun_seconds", "Streamlit 실행 시간 (app: 전체 스크립트, fragment: 타이핑 영역만)", ["scope"])
+RERUN_CPU_SECONDS = REGISTRY.histogram(
+    "typing_streamlit_rerun_cpu_seconds", "Streamlit 실행에 사용한 스레드 CPU 시간", ["scope"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+FEED_FETCHES = REGISTRY.counter(
+    "typing_feed_fetches_total", "피드/사이트맵 요청 결과", ["result"])
+FEED_ITEMS = REGISTRY.counter(
+    "typing_feed_items_total", "새로 내려받은 피드 항목 처리 결과", ["result"])
+SESSION_CACHE = REGISTRY.counter(
+    "typing_session_cache_total", "API 세션 메모리 캐시 조회 결과", ["result"])
+SESSION_MEMORY_BYTES = REGISTRY.gauge(
+    "typing_session_memory_bytes", "메모리에 올려 둔 세션의 추정 크기 합계")
+SESSIONS_RESIDENT = REGISTRY.gauge(
+    "typing_sessions_resident", "메모리에 올려 둔 세션 수")
+SESSION_EVICTIONS = REGISTRY.counter(
+    "typing_session_evictions_total", "메모리에서 내보낸 세션 수", ["reason"])
+JOBS_ACTIVE = REGISTRY.gauge(
+    "typing_jobs_active", "대기 중이거나 실행 중인 백그라운드 작업 수")
+JOBS_FINISHED = REGISTRY.counter(
+    "typing_jobs_finished_total", "끝난 백그라운드 작업 수", ["kind", "status"])
+JOB_SECONDS = REGISTRY.histogram(
+    "typing_job_seconds", "백그라운드 작업을 넣은 뒤 끝날 때까지의 시간 (대기 포함)", ["kind"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60))
+ACTIVE_SESSIONS = ActiveSessions()
+REGISTRY.gauge("typing_active_sessions", "최근 요청이 있었던 세션 수").set_function(ACTIVE_SESSIONS.count)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics 요청에 지표를 응답합니다."""
+    registry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] != METRICS_CONFIG["path"]:
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+_servers: Dict[Tuple[str, int], ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def start_http_server(port: int = METRICS_CONFIG["port"], host: str = METRICS_CONFIG["host"],
+                      registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """지표를 내보내는 HTTP 서버를 백그라운드 스레드로 시작합니다. 같은 주소로 다시 부르면 기존 서버를 반환합니다."""
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            handler = type("Handler", (MetricsHandler,), {"registry": registry})
+            server = ThreadingHTTPServer((host, port), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+            if port:  # 0(임의 포트)은 부를 때마다 새 서버
+                _servers[(host, port)] = server
+        return server
@@ -0,0 +1,330 @@
+"""여러 사용자가 같은 문장으로 겨루는 실시간 레이스
+
+참가자마다 ``TypingManager``를 두고, 웹소켓으로 받은 진행 상황을 방 상태에 반영합니다.
+방 상태는 메시지마다 보내지 않고 이벤트 루프 하나에서 ``tick_interval``마다 한 번씩,
+바뀐 방에 대해서만 JSON을 한 번 만들어 모든 참가자에게 보냅니다.
+참가자별로 가장 최근 상태 하나만 보관하므로 느린 클라이언트가 있어도 대기열이 쌓이지 않습니다.
+
+클라이언트 → 서버::
+
+    {"type": "start"}                         카운트다운 후 레이스 시작
+    {"type": "progress", "typed": "입력 중인 글자"}
+    {"type": "submit", "text": "완성한 문장"}
+
+서버 → 클라이언트::
+
+    {"type": "joined", "racer_id": 3, "sentences": [...]}
+    {"type": "roster", "racers": {"3": "이름", ...}}
+    {"type": "state", "tick": 42, "status": "running", "starts_in": 0.0,
+     "racers": [[id, 완료 문장 수, 진행률(천분율), WPM, 정확도, 순위], ...]}
+    {"type": "error", "message": "..."}
+"""
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from urllib.parse import parse_qs
+from config import RACE_CONFIG
+from typing_manager import TypingManager
+
+RACE_INPUT_METHOD = "레이스"
+
+
+class Racer:
+    """레이스 참가자 한 명"""
+    def __init__(self, racer_id: int, name: str, sentences: List[str], start_time: float):
+        self.id = racer_id
+        self.name = name
+        self.manager = TypingManager()
+        self.manager.set_input_method(RACE_INPUT_METHOD)
+        self.manager.load_sentences(list(sentences))
+        self.manager.stats.restart(at=start_time)
+        self.typed_chars = 0
+        self.rank = 0
+        self._row_json: Optional[str] = None
+        # 보낼 메시지: 오류/참가 같은 개별 메시지는 순서대로, 방 상태는 가장 최근 것 하나만
+        self.direct: Deque[str] = deque()
+        self.pending: Optional[str] = None
+        self.roster_version = -1
+        self.wakeup = asyncio.Event()
+
+    @property
+    def completed(self) -> int:
+        return self.manager.total_sentences_completed or self.manager.current_index
+
+    @property
+    def finished(self) -> bool:
+        return self.rank > 0
+
+    def progress(self) -> int:
+        """전체 문장 중 진행한 정도를 천분율로 반환합니다."""
+        sentences = self.manager.current_sentences
+        if self.finished:
+            return 1000
+        sentence = self.manager.get_current_sentence()
+        partial = min(self.typed_chars / len(sentence), 1.0) if sentence else 0.0
+        return int((self.completed + partial) / len(sentences) * 1000)
+
+    def row(self) -> List[Any]:
+        stats = self.manager.stats
+        return [self.id, self.completed, self.progress(), stats.get_wpm(), stats.word_stats.accuracy, self.rank]
+
+    def row_json(self) -> str:
+        """방 상태 메시지에 들어갈 JSON 행을 반환합니다. 바뀌지 않았으면 이전 값을 재사용합니다."""
+        if self._row_json is None:
+            # 값이 모두 int/float이므로 json.dumps 없이 직접 만듭니다
+            self._row_json = '[%d,%d,%d,%r,%r,%d]' % tuple(self.row())
+        return self._row_json
+
+    def changed(self) -> None:
+        self._row_json = None
+
+    def notify(self, message: str) -> None:
+        """개별 메시지를 보낼 목록에 추가합니다."""
+        self.direct.append(message)
+        self.wakeup.set()
+
+
+class RaceRoom:
+    """같은 문장 세트로 겨루는 방"""
+    def __init__(self, room_id: str, sentences: List[str], max_racers: int = RACE_CONFIG["max_racers"]):
+        if not sentences:
+            raise ValueError("문장이 비어있습니다.")
+        self.id = room_id
+        self.sentences = sentences
+        self.max_racers = max_racers
+        self.racers: Dict[int, Racer] = {}
+        self.status = "waiting"
+        self.starts_at: Optional[float] = None
+        self.finished_count = 0
+        self._finished_present = 0     # 현재 방에 남아 있는 완주자 수
+        self.last_activity = time.time()
+        self.dirty = True
+        self.roster_version = 0
+        self._roster_message: Optional[str] = None
+        self._next_id = 1
+
+    def join(self, name: str, now: Optional[float] = None) -> Racer:
+        """참가자를 추가합니다."""
+        if self.status == "finished":
+            raise ValueError("이미 끝난 레이스입니다.")
+        if len(self.racers) >= self.max_racers:
+            raise ValueError("방이 가득 찼습니다.")
+        now = time.time() if now is None else now
+        name = ' '.join(name.split())[:RACE_CONFIG["max_name_length"]] or f"참가자 {self._next_id}"
+        racer = Racer(self._next_id, name, self.sentences, max(now, self.starts_at or now))
+        self._next_id += 1
+        self.racers[racer.id] = racer
+        self._roster_changed(now)
+        return racer
+
+    def leave(self, racer_id: int, now: Optional[float] = None) -> None:
+        """참가자를 내보냅니다."""
+        racer = self.racers.pop(racer_id, None)
+        if racer is not None:
+            self._finished_present -= racer.finished
+            self._roster_changed(time.time() if now is None else now)
+
+    def _roster_changed(self, now: float) -> None:
+        self.roster_version += 1
+        self._roster_message = None
+        self.last_activity = now
+        self.dirty = True
+
+    def start(self, now: Optional[float] = None, countdown: float = RACE_CONFIG["countdown"]) -> None:
+        """카운트다운 후 레이스를 시작합니다. 이미 시작했으면 무시합니다."""
+        if self.status != "waiting" or self.starts_at is not None:
+            return
+        now = time.time() if now is None else now
+        self.starts_at = now + countdown
+        for racer in self.racers.values():
+            racer.manager.stats.restart(at=self.starts_at)
+        self.dirty = True
+
+    def update_status(self, now: float) -> None:
+        """카운트다운이 끝났거나 모두 완주했으면 상태를 바꿉니다."""
+        if self.status == "waiting" and self.starts_at is not None and now >= self.starts_at:
+            self.status = "running"
+            self.dirty = True
+        elif self.status == "running" and self.racers and self._finished_present == len(self.racers):
+            self.status = "finished"
+            self.dirty = True
+
+    def handle_message(self, racer: Racer, message: Dict[str, Any], now: float) -> None:
+        """참가자가 보낸 메시지를 처리합니다. 잘못된 메시지는 ValueError를 발생시킵니다."""
+        kind = message.get("type")
+        self.last_activity = now
+        if kind == "start":
+            self.start(now)
+            return
+        if kind not in ("progress", "submit"):
+            raise ValueError(f"알 수 없는 메시지입니다: {kind}")
+        self.update_status(now)
+        if self.status != "running" or racer.finished:
+            return
+
+        if kind == "progress":
+            typed = message.get("typed")
+            if not isinstance(typed, str):
+                raise ValueError("typed는 문자열이어야 합니다.")
+            if len(typed) != racer.typed_chars:
+                racer.typed_chars = len(typed)
+                racer.changed()
+                self.dirty = True
+            return
+
+        text = message.get("text")
+        if not isinstance(text, str):
+            raise ValueError("text는 문자열이어야 합니다.")
+        if racer.manager.handle_input(text):
+            racer.typed_chars = 0
+            if racer.manager.total_sentences_completed >= len(self.sentences):
+                self.finished_count += 1
+                self._finished_present += 1
+                racer.rank = self.finished_count
+            racer.changed()
+            self.dirty = True
+
+    def roster_message(self) -> str:
+        """참가자 이름 목록 메시지를 반환합니다. 참가자가 바뀔 때만 다시 만듭니다."""
+        if self._roster_message is None:
+            self._roster_message = json.dumps({
+                "type": "roster",
+                "racers": {racer.id: racer.name for racer in self.racers.values()}
+            }, ensure_ascii=False)
+        return self._roster_message
+
+    def state_message(self, tick: int, now: float) -> str:
+        """방 상태 메시지를 만듭니다. 참가자 행은 바뀐 것만 다시 직렬화합니다."""
+        starts_in = round(max(0.0, self.starts_at - now), 2) if self.starts_at is not None else None
+        header = json.dumps({"type": "state", "tick": tick, "status": self.status, "starts_in": starts_in},
+                            separators=(',', ':'))
+        return f'{header[:-1]},"racers":[{",".join(racer.row_json() for racer in self.racers.values())}]}}'
+
+    def summary(self) -> Dict[str, Any]:
+        """HTTP 조회용 방 정보를 반환합니다."""
+        return {
+            "room_id": self.id,
+            "status": self.status,
+            "sentences": self.sentences,
+            "racers": [{"id": r.id, "name": r.name, "row": r.row()} for r in self.racers.values()]
+        }
+
+
+class RaceHub:
+    """한 프로세스의 모든 레이스 방과 방송 주기를 관리하는 클래스"""
+    def __init__(self, tick_interval: float = RACE_CONFIG["tick_interval"],
+                 max_racers: int = RACE_CONFIG["max_racers"], room_ttl: float = RACE_CONFIG["room_ttl"]):
+        self.tick_interval = tick_interval
+        self.max_racers = max_racers
+        self.room_ttl = room_ttl
+        self.rooms: Dict[str, RaceRoom] = {}
+        self.ticks = 0
+        self._ticker: Optional[asyncio.Task] = None
+
+    def create_room(self, sentences: List[str]) -> RaceRoom:
+        """새 방을 만듭니다."""
+        room = RaceRoom(uuid.uuid4().hex[:12], sentences, self.max_racers)
+        self.rooms[room.id] = room
+        return room
+
+    def ensure_ticker(self) -> None:
+        """실행 중인 이벤트 루프에서 방송 작업을 시작합니다."""
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.get_running_loop().create_task(self._tick_loop())
+
+    def stop(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+
+    async def _tick_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick_interval
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self.tick()
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """바뀐 방의 상태를 참가자에게 보내고, 보낸 메시지 수를 반환합니다."""
+        now = time.time() if now is None else now
+        self.ticks += 1
+        delivered = 0
+        for room_id, room in list(self.rooms.items()):
+            room.update_status(now)
+            if not room.racers:
+                if now - room.last_activity > self.room_ttl:
+                    del self.rooms[room_id]
+                continue
+            if not room.dirty:
+                continue
+            room.dirty = False
+            message = room.state_message(self.ticks, now)
+            for racer in room.racers.values():
+                racer.pending = message
+                racer.wakeup.set()
+            delivered += len(room.racers)
+        return delivered
+
+    async def _sender(self, room: RaceRoom, racer: Racer, send: Callable) -> None:
+        """참가자 한 명에게 메시지를 보내는 작업"""
+        try:
+            while True:
+                await racer.wakeup.wait()
+                racer.wakeup.clear()
+                while racer.direct:
+                    await send({"type": "websocket.send", "text": racer.direct.popleft()})
+                if racer.roster_version != room.roster_version:
+                    racer.roster_version = room.roster_version
+                    await send({"type": "websocket.send", "text": room.roster_message()})
+                message, racer.pending = racer.pending, None
+                if message is not None:
+                    await send({"type": "websocket.send", "text": message})
+        except Exception:
+            # 연결이 끊어지면 수신 쪽에서 참가자를 정리합니다
+            return
+
+    async def handle_websocket(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """/races/{방 ID}/ws?name=이름 웹소켓 연결을 처리합니다."""
+        if (await receive())["type"] != "websocket.connect":
+            return
+        parts = scope["path"].strip('/').split('/')
+        room = self.rooms.get(parts[1]) if len(parts) == 3 and parts[0] == "races" and parts[2] == "ws" else None
+        if room is None:
+            await send({"type": "websocket.close", "code": 4404})
+            return
+        query = parse_qs(scope.get("query_string", b"").decode('utf-8', 'replace'))
+        try:
+            racer = room.join(query.get("name", [""])[-1])
+        except ValueError as e:
+            await send({"type": "websocket.close", "code": 4409, "reason": str(e)})
+            return
+
+        self.ensure_ticker()
+        await send({"type": "websocket.accept"})
+        racer.notify(json.dumps({"type": "joined", "racer_id": racer.id, "room_id": room.id,
+                                 "sentences": room.sentences}, ensure_ascii=False))
+        sender = asyncio.create_task(self._sender(room, racer, send))
+        try:
+            while True:
+                event = await receive()
+                if event["type"] == "websocket.disconnect":
+                    break
+                text = event.get("text")
+                if text is None:
+                    text = (event.get("bytes") or b"").decode('utf-8', 'replace')
+                try:
+                    if len(text) > RACE_CONFIG["max_message_bytes"]:
+                        raise ValueError("메시지가 너무 깁니다.")
+                    message = json.loads(text)
+                    if not isinstance(message, dict):
+                        raise ValueError("메시지는 JSON 객체여야 합니다.")
+                    room.handle_message(racer, message, time.time())
+                except ValueError as e:
+                    racer.notify(json.dumps({"type": "error", "message": str(e)}, ensure_ascii=False))
+        finally:
+            sender.cancel()
+            room.leave(racer.id)
@@ -0,0 +1,149 @@
+"""개발/테스트용 Redis 프로토콜(RESP) 대체 서버
+
+Redis가 없는 환경에서 ``RedisBackend``를 쓸 수 있도록 세션 저장에 필요한 명령
+(PING, GET, SET [EX], DEL, EXISTS, EXPIRE, TTL, FLUSHDB, SELECT, AUTH)만 지원합니다.
+데이터는 메모리에만 보관되므로 운영 환경에서는 실제 Redis를 사용하세요.
+
+    python resp_server.py --port 6379
+"""
+import argparse
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RespStore:
+    """만료 시간을 지원하는 메모리 키-값 저장소"""
+    def __init__(self):
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key: bytes) -> Optional[Tuple[bytes, Optional[float]]]:
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.time():
+            del self._data[key]
+            return None
+        return item
+
+    def execute(self, args: List[bytes]) -> object:
+        """명령 하나를 실행하고 응답 값을 반환합니다. 오류는 Exception으로 표현합니다."""
+        command = args[0].upper()
+        with self._lock:
+            if command == b'PING':
+                return args[1] if len(args) > 1 else 'PONG'
+            if command in (b'SELECT', b'AUTH'):
+                return 'OK'
+            if command == b'GET' and len(args) == 2:
+                item = self._alive(args[1])
+                return item[0] if item else None
+            if command == b'SET' and len(args) in (3, 5):
+                expires = None
+                if len(args) == 5:
+                    if args[3].upper() != b'EX':
+                        return Exception("ERR syntax error")
+                    expires = time.time() + int(args[4])
+                self._data[args[1]] = (args[2], expires)
+                return 'OK'
+            if command in (b'DEL', b'EXISTS') and len(args) > 1:
+                found = [key for key in args[1:] if self._alive(key)]
+                if command == b'DEL':
+                    for key in found:
+                        del self._data[key]
+                return len(found)
+            if command == b'EXPIRE' and len(args) == 3:
+                item = self._alive(args[1])
+                if not item:
+                    return 0
+                self._data[args[1]] = (item[0], time.time() + int(args[2]))
+                return 1
+            if command == b'TTL' and len(args) == 2:
+                item = self._alive(args[1])
+                if not item:
+                    return -2
+                return -1 if item[1] is None else int(item[1] - time.time())
+            if command == b'FLUSHDB':
+                self._data.clear()
+                return 'OK'
+        return Exception(f"ERR unknown command or wrong number of arguments for '{command.decode(errors='replace')}'")
+
+
+def encode_reply(value: object) -> bytes:
+    """응답 값을 RESP 형식으로 인코딩합니다."""
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, Exception):
+        return b'-%s\r\n' % str(value).encode('utf-8')
+    if isinstance(value, str):
+        return b'+%s\r\n' % value.encode('utf-8')
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """연결 하나에서 들어오는 RESP 명령을 처리합니다."""
+    def read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # 인라인 명령 (예: telnet에서 입력한 PING)
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self) -> None:
+        while True:
+            try:
+                args = self.read_command()
+            except (ValueError, ConnectionError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            self.wfile.write(encode_reply(self.server.store.execute(args)))
+            self.wfile.flush()
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """RESP 대체 서버"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 6379)):
+        super().__init__(address, RespHandler)
+        self.store = RespStore()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start_in_thread(self) -> threading.Thread:
+        """백그라운드 스레드에서 서버를 실행합니다."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="개발용 RESP(Redis 프로토콜) 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    with RespServer((args.host, args.port)) as server:
+        print(f"RESP 서버 실행 중: {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
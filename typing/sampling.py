@@ -0,0 +1,60 @@
+"""큰 파일에서 연습할 문장을 고르게 뽑는 무작위 추출
+
+- ``reservoir_sample``: 길이를 모르는 스트림(업로드한 텍스트 파일)을 한 번만 읽으며 k개를 고르게 뽑음.
+  Algorithm L로 다음에 바꿀 항목까지 건너뛸 개수를 바로 계산하므로 난수는 O(k log(n/k))개만 쓰고,
+  메모리는 파일 크기와 관계없이 k개에 비례합니다.
+- ``sample_sequence``: 길이와 위치별 접근을 아는 경우(코퍼스 블록 색인) k개의 위치만 뽑아 읽음.
+
+같은 seed를 주면 같은 문장을 같은 순서로 뽑습니다.
+"""
+import math
+import random
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+_MISSING = object()
+
+
+def make_rng(seed: Optional[int] = None) -> random.Random:
+    """seed가 없으면 매번 다른 난수 생성기를 만듭니다."""
+    return random.Random(seed)
+
+
+def _weight(rng: random.Random, k: int) -> float:
+    # random()은 0을 반환할 수 있으므로 (0, 1] 구간의 값을 사용
+    return math.exp(math.log(1.0 - rng.random()) / k)
+
+
+def reservoir_sample(items: Iterable[T], k: int, rng: Optional[random.Random] = None) -> List[T]:
+    """items에서 최대 k개를 고르게 뽑아 무작위 순서로 반환합니다. (한 번만 읽음, Algorithm L)"""
+    if k < 0:
+        raise ValueError("뽑을 개수는 0 이상이어야 합니다.")
+    rng = rng or make_rng()
+    source = iter(items)
+    reservoir = list(islice(source, k))
+    if len(reservoir) == k and k > 0:
+        w = _weight(rng, k)
+        while w < 1.0:
+            # 다음에 저장소에 들어갈 항목까지 건너뛸 개수 (기하 분포)
+            skip = int(math.log(1.0 - rng.random()) / math.log1p(-w))
+            item = next(islice(source, skip, None), _MISSING)
+            if item is _MISSING:
+                break
+            reservoir[rng.randrange(k)] = item
+            w *= _weight(rng, k)
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+def sample_sequence(sequence: Sequence[T], k: int, rng: Optional[random.Random] = None) -> List[T]:
+    """위치로 읽을 수 있는 sequence에서 최대 k개를 고르게 뽑아 무작위 순서로 반환합니다.
+
+    뽑은 위치를 앞에서부터 읽으므로 코퍼스는 필요한 블록만 한 번씩 풉니다.
+    """
+    if k < 0:
+        raise ValueError("뽑을 개수는 0 이상이어야 합니다.")
+    rng = rng or make_rng()
+    indices = rng.sample(range(len(sequence)), min(k, len(sequence)))
+    items = {index: sequence[index] for index in sorted(indices)}
+    return [items[index] for index in indices]
@@ -0,0 +1,306 @@
+"""코퍼스 문장 전문 검색 (역색인)
+
+한글·한자·가나는 글자 2-gram(한 글자뿐인 덩어리는 그 글자)을, 그 밖의 문자는 단어를 색인 단위(term)로
+쓰고, term마다 그 term이 들어 있는 문장 번호 목록(postings)을 만듭니다. 문장은 번호 순서대로 추가되므로
+postings는 항상 정렬되어 있습니다.
+
+``CorpusWriter(index=SearchIndex())``로 코퍼스를 쓰면 문장을 추가할 때마다 색인도 함께 만들어
+블록들과 메타데이터 사이에 저장합니다 (``metadata["index"]``)::
+
+    HEADER | term 목록(정렬) | term별 시작 위치 | term별 postings 시작 위치 | 문장별 term 수 | postings
+
+색인을 열 때는 term 목록을 풀지 않고 이진 탐색하므로 term이 수백만 개여도 바로 열립니다.
+
+검색은 검색어 term 중 ``min_should_match`` 비율 이상이 들어 있는 문장을 BM25로 점수 매기고,
+점수가 높은 후보 중 검색어가 그대로 들어 있는 문장을 앞에 놓습니다. numpy가 있으면 점수 계산을
+배열 연산으로 하여 문장 수가 많아도 흔한 검색어를 빠르게 처리합니다.
+"""
+import heapq
+import math
+import re
+import struct
+import unicodedata
+from array import array
+from collections import defaultdict
+from bisect import bisect_left
+from typing import BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from config import SEARCH_CONFIG
+from corpus import CorpusReader, from_le_bytes, to_le_bytes
+from hangul import normalize as normalize_hangul
+
+try:
+    import numpy as np
+except ImportError:  # 없으면 순수 Python으로 점수를 계산합니다
+    np = None
+
+INDEX_MAGIC = b'TIDX'
+# MAGIC, term 수, 문장 수, term 목록 바이트 수
+HEADER = struct.Struct('<4sQQQ')
+MAX_LENGTH = 0xFFFF
+
+# 글자 2-gram으로 색인할 문자 (한글 음절, 히라가나/가타카나, 한자)
+_NGRAM_CHARS = '가-힣぀-ヿ㐀-䶿一-鿿'
+_NGRAM_RUN = re.compile(f'[{_NGRAM_CHARS}]+')
+_WORD = re.compile(f'[^\\W_{_NGRAM_CHARS}]+')
+
+
+class SearchHit(NamedTuple):
+    """검색 결과 (코퍼스 안의 문장 번호, 문장, 점수)"""
+    position: int
+    sentence: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    """검색용으로 한글 입력 표현, 전각/반각, 대소문자를 통일합니다."""
+    return unicodedata.normalize('NFKC', normalize_hangul(text)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """문장을 색인 단위(term) 목록으로 나눕니다. ('Python으로' → 'python', '으로')"""
+    text = normalize(text)
+    terms = _WORD.findall(text)
+    for run in _NGRAM_RUN.findall(text):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(map(str.__add__, run, run[1:]))
+    return terms
+
+
+class _Index:
+    """SearchIndex와 IndexReader가 함께 쓰는 문장 길이 정보"""
+    lengths: array
+    _factors: Optional[List[float]] = None
+    _factors_count = -1
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def length_factors(self) -> List[float]:
+        """문장 길이(term 수)별 BM25 길이 보정 값. 문장 수가 바뀔 때만 다시 계산합니다."""
+        if self._factors_count != len(self.lengths):
+            k1, b = SEARCH_CONFIG["k1"], SEARCH_CONFIG["b"]
+            average = sum(self.lengths) / len(self.lengths) if self.lengths else 1.0
+            average = average or 1.0
+            self._factors = [(k1 + 1) / (1 + k1 * (1 - b + b * length / average))
+                             for length in range(max(self.lengths, default=0) + 1)]
+            self._factors_count = len(self.lengths)
+        return self._factors
+
+
+class SearchIndex(_Index):
+    """문장을 추가하며 메모리에서 만드는 역색인. 코퍼스에 이어 쓸 때는 기존 색인을 불러와 이어 만듭니다."""
+    def __init__(self):
+        self.postings: Dict[str, array] = defaultdict(lambda: array('I'))
+        self.lengths = array('H')
+
+    def add(self, sentence: str) -> int:
+        """문장을 색인하고 문장 번호를 반환합니다."""
+        position = len(self.lengths)
+        terms = tokenize(sentence)
+        self.lengths.append(min(len(terms), MAX_LENGTH))
+        postings = self.postings
+        for term in set(terms):
+            postings[term].append(position)
+        return position
+
+    def add_many(self, sentences: Iterable[str]) -> None:
+        for sentence in sentences:
+            self.add(sentence)
+
+    def extend(self, other: 'SearchIndex') -> None:
+        """다음 문장들만으로 따로 만든 색인 조각을 뒤에 이어 붙입니다."""
+        offset = len(self.lengths)
+        postings = self.postings
+        for term, positions in other.postings.items():
+            postings[term].extend(position + offset for position in positions)
+        self.lengths.extend(other.lengths)
+
+    def __getstate__(self) -> Tuple[Dict[str, array], array]:
+        # 작업 프로세스에서 만든 색인 조각을 주고받을 수 있도록 defaultdict 대신 dict로 보냅니다
+        return dict(self.postings), self.lengths
+
+    def __setstate__(self, state: Tuple[Dict[str, array], array]) -> None:
+        self.__init__()
+        postings, self.lengths = state
+        self.postings.update(postings)
+
+    def postings_for(self, term: str) -> Sequence[int]:
+        return self.postings.get(term, ())
+
+    def load(self, reader: CorpusReader) -> None:
+        """코퍼스에 저장된 색인을 불러옵니다. 색인 없이 만든 코퍼스면 기존 문장으로 새로 만듭니다."""
+        self.postings.clear()
+        self.lengths = array('H')
+        info = reader.metadata.get("index")
+        if not info:
+            self.add_many(reader)
+            return
+        stored = IndexReader(reader._file, info["offset"])
+        self.lengths = stored.lengths
+        reader._file.seek(stored.postings_offset)
+        data = from_le_bytes('I', reader._file.read(4 * stored.offsets[-1]))
+        offsets = stored.offsets
+        for i in range(stored.num_terms):
+            self.postings[stored.term(i)] = data[offsets[i]:offsets[i + 1]]
+
+    def write(self, fileobj: BinaryIO) -> Dict[str, int]:
+        """현재 파일 위치에 색인을 기록하고 메타데이터에 넣을 위치 정보를 반환합니다."""
+        start = fileobj.tell()
+        terms = sorted(term.encode('utf-8') for term in self.postings)
+        term_offsets, offsets = array('Q', [0]), array('Q', [0])
+        for term in terms:
+            term_offsets.append(term_offsets[-1] + len(term))
+            offsets.append(offsets[-1] + len(self.postings[term.decode('utf-8')]))
+        fileobj.write(HEADER.pack(INDEX_MAGIC, len(terms), len(self.lengths), term_offsets[-1]))
+        fileobj.write(b''.join(terms))
+        fileobj.write(to_le_bytes(term_offsets))
+        fileobj.write(to_le_bytes(offsets))
+        fileobj.write(to_le_bytes(self.lengths))
+        for term in terms:
+            fileobj.write(to_le_bytes(self.postings[term.decode('utf-8')]))
+        return {"offset": start, "length": fileobj.tell() - start}
+
+
+class IndexReader(_Index):
+    """코퍼스 파일에 저장된 색인. term 목록과 문장 길이만 읽어 두고 postings는 검색할 때 읽습니다."""
+    def __init__(self, fileobj: BinaryIO, offset: int):
+        self._file = fileobj
+        fileobj.seek(offset)
+        magic, num_terms, num_sentences, terms_len = HEADER.unpack(fileobj.read(HEADER.size))
+        if magic != INDEX_MAGIC:
+            raise ValueError("검색 색인이 손상되었습니다.")
+        self.num_terms = num_terms
+        self._terms = fileobj.read(terms_len)
+        self._term_offsets = from_le_bytes('Q', fileobj.read(8 * (num_terms + 1)))
+        self.offsets = from_le_bytes('Q', fileobj.read(8 * (num_terms + 1)))
+        self.lengths = from_le_bytes('H', fileobj.read(2 * num_sentences))
+        self.postings_offset = fileobj.tell()
+
+    def _term_bytes(self, i: int) -> bytes:
+        return self._terms[self._term_offsets[i]:self._term_offsets[i + 1]]
+
+    def term(self, i: int) -> str:
+        return self._term_bytes(i).decode('utf-8')
+
+    def postings_for(self, term: str) -> Sequence[int]:
+        # UTF-8 바이트 순서는 코드 포인트 순서와 같으므로 정렬된 term 목록을 바이트로 이진 탐색합니다
+        key = term.encode('utf-8')
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.num_terms or self._term_bytes(lo) != key:
+            return ()
+        i = lo
+        start, end = self.offsets[i], self.offsets[i + 1]
+        self._file.seek(self.postings_offset + 4 * start)
+        return from_le_bytes('I', self._file.read(4 * (end - start)))
+
+
+def open_index(reader: CorpusReader) -> Optional[IndexReader]:
+    """코퍼스에 저장된 색인을 엽니다. 색인 없이 만든 코퍼스면 None을 반환합니다."""
+    info = reader.metadata.get("index")
+    return IndexReader(reader._file, info["offset"]) if info else None
+
+
+def _top_python(index: _Index, lists: List[Sequence[int]], weights: List[float],
+                required: int, size: int) -> List[Tuple[int, float]]:
+    """required개 이상의 term이 들어 있는 문장 중 점수가 높은 size개의 (문장 번호, 점수)를 반환합니다.
+
+    드문 term부터 더합니다. 남은 term을 모두 포함해도 required에 못 미치는 문장은 새로 넣지 않고
+    이미 후보인 문장만 이진 탐색으로 확인합니다.
+    """
+    scores: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    for i, (postings, weight) in enumerate(zip(lists, weights)):
+        if i == 0:
+            scores = dict.fromkeys(postings, weight)
+            counts = dict.fromkeys(postings, 1)
+        elif i <= len(lists) - required:
+            for position in postings:
+                scores[position] = scores.get(position, 0.0) + weight
+                counts[position] = counts.get(position, 0) + 1
+        else:
+            for position in scores:
+                j = bisect_left(postings, position)
+                if j < len(postings) and postings[j] == position:
+                    scores[position] += weight
+                    counts[position] += 1
+
+    lengths, factor = index.lengths, index.length_factors()
+    candidates = scores if required == 1 else [p for p, count in counts.items() if count >= required]
+    pool = heapq.nlargest(size, candidates, key=lambda p: scores[p] * factor[lengths[p]])
+    return [(p, scores[p] * factor[lengths[p]]) for p in pool]
+
+
+def _top_numpy(index: _Index, lists: List[Sequence[int]], weights: List[float],
+               required: int, size: int) -> List[Tuple[int, float]]:
+    """_top_python과 같은 결과를 배열 연산으로 계산합니다."""
+    positions = [np.frombuffer(postings, dtype=np.uint32) for postings in lists]
+    if required == len(lists):
+        # 모든 term이 들어 있어야 하면 가장 드문 term의 문장들만 나머지 postings에서 이진 탐색합니다
+        candidates = positions[0]
+        for other in positions[1:]:
+            found = np.minimum(np.searchsorted(other, candidates), len(other) - 1)
+            candidates = candidates[other[found] == candidates]
+        scores = np.full(len(candidates), sum(weights))
+    else:
+        dense = np.zeros(len(index), dtype=np.float64)
+        counts = np.zeros(len(index), dtype=np.uint8)
+        for other, weight in zip(positions, weights):
+            dense[other] += weight
+            counts[other] += 1
+        candidates = np.flatnonzero(counts >= required)
+        scores = dense[candidates]
+    lengths = np.frombuffer(index.lengths, dtype=np.uint16)[candidates]
+    final = scores * np.asarray(index.length_factors())[lengths]
+    if len(candidates) > size:
+        top = np.argpartition(-final, size)[:size]
+        candidates, final = candidates[top], final[top]
+    order = np.lexsort((candidates, -final))
+    return list(zip(candidates[order].tolist(), final[order].tolist()))
+
+
+def search(index: _Index, sentences: Sequence[str], query: str,
+           limit: int = SEARCH_CONFIG["max_results"],
+           min_should_match: float = SEARCH_CONFIG["min_should_match"]) -> List[SearchHit]:
+    """검색어와 관련 있는 문장을 점수가 높은 순서로 최대 limit개 반환합니다.
+
+    index는 SearchIndex나 IndexReader, sentences는 같은 순서의 문장 목록(CorpusReader 등)입니다.
+    한 문장 안에서 같은 term은 한 번만 세므로, 점수는 일치한 term의 IDF 합에 BM25 길이 보정을 곱한 값입니다.
+    """
+    query_terms = set(tokenize(query))
+    if not query_terms or not len(index) or limit < 1:
+        return []
+    total = len(index)
+    lists = sorted((p for p in map(index.postings_for, query_terms) if len(p)), key=len)
+    required = max(1, math.ceil(len(query_terms) * min_should_match))
+    if len(lists) < required:
+        return []
+
+    weights = [math.log(1 + (total - len(p) + 0.5) / (len(p) + 0.5)) for p in lists]
+    rank = _top_numpy if np is not None else _top_python
+    # term이 하나면 검색어가 그대로 들어 있는지 확인할 필요가 없으므로 결과 수만큼만 읽습니다
+    size = limit * SEARCH_CONFIG["phrase_pool"] if len(query_terms) > 1 else limit
+    pool = rank(index, lists, weights, required, size)
+
+    # 블록 캐시를 살리도록 문장 번호 순서로 읽고, 검색어가 그대로 들어 있는 문장을 앞에 놓습니다
+    phrase = ' '.join(normalize(query).split())
+    texts = {position: sentences[position] for position in sorted(p for p, _ in pool)}
+    hits = [SearchHit(p, texts[p], score) for p, score in pool]
+    hits.sort(key=lambda hit: phrase not in normalize(hit.sentence))
+    return hits[:limit]
+
+
+def search_corpus(reader: CorpusReader, query: str, limit: int = SEARCH_CONFIG["max_results"]) -> List[SearchHit]:
+    """코퍼스에서 검색합니다. 색인 없이 만든 코퍼스면 메모리에서 색인을 만들어 검색합니다."""
+    index = open_index(reader)
+    if index is None:
+        index = SearchIndex()
+        index.add_many(reader)
+    return search(index, reader, query, limit)
@@ -0,0 +1,152 @@
+"""사용자가 이미 입력한 문장을 기억하는 확률적 집합 (Bloom 필터)
+
+``TypingManager``마다 하나씩 두고 세션 상태와 함께 저장하므로, 여기서 사용자는 세션 ID를 뜻합니다.
+
+문장 해시만 비트 배열에 기록하므로 문장당 2바이트 남짓으로 문장 수와 관계없이 빠르게 확인할 수 있습니다.
+없는 문장을 있다고 잘못 판단할 수는 있지만(오탐), 입력한 문장을 모른다고 하지는 않습니다.
+
+정한 용량이 차면 더 크고 오탐률이 낮은 필터를 하나씩 덧붙이므로(Scalable Bloom filter)
+문장 수가 늘어도 전체 오탐률은 ``error_rate / (1 - tightening)`` 아래로 유지됩니다.
+"""
+import base64
+import hashlib
+import math
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple
+from config import SEEN_CONFIG
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<BB')       # 형식 버전, 필터 수
+LAYER = struct.Struct('<IIIB')      # 용량, 추가한 문장 수, 비트 수, 해시 함수 수
+
+
+def sentence_hashes(sentence: str) -> Tuple[int, int]:
+    """문장의 해시 두 개 (공백 차이는 무시합니다)"""
+    digest = hashlib.blake2b(' '.join(sentence.split()).encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class BloomFilter:
+    """고정 크기 Bloom 필터. 해시 두 개를 섞어 k개의 비트 위치를 만듭니다 (Kirsch-Mitzenmacher)."""
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("용량은 1 이상, 오탐률은 0과 1 사이여야 합니다.")
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, hashes: Tuple[int, int]) -> Iterator[int]:
+        h1, h2 = hashes
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, hashes: Tuple[int, int]) -> None:
+        for position in self._positions(hashes):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, hashes: Tuple[int, int]) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(hashes))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class SeenFilter:
+    """입력한 문장을 기록하고, 새 문장 목록에서 이미 입력한 문장을 건너뛰거나 뒤로 미루는 필터"""
+    def __init__(self, capacity: int = SEEN_CONFIG["capacity"], error_rate: float = SEEN_CONFIG["error_rate"]):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.layers: List[BloomFilter] = [BloomFilter(capacity, error_rate)]
+
+    def __len__(self) -> int:
+        """기록한 문장 수. 같은 문장은 한 번만 세며, 오탐으로 이미 있다고 판단한 문장은 세지 않습니다."""
+        return sum(layer.count for layer in self.layers)
+
+    def __contains__(self, sentence: str) -> bool:
+        hashes = sentence_hashes(sentence)
+        return any(hashes in layer for layer in self.layers)
+
+    def add(self, sentence: str) -> bool:
+        """입력한 문장을 기록합니다. 처음 기록하면 True를 반환합니다."""
+        hashes = sentence_hashes(sentence)
+        if any(hashes in layer for layer in self.layers):
+            return False
+        if self.layers[-1].full:
+            depth = len(self.layers)
+            self.layers.append(BloomFilter(self.capacity * SEEN_CONFIG["growth"] ** depth,
+                                           self.error_rate * SEEN_CONFIG["tightening"] ** depth))
+        self.layers[-1].add(hashes)
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        """비트 배열 크기 합계"""
+        return sum(len(layer.bits) for layer in self.layers)
+
+    def prefer_unseen(self, sentences: Iterable[str], policy: str = SEEN_CONFIG["policy"],
+                      max_deferred: int = SEEN_CONFIG["max_deferred"]) -> Iterator[str]:
+        """처음 보는 문장을 먼저 순서대로 반환합니다.
+
+        이미 입력한 문장은 policy가 "deprioritize"면 마지막에 반환하고, "skip"이면 버립니다.
+        다만 skip이어도 처음 보는 문장이 하나도 없으면 연습할 문장이 남도록 미뤄 둔 문장을 반환합니다.
+        미뤄 두는 문장은 max_deferred개까지입니다.
+        """
+        if policy not in ("skip", "deprioritize"):
+            raise ValueError(f"지원하지 않는 정책입니다: {policy}")
+        deferred: List[str] = []
+        fresh = 0
+        for sentence in sentences:
+            if sentence in self:
+                if len(deferred) < max_deferred:
+                    deferred.append(sentence)
+            else:
+                fresh += 1
+                yield sentence
+        if policy == "deprioritize" or not fresh:
+            yield from deferred
+
+    def to_bytes(self) -> bytes:
+        parts = [HEADER.pack(FORMAT_VERSION, len(self.layers))]
+        for layer in self.layers:
+            parts.append(LAYER.pack(layer.capacity, layer.count, layer.num_bits, layer.num_hashes))
+            parts.append(bytes(layer.bits))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = SEEN_CONFIG["capacity"],
+                   error_rate: float = SEEN_CONFIG["error_rate"]) -> 'SeenFilter':
+        if len(data) < HEADER.size:
+            raise ValueError("입력한 문장 기록 형식이 올바르지 않습니다.")
+        version, num_layers = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION or not num_layers:
+            raise ValueError("입력한 문장 기록 형식이 올바르지 않습니다.")
+        seen = cls(capacity, error_rate)
+        seen.layers = []
+        offset = HEADER.size
+        for _ in range(num_layers):
+            if len(data) < offset + LAYER.size:
+                raise ValueError("입력한 문장 기록이 잘렸습니다.")
+            layer_capacity, count, num_bits, num_hashes = LAYER.unpack_from(data, offset)
+            offset += LAYER.size
+            layer = BloomFilter.__new__(BloomFilter)
+            layer.capacity, layer.count, layer.num_bits, layer.num_hashes = layer_capacity, count, num_bits, num_hashes
+            layer.bits = bytearray(data[offset:offset + (num_bits + 7) // 8])
+            if len(layer.bits) != (num_bits + 7) // 8:
+                raise ValueError("입력한 문장 기록이 잘렸습니다.")
+            offset += len(layer.bits)
+            seen.layers.append(layer)
+        return seen
+
+    def to_state(self) -> str:
+        """세션 상태(JSON)에 넣을 문자열"""
+        return base64.b64encode(self.to_bytes()).decode('ascii')
+
+    @classmethod
+    def from_state(cls, state: Optional[str]) -> 'SeenFilter':
+        """저장한 문자열로 복원합니다. 기록이 없던 세션이면 빈 필터를 반환합니다."""
+        return cls.from_bytes(base64.b64decode(state)) if state else cls()
@@ -0,0 +1,220 @@
+"""프로세스 메모리에 올려 둔 타이핑 세션과 세션별 메모리 사용량 관리
+
+세션마다 문장 목록과 통계의 크기를 추정하여 합계를 ``budget_bytes`` 아래로 유지합니다.
+예산을 넘으면 가장 오래 쓰이지 않은 세션부터, ``idle_ttl`` 동안 쓰이지 않은 세션은 예산과 관계없이
+내보낼 세션으로 골라 반환하며, 실제 기록(디스크나 세션 저장소로 내보내기)은 호출한 쪽이 합니다.
+사용 중(``pin``)이거나 문장을 불러오는 중인 세션은 내보내지 않습니다.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from config import SESSION_MEMORY_CONFIG
+from metrics import SESSION_EVICTIONS, SESSION_MEMORY_BYTES, SESSIONS_RESIDENT
+from session_store import MemoryBackend, SessionStore, SQLiteBackend
+from typing_manager import TypingManager
+
+# TypingManager/TypingStats 객체와 속성 딕셔너리 등 문장 수와 관계없는 크기 (추정값)
+BASE_SIZE = 2048
+Evicted = List[Tuple[str, TypingManager]]
+
+
+def sentences_size(sentences: List[str], start: int = 0) -> int:
+    """문장 문자열들의 크기 합계"""
+    return sum(map(sys.getsizeof, sentences[start:]))
+
+
+class _Entry:
+    __slots__ = ("manager", "size", "sentences", "counted", "sentence_bytes", "last_used", "pins")
+
+    def __init__(self, manager: TypingManager):
+        self.manager = manager
+        self.size = 0
+        # 문장 목록이 그대로이고 뒤에만 추가되었으면(스트리밍) 새 문장만 더 셉니다
+        self.sentences: Optional[List[str]] = None
+        self.counted = 0
+        self.sentence_bytes = 0
+        self.last_used = time.monotonic()
+        self.pins = 0
+
+    def measure(self) -> int:
+        """크기를 다시 추정하고 바뀐 만큼을 반환합니다."""
+        manager = self.manager
+        sentences = manager.current_sentences
+        if sentences is self.sentences and len(sentences) >= self.counted:
+            self.sentence_bytes += sentences_size(sentences, self.counted)
+        else:
+            self.sentences = sentences
+            self.sentence_bytes = sentences_size(sentences)
+        self.counted = len(sentences)
+        size = (BASE_SIZE + sys.getsizeof(sentences) + self.sentence_bytes
+                + sys.getsizeof(manager.stats.elapsed_times) + 24 * len(manager.stats.elapsed_times)
+                + manager.seen.size_bytes + manager.prepared_bytes)
+        delta, self.size = size - self.size, size
+        return delta
+
+
+class SessionPool:
+    """세션 ID별 TypingManager를 메모리 예산 안에서 보관하는 클래스 (여러 스레드에서 사용 가능)"""
+    def __init__(self, budget_bytes: int = SESSION_MEMORY_CONFIG["budget_bytes"],
+                 idle_ttl: float = SESSION_MEMORY_CONFIG["idle_ttl"],
+                 max_sessions: Optional[int] = None,
+                 sweep_interval: float = SESSION_MEMORY_CONFIG["sweep_interval"]):
+        self.budget_bytes = budget_bytes
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def size_of(self, session_id: str) -> int:
+        """세션의 추정 크기. 메모리에 없으면 0입니다."""
+        entry = self._entries.get(session_id)
+        return entry.size if entry is not None else 0
+
+    def _adjust(self, delta: int, count: int = 0) -> None:
+        self.total_bytes += delta
+        SESSION_MEMORY_BYTES.inc(delta)
+        if count:
+            SESSIONS_RESIDENT.inc(count)
+
+    def get(self, session_id: str, pin: bool = False) -> Optional[TypingManager]:
+        """메모리에 있는 세션을 반환합니다. pin이면 release할 때까지 내보내지 않습니다."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(session_id)
+            entry.last_used = time.monotonic()
+            entry.pins += pin
+            return entry.manager
+
+    def put(self, session_id: str, manager: TypingManager, pin: bool = False) -> Evicted:
+        """세션을 메모리에 올리고, 그 때문에 내보내야 할 세션 목록을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry.manager is not manager:
+                if entry is not None:
+                    self._adjust(-entry.size, -1)
+                entry = self._entries[session_id] = _Entry(manager)
+                self._adjust(0, 1)
+            self._entries.move_to_end(session_id)
+            entry.last_used = time.monotonic()
+            entry.pins += pin
+            self._adjust(entry.measure())
+            return self._enforce()
+
+    def release(self, session_id: str) -> Evicted:
+        """사용이 끝난 세션의 크기를 다시 재고, 내보내야 할 세션 목록을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.pins = max(0, entry.pins - 1)
+                entry.last_used = time.monotonic()
+                self._adjust(entry.measure())
+            evicted = self._enforce()
+        return evicted + self.maybe_sweep()
+
+    def discard(self, session_id: str) -> Optional[TypingManager]:
+        """세션을 기록하지 않고 메모리에서 지웁니다."""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return None
+            self._adjust(-entry.size, -1)
+            return entry.manager
+
+    def clear(self) -> None:
+        with self._lock:
+            self._adjust(-self.total_bytes, -len(self._entries))
+            self._entries.clear()
+
+    @staticmethod
+    def _evictable(entry: _Entry) -> bool:
+        return entry.pins == 0 and not entry.manager.is_loading
+
+    def _pop(self, session_id: str, reason: str) -> Tuple[str, TypingManager]:
+        entry = self._entries.pop(session_id)
+        self._adjust(-entry.size, -1)
+        SESSION_EVICTIONS.inc(reason=reason)
+        return session_id, entry.manager
+
+    def _enforce(self) -> Evicted:
+        """예산이나 최대 세션 수를 넘으면 오래 쓰이지 않은 세션부터 고릅니다. (잠금 안에서 호출)"""
+        evicted = []
+        if self.total_bytes <= self.budget_bytes and (self.max_sessions is None
+                                                      or len(self._entries) <= self.max_sessions):
+            return evicted
+        for session_id in [key for key, entry in self._entries.items() if self._evictable(entry)]:
+            over_budget = self.total_bytes > self.budget_bytes
+            if not over_budget and (self.max_sessions is None or len(self._entries) <= self.max_sessions):
+                break
+            evicted.append(self._pop(session_id, "budget" if over_budget else "count"))
+        return evicted
+
+    def maybe_sweep(self) -> Evicted:
+        """마지막 확인 후 sweep_interval이 지났으면 sweep합니다."""
+        if time.monotonic() - self._last_sweep < self.sweep_interval:
+            return []
+        return self.sweep()
+
+    def sweep(self, now: Optional[float] = None) -> Evicted:
+        """idle_ttl 동안 쓰이지 않은 세션을 고릅니다."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            idle = [key for key, entry in self._entries.items()
+                    if now - entry.last_used >= self.idle_ttl and self._evictable(entry)]
+            return [self._pop(session_id, "idle") for session_id in idle]
+
+
+class SpillStore:
+    """메모리에서 내린 세션을 기록하고 다시 불러오는 저장소
+
+    memory 저장소는 내린 세션도 프로세스 메모리에 남으므로, 이때는 SQLite 파일에 기록하고
+    memory 저장소에서는 지웁니다. sqlite/redis 저장소는 그 저장소에 그대로 기록합니다.
+    memory 저장소에 메모리에 올라 있는 세션까지 기록하면 같은 세션을 두 번 들고 있게 되므로,
+    이때 ``save_resident``는 아무것도 기록하지 않고 세션을 내릴 때만 파일에 기록합니다.
+    """
+    def __init__(self, store: SessionStore, path: str = SESSION_MEMORY_CONFIG["spill_path"]):
+        self.store = store
+        self.spill = store
+        if isinstance(store.backend, MemoryBackend):
+            self.spill = SessionStore(SQLiteBackend(path), key_prefix=store.key_prefix, ttl=store.ttl)
+            # 다시 쓰이지 않은 세션이 파일에 쌓이지 않도록 시작할 때 한 번 지우고, 이후에는 기록할 때 가끔 지웁니다
+            self.spill.backend.purge_expired()
+
+    def save_resident(self, session_id: str, manager: TypingManager) -> bool:
+        """메모리에 올라 있는 세션이 바뀌었으면 세션 저장소에 기록하고, 실제로 기록했는지 반환합니다."""
+        if self.spill is not self.store:
+            return False
+        return self.store.save(session_id, manager)
+
+    def save(self, evicted: Evicted) -> None:
+        """내린 세션들을 기록합니다."""
+        for session_id, manager in evicted:
+            self.spill.save(session_id, manager)
+            if self.spill is not self.store:
+                self.store.delete(session_id)
+
+    def load(self, session_id: str) -> Optional[TypingManager]:
+        """내렸던 세션이나 저장된 세션을 불러옵니다. 없으면 None을 반환합니다."""
+        if self.spill is not self.store:
+            manager = self.spill.load(session_id)
+            if manager is not None:
+                self.spill.delete(session_id)
+                return manager
+        return self.store.load(session_id)
+
+    def close(self) -> None:
+        if self.spill is not self.store:
+            self.spill.close()
@@ -0,0 +1,303 @@
+"""타이핑 세션 상태를 외부 저장소에 보관하는 모듈
+
+상태는 ``버전(1바이트) | zlib(JSON)`` 형식으로 직렬화되어 저장소에 기록됩니다.
+저장소는 메모리, SQLite, Redis 프로토콜(RESP) 서버 중에서 고를 수 있으며,
+여러 앱 프로세스가 같은 저장소를 쓰면 프로세스가 바뀌거나 재시작되어도 세션이 유지됩니다.
+"""
+import json
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+from config import SESSION_CONFIG
+from typing_manager import TypingManager
+
+STATE_VERSION = 1
+
+
+def encode_state(state: Dict[str, Any], level: int = SESSION_CONFIG["compress_level"]) -> bytes:
+    """상태 딕셔너리를 저장용 바이트로 변환합니다."""
+    payload = json.dumps(state, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return bytes([STATE_VERSION]) + zlib.compress(payload, level)
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """저장된 바이트를 상태 딕셔너리로 변환합니다."""
+    if not data or data[0] != STATE_VERSION:
+        raise ValueError(f"지원하지 않는 세션 상태 버전입니다: {data[0] if data else None}")
+    return json.loads(zlib.decompress(data[1:]).decode('utf-8'))
+
+
+class MemoryBackend:
+    """프로세스 메모리에 세션을 저장하는 저장소 (단일 프로세스용)"""
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._data[key]
+                return None
+            return item[0]
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def purge_expired(self) -> int:
+        """만료된 세션을 지우고 지운 개수를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires) in self._data.items() if expires <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """SQLite 파일에 세션을 저장하는 저장소 (한 서버의 여러 프로세스용)"""
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, timeout=SESSION_CONFIG["socket_timeout"], check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sessions WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (key, value, expires) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """만료된 세션을 지우고 지운 개수를 반환합니다."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM sessions WHERE expires <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RespError(Exception):
+    """RESP 서버가 오류 응답을 보냈을 때 발생하는 예외"""
+
+
+# 저장소 연결/입출력 실패 시 발생할 수 있는 예외
+BACKEND_ERRORS = (OSError, sqlite3.Error, RespError)
+
+
+class RedisBackend:
+    """Redis 프로토콜(RESP)을 쓰는 서버에 세션을 저장하는 저장소 (여러 서버용)
+
+    필요한 명령(GET, SET EX, DEL)만 구현한 최소 클라이언트이며, 연결은 처음 사용할 때 맺습니다.
+    """
+    def __init__(self, url: str, timeout: float = SESSION_CONFIG["socket_timeout"]):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"redis:// 주소가 아닙니다: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        """서버에 연결하고 인증/DB 선택을 수행합니다."""
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self._send_command("AUTH", self.password)
+        if self.db:
+            self._send_command("SELECT", str(self.db))
+
+    @staticmethod
+    def _pack(args: Tuple[Union[str, bytes], ...]) -> bytes:
+        """명령을 RESP 배열로 인코딩합니다."""
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg.encode('utf-8') if isinstance(arg, str) else arg
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        return b''.join(parts)
+
+    def _read_reply(self) -> Any:
+        """RESP 응답 하나를 읽습니다."""
+        line = self._reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError("RESP 서버와의 연결이 끊어졌습니다.")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode('utf-8')
+        if kind == b'-':
+            raise RespError(rest.decode('utf-8'))
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"알 수 없는 RESP 응답입니다: {line!r}")
+
+    def _send_command(self, *args: Union[str, bytes]) -> Any:
+        self._sock.sendall(self._pack(args))
+        return self._read_reply()
+
+    def execute(self, *args: Union[str, bytes]) -> Any:
+        """명령을 실행하고 응답을 반환합니다. 연결이 끊겼으면 한 번 다시 연결합니다."""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._send_command(*args)
+                except (ConnectionError, socket.timeout, OSError):
+                    self._disconnect()
+                    if attempt:
+                        raise
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.execute("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.execute("SET", key, value, "EX", str(int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self.execute("DEL", key)
+
+    def purge_expired(self) -> int:
+        """만료된 키는 서버가 지우므로 할 일이 없습니다."""
+        return 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+def create_backend(config: Dict[str, Any] = SESSION_CONFIG):
+    """설정에 맞는 세션 저장소를 생성합니다."""
+    backend = config["backend"]
+    if backend == "memory":
+        return MemoryBackend()
+    if backend == "sqlite":
+        return SQLiteBackend(config["sqlite_path"])
+    if backend == "redis":
+        return RedisBackend(config["redis_url"])
+    raise ValueError(f"지원하지 않는 세션 저장소입니다: {backend}")
+
+
+class SessionStore:
+    """세션 ID별 TypingManager를 저장소에서 불러오고 변경된 경우에만 기록하는 클래스
+
+    변경 여부는 TypingManager.version으로 판단하므로, 바뀌지 않은 세션은 직렬화하지 않고 건너뜁니다.
+    """
+    def __init__(self, backend=None, key_prefix: str = SESSION_CONFIG["key_prefix"],
+                 ttl: int = SESSION_CONFIG["ttl"], tracked_sessions: int = SESSION_CONFIG["tracked_sessions"],
+                 purge_every: int = SESSION_CONFIG["purge_every"]):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.tracked_sessions = tracked_sessions
+        self.purge_every = purge_every
+        # 세션별로 마지막으로 읽거나 쓴 상태의 버전 (변경 여부 판단용)
+        self._versions: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.writes = 0
+
+    def _key(self, session_id: str) -> str:
+        return self.key_prefix + session_id
+
+    def _remember(self, session_id: str, version: Any) -> None:
+        with self._lock:
+            self._versions[session_id] = version
+            self._versions.move_to_end(session_id)
+            while len(self._versions) > self.tracked_sessions:
+                self._versions.popitem(last=False)
+
+    def load(self, session_id: str) -> Optional[TypingManager]:
+        """저장된 세션을 불러옵니다. 없거나 읽을 수 없으면 None을 반환합니다."""
+        data = self.backend.get(self._key(session_id))
+        if data is None:
+            return None
+        try:
+            manager = TypingManager.from_state(decode_state(data))
+        except (ValueError, KeyError, TypeError, zlib.error):
+            return None
+        self._remember(session_id, manager.version)
+        return manager
+
+    def is_saved(self, session_id: str, manager: TypingManager) -> bool:
+        """세션이 마지막으로 읽거나 쓴 뒤로 바뀌지 않았는지 확인합니다."""
+        with self._lock:
+            return self._versions.get(session_id) == manager.version
+
+    def save(self, session_id: str, manager: TypingManager) -> bool:
+        """상태가 바뀐 경우에만 저장하고, 실제로 저장했는지 반환합니다."""
+        if self.is_saved(session_id, manager):
+            return False
+        self.save_state(session_id, manager.to_state(), manager.version)
+        return True
+
+    def save_state(self, session_id: str, state: Dict[str, Any], version: Any) -> None:
+        """미리 복사해 둔 상태를 저장하고 그 상태의 버전을 기억합니다."""
+        self.backend.set(self._key(session_id), encode_state(state), self.ttl)
+        self._remember(session_id, version)
+        self.writes += 1
+        # 다시 읽히지 않는 세션도 쌓이지 않도록 기록할 때 가끔 만료된 세션을 지웁니다
+        if self.purge_every and self.writes % self.purge_every == 0:
+            self.backend.purge_expired()
+
+    def delete(self, session_id: str) -> None:
+        """세션을 삭제합니다."""
+        self.backend.delete(self._key(session_id))
+        with self._lock:
+            self._versions.pop(session_id, None)
+
+    def close(self) -> None:
+        self.backend.close()
@@ -0,0 +1,2 @@
+// hangul.py로 생성한 파일입니다. 직접 수정하지 마세요.
+const HANGUL_TABLES = {"base":44032,"count":11172,"choseong":["ㄱ","ㄲ","ㄴ","ㄷ","ㄸ","ㄹ","ㅁ","ㅂ","ㅃ","ㅅ","ㅆ","ㅇ","ㅈ","ㅉ","ㅊ","ㅋ","ㅌ","ㅍ","ㅎ"],"jungseong":["ㅏ","ㅐ","ㅑ","ㅒ","ㅓ","ㅔ","ㅕ","ㅖ","ㅗ","ㅗㅏ","ㅗㅐ","ㅗㅣ","ㅛ","ㅜ","ㅜㅓ","ㅜㅔ","ㅜㅣ","ㅠ","ㅡ","ㅡㅣ","ㅣ"],"jongseong":["","ㄱ","ㄲ","ㄱㅅ","ㄴ","ㄴㅈ","ㄴㅎ","ㄷ","ㄹ","ㄹㄱ","ㄹㅁ","ㄹㅂ","ㄹㅅ","ㄹㅌ","ㄹㅍ","ㄹㅎ","ㅁ","ㅂ","ㅂㅅ","ㅅ","ㅆ","ㅇ","ㅈ","ㅊ","ㅋ","ㅌ","ㅍ","ㅎ"],"compound":{"ㅘ":"ㅗㅏ","ㅙ":"ㅗㅐ","ㅚ":"ㅗㅣ","ㅝ":"ㅜㅓ","ㅞ":"ㅜㅔ","ㅟ":"ㅜㅣ","ㅢ":"ㅡㅣ","ㄳ":"ㄱㅅ","ㄵ":"ㄴㅈ","ㄶ":"ㄴㅎ","ㄺ":"ㄹㄱ","ㄻ":"ㄹㅁ","ㄼ":"ㄹㅂ","ㄽ":"ㄹㅅ","ㄾ":"ㄹㅌ","ㄿ":"ㄹㅍ","ㅀ":"ㄹㅎ","ㅄ":"ㅂㅅ"},"conjoining":{"4352":"ㄱ","4353":"ㄲ","4354":"ㄴ","4355":"ㄷ","4356":"ㄸ","4357":"ㄹ","4358":"ㅁ","4359":"ㅂ","4360":"ㅃ","4361":"ㅅ","4362":"ㅆ","4363":"ㅇ","4364":"ㅈ","4365":"ㅉ","4366":"ㅊ","4367":"ㅋ","4368":"ㅌ","4369":"ㅍ","4370":"ㅎ","4449":"ㅏ","4450":"ㅐ","4451":"ㅑ","4452":"ㅒ","4453":"ㅓ","4454":"ㅔ","4455":"ㅕ","4456":"ㅖ","4457":"ㅗ","4458":"ㅗㅏ","4459":"ㅗㅐ","4460":"ㅗㅣ","4461":"ㅛ","4462":"ㅜ","4463":"ㅜㅓ","4464":"ㅜㅔ","4465":"ㅜㅣ","4466":"ㅠ","4467":"ㅡ","4468":"ㅡㅣ","4469":"ㅣ","4520":"ㄱ","4521":"ㄲ","4522":"ㄱㅅ","4523":"ㄴ","4524":"ㄴㅈ","4525":"ㄴㅎ","4526":"ㄷ","4527":"ㄹ","4528":"ㄹㄱ","4529":"ㄹㅁ","4530":"ㄹㅂ","4531":"ㄹㅅ","4532":"ㄹㅌ","4533":"ㄹㅍ","4534":"ㄹㅎ","4535":"ㅁ","4536":"ㅂ","4537":"ㅂㅅ","4538":"ㅅ","4539":"ㅆ","4540":"ㅇ","4541":"ㅈ","4542":"ㅊ","4543":"ㅋ","4544":"ㅌ","4545":"ㅍ","4546":"ㅎ"}};
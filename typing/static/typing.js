@@ -1,9 +1,78 @@
+class HangulMatcher {
+    constructor(tables) {
+        // 음절 번호 → 자판 입력 순서의 자모 문자열 (hangul.py의 SYLLABLE_KEYS와 같은 표)
+        this.base = tables.base;
+        this.syllableKeys = new Array(tables.count);
+        for (let i = 0; i < tables.count; i++) {
+            this.syllableKeys[i] = tables.choseong[Math.floor(i / 588)]
+                + tables.jungseong[Math.floor(i / 28) % 21]
+                + tables.jongseong[i % 28];
+        }
+        // 겹모음/겹받침, 조합형 낱자모 → 자모 문자열
+        this.jamoKeys = new Map(Object.entries(tables.compound));
+        Object.entries(tables.conjoining).forEach(([code, keys]) => {
+            this.jamoKeys.set(String.fromCharCode(Number(code)), keys);
+        });
+        this.targetCache = new Map();
+    }
+
+    toKeys(text) {
+        let keys = '';
+        for (const ch of text.normalize('NFC')) {
+            const index = ch.charCodeAt(0) - this.base;
+            if (index >= 0 && index < this.syllableKeys.length) {
+                keys += this.syllableKeys[index];
+            } else {
+                keys += this.jamoKeys.has(ch) ? this.jamoKeys.get(ch) : ch;
+            }
+        }
+        return keys;
+    }
+
+    targetKeys(word) {
+        // 목표 단어는 문장이 바뀔 때까지 같으므로 한 번만 분해
+        if (!this.targetCache.has(word)) {
+            if (this.targetCache.size > 1000) this.targetCache.clear();
+            this.targetCache.set(word, this.toKeys(word));
+        }
+        return this.targetCache.get(word);
+    }
+
+    // 'correct', 'partial'(조합 중인 앞부분), 'incorrect' 중 하나를 반환
+    wordState(typed, target, composing) {
+        const typedKeys = this.toKeys(typed);
+        const targetKeys = this.targetKeys(target);
+        if (typedKeys === targetKeys) return 'correct';
+        if (composing && targetKeys.startsWith(typedKeys)) return 'partial';
+        return 'incorrect';
+    }
+}
+
+// typing_manager.split_client_timing이 찾는 구분 문자 (보이지 않는 문자)
+const TIMING_MARKER = '\u2063';
+// 타이핑 입력창 (main.py의 st.text_input 라벨). 사이드바의 다른 입력창과 구분
+const TYPING_INPUT_SELECTOR = 'input[aria-label="Type the text above"]';
+
 class TypingChecker {
     constructor() {
+        this.matcher = new HangulMatcher(HANGUL_TABLES);
         this.lastInputKey = '';
         this.currentInput = null;
         this.checkInterval = 100; // ms
         this.boundCheckTyping = this.checkTyping.bind(this);
+        // 첫 입력 시각 (performance.now, 문장마다 초기화)
+        this.firstKeyTime = null;
+    }
+
+    // 제출 직전 입력 값 끝에 "구분 문자 + 첫 입력부터 경과한 ms"를 붙임 (TIMING_CONFIG["marker"])
+    attachElapsed(input) {
+        if (this.firstKeyTime === null || input.value.includes(TIMING_MARKER)) return;
+        const elapsed = Math.round(performance.now() - this.firstKeyTime);
+        // React가 관리하는 입력창이므로 원래 setter로 값을 바꾸고 input 이벤트를 보냄
+        const setter = Object.getOwnPropertyDescriptor(
+            window.parent.HTMLInputElement.prototype, 'value').set;
+        setter.call(input, input.value + TIMING_MARKER + elapsed);
+        input.dispatchEvent(new Event('input', { bubbles: true }));
     }
 
     cleanText(text) {
@@ -12,27 +81,28 @@ class TypingChecker {
 
     checkTyping() {
         const doc = window.parent.document;
-        const input = doc.querySelector('input[type="text"]');
+        const input = doc.querySelector(TYPING_INPUT_SELECTOR);
         const words = doc.querySelectorAll('.word');
         
         if (!input) return;
         
         const inputWords = this.cleanText(input.value).split(' ');
+        // 공백으로 끝나지 않았다면 마지막 단어는 아직 입력(조합) 중
+        const composing = !/\s$/.test(input.value);
         
         // 모든 단어 스타일 초기화
         words.forEach(word => {
-            word.classList.remove('correct', 'incorrect');
+            word.classList.remove('correct', 'incorrect', 'partial');
         });
         
-        // 입력된 단어 체크
+        // 입력된 단어 체크 (자모 단위 비교)
         inputWords.forEach((word, i) => {
             if (i < words.length) {
                 const targetWord = this.cleanText(words[i].textContent);
                 const inputWord = this.cleanText(word);
-                if (inputWord === targetWord) {
-                    words[i].classList.add('correct');
-                } else if (inputWord) {
-                    words[i].classList.add('incorrect');
+                if (inputWord) {
+                    const isLast = i === inputWords.length - 1;
+                    words[i].classList.add(this.matcher.wordState(inputWord, targetWord, composing && isLast));
                 }
             }
         });
@@ -40,7 +110,7 @@ class TypingChecker {
 
     setupTypingInput() {
         const doc = window.parent.document;
-        const input = doc.querySelector('input[type="text"]');
+        const input = doc.querySelector(TYPING_INPUT_SELECTOR);
         
         if (!input) return;
         
@@ -48,19 +118,23 @@ class TypingChecker {
         if (input !== this.currentInput) {
             this.currentInput = input;
             this.lastInputKey = input.getAttribute('data-testid') || '';
+            this.firstKeyTime = null;
             
             // 이벤트 리스너 제거 후 다시 설정
             input.removeEventListener('input', this.boundCheckTyping);
             input.addEventListener('input', this.boundCheckTyping);
+            input.addEventListener('input', () => {
+                if (this.firstKeyTime === null && input.value) this.firstKeyTime = performance.now();
+            });
             
-            // Enter 키 이벤트
-            input.addEventListener('keypress', (e) => {
-                if (e.key === 'Enter') {
-                    e.preventDefault();
-                    const submitBtn = doc.querySelector('button[kind="primaryFormSubmit"]');
-                    if (submitBtn) submitBtn.click();
+            // Enter 키 이벤트: 캡처 단계에서 Streamlit보다 먼저 받아 측정 시간만 붙이고 이벤트는 그대로 통과시킴.
+            // 제출은 Streamlit text_input이 Enter로 값을 확정하면서 on_change(main.handle_input)로 이루어지며,
+            // 그 전에 보낸 input 이벤트로 React 상태가 먼저 갱신되므로 측정 시간이 붙은 값이 제출됨
+            input.addEventListener('keydown', (e) => {
+                if (e.key === 'Enter' && !e.isComposing) {
+                    this.attachElapsed(input);
                 }
-            });
+            }, true);
             
             // 새 문장이 나타났을 때 포커스
             setTimeout(() => {
@@ -0,0 +1,237 @@
+"""터미널 타자 연습 클라이언트 (curses)
+
+Streamlit과 브라우저 없이 `TypingManager`, `TypingStats`, `URLProcessor`를 그대로 사용하므로
+SSH 접속이나 실습실 컴퓨터에서도 가볍게 연습할 수 있습니다::
+
+    python terminal_client.py                                   # 기본 문장
+    python terminal_client.py --text "연습할 문장"               # 직접 입력
+    python terminal_client.py --text https://example.com/article  # URL (불러오는 대로 시작)
+    python terminal_client.py --file book.txt.gz --start 100 --count 20
+    python terminal_client.py --file book.txt.gz --sample --seed 7  # 파일 전체에서 고르게 뽑기
+
+Enter로 제출, Backspace로 지우기, Ctrl-U로 입력 지우기, Esc 또는 Ctrl-C로 종료합니다.
+"""
+import argparse
+import curses
+import locale
+import sys
+import time
+import unicodedata
+from itertools import islice
+from typing import Callable, List, Optional, Tuple, Union
+from compression import iter_lines
+from config import DEFAULT_SENTENCES, FILE_CONFIG, SEEN_CONFIG
+from corpus import CorpusReader, is_corpus_file
+from hangul import char_states
+from sampling import make_rng, reservoir_sample, sample_sequence
+from typing_manager import TypingManager
+
+ENTER_KEYS = ('\n', '\r', curses.KEY_ENTER)
+BACKSPACE_KEYS = ('\x7f', '\b', curses.KEY_BACKSPACE)
+QUIT_KEYS = ('\x1b', '\x03')
+CLEAR_KEY = '\x15'   # Ctrl-U
+
+# 글자 상태별 색 (색을 쓸 수 없는 터미널에서는 굵게/반전/밑줄)
+STATE_COLORS = {"correct": curses.COLOR_GREEN, "incorrect": curses.COLOR_RED, "partial": curses.COLOR_YELLOW}
+STATE_ATTRS = {"correct": curses.A_BOLD, "incorrect": curses.A_REVERSE, "partial": curses.A_UNDERLINE}
+
+
+def cell_width(char: str) -> int:
+    """터미널에서 글자가 차지하는 칸 수 (한글 등 전각 문자는 2칸)"""
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def wrap_cells(text: str, width: int) -> List[Tuple[int, int]]:
+    """화면 폭에 맞춰 나눈 줄들의 (시작, 끝) 글자 위치를 반환합니다."""
+    lines, start, used = [], 0, 0
+    for i, char in enumerate(text):
+        w = cell_width(char)
+        if used + w > width and i > start:
+            lines.append((start, i))
+            start, used = i, 0
+        used += w
+    lines.append((start, len(text)))
+    return lines
+
+
+def tail_cells(text: str, width: int) -> str:
+    """화면 폭을 넘으면 앞부분을 잘라 끝(입력 위치)이 보이게 합니다."""
+    used = 0
+    for i in range(len(text) - 1, -1, -1):
+        used += cell_width(text[i])
+        if used > width:
+            return text[i + 1:]
+    return text
+
+
+class TerminalSession:
+    """키 입력을 TypingManager에 넘기는 터미널 세션 (화면 그리기와 분리)"""
+    def __init__(self, manager: TypingManager, clock: Callable[[], float] = time.monotonic):
+        self.manager = manager
+        self.clock = clock
+        self.typed = ""
+        self.first_key: Optional[float] = None
+        self.submitted = 0
+
+    def feed(self, key: Union[str, int]) -> bool:
+        """키 하나를 처리합니다. 종료해야 하면 False를 반환합니다."""
+        if key in QUIT_KEYS:
+            return False
+        if key in ENTER_KEYS:
+            self.submit()
+        elif key in BACKSPACE_KEYS:
+            self.typed = self.typed[:-1]
+        elif key == CLEAR_KEY:
+            self.typed = ""
+        elif isinstance(key, str) and key.isprintable():
+            if self.first_key is None:
+                self.first_key = self.clock()
+            self.typed += key
+        return True
+
+    def submit(self) -> None:
+        """입력한 문장을 제출합니다. 첫 키부터 제출까지 잰 시간을 브라우저 측정 시간처럼 넘깁니다."""
+        if not self.typed.strip():
+            return
+        elapsed = self.clock() - self.first_key if self.first_key is not None else None
+        if self.manager.handle_input(self.typed, client_elapsed=elapsed):
+            self.submitted += 1
+        self.typed = ""
+        self.first_key = None
+
+    def status_line(self) -> str:
+        progress = self.manager.get_progress()
+        loading = " · 불러오는 중" if self.manager.is_loading else ""
+        return (f"문장 {progress['current_index']}/{progress['total_sentences']} · "
+                f"완료 {progress['completed_sentences']}{loading}")
+
+    def stats_line(self) -> str:
+        stats = self.manager.to_dict()
+        return f"WPM {stats['wpm']:.1f}  CPM {stats['cpm']:.1f}  정확도 {stats['accuracy']:.1f}%"
+
+
+class Screen:
+    """TerminalSession을 curses 창에 그립니다."""
+    HELP = "Enter 제출 · Backspace 지우기 · Ctrl-U 입력 지우기 · Esc 종료"
+
+    def __init__(self, window):
+        self.window = window
+        self.attrs = dict(STATE_ATTRS)
+        if curses.has_colors():
+            curses.use_default_colors()
+            for pair, (state, color) in enumerate(STATE_COLORS.items(), 1):
+                curses.init_pair(pair, color, -1)
+                self.attrs[state] = curses.color_pair(pair) | (curses.A_UNDERLINE if state == "partial" else 0)
+
+    def _put(self, row: int, col: int, text: str, attr: int = 0) -> None:
+        try:
+            self.window.addstr(row, col, text, attr)
+        except curses.error:
+            pass  # 화면 오른쪽 아래 칸에 쓰거나 창이 너무 작은 경우
+
+    def draw(self, session: TerminalSession) -> None:
+        height, width = self.window.getmaxyx()
+        width = max(width - 1, 10)
+        self.window.erase()
+        self._put(0, 0, session.status_line(), curses.A_DIM)
+
+        target = session.manager.get_current_sentence()
+        states = char_states(session.typed, target)
+        row = 2
+        for start, end in wrap_cells(target, width):
+            col = 0
+            for i in range(start, end):
+                self._put(row, col, target[i], self.attrs.get(states[i], 0))
+                col += cell_width(target[i])
+            row += 1
+
+        row += 1
+        visible = tail_cells("> " + session.typed, width)
+        self._put(row, 0, visible)
+        cursor = (row, sum(map(cell_width, visible)))
+        self._put(row + 2, 0, session.stats_line())
+        self._put(min(row + 4, height - 1), 0, self.HELP[:width], curses.A_DIM)
+        try:
+            self.window.move(*cursor)
+        except curses.error:
+            pass
+        self.window.refresh()
+
+
+def run(window, session: TerminalSession) -> None:
+    """키 입력을 받아 처리하고 다시 그리는 반복. 문장을 불러오는 동안에는 주기적으로 다시 그립니다."""
+    screen = Screen(window)
+    curses.set_escdelay(25)   # Esc 키를 바로 종료로 처리 (기본값은 1초 기다림)
+    while True:
+        screen.draw(session)
+        window.timeout(250 if session.manager.is_loading else -1)
+        try:
+            key = window.get_wch()
+        except curses.error:
+            continue   # 시간 초과 (불러온 문장 수 갱신)
+        except KeyboardInterrupt:
+            return
+        if key == curses.KEY_RESIZE:
+            continue
+        if not session.feed(key):
+            return
+
+
+def load_manager(args: argparse.Namespace) -> TypingManager:
+    """명령줄 인자에 맞게 문장을 불러온 TypingManager를 만듭니다."""
+    manager = TypingManager()
+    if args.file:
+        manager.set_input_method("파일 업로드")
+        with open(args.file, 'rb') as f:
+            if is_corpus_file(f):
+                with CorpusReader(f) as reader:
+                    if args.sample:
+                        following = sample_sequence(reader, args.count * SEEN_CONFIG["lookahead"], make_rng(args.seed))
+                    else:
+                        following = (reader[i] for i in range(args.start, len(reader)))
+                    sentences = manager.take_unseen(following, args.count)
+            else:
+                f.seek(0)
+                sentences = manager.iter_sentences(iter_lines(f, args.file))
+                if args.sample:
+                    # 파일을 한 번 끝까지 읽으며 뽑은 문장만 보관
+                    following = reservoir_sample(sentences, args.count * SEEN_CONFIG["lookahead"], make_rng(args.seed))
+                else:
+                    following = islice(sentences, args.start, None)
+                sentences = manager.take_unseen(following, args.count)
+        if not sentences:
+            raise ValueError("연습할 문장이 없습니다." if args.sample else "시작 위치 이후에 연습할 문장이 없습니다.")
+        manager.load_sentences(sentences)
+    else:
+        manager.set_input_method("직접 입력")
+        # URL이면 첫 문장이 준비되는 대로 시작하고 나머지는 연습하는 동안 불러옴
+        manager.load_sentence_stream(manager.iter_input_sentences(args.text))
+    return manager
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="터미널 타자 연습")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--text", default=DEFAULT_SENTENCES, help="연습할 문장 또는 URL")
+    source.add_argument("--file", help="텍스트 파일(압축 파일 포함) 또는 코퍼스(.corpus)")
+    parser.add_argument("--start", type=int, default=FILE_CONFIG["default_start_line"], help="시작 문장 (0부터)")
+    parser.add_argument("--count", type=int, default=FILE_CONFIG["default_sentences"], help="연습할 문장 수")
+    parser.add_argument("--sample", action="store_true", help="--start 대신 파일 전체에서 문장을 고르게 뽑음")
+    parser.add_argument("--seed", type=int, default=None, help="무작위 추출 시드 (같은 시드는 같은 문장)")
+    args = parser.parse_args(argv)
+
+    try:
+        manager = load_manager(args)
+    except (ValueError, OSError) as e:
+        print(f"오류: {str(e)}", file=sys.stderr)
+        return 1
+
+    locale.setlocale(locale.LC_ALL, '')
+    session = TerminalSession(manager)
+    curses.wrapper(run, session)
+    print(f"{session.submitted}문장 입력 · {session.stats_line()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""JSON API 테스트"""
+from unittest import TestCase, main
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Tuple
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from api import TypingAPI
+from leaderboard import Leaderboard
+from session_store import MemoryBackend, SessionStore
+
+SENTENCES = ["첫 번째 연습 문장입니다.", "Second practice sentence."]
+
+async def call(app: TypingAPI, method: str, path: str, body: Any = None,
+               query: str = "") -> Tuple[int, Dict[str, Any]]:
+    """ASGI 앱에 요청을 보내고 (상태 코드, JSON 응답)을 반환합니다."""
+    if body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+    # 본문을 두 조각으로 나누어 보냄
+    body = body or b""
+    messages = [{"type": "http.request", "body": body[:3], "more_body": True},
+                {"type": "http.request", "body": body[3:], "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode()}
+    await app(scope, receive, send)
+    if sent[1]["body"] and not dict(sent[0]["headers"])[b"content-type"].startswith(b"application/json"):
+        return sent[0]["status"], sent[1]["body"].decode('utf-8')
+    return sent[0]["status"], json.loads(sent[1]["body"]) if sent[1]["body"] else None
+
+class TestTypingAPI(TestCase):
+    def setUp(self) -> None:
+        self.backend = MemoryBackend()
+        self.keylog_dir = tempfile.TemporaryDirectory()
+        self.app = TypingAPI(SessionStore(self.backend), keylog_dir=self.keylog_dir.name,
+                             leaderboard=Leaderboard(":memory:"))
+
+    def tearDown(self) -> None:
+        for writer, _ in self.app.keylogs.values():
+            writer.close()
+        self.keylog_dir.cleanup()
+        self.app.leaderboard.close()
+
+    def request(self, method: str, path: str, body: Any = None, query: str = "") -> Tuple[int, Dict[str, Any]]:
+        return asyncio.run(call(self.app, method, path, body, query))
+
+    def create_session(self) -> str:
+        status, payload = self.request("POST", "/sessions")
+        self.assertEqual(status, 201)
+        return payload["session_id"]
+
+    def test_practice_flow(self) -> None:
+        """세션 생성부터 문장 불러오기, 입력 제출, 통계 조회까지 테스트"""
+        session_id = self.create_session()
+        status, payload = self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["sentence"], SENTENCES[0])
+
+        status, payload = self.request("POST", f"/sessions/{session_id}/input", {"text": "첫 번째 연습 문장이다."})
+        self.assertTrue(payload["accepted"])
+        self.assertEqual(payload["sentence"], SENTENCES[1])
+        self.assertEqual(payload["stats"]["correct_words"], 3)
+
+        status, progress = self.request("GET", f"/sessions/{session_id}/progress")
+        self.assertEqual(progress["current_index"], 2)
+        status, stats = self.request("GET", f"/sessions/{session_id}/stats")
+        self.assertEqual(stats["total_words"], 4)
+
+    def test_load_text_and_file(self) -> None:
+        """텍스트와 압축 파일에서 문장을 불러오는지 테스트"""
+        session_id = self.create_session()
+        status, payload = self.request("POST", f"/sessions/{session_id}/sentences", {"text": '\n'.join(SENTENCES)})
+        self.assertEqual(payload["progress"]["total_sentences"], 2)
+        self.assertEqual(payload["duplicates_dropped"], 0)
+
+        data = gzip.compress('\n'.join(f"문장 {i}번입니다." for i in range(20)).encode('cp949'))
+        status, payload = self.request("POST", f"/sessions/{session_id}/file", data,
+                                       query="name=book.txt.gz&start=5&count=3")
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["sentence"], "문장 5번입니다.")
+        self.assertEqual(payload["progress"]["total_sentences"], 3)
+
+    def test_memory_budget(self) -> None:
+        """예산을 넘으면 다른 세션을 저장소로 내보내고, 다시 요청하면 이어서 쓰는지 테스트"""
+        self.app.sessions.budget_bytes = 1
+        first = self.create_session()
+        self.request("POST", f"/sessions/{first}/sentences", {"sentences": SENTENCES})
+        self.request("POST", f"/sessions/{first}/input", {"text": SENTENCES[0]})
+        second = self.create_session()
+        self.assertNotIn(first, self.app.sessions)
+        asyncio.run(self.app.flush())
+        self.assertEqual(self.request("GET", f"/sessions/{first}/progress")[1]["current_index"], 2)
+        self.assertNotIn(second, self.app.sessions)
+
+    def test_metrics(self) -> None:
+        """세션 캐시 조회와 문장 입력이 지표로 집계되는지 테스트"""
+        session_id = self.create_session()
+        self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        self.app.sessions.clear()
+        self.request("POST", f"/sessions/{session_id}/input", {"text": SENTENCES[0]})
+        self.request("GET", f"/sessions/{session_id}/stats")
+
+        status, text = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn('typing_session_cache_total{result="miss"}', text)
+        self.assertIn('typing_sentences_typed_total{timing="server"}', text)
+        self.assertIn("# TYPE typing_url_fetch_seconds histogram", text)
+        active = next(line for line in text.splitlines() if line.startswith("typing_active_sessions "))
+        self.assertGreaterEqual(float(active.split()[1]), 1)
+
+    def test_leaderboard(self) -> None:
+        """연습 결과를 순위표에 기록하고 조회하는지 테스트"""
+        long_sentence = " ".join(["연습"] * 20)
+        session_id = self.create_session()
+        self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": [long_sentence]})
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/leaderboard")[0], 422)
+        self.request("POST", f"/sessions/{session_id}/input", {"text": long_sentence})
+
+        status, payload = self.request("POST", f"/sessions/{session_id}/leaderboard", {"name": "홍길동"})
+        self.assertEqual(status, 200)
+        self.assertEqual((payload["language"], payload["rank"], payload["total"]), ("한국어", 1, 1))
+        query = urlencode({"language": "한국어", "mode": "직접 입력", "score": 1})
+        status, payload = self.request("GET", "/leaderboard", query=query)
+        self.assertEqual([row["name"] for row in payload["entries"]], ["홍길동"])
+        self.assertEqual(payload["standing"]["rank"], 2)
+        self.assertEqual(self.request("GET", "/leaderboard", query="limit=x")[0], 400)
+
+    def test_classroom(self) -> None:
+        """강사가 올린 문장을 학생 세션이 연습하고 현황판에 반영되는지 테스트"""
+        status, room = self.request("POST", "/classrooms", {"sentences": SENTENCES})
+        self.assertEqual(status, 201)
+        path, key = f"/classrooms/{room['room_id']}", urlencode({"key": room["key"]})
+        session_id = self.create_session()
+        status, payload = self.request("POST", f"/sessions/{session_id}/classroom",
+                                       {"room_id": room["room_id"], "name": "홍길동"})
+        self.assertEqual((status, payload["sentence"], payload["input_method"]), (200, SENTENCES[0], "수업"))
+        self.request("POST", f"/sessions/{session_id}/input", {"text": SENTENCES[0]})
+
+        self.assertEqual(self.request("GET", f"{path}/dashboard", query="key=wrong")[0], 403)
+        status, board = self.request("GET", f"{path}/dashboard", query=f"{key}&since=0")
+        self.assertEqual((status, board["progress"]), (200, [0, 1, 0]))
+        self.assertEqual(board["students"][0]["name"], "홍길동")
+
+        # 새 문장 세트를 올리면 다음 요청 때 불러옴
+        self.request("POST", f"{path}/sentences", {"sentences": ["새 문장"]}, query=key)
+        status, payload = self.request("POST", f"/sessions/{session_id}/input", {"text": SENTENCES[1]})
+        self.assertEqual((payload["accepted"], payload["sentence"]), (False, "새 문장"))
+        self.assertEqual(self.request("DELETE", f"/sessions/{session_id}/classroom")[0], 200)
+        self.assertEqual(self.request("GET", path)[1]["students"], 0)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/classroom", {"room_id": "abc"})[0], 404)
+
+    def test_errors(self) -> None:
+        """잘못된 요청에 알맞은 오류 코드를 반환하는지 테스트"""
+        session_id = self.create_session()
+        self.assertEqual(self.request("GET", "/sessions/unknown")[0], 404)
+        self.assertEqual(self.request("GET", "/nothing")[0], 404)
+        self.assertEqual(self.request("PUT", f"/sessions/{session_id}")[0], 405)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/input", b"{not json")[0], 400)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/input", {"text": "입력"})[0], 409)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/input", {"text": "입력", "elapsed_ms": "1초"})[0], 400)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/sentences", {"url": "not a url"})[0], 400)
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": [" "]})[0], 422)
+
+        self.app.max_body_bytes = 10
+        status, payload = self.request("POST", f"/sessions/{session_id}/sentences", {"text": "x" * 100})
+        self.assertEqual(status, 413)
+        self.assertIn("error", payload)
+
+        # 예상하지 못한 오류는 기록하고 500 JSON 응답으로 보냄
+        with patch.object(TypingAPI, "session_payload", side_effect=RuntimeError("boom")), \
+                self.assertLogs("api", level="ERROR") as logs:
+            status, payload = self.request("GET", f"/sessions/{session_id}")
+        self.assertEqual(status, 500)
+        self.assertIn("error", payload)
+        self.assertIn("boom", logs.output[0])
+        self.assertEqual(self.request("GET", f"/sessions/{session_id}")[0], 200)
+
+    def test_flush_and_restore(self) -> None:
+        """바뀐 세션만 저장소에 기록하고 다른 프로세스에서 이어서 쓰는지 테스트"""
+        session_id = self.create_session()
+        self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        self.request("POST", f"/sessions/{session_id}/input", {"text": SENTENCES[0]})
+        self.assertEqual(asyncio.run(self.app.flush()), 1)
+        self.assertEqual(asyncio.run(self.app.flush()), 0)
+
+        other = TypingAPI(SessionStore(self.backend))
+        status, payload = asyncio.run(call(other, "GET", f"/sessions/{session_id}"))
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["sentence"], SENTENCES[1])
+
+        self.request("DELETE", f"/sessions/{session_id}")
+        self.assertEqual(asyncio.run(call(TypingAPI(SessionStore(self.backend)), "GET", f"/sessions/{session_id}"))[0], 404)
+
+    def test_keystrokes_and_replay(self) -> None:
+        """키 입력 기록, 문장 제출 표시, 재생 테스트"""
+        session_id = self.create_session()
+        self.assertEqual(self.request("GET", f"/sessions/{session_id}/replay")[0], 404)
+        self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        events = [[1000 + 100 * i, SENTENCES[0][:i + 1]] for i in range(len(SENTENCES[0]))]
+        status, payload = self.request("POST", f"/sessions/{session_id}/keystrokes", {"events": events})
+        self.assertEqual((status, payload), (200, {"recorded": len(events)}))
+        self.request("POST", f"/sessions/{session_id}/input", {"text": SENTENCES[0]})
+        self.request("POST", f"/sessions/{session_id}/keystrokes", {"events": [[5000, "S"]]})
+        self.assertEqual(self.request("POST", f"/sessions/{session_id}/keystrokes", {"events": [[1, 2]]})[0], 400)
+
+        status, payload = self.request("GET", f"/sessions/{session_id}/replay", query="speed=2")
+        self.assertEqual(status, 200)
+        frames = payload["frames"]
+        self.assertEqual(len(frames), len(events) + 1)
+        self.assertEqual(frames[len(events) - 1]["typed"], SENTENCES[0])
+        self.assertTrue(frames[len(events) - 1]["submitted"])  # 마지막 입력 시각에 제출 표시
+        self.assertEqual(frames[-1], {"delay": 1.0, "sentence_index": 1, "target": SENTENCES[1],
+                                      "typed": "S", "submitted": False})
+        self.assertEqual(frames[1]["delay"], 0.05)
+
+    def test_keylog_writer_cap(self) -> None:
+        """열어 두는 키 입력 기록 파일 수를 제한하고, 닫힌 파일은 다시 열어 이어 쓰는지 테스트"""
+        self.app.max_keylog_writers = 1
+        first, second = self.create_session(), self.create_session()
+        for session_id in (first, second):
+            self.request("POST", f"/sessions/{session_id}/sentences", {"sentences": SENTENCES})
+        self.request("POST", f"/sessions/{first}/keystrokes", {"events": [[1000, "첫"]]})
+        writer, _ = self.app.keylogs[first]
+        self.request("POST", f"/sessions/{second}/keystrokes", {"events": [[1000, "S"]]})
+        self.assertEqual(list(self.app.keylogs), [second])
+        self.assertTrue(writer._file.closed)
+
+        self.request("POST", f"/sessions/{first}/keystrokes", {"events": [[1100, "첫 "]]})
+        self.assertEqual(list(self.app.keylogs), [first])
+        frames = self.request("GET", f"/sessions/{first}/replay")[1]["frames"]
+        self.assertEqual([frame["typed"] for frame in frames][-2:], ["첫", "첫 "])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""수업 모드 테스트"""
+from unittest import TestCase, main
+import asyncio
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from classroom import CLASSROOM_INPUT_METHOD, ClassroomHub
+from typing_manager import TypingManager
+
+SENTENCES = ["오늘은 타자 연습을 합니다", "The quick brown fox"]
+
+class TestClassroom(TestCase):
+    def setUp(self) -> None:
+        self.hub = ClassroomHub()
+        self.room = self.hub.create_room(SENTENCES)
+
+    def join(self, session_id: str, name: str = ""):
+        manager = TypingManager()
+        student = self.hub.join(self.room, session_id, name)
+        self.room.sync(student, manager)
+        return student, manager
+
+    def submit(self, student, manager, text: str, seconds: float = 6.0) -> bool:
+        manager.stats.restart(at=manager.stats.start_time - seconds)
+        return self.room.submit(student, manager, text)
+
+    def test_incremental_dashboard(self) -> None:
+        """제출마다 학생 행, 분포, 진행 인원, 자주 틀린 단어가 바뀐 만큼만 고쳐지는지 테스트"""
+        kim, kim_manager = self.join("a", "김")
+        lee, lee_manager = self.join("b", "이")
+        self.assertEqual(kim_manager.current_input_method, CLASSROOM_INPUT_METHOD)
+        self.assertEqual(kim_manager.current_sentences, SENTENCES)
+        self.assertEqual(self.room.dashboard()["progress"], [2, 0, 0])
+
+        self.assertTrue(self.submit(kim, kim_manager, "오늘은 타자 연습을 합니다"))
+        self.assertTrue(self.submit(lee, lee_manager, "오늘은 타자 연슴을 한다"))
+        self.assertTrue(self.submit(lee, lee_manager, "The quick brown fox"))
+        board = self.room.dashboard()
+        self.assertIs(self.room.dashboard(), board)           # 바뀌지 않았으면 다시 만들지 않음
+        self.assertEqual(board["progress"], [0, 1, 1])
+        self.assertEqual(board["class"]["finished"], 1)
+        rows = {row["name"]: row for row in board["students"]}
+        self.assertEqual((rows["김"]["completed"], rows["김"]["accuracy"], rows["김"]["wpm"]), (1, 100.0, 40.0))
+        self.assertEqual((rows["이"]["completed"], rows["이"]["accuracy"]), (2, 75.0))
+        self.assertEqual(board["class"]["reported"], 2)
+        self.assertEqual(board["class"]["accuracy"]["mean"], 87.5)
+        self.assertEqual(sum(board["class"]["wpm"]["counts"]), 2)
+        self.assertEqual(dict(board["missed_words"]), {"연습을": 1, "합니다": 1})
+
+        # 나가면 분포와 진행 인원에서 빠짐
+        self.hub.leave("b")
+        board = self.room.dashboard()
+        self.assertEqual(board["progress"], [0, 1, 0])
+        self.assertEqual(board["class"]["accuracy"]["mean"], 100.0)
+        self.assertEqual(sum(board["class"]["accuracy"]["counts"]), 1)
+
+    def test_publish_new_set(self) -> None:
+        """새 문장 세트를 올리면 집계를 새로 시작하고 학생 세션은 다음 요청 때 새 문장을 불러오는지 테스트"""
+        student, manager = self.join("a")
+        self.submit(student, manager, SENTENCES[0])
+        self.room.publish(["새 문장 세트"])
+        board = self.room.dashboard()
+        self.assertEqual((board["progress"], board["class"]["reported"], board["missed_words"]), ([1, 0], 0, []))
+        self.assertFalse(self.submit(student, manager, SENTENCES[1]))   # 불러오기만 함
+        self.assertEqual(manager.current_sentences, ["새 문장 세트"])
+        self.assertTrue(self.submit(student, manager, "새 문장 세트"))
+        self.assertEqual(self.room.dashboard()["progress"], [0, 1])
+
+    def test_limits_and_long_polling(self) -> None:
+        self.room.max_students = 1
+        self.join("a")
+        with self.assertRaises(ValueError):
+            self.hub.join(self.room, "b", "")
+        self.assertIs(self.hub.join(self.room, "a", ""), self.hub.members["a"][1])
+        self.assertIsNone(self.hub.authorize(self.room.id, "wrong"))
+        self.assertIs(self.hub.authorize(self.room.id, self.room.key), self.room)
+
+        async def wait() -> int:
+            version = self.room.version
+            waiter = asyncio.ensure_future(self.room.wait_for_change(version, 5))
+            await asyncio.sleep(0)
+            self.room.publish(["다음 문장"])
+            await waiter
+            return self.room.version - version
+
+        self.assertEqual(asyncio.run(wait()), 1)
+        self.hub.sweep(now=self.room.last_activity + self.hub.room_ttl + 1)
+        self.assertEqual((self.hub.rooms, self.hub.members), ({}, {}))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""압축 파일 처리 테스트"""
+from unittest import TestCase, main
+import bz2
+import gzip
+import io
+import lzma
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from compression import detect_compression, iter_lines, iter_members
+from corpus import CODECS, CorpusReader, CorpusWriter
+from corpus_builder import build_corpus, collect_files, make_tasks
+
+LINES = ["타이핑 연습을 하는 어플입니다.", "Practice makes perfect when you type every day."]
+TEXT = '\n'.join(LINES) + '\n'
+
+def make_zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+class TestCompression(TestCase):
+    def setUp(self) -> None:
+        self.samples = {
+            'gz': gzip.compress(TEXT.encode('utf-8')),
+            'bz2': bz2.compress(TEXT.encode('utf-8')),
+            'xz': lzma.compress(TEXT.encode('utf-8')),
+            'zip': make_zip({"book.txt": TEXT.encode('utf-8')}),
+        }
+
+    def test_detect_compression(self) -> None:
+        """매직 넘버로 압축 형식을 감지하는지 테스트"""
+        for kind, data in self.samples.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(detect_compression(io.BytesIO(data)), kind)
+        self.assertIsNone(detect_compression(io.BytesIO(TEXT.encode('utf-8'))))
+        self.assertIsNone(detect_compression(io.BytesIO(b"BZh is just text here")))
+
+    def test_iter_lines(self) -> None:
+        """압축 형식에 관계없이 같은 줄을 읽는지 테스트"""
+        for kind, data in self.samples.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(list(iter_lines(io.BytesIO(data), f"book.txt.{kind}")), LINES)
+        self.assertEqual(list(iter_lines(io.BytesIO(TEXT.encode('cp949')), "book.txt")), LINES)
+
+    def test_zip_members(self) -> None:
+        """zip 파일에서 허용된 확장자의 항목만 순서대로 읽는지 테스트"""
+        data = make_zip({
+            "a.txt": "첫 번째 파일입니다.\n".encode('cp949'),
+            "images/logo.png": b"\x89PNG",
+            "b/c.txt": b"second file\n",
+        })
+        names = [name for name, _ in iter_members(io.BytesIO(data), "books.zip")]
+        self.assertEqual(names, ["a.txt", "b/c.txt"])
+        self.assertEqual(list(iter_lines(io.BytesIO(data), "books.zip")),
+                         ["첫 번째 파일입니다.", "second file"])
+
+    def test_inner_name(self) -> None:
+        """단일 스트림 압축 파일은 압축 확장자를 뗀 이름을 반환하는지 테스트"""
+        names = [name for name, _ in iter_members(io.BytesIO(self.samples['gz']), "page.html.gz")]
+        self.assertEqual(names, ["page.html"])
+
+class TestCompressedCorpus(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_codecs_random_access(self) -> None:
+        """블록 압축 방식마다 임의 접근이 되는지 테스트"""
+        sentences = [f"압축된 코퍼스의 문장 {i}번입니다." for i in range(100)]
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                path = self.root / f"{codec}.corpus"
+                with CorpusWriter(path, block_size=16, codec=codec) as writer:
+                    writer.add_many(sentences)
+                with CorpusReader(path) as reader:
+                    self.assertEqual(reader.metadata["codec"], codec)
+                    for index in (99, 0, 50, 17):
+                        self.assertEqual(reader[index], sentences[index])
+
+    def test_compressed_blocks_are_smaller(self) -> None:
+        """압축 블록이 원본보다 작은지 테스트"""
+        sentences = ["반복되는 연습 문장은 잘 압축됩니다."] * 500
+        sizes = {}
+        for codec in ("none", "zlib"):
+            path = self.root / f"{codec}.corpus"
+            with CorpusWriter(path, codec=codec) as writer:
+                writer.add_many(sentences)
+            sizes[codec] = path.stat().st_size
+        self.assertLess(sizes["zlib"] * 5, sizes["none"])
+
+    def test_unknown_codec(self) -> None:
+        """지원하지 않는 압축 방식은 ValueError를 발생시키는지 테스트"""
+        with self.assertRaises(ValueError):
+            CorpusWriter(self.root / "x.corpus", codec="zstd")
+
+    def test_build_from_compressed_sources(self) -> None:
+        """압축된 txt/html 파일로 코퍼스를 만드는지 테스트"""
+        lines = [f"Compressed practice sentence number {i} is here." for i in range(50)]
+        (self.root / "book.txt.gz").write_bytes(gzip.compress('\n'.join(lines).encode('utf-8')))
+        (self.root / "pages.zip").write_bytes(make_zip({
+            "page.html": "<html><body><p>Paragraph inside a zipped html page for practice.</p></body></html>",
+        }))
+        tasks = list(make_tasks(collect_files([str(self.root)])))
+        self.assertEqual([task.member for task in tasks], ["book.txt", "page.html"])
+        self.assertEqual(sum(task.end - task.start for task in tasks), sum(f.stat().st_size for f in self.root.iterdir()))
+        output = self.root / "out.corpus"
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                report = build_corpus([str(self.root)], str(output), workers=workers,
+                                      chunk_bytes=256, progress=None)
+                self.assertEqual(report.files, 2)
+                self.assertEqual(report.processed_bytes, report.input_bytes)
+                with CorpusReader(output) as reader:
+                    sentences = list(reader)
+                self.assertIn(lines[0], sentences)
+                self.assertIn("Paragraph inside a zipped html page for practice.", sentences)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""코퍼스 파일 및 코퍼스 빌더 테스트"""
+from unittest import TestCase, main
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus import CorpusReader, CorpusWriter, is_corpus_file
+from corpus_builder import build_corpus, make_tasks, read_chunk
+from tests.test_data import TEST_DATA
+
+class TestCorpusFile(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "test.corpus"
+        self.sentences = [f"연습 문장 번호 {i} 입니다." for i in range(25)]
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _write(self, block_size: int = 4) -> None:
+        with CorpusWriter(self.path, block_size=block_size, metadata={"source": "test"}) as writer:
+            writer.add_many(self.sentences)
+
+    def test_round_trip(self) -> None:
+        """작성한 문장을 순서대로 다시 읽는지 테스트"""
+        self._write()
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(len(reader), len(self.sentences))
+            self.assertEqual(list(reader), self.sentences)
+            self.assertEqual(reader.metadata["source"], "test")
+
+    def test_random_access(self) -> None:
+        """블록 경계를 넘나드는 임의 접근 테스트"""
+        self._write(block_size=3)
+        with CorpusReader(self.path) as reader:
+            for index in (24, 0, 3, 2, 13, -1):
+                with self.subTest(index=index):
+                    self.assertEqual(reader[index], self.sentences[index])
+            with self.assertRaises(IndexError):
+                reader[25]
+
+    def test_slice(self) -> None:
+        """시작 위치와 개수로 문장을 가져오는지 테스트"""
+        self._write()
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(reader.slice(5, 10), self.sentences[5:15])
+            self.assertEqual(reader.slice(20, 10), self.sentences[20:])
+            self.assertEqual(reader.slice(100, 10), [])
+
+    def test_file_object_and_detection(self) -> None:
+        """업로드된 파일 객체에서 읽기와 형식 감지 테스트"""
+        self._write()
+        uploaded = io.BytesIO(self.path.read_bytes())
+        self.assertTrue(is_corpus_file(uploaded))
+        self.assertFalse(is_corpus_file(io.BytesIO("일반 텍스트".encode('utf-8'))))
+        self.assertEqual(CorpusReader(uploaded)[7], self.sentences[7])
+
+    def test_invalid_file(self) -> None:
+        """코퍼스가 아닌 파일은 ValueError를 발생시키는지 테스트"""
+        with self.assertRaises(ValueError):
+            CorpusReader(io.BytesIO(b"not a corpus file at all"))
+
+    def test_append(self) -> None:
+        """덜 찬 마지막 블록을 이어서 채우며 기존 설정을 따르는지 테스트"""
+        self._write(block_size=4)
+        added = [f"추가 문장 번호 {i} 입니다." for i in range(6)]
+        with CorpusWriter(self.path, block_size=100, metadata={"updated": 1}, append=True) as writer:
+            writer.add_many(added)
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(list(reader), self.sentences + added)
+            self.assertEqual(reader.metadata["block_size"], 4)
+            self.assertEqual(reader.metadata["source"], "test")
+            self.assertEqual(reader.metadata["updated"], 1)
+            self.assertEqual(reader[26], added[1])
+
+    def test_interrupted_append(self) -> None:
+        """이어 쓰는 도중 예외가 나거나 닫지 못해도 기존 파일을 그대로 읽을 수 있는지 테스트"""
+        self._write(block_size=4)
+        with self.assertRaises(RuntimeError):
+            with CorpusWriter(self.path, append=True) as writer:
+                writer.add_many(f"추가 문장 번호 {i} 입니다." for i in range(10))
+                # 쓰는 도중에 연 읽기도 기존 내용을 읽음
+                with CorpusReader(self.path) as reader:
+                    self.assertEqual(list(reader), self.sentences)
+                raise RuntimeError("중단")
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(list(reader), self.sentences)
+        self.assertFalse(os.path.exists(str(self.path) + '.tmp'))
+
+        # 프로세스가 죽어 close를 부르지 못한 경우
+        writer = CorpusWriter(self.path, append=True)
+        writer.add_many(f"추가 문장 번호 {i} 입니다." for i in range(10))
+        writer._file.close()
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(list(reader), self.sentences)
+
+class TestCorpusBuilder(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "pages").mkdir()
+        (self.root / "pages" / "page.html").write_text(TEST_DATA.html.content, encoding='utf-8')
+        lines = [f"Practice sentence number {i} for the corpus builder." for i in range(200)]
+        lines += ["Practice sentence number 0 for the corpus builder."]
+        (self.root / "book.txt").write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        self.output = self.root / "out.corpus"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_read_chunk_covers_every_line_once(self) -> None:
+        """바이트 구간으로 나누어도 모든 줄이 한 번씩만 읽히는지 테스트"""
+        path = self.root / "book.txt"
+        tasks = list(make_tasks([path], chunk_bytes=100))
+        self.assertGreater(len(tasks), 1)
+        data = b''.join(read_chunk(*task[:3]) for task in tasks)
+        self.assertEqual(data, path.read_bytes())
+
+    def test_build_corpus(self) -> None:
+        """txt/html 파일로 코퍼스를 만드는지 테스트"""
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                report = build_corpus([str(self.root)], str(self.output), workers=workers,
+                                      chunk_bytes=1024, progress=None)
+                self.assertEqual(report.files, 2)
+                self.assertEqual(report.exact_duplicates, 1)
+                self.assertEqual(report.processed_bytes, report.input_bytes)
+                with CorpusReader(self.output) as reader:
+                    sentences = list(reader)
+                self.assertEqual(len(sentences), report.sentences)
+                self.assertEqual(sentences[0], "Practice sentence number 0 for the corpus builder.")
+                for expected in TEST_DATA.html.expected:
+                    self.assertIn(expected, sentences)
+
+    def test_build_corpus_bounded_hashes(self) -> None:
+        """max_hashes를 주면 완전 중복 해시를 그만큼만 보관하고, 밀려난 중복은 유사 중복 필터가 거르는지 테스트"""
+        book = [str(self.root / "book.txt")]
+        unbounded = build_corpus(book, str(self.output), workers=1, chunk_bytes=1024, progress=None)
+        report = build_corpus(book, str(self.output), workers=1, chunk_bytes=1024, progress=None, max_hashes=10)
+        self.assertEqual(unbounded.exact_duplicates, 1)
+        self.assertEqual(report.exact_duplicates, 0)
+        self.assertEqual(report.sentences, unbounded.sentences)
+        self.assertEqual(report.near_duplicates, unbounded.near_duplicates + 1)
+        with CorpusReader(self.output) as reader:
+            sentences = list(reader)
+        self.assertEqual(len(sentences), len(set(sentences)))
+
+    def test_build_corpus_cp949(self) -> None:
+        """CP949로 저장된 텍스트 파일도 처리하는지 테스트"""
+        sentence = "꾸준한 연습이 타자 속도를 높여줍니다."
+        korean_dir = self.root / "korean"
+        korean_dir.mkdir()
+        (korean_dir / "korean.txt").write_bytes((sentence + '\n').encode('cp949'))
+        build_corpus([str(korean_dir)], str(self.output), workers=1, progress=None)
+        with CorpusReader(self.output) as reader:
+            self.assertEqual(list(reader), [sentence])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""유사 중복 문장 제거 테스트"""
+from unittest import TestCase, main
+from unittest.mock import patch
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from dedup import NearDuplicateFilter
+from url_processor import URLProcessor
+
+class TestNearDuplicateFilter(TestCase):
+    def setUp(self) -> None:
+        self.dedup_filter = NearDuplicateFilter(threshold=0.7)
+
+    def test_exact_and_punctuation_variants_dropped(self) -> None:
+        """문장 부호만 다른 문장은 중복으로 처리되는지 테스트"""
+        sentences = [
+            "Learning a new skill every day builds lasting confidence.",
+            "Learning a new skill every day builds lasting confidence!",
+            "learning a new skill, every day builds lasting confidence",
+        ]
+        kept = list(self.dedup_filter.filter(sentences))
+        self.assertEqual(kept, sentences[:1])
+        self.assertEqual(self.dedup_filter.dropped, 2)
+        self.assertEqual(self.dedup_filter.seen, 3)
+
+    def test_distinct_sentences_kept(self) -> None:
+        """서로 다른 문장은 모두 유지되는지 테스트"""
+        sentences = [
+            "Reading books expands your understanding of the world.",
+            "오늘은 날씨가 매우 맑고 화창합니다.",
+            "꾸준한 연습이 타자 속도를 높여줍니다.",
+        ]
+        self.assertEqual(list(self.dedup_filter.filter(sentences)), sentences)
+        self.assertEqual(self.dedup_filter.dropped, 0)
+
+    def test_near_duplicate_korean_boilerplate(self) -> None:
+        """한 단어만 다른 한국어 상투 문구가 제거되는지 테스트"""
+        dedup_filter = NearDuplicateFilter(threshold=0.6)
+        sentences = [
+            "이 기사의 저작권은 연합뉴스에 있으며 무단 전재 및 재배포를 금지합니다",
+            "이 기사의 저작권은 뉴스1에 있으며 무단 전재 및 재배포를 금지합니다",
+        ]
+        self.assertEqual(list(dedup_filter.filter(sentences)), sentences[:1])
+
+    def test_bounded_memory(self) -> None:
+        """보관하는 서명 수가 max_entries를 넘지 않는지 테스트"""
+        dedup_filter = NearDuplicateFilter(max_entries=10)
+        sentences = [f"sentence number {i} with unique words {i * 7}" for i in range(50)]
+        list(dedup_filter.filter(sentences))
+        self.assertLessEqual(len(dedup_filter._entries), 10)
+        for table in dedup_filter._tables:
+            self.assertLessEqual(len(table), 10)
+
+    def test_shared_bucket_keeps_earlier_entry(self) -> None:
+        """다른 문장이 같은 LSH 버킷에 들어가도 앞서 등록된 문장과 비교하는지 테스트"""
+        first = "Learning a new skill every day builds lasting confidence."
+        other = "오늘은 날씨가 매우 맑고 화창합니다."
+        keys = (1,) * self.dedup_filter.bands
+        with patch.object(self.dedup_filter, "_band_keys", return_value=keys):
+            self.assertFalse(self.dedup_filter.is_duplicate(first))
+            self.assertFalse(self.dedup_filter.is_duplicate(other))
+            self.assertTrue(self.dedup_filter.is_duplicate(first + "!"))
+        self.assertEqual(self.dedup_filter._tables[0][1], [0, 1])
+
+    def test_reset(self) -> None:
+        """초기화 후 같은 문장을 다시 받아들이는지 테스트"""
+        sentence = "Practice makes perfect when you type every day."
+        self.assertFalse(self.dedup_filter.is_duplicate(sentence))
+        self.assertTrue(self.dedup_filter.is_duplicate(sentence))
+        self.dedup_filter.reset()
+        self.assertFalse(self.dedup_filter.is_duplicate(sentence))
+        self.assertEqual(self.dedup_filter.dropped, 0)
+
+    def test_invalid_threshold(self) -> None:
+        """잘못된 임계값은 ValueError를 발생시키는지 테스트"""
+        for threshold in (0.0, 1.5, -0.1):
+            with self.subTest(threshold=threshold):
+                with self.assertRaises(ValueError):
+                    NearDuplicateFilter(threshold=threshold)
+
+    def test_url_processor_reports_dropped(self) -> None:
+        """URLProcessor가 제거된 문장 수를 반환하는지 테스트"""
+        sentences = [
+            "Subscribe to our newsletter for daily updates.",
+            "Subscribe to our newsletter for daily updates!",
+            "The river flows gently through the quiet valley.",
+        ]
+        kept, dropped = URLProcessor.remove_near_duplicates(sentences)
+        self.assertEqual(kept, [sentences[0], sentences[2]])
+        self.assertEqual(dropped, 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""피드/사이트맵 구독 테스트"""
+from unittest import TestCase, main
+import gzip
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus import CorpusReader
+from feeds import FeedManager, parse_feed
+
+WORDS = ("타자 연습 문장 키보드 손가락 속도 정확도 습관 매일 조금씩 꾸준히 실력 향상 "
+         "글자 단어 화면 입력 시간 결과 기록 목표 도전 성공 노력 바다 하늘 도서관 음악").split()
+NOTICE = "이 기사의 모든 권리는 테스트 신문사에 있습니다."
+
+
+def article(number: int) -> bytes:
+    rng = random.Random(number)
+    sentences = [' '.join(rng.choice(WORDS) for _ in range(8)) + '.' for _ in range(3)]
+    return (f"<html><body><p>{' '.join(sentences)}</p><footer>메뉴</footer><p>{NOTICE}</p></body></html>"
+            ).encode('utf-8')
+
+
+def rss(base: str, numbers) -> bytes:
+    items = ''.join(f"<item><title>{n}</title><link>{base}/article/{n}.html</link><guid>article-{n}</guid></item>"
+                    for n in sorted(numbers, reverse=True))
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>t</title>{items}</channel></rss>".encode()
+
+
+class FeedServer:
+    """ETag 조건부 요청을 지원하는 로컬 HTTP 서버"""
+    def __init__(self):
+        self.documents = {}
+        self.requests = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                owner.requests.append(self.path)
+                body = owner.documents.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def article_requests(self):
+        return [path for path in self.requests if path.startswith("/article/")]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestParseFeed(TestCase):
+    def test_formats(self) -> None:
+        """RSS, Atom, 사이트맵(gzip 포함)의 항목 추출 테스트"""
+        kind, items = parse_feed(rss("http://x", [1, 2]))
+        self.assertEqual(kind, "rss")
+        self.assertEqual([item.id for item in items], ["article-2", "article-1"])
+
+        atom = (b"<feed xmlns='http://www.w3.org/2005/Atom'><entry><id>tag:1</id>"
+                b"<link rel='self' href='http://x/self'/><link href='http://x/a.html'/></entry></feed>")
+        self.assertEqual(parse_feed(atom), ("atom", [("tag:1", "http://x/a.html")]))
+
+        sitemap = (b"<urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>"
+                   b"<url><loc>http://x/a.html</loc></url></urlset>")
+        self.assertEqual(parse_feed(gzip.compress(sitemap)), ("sitemap", [("http://x/a.html", "http://x/a.html")]))
+
+        with self.assertRaises(ValueError):
+            parse_feed(b"<html><body>not a feed</body></html>")
+        with self.assertRaises(ValueError):
+            parse_feed(b"not xml")
+
+
+class TestFeedManager(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.server = FeedServer()
+        for n in range(1, 5):
+            self.server.documents[f"/article/{n}.html"] = article(n)
+        self.manager = FeedManager(str(self.root / "feeds.db"), str(self.root / "corpora"))
+
+    def tearDown(self) -> None:
+        self.manager.close()
+        self.server.close()
+        self.temp_dir.cleanup()
+
+    def test_incremental_refresh(self) -> None:
+        """새 항목만 내려받아 코퍼스 뒤에 이어 붙이고, 바뀌지 않은 피드는 304로 건너뛰는지 테스트"""
+        base = self.server.base
+        self.server.documents["/rss.xml"] = rss(base, [1, 2])
+        subscription = self.manager.subscribe(base + "/rss.xml", interval=3600)
+
+        report = self.manager.refresh(subscription.url)
+        self.assertEqual((report.status, report.new_items, report.sentences), ("updated", 2, 7))
+        with CorpusReader(subscription.corpus) as reader:
+            first = list(reader)
+        self.assertEqual(len(first), 7)
+        self.assertEqual(first.count(NOTICE), 1)  # 기사마다 반복되는 문구는 한 번만
+        self.assertEqual(self.manager.due(), [])
+
+        # 피드가 바뀌지 않았으면 항목을 다시 내려받지 않음
+        self.assertEqual(self.manager.refresh(subscription.url).status, "not_modified")
+        self.assertEqual(len(self.server.article_requests()), 2)
+
+        self.server.documents["/rss.xml"] = rss(base, [1, 2, 3])
+        report = self.manager.refresh(subscription.url)
+        # 중복 제거는 새로 고침 단위이므로 반복 문구가 다시 한 번 들어감
+        self.assertEqual((report.new_items, report.sentences), (1, 4))
+        self.assertEqual(self.server.article_requests()[-1], "/article/3.html")
+        self.assertEqual(len(self.server.article_requests()), 3)
+        with CorpusReader(subscription.corpus) as reader:
+            self.assertEqual(list(reader)[:7], first)
+            self.assertEqual(len(reader), 11)
+            self.assertEqual(reader.metadata["source"], subscription.url)
+        self.assertEqual(self.manager.get(subscription.url).sentences, 11)
+
+    def test_failed_items_retry(self) -> None:
+        """내려받지 못한 항목은 읽은 것으로 기록하지 않는지 테스트"""
+        base = self.server.base
+        self.server.documents["/rss.xml"] = rss(base, [1, 9])
+        url = self.manager.subscribe(base + "/rss.xml").url
+        report = self.manager.refresh(url)
+        self.assertEqual((report.new_items, report.failed), (1, 1))
+
+        self.server.documents["/article/9.html"] = article(9)
+        report = self.manager.refresh(url, force=True)
+        self.assertEqual((report.new_items, report.failed), (1, 0))
+        self.assertEqual(self.server.article_requests().count("/article/1.html"), 1)
+
+    def test_sitemap_index(self) -> None:
+        """사이트맵 색인을 따라가 하위 사이트맵의 문서를 모으는지 테스트"""
+        base = self.server.base
+        self.server.documents["/sitemap.xml"] = (
+            f"<sitemapindex><sitemap><loc>{base}/pages.xml</loc></sitemap></sitemapindex>").encode()
+        self.server.documents["/pages.xml"] = (
+            f"<urlset><url><loc>{base}/article/3.html</loc></url>"
+            f"<url><loc>{base}/article/4.html</loc></url></urlset>").encode()
+        subscription = self.manager.subscribe(base + "/sitemap.xml")
+        report = self.manager.refresh(subscription.url)
+        self.assertEqual(report.new_items, 2)
+        self.assertEqual(self.server.article_requests(), ["/article/3.html", "/article/4.html"])
+
+    def test_errors(self) -> None:
+        """잘못된 URL과 가져올 수 없는 피드 처리 테스트"""
+        with self.assertRaises(ValueError):
+            self.manager.subscribe("not a url")
+        with self.assertRaises(ValueError):
+            self.manager.refresh(self.server.base + "/unknown.xml")
+        url = self.manager.subscribe(self.server.base + "/missing.xml").url
+        self.assertEqual(self.manager.refresh(url).status, "error")
+        self.manager.unsubscribe(url)
+        self.assertEqual(self.manager.subscriptions(), [])
+
+
+if __name__ == '__main__':
+    main()
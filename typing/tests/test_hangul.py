@@ -0,0 +1,58 @@
+"""한글 자모 비교 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import unicodedata
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from hangul import SYLLABLE_KEYS, char_states, compose, javascript_tables, normalize, to_keys, word_states
+
+class TestHangul(TestCase):
+    def test_tables_round_trip(self) -> None:
+        """모든 음절이 자모로 분해되고 다시 조합되는지 테스트"""
+        self.assertEqual(len(SYLLABLE_KEYS), 11172)
+        self.assertEqual(to_keys("값 과 뷁"), "ㄱㅏㅂㅅ ㄱㅗㅏ ㅂㅜㅔㄹㄱ")
+        for index, keys in enumerate(SYLLABLE_KEYS):
+            self.assertEqual(compose(keys), chr(0xAC00 + index))
+
+    def test_compose_moves_final_consonant(self) -> None:
+        """받침 뒤에 모음이 오면 다음 음절로 넘기는지 테스트"""
+        self.assertEqual(compose("ㅇㅏㄴㅣ"), "아니")
+        self.assertEqual(compose("ㅇㅏㄴㅈㅇㅏ"), "앉아")
+        self.assertEqual(compose("ㄷㅏㄹㄱㅣ"), "달기")
+        self.assertEqual(compose("ㅋㅋ"), "ㅋㅋ")
+
+    def test_normalize(self) -> None:
+        """NFD, 조합형 낱자모, 호환 낱자모 입력을 완성형으로 통일하는지 테스트"""
+        self.assertEqual(normalize(unicodedata.normalize('NFD', "한글 입력")), "한글 입력")
+        self.assertEqual(normalize("한"), "한")
+        self.assertEqual(normalize("  ㅎㅏㄴ   hello "), "한 hello")
+
+    def test_word_states(self) -> None:
+        """조합 중인 마지막 단어의 부분 일치 판정 테스트"""
+        target = "안녕하세요 아니요 과일"
+        self.assertEqual(word_states("아", target), ["partial", "", ""])
+        self.assertEqual(word_states("안녕하세요 안", target), ["correct", "partial", ""])
+        self.assertEqual(word_states("안녕하세요 아니요 고", target), ["correct", "correct", "partial"])
+        self.assertEqual(word_states("안녕 ", target), ["incorrect", "", ""])  # 공백 뒤에는 완성된 단어
+        self.assertEqual(word_states("안녕하세요 아나", target), ["correct", "incorrect", ""])
+
+    def test_char_states(self) -> None:
+        """글자별 판정과 조합 중인 마지막 글자의 부분 일치 테스트"""
+        target = "아니요 ab"
+        self.assertEqual(char_states("안", target), ["partial", "", "", "", "", ""])
+        self.assertEqual(char_states("아니", target), ["correct", "correct", "", "", "", ""])
+        self.assertEqual(char_states("ㅇㅏㄴㅣㅇ", target), ["correct", "partial", "", "", "", ""])  # "아닝"
+        self.assertEqual(char_states("아나요 ", target), ["correct", "incorrect", "correct", "correct", "", ""])
+        self.assertEqual(char_states("아니요 b", target)[4], "incorrect")
+
+    def test_javascript_tables(self) -> None:
+        """생성된 브라우저용 표가 저장소의 파일과 같은지 테스트"""
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "hangul_tables.js")
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), javascript_tables())
+
+if __name__ == '__main__':
+    main()
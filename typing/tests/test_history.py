@@ -0,0 +1,70 @@
+"""기록 추이 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from history import DAY, WEEK, HistoryStore, bucket_start, lttb
+from config import HISTORY_CONFIG
+
+class TestHistory(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.temp_dir.name, "history.db"))
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_lttb_keeps_ends_and_peaks(self) -> None:
+        xs = list(range(1000))
+        ys = [100.0 if x == 500 else 0.0 for x in xs]
+        chosen = lttb(xs, ys, 50)
+        self.assertEqual(len(chosen), 50)
+        self.assertEqual((chosen[0], chosen[-1]), (0, 999))
+        self.assertIn(500, chosen)
+        self.assertEqual(chosen, sorted(chosen))
+        self.assertEqual(lttb(xs[:10], ys[:10], 50), list(range(10)))
+
+    def test_buckets_use_local_midnight_and_monday(self) -> None:
+        offset = 9 * 3600
+        ts = 1700000000                     # 2023-11-15(수) 07:13 (UTC+9)
+        self.assertEqual((bucket_start(ts, DAY, offset) + offset) % DAY, 0)
+        self.assertLessEqual(bucket_start(ts, DAY, offset), ts)
+        week = bucket_start(ts, WEEK, offset)
+        self.assertEqual(ts - week, 2 * DAY + (ts + offset) % DAY)   # 월요일 자정부터 이틀 남짓
+
+    def test_series_resolutions(self) -> None:
+        """기록 수에 따라 그대로, LTTB, 일/주 집계로 점 수를 제한하는지 테스트"""
+        for i in range(10):
+            self.store.record("a", {"wpm": 40 + i, "cpm": 200, "accuracy": 95}, ts=1000 + i)
+        resolution, points = self.store.series("a", "wpm", max_points=20)
+        self.assertEqual(resolution, "raw")
+        self.assertEqual([p.value for p in points], [40.0 + i for i in range(10)])
+        resolution, points = self.store.series("a", "wpm", max_points=5)
+        self.assertEqual((resolution, len(points), points[-1].value), ("lttb", 5, 49.0))
+        self.assertEqual(self.store.series("b", "wpm"), ("raw", []))
+        with self.assertRaises(ValueError):
+            self.store.series("a", "latency")
+
+        # 300일 동안 하루 두 번 기록 -> 일 구간 300개는 너무 많으므로 주 단위 집계
+        old = HISTORY_CONFIG["lttb_max_input"]
+        HISTORY_CONFIG["lttb_max_input"] = 100
+        try:
+            for day in range(300):
+                for wpm in (30, 50):
+                    self.store.record("c", {"wpm": wpm, "cpm": 0, "accuracy": 100}, ts=day * DAY + 3600 * 3)
+            resolution, points = self.store.series("c", "wpm", max_points=100)
+            self.assertEqual(resolution, "week")
+            self.assertLessEqual(len(points), 100)
+            self.assertTrue(all((p.value, p.low, p.high) == (40, 30, 50) for p in points))
+            resolution, points = self.store.series("c", "wpm", start=200 * DAY, max_points=100)
+            self.assertEqual((resolution, len(points)), ("day", 100))
+        finally:
+            HISTORY_CONFIG["lttb_max_input"] = old
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""백그라운드 작업 대기열 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import threading
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from jobs import JobQueue, parse_html_sentences
+
+HTML = ("<html><body><p>오늘은 날씨가 맑습니다. The quick brown fox jumps.</p>"
+        "<p>The quick brown fox jumps!</p><script>var x = 1;</script></body></html>")
+
+def wait(job, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+def count_items(job, n: int):
+    return sum(1 for _ in job.track(range(n), n, "항목", every=10))
+
+def parse_in_process(job, html: str):
+    return job.run_cpu(parse_html_sentences, html)
+
+class TestJobQueue(TestCase):
+    def setUp(self) -> None:
+        self.queue = JobQueue(io_workers=2, cpu_workers=0, per_user=2, max_pending=4)
+
+    def tearDown(self) -> None:
+        self.queue.shutdown()
+
+    def test_result_and_failure(self) -> None:
+        """작업 결과와 진행률, 실패한 작업의 예외가 핸들에 기록되는지 테스트"""
+        job = wait(self.queue.submit("a", "test", count_items, 100))
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.result, 100)
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(job.message, "항목 100개")
+
+        def fail(job):
+            raise ValueError("실패")
+        job = wait(self.queue.submit("a", "test", fail))
+        self.assertEqual(job.status, "failed")
+        self.assertIsInstance(job.error, ValueError)
+        self.assertEqual(self.queue.active("a"), 0)
+        self.assertEqual(self.queue.pending, 0)
+
+    def test_cancel(self) -> None:
+        """실행 중인 작업은 다음 진행 보고 때, 대기 중인 작업은 바로 취소되는지 테스트"""
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(job):
+            started.set()
+            release.wait(10)
+            job.report(0.5)
+            return "끝"
+
+        queue = JobQueue(io_workers=1, cpu_workers=0)
+        running = queue.submit("a", "test", blocking)
+        started.wait(10)
+        queued = queue.submit("b", "test", blocking)
+        queued.cancel()
+        self.assertEqual(queued.status, "cancelled")
+        running.cancel()
+        self.assertEqual(running.status, "running")
+        release.set()
+        self.assertEqual(wait(running).status, "cancelled")
+        self.assertIsNone(running.result)
+        self.assertEqual(queue.pending, 0)
+        queue.shutdown()
+
+    def test_limits(self) -> None:
+        """사용자별/전체 작업 수 한도를 넘으면 거절하고, 작업이 끝나면 다시 받는지 테스트"""
+        release = threading.Event()
+        block = lambda job: release.wait(10)
+        jobs = [self.queue.submit("a", "test", block), self.queue.submit("a", "test", block)]
+        with self.assertRaises(ValueError):
+            self.queue.submit("a", "test", block)
+        jobs += [self.queue.submit("b", "test", block), self.queue.submit("c", "test", block)]
+        with self.assertRaises(ValueError):
+            self.queue.submit("d", "test", block)
+        release.set()
+        for job in jobs:
+            wait(job)
+        self.assertEqual(wait(self.queue.submit("a", "test", count_items, 5)).result, 5)
+
+    def test_stream(self) -> None:
+        """넘긴 항목을 작업이 끝나기 전부터 받고, 중간에 그만 읽으면 작업이 취소되는지 테스트"""
+        release = threading.Event()
+
+        def produce(job, fail: bool):
+            job.emit("첫 문장")
+            release.wait(10)
+            for i in range(1000):
+                job.emit(f"문장 {i}")
+            if fail:
+                raise ValueError("연결이 끊겼습니다.")
+
+        job = self.queue.submit("a", "url", produce, False)
+        items = job.iter_items()
+        self.assertEqual(next(items), "첫 문장")
+        self.assertFalse(job.done)
+        release.set()
+        self.assertEqual(len(list(items)), 1000)
+        self.assertEqual(wait(job).status, "done")
+
+        release.clear()
+        job = self.queue.submit("a", "url", produce, False)
+        items = job.iter_items()
+        next(items)
+        items.close()
+        release.set()
+        self.assertEqual(wait(job).status, "cancelled")
+
+        job = self.queue.submit("a", "url", produce, True)
+        with self.assertRaises(ValueError):
+            list(job.iter_items())
+
+    def test_run_cpu(self) -> None:
+        """파싱 함수를 작업 프로세스와 작업 스레드에서 실행한 결과(제외한 유사 중복 문장 수 포함)가 같은지 테스트"""
+        expected = (["오늘은 날씨가 맑습니다.", "The quick brown fox jumps."], 1)
+        inline = wait(self.queue.submit("a", "url", parse_in_process, HTML))
+        self.assertEqual(inline.result, expected)
+
+        queue = JobQueue(io_workers=1, cpu_workers=1)
+        job = wait(queue.submit("a", "url", parse_in_process, HTML), timeout=60)
+        self.assertEqual(job.status, "done", job.error)
+        self.assertEqual(job.result, expected)
+        queue.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""키 입력 기록 테스트"""
+from unittest import TestCase, main, skipUnless
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from keystroke_log import (BACKSPACE, END, KEY, SENTENCE, TARGET, KeystrokeLog, KeystrokeWriter, analyze,
+                           decode_char, encode_char, iter_replay, np)
+
+# 한글 조합 중 입력창 값이 바뀌는 순서
+COMPOSING = ["ㅇ", "아", "안", "안ㄴ", "안녀", "안녕", "안녕 ", "안녕 a", "안녕 ax", "안녕 a", "안녕 ab", "안녕 abc"]
+
+class TestKeystrokeLog(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "session.keys")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write_sample(self) -> int:
+        with KeystrokeWriter(self.path) as writer:
+            start = writer.base_ms
+            writer.begin_sentence(0, "안녕 abc", start)
+            for i, value in enumerate(COMPOSING):
+                writer.record_input(value, start + 100 * (i + 1))
+            writer.end_sentence(start + 2000)
+        return start
+
+    def test_char_codes(self) -> None:
+        """글자 코드 변환과 크기 테스트"""
+        for char in "a~가힣ㄱ😀 ":
+            self.assertEqual(decode_char(encode_char(char)), char)
+        self.assertLess(encode_char("z"), 128)
+        self.assertLess(encode_char("힣"), 1 << 14)  # 한글 음절은 varint 2바이트
+
+    def test_round_trip_and_composition(self) -> None:
+        """입력창 값의 차이가 삭제/입력 레코드로 기록되는지 테스트"""
+        start = self.write_sample()
+        with KeystrokeLog(self.path) as log:
+            events = list(log.iter_events())
+        self.assertEqual(events[0].kind, SENTENCE)
+        self.assertEqual(''.join(e.char for e in events if e.kind == TARGET), "안녕 abc")
+        typing_events = [e for e in events if e.kind in (KEY, BACKSPACE)]
+        # "ㅇ" → "아"는 같은 시각의 삭제 + 입력
+        self.assertEqual([(e.kind, e.char, e.time_ms - start) for e in typing_events[:3]],
+                         [(KEY, "ㅇ", 100), (BACKSPACE, "", 200), (KEY, "아", 200)])
+        self.assertEqual(events[-1].kind, END)
+        self.assertEqual(events[-1].time_ms - start, 2000)
+
+    def test_reopen_and_truncated_tail(self) -> None:
+        """이어 쓰기와 마지막 불완전한 레코드 무시 테스트"""
+        self.write_sample()
+        with KeystrokeWriter(self.path) as writer:
+            writer.begin_sentence(1, "ab")
+            writer.record_input("ab")
+            writer.end_sentence()
+        with open(self.path, 'ab') as f:
+            f.write(b'\x80')
+        with KeystrokeLog(self.path) as log:
+            segments = {e.sentence_index for e in log.iter_events()}
+        self.assertEqual(segments, {0, 1})
+        with KeystrokeWriter(self.path) as writer, self.assertRaises(ValueError):
+            writer.record_input("x")  # 문장 시작 전 입력
+
+    def test_reopen_after_torn_write(self) -> None:
+        """쓰던 중 중단된 레코드를 잘라내고 이어 쓰는지 테스트"""
+        start = self.write_sample()
+        size = os.path.getsize(self.path)
+        for tail in (b'\x85', b'\x05', b'\x05\x85\x80'):
+            with self.subTest(tail=tail):
+                with open(self.path, 'ab') as f:
+                    f.write(tail)
+                with KeystrokeWriter(self.path) as writer:
+                    self.assertEqual(os.path.getsize(self.path), size)
+                    writer.begin_sentence(1, "ab", start + 3000)
+                    writer.record_input("ab", start + 3100)
+                    writer.end_sentence(start + 3200)
+                with KeystrokeLog(self.path) as log:
+                    events = [e for e in log.iter_events() if e.sentence == 1]
+                self.assertEqual([(e.kind, e.time_ms - start, e.sentence_index) for e in events if e.kind != TARGET],
+                                 [(SENTENCE, 3000, 1), (KEY, 3100, 1), (KEY, 3100, 1), (END, 3200, 1)])
+                # 다음 경우를 위해 이어 쓴 문장을 지웁니다
+                with open(self.path, 'r+b') as f:
+                    f.truncate(size)
+
+    @skipUnless(np is not None, "numpy가 설치되어 있지 않습니다")
+    def test_vectorised_matches_python(self) -> None:
+        """NumPy 디코딩이 순수 Python 디코딩과 같은지 테스트"""
+        self.write_sample()
+        with KeystrokeWriter(self.path) as writer:
+            writer.begin_sentence(1, "ab")
+            writer.record_input("ab")
+            writer.end_sentence()
+        with KeystrokeLog(self.path) as log:
+            events = list(log.iter_events())
+            arrays = log.arrays()
+        self.assertEqual(arrays.times.tolist(), [e.time_ms for e in events])
+        self.assertEqual(arrays.kinds.tolist(), [e.kind for e in events])
+        self.assertEqual(arrays.segments.tolist(), [e.sentence for e in events])
+        self.assertEqual(arrays.target_lengths.tolist(), [6, 2])
+
+    @skipUnless(np is not None, "numpy가 설치되어 있지 않습니다")
+    def test_analytics(self) -> None:
+        """조합 중간 글자를 제외한 간격과 오타 분석 테스트"""
+        self.write_sample()
+        result = analyze(self.path)
+        self.assertEqual(result["sentences"], 1)
+        latency = {row["char"]: row for row in result["key_latency"]}
+        self.assertEqual(latency["녕"]["mean_ms"], 100.0)
+        self.assertNotIn("ㅇ", latency)  # 조합 중간 상태
+        # 'b' 자리에 'x'를 한 번 잘못 입력
+        self.assertEqual(result["error_hotspots"], [{"char": "b", "attempts": 2, "errors": 1, "error_rate": 0.5}])
+
+    def test_replay(self) -> None:
+        """같은 시각의 레코드가 한 화면으로 합쳐지고 속도가 반영되는지 테스트"""
+        self.write_sample()
+        frames = list(iter_replay(self.path, speed=2.0))
+        self.assertEqual([f.typed for f in frames[:3]], ["ㅇ", "아", "안"])
+        self.assertEqual(frames[1].delay, 0.05)
+        self.assertTrue(frames[-1].submitted)
+        self.assertEqual(frames[-1].typed, "안녕 abc")
+        with self.assertRaises(ValueError):
+            list(iter_replay(self.path, speed=0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""순위표 테스트"""
+from unittest import TestCase, main
+import os
+import random
+import sys
+import tempfile
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from leaderboard import FenwickTree, Leaderboard, detect_language
+
+def stats(cpm: float, words: int = 30, accuracy: float = 95.0) -> dict:
+    return {"total_words": words, "accuracy": accuracy, "cpm": cpm, "wpm": cpm / 5}
+
+class TestLeaderboard(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "leaderboard.db")
+        self.boards = []
+
+    def tearDown(self) -> None:
+        for board in self.boards:
+            board.close()
+        self.temp_dir.cleanup()
+
+    def open(self, **kwargs) -> Leaderboard:
+        board = Leaderboard(self.path, **kwargs)
+        self.boards.append(board)
+        return board
+
+    def test_fenwick_tree(self) -> None:
+        """누적합이 단순 합과 같은지, 개수 목록으로 만든 트리와 같은지 테스트"""
+        rng = random.Random(0)
+        counts = [rng.randint(0, 5) for _ in range(100)]
+        built = FenwickTree.from_counts(counts)
+        tree = FenwickTree(100)
+        for index, count in enumerate(counts):
+            tree.add(index, count)
+        for index in range(-1, 101):
+            expected = sum(counts[:index + 1])
+            self.assertEqual(tree.prefix_sum(index), expected)
+            self.assertEqual(built.prefix_sum(index), expected)
+        self.assertEqual(built.total, sum(counts))
+
+    def test_rank_percentile_and_top(self) -> None:
+        """최고 기록만 반영한 순위, 백분위, 상위 K명이 전체 정렬 결과와 같은지 테스트"""
+        board = self.open(top_k=5)
+        rng = random.Random(1)
+        best = {}
+        for _ in range(300):
+            user = f"user{rng.randrange(40)}"
+            cpm = round(rng.uniform(100, 600), 1)
+            board.submit(user, "한국어", "직접 입력", stats(cpm))
+            best[user] = max(best.get(user, 0), cpm)
+
+        scores = sorted(best.values(), reverse=True)
+        self.assertEqual([row["score"] for row in board.top("한국어", "직접 입력")], scores[:5])
+        user, score = max(best.items(), key=lambda item: item[1])
+        standing = board.user_rank(user, "한국어", "직접 입력")
+        self.assertEqual((standing["rank"], standing["total"], standing["percentile"]), (1, len(best), 100.0))
+        middle = board.rank("한국어", "직접 입력", scores[len(scores) // 2])
+        self.assertEqual(middle["rank"], len(scores) // 2 + 1)
+        self.assertEqual(board.rank("English", "직접 입력", 300)["total"], 0)
+
+    def test_qualification_and_best_only(self) -> None:
+        """기준 미달 기록은 무시하고, 낮은 기록은 최고 기록을 바꾸지 않는지 테스트"""
+        board = self.open()
+        self.assertIsNone(board.submit("a", "한국어", "직접 입력", stats(500, words=3)))
+        self.assertIsNone(board.submit("a", "한국어", "직접 입력", stats(500, accuracy=50)))
+        self.assertTrue(board.submit("a", "한국어", "직접 입력", stats(300))["improved"])
+        result = board.submit("a", "한국어", "직접 입력", stats(200))
+        self.assertFalse(result["improved"])
+        self.assertEqual((result["score"], result["total"]), (300.0, 1))
+
+    def test_rebuild_and_other_process_writes(self) -> None:
+        """파일에서 다시 만든 색인과 다른 연결의 기록 감지 테스트"""
+        first = self.open(top_k=3)
+        for i, cpm in enumerate([250, 400, 320, 180]):
+            first.submit(f"u{i}", "English", "파일 업로드", stats(cpm), name=f"name{i}")
+        reopened = self.open(top_k=3)
+        self.assertEqual(reopened.top("English", "파일 업로드"), first.top("English", "파일 업로드"))
+        self.assertEqual(reopened.top("English", "파일 업로드")[0]["name"], "name1")
+
+        reopened.submit("u9", "English", "파일 업로드", stats(450))
+        self.assertEqual(first.user_rank("u1", "English", "파일 업로드")["rank"], 2)
+        self.assertEqual(first.top("English", "파일 업로드")[0]["score"], 450.0)
+
+    def test_concurrent_submit_keeps_best(self) -> None:
+        """두 프로세스가 같은 사용자의 기록을 동시에 남겨도 낮은 점수가 높은 점수를 덮어쓰지 않는지 테스트"""
+        first, second = self.open(), self.open()
+        conn = second._conn
+
+        class RacingConnection:
+            """비교한 뒤 기록하기 직전에 다른 프로세스가 더 높은 기록을 남기는 연결"""
+            def execute(self, sql, *args):
+                if sql.startswith("INSERT"):
+                    first.submit("u1", "한국어", "직접 입력", stats(400))
+                return conn.execute(sql, *args)
+
+            def __enter__(self):
+                return conn.__enter__()
+
+            def __exit__(self, *exc_info):
+                return conn.__exit__(*exc_info)
+
+        second._conn = RacingConnection()
+        result = second.submit("u1", "한국어", "직접 입력", stats(300))
+        second._conn = conn
+        self.assertFalse(result["improved"])
+        self.assertEqual(second.user_rank("u1", "한국어", "직접 입력")["total"], 1)
+        self.assertEqual(second.top("한국어", "직접 입력")[0]["score"], 400.0)
+
+    def test_detect_language(self) -> None:
+        self.assertEqual(detect_language("오늘도 타자 연습을 합니다."), "한국어")
+        self.assertEqual(detect_language("Practice every day."), "English")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""운영 지표 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import urllib.request
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from metrics import ActiveSessions, Registry, start_http_server
+
+class TestMetrics(TestCase):
+    def setUp(self) -> None:
+        self.registry = Registry()
+
+    def test_counter_and_gauge(self) -> None:
+        """라벨별 카운터와 계산 게이지 출력 테스트"""
+        counter = self.registry.counter("requests_total", "요청 수", ["path"])
+        counter.inc(path="/a")
+        counter.inc(2, path='/b"c')
+        self.registry.gauge("queue_size", "대기 수").set_function(lambda: 7)
+        text = self.registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{path="/a"} 1.0', text)
+        self.assertIn('requests_total{path="/b\\"c"} 2.0', text)
+        self.assertIn("queue_size 7.0", text)
+        self.assertIs(self.registry.counter("requests_total", "요청 수", ["path"]), counter)
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests_total", "요청 수")
+        with self.assertRaises(ValueError):
+            counter.inc(-1, path="/a")
+        with self.assertRaises(ValueError):
+            counter.inc(method="GET")
+
+    def test_histogram_buckets(self) -> None:
+        """구간 경계값과 누적 횟수 테스트"""
+        histogram = self.registry.histogram("latency_seconds", "지연", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+        with histogram.time():
+            pass
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 4', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 5', lines)
+        self.assertIn('latency_seconds_count 5', lines)
+        self.assertEqual(histogram.count(), 5)
+
+    def test_active_sessions_window(self) -> None:
+        """활성 세션 집계 시간 창 테스트"""
+        sessions = ActiveSessions(window=60)
+        sessions.touch("a")
+        sessions.touch("b")
+        sessions.touch("a")
+        self.assertEqual(sessions.count(), 2)
+        sessions.window = -1
+        self.assertEqual(sessions.count(), 0)
+
+    def test_http_server(self) -> None:
+        """지표 HTTP 서버 응답 테스트"""
+        self.registry.counter("hits_total", "조회 수").inc()
+        server = start_http_server(port=0, registry=self.registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+                self.assertIn("hits_total 1.0", response.read().decode('utf-8'))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    main()
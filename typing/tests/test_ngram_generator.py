@@ -0,0 +1,85 @@
+"""오프라인 n-gram 문장 생성기 테스트"""
+from unittest import TestCase, main
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus import CorpusWriter
+from ngram_generator import NGramModel, iter_training_sentences, matches_language
+
+TRAINING_SENTENCES = [
+    "작은 습관이 모여 큰 변화를 만들어 내고 우리의 삶을 바꿉니다.",
+    "매일 조금씩 배우는 습관이 모여 큰 성장을 만들어 냅니다.",
+    "새로운 기술을 배우는 것은 우리의 삶을 더 풍요롭게 만듭니다.",
+    "꾸준한 연습이 모여 큰 변화를 만들어 내고 자신감을 키워줍니다.",
+    "Small daily habits build a strong foundation for lasting success.",
+    "Learning a new skill every day builds a strong sense of confidence.",
+]
+
+class TestNGramModel(TestCase):
+    def setUp(self) -> None:
+        self.model = NGramModel.train(TRAINING_SENTENCES)
+
+    def test_generate_within_length(self) -> None:
+        """생성된 문장이 단어 수 조건을 지키는지 테스트"""
+        sentences = self.model.generate_sentences(5, min_words=7, max_words=12, seed=1)
+        self.assertTrue(sentences)
+        for sentence in sentences:
+            with self.subTest(sentence=sentence):
+                self.assertTrue(7 <= len(sentence.split()) <= 12)
+
+    def test_generated_words_come_from_corpus(self) -> None:
+        """생성된 문장의 단어가 모두 학습 데이터에 있는지 테스트"""
+        vocabulary = {word for sentence in TRAINING_SENTENCES for word in sentence.split()}
+        for sentence in self.model.generate_sentences(5, seed=2):
+            self.assertTrue(set(sentence.split()) <= vocabulary)
+
+    def test_unreachable_length_returns_none(self) -> None:
+        """만들 수 없는 길이 조건이면 None을 반환하는지 테스트"""
+        self.assertIsNone(self.model.generate(min_words=50, max_words=60, rng=random.Random(0)))
+
+    def test_save_and_load(self) -> None:
+        """저장 후 불러온 모델이 같은 문장을 생성하는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "models" / "model.bin"
+            self.model.save(path)
+            loaded = NGramModel.load(path)
+        self.assertEqual(loaded.vocab, self.model.vocab)
+        self.assertEqual(loaded.generate_sentences(5, seed=3), self.model.generate_sentences(5, seed=3))
+
+    def test_invalid_training(self) -> None:
+        """학습할 문장이 없거나 차수가 잘못되면 ValueError를 발생시키는지 테스트"""
+        with self.assertRaises(ValueError):
+            NGramModel.train(["", "   "])
+        with self.assertRaises(ValueError):
+            NGramModel.train(TRAINING_SENTENCES, order=1)
+
+class TestTrainingData(TestCase):
+    def test_matches_language(self) -> None:
+        """언어 판별 테스트"""
+        self.assertTrue(matches_language(TRAINING_SENTENCES[0], "한국어"))
+        self.assertFalse(matches_language(TRAINING_SENTENCES[4], "한국어"))
+        self.assertTrue(matches_language(TRAINING_SENTENCES[4], "English"))
+        self.assertFalse(matches_language(TRAINING_SENTENCES[0], "English"))
+
+    def test_iter_training_sentences(self) -> None:
+        """코퍼스와 텍스트 파일에서 언어별로 학습 문장을 읽는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_path = Path(temp_dir) / "train.corpus"
+            with CorpusWriter(corpus_path) as writer:
+                writer.add_many(TRAINING_SENTENCES[:4])
+            text_path = Path(temp_dir) / "train.txt"
+            text_path.write_text('\n'.join(TRAINING_SENTENCES[4:]), encoding='utf-8')
+
+            korean = list(iter_training_sentences([str(corpus_path), str(text_path)], "한국어"))
+            english = list(iter_training_sentences([str(corpus_path), str(text_path)], "English"))
+        self.assertEqual(korean, TRAINING_SENTENCES[:4])
+        self.assertEqual(english, TRAINING_SENTENCES[4:])
+
+if __name__ == '__main__':
+    main()
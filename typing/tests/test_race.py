@@ -0,0 +1,143 @@
+"""멀티플레이 레이스 테스트"""
+from unittest import TestCase, main
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from race import RaceHub, RaceRoom
+
+SENTENCES = ["첫 번째 레이스 문장입니다.", "Second race sentence."]
+
+class FakeWebSocket:
+    """ASGI 웹소켓 연결 흉내"""
+    def __init__(self, hub: RaceHub, room_id: str, name: str):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent: List[Dict[str, Any]] = []
+        self.incoming.put_nowait({"type": "websocket.connect"})
+        scope = {"type": "websocket", "path": f"/races/{room_id}/ws", "query_string": f"name={name}".encode()}
+        self.task = asyncio.create_task(hub.handle_websocket(scope, self.incoming.get, self._send))
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self.sent.append(message)
+
+    def send_json(self, message: Dict[str, Any]) -> None:
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(message)})
+
+    def messages(self, kind: str) -> List[Dict[str, Any]]:
+        return [json.loads(m["text"]) for m in self.sent
+                if m["type"] == "websocket.send" and json.loads(m["text"])["type"] == kind]
+
+    async def close(self) -> None:
+        self.incoming.put_nowait({"type": "websocket.disconnect"})
+        await self.task
+
+async def settle() -> None:
+    """대기 중인 작업이 처리되도록 이벤트 루프를 몇 번 돌립니다."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+class TestRaceRoom(TestCase):
+    def test_race_to_finish(self) -> None:
+        """카운트다운, 진행, 완주 순위 테스트"""
+        room = RaceRoom("room", SENTENCES)
+        first, second = room.join("하나", now=0.0), room.join("둘", now=0.0)
+        room.handle_message(first, {"type": "progress", "typed": "첫 번째"}, now=0.5)
+        self.assertEqual(first.typed_chars, 0)  # 시작 전 입력은 무시
+
+        room.start(now=1.0, countdown=2.0)
+        room.update_status(2.0)
+        self.assertEqual(room.status, "waiting")
+        room.handle_message(first, {"type": "progress", "typed": "첫 번째"}, now=3.0)
+        self.assertEqual(room.status, "running")
+        self.assertEqual(first.typed_chars, 4)
+        self.assertGreater(first.progress(), 0)
+
+        for racer in (second, first):
+            for sentence in SENTENCES:
+                room.handle_message(racer, {"type": "submit", "text": sentence}, now=10.0)
+        self.assertEqual((second.rank, first.rank), (1, 2))
+        self.assertEqual(first.row()[1:3], [2, 1000])
+        room.update_status(10.0)
+        self.assertEqual(room.status, "finished")
+        with self.assertRaises(ValueError):
+            room.join("늦은 참가자")
+
+    def test_limits_and_invalid_messages(self) -> None:
+        """정원 초과와 잘못된 메시지 처리 테스트"""
+        room = RaceRoom("room", SENTENCES, max_racers=1)
+        racer = room.join("  아주   긴 이름 " * 5)
+        self.assertLessEqual(len(racer.name), 20)
+        with self.assertRaises(ValueError):
+            room.join("둘")
+        with self.assertRaises(ValueError):
+            room.handle_message(racer, {"type": "cheat"}, now=0.0)
+        with self.assertRaises(ValueError):
+            RaceRoom("empty", [])
+
+class TestRaceHub(TestCase):
+    def test_coalesced_broadcast(self) -> None:
+        """여러 진행 메시지가 한 번의 방송으로 합쳐지는지 테스트"""
+        async def scenario() -> None:
+            hub = RaceHub(tick_interval=3600)
+            room = hub.create_room(SENTENCES)
+            room.start(countdown=0)
+            sockets = [FakeWebSocket(hub, room.id, f"racer{i}") for i in range(3)]
+            await settle()
+            self.assertEqual(len(room.racers), 3)
+            for socket in sockets:
+                self.assertEqual(socket.sent[0]["type"], "websocket.accept")
+                self.assertEqual(socket.messages("joined")[0]["sentences"], SENTENCES)
+
+            for typed in ("첫", "첫 번", "첫 번째"):
+                sockets[0].send_json({"type": "progress", "typed": typed})
+            await settle()
+            self.assertEqual(hub.tick(), 3)
+            self.assertEqual(hub.tick(), 0)  # 바뀐 것이 없으면 보내지 않음
+            await settle()
+            for socket in sockets:
+                states = socket.messages("state")
+                self.assertEqual(len(states), 1)
+                self.assertEqual(len(socket.messages("roster")[-1]["racers"]), 3)
+            rows = {row[0]: row for row in sockets[1].messages("state")[0]["racers"]}
+            self.assertGreater(rows[1][2], 0)
+
+            sockets[0].send_json({"type": "nonsense"})
+            await settle()
+            self.assertEqual(len(sockets[0].messages("error")), 1)
+
+            await sockets[2].close()
+            self.assertEqual(len(room.racers), 2)
+            for socket in sockets[:2]:
+                await socket.close()
+            hub.stop()
+
+        asyncio.run(scenario())
+
+    def test_slow_client_keeps_latest_state_only(self) -> None:
+        """보내지 못한 상태는 최신 것 하나만 남는지 테스트"""
+        room = RaceRoom("room", SENTENCES)
+        hub = RaceHub()
+        hub.rooms[room.id] = room
+        racer = room.join("느린 참가자")
+        for tick in range(5):
+            room.dirty = True
+            hub.tick(now=float(tick))
+        self.assertEqual(json.loads(racer.pending)["tick"], 5)
+
+    def test_unknown_room(self) -> None:
+        """없는 방에 접속하면 연결을 거부하는지 테스트"""
+        async def scenario() -> List[Dict[str, Any]]:
+            socket = FakeWebSocket(RaceHub(), "missing", "누군가")
+            await socket.task
+            return socket.sent
+
+        sent = asyncio.run(scenario())
+        self.assertEqual(sent, [{"type": "websocket.close", "code": 4404}])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""무작위 추출 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus import CorpusReader, CorpusWriter
+from sampling import make_rng, reservoir_sample, sample_sequence
+
+class TestSampling(TestCase):
+    def test_reservoir_sample(self) -> None:
+        """한 번 읽는 스트림에서 중복 없이 k개를 뽑고, 시드가 같으면 결과도 같은지 테스트"""
+        sample = reservoir_sample(iter(range(10000)), 20, make_rng(7))
+        self.assertEqual(len(sample), 20)
+        self.assertEqual(len(set(sample)), 20)
+        self.assertTrue(all(0 <= x < 10000 for x in sample))
+        self.assertEqual(reservoir_sample(iter(range(10000)), 20, make_rng(7)), sample)
+        self.assertNotEqual(reservoir_sample(iter(range(10000)), 20, make_rng(8)), sample)
+
+        self.assertEqual(sorted(reservoir_sample(range(5), 10, make_rng(1))), list(range(5)))
+        self.assertEqual(reservoir_sample(range(5), 0), [])
+        with self.assertRaises(ValueError):
+            reservoir_sample(range(5), -1)
+
+    def test_uniform(self) -> None:
+        """앞쪽과 뒤쪽 항목이 뽑힐 확률이 고른지 테스트"""
+        rng = make_rng(0)
+        counts = Counter()
+        for _ in range(4000):
+            counts.update(reservoir_sample(range(100), 5, rng))
+        # 항목마다 기대값 200회, 3시그마(약 42회)를 넉넉히 넘지 않아야 함
+        self.assertLess(max(abs(counts[i] - 200) for i in range(100)), 60)
+        self.assertLess(abs(sum(counts[i] for i in range(50)) - 10000), 300)
+
+    def test_sample_corpus(self) -> None:
+        """코퍼스 색인으로 필요한 문장만 읽어 뽑는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "test.corpus"
+            sentences = [f"연습 문장 번호 {i} 입니다." for i in range(100)]
+            with CorpusWriter(path, block_size=7) as writer:
+                writer.add_many(sentences)
+            with CorpusReader(path) as reader:
+                sample = sample_sequence(reader, 10, make_rng(3))
+                self.assertEqual(len(set(sample)), 10)
+                self.assertTrue(set(sample) <= set(sentences))
+                self.assertEqual(sample_sequence(reader, 10, make_rng(3)), sample)
+                self.assertEqual(len(sample_sequence(reader, 500)), 100)
+
+if __name__ == '__main__':
+    main()
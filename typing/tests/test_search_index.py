@@ -0,0 +1,126 @@
+"""코퍼스 검색 색인 테스트"""
+from unittest import TestCase, main
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from corpus import CorpusReader, CorpusWriter
+from corpus_builder import process_block
+from search_index import SearchIndex, open_index, search, search_corpus, tokenize
+
+SENTENCES = [
+    "타자 연습은 매일 조금씩 하는 것이 좋습니다.",
+    "오늘은 날씨가 맑습니다.",
+    "The quick brown fox jumps over the lazy dog.",
+    "매일 아침 타자 연습을 합니다.",
+    "A lazy afternoon with a good book.",
+    "연습 문제를 풀어 봅시다.",
+]
+
+class TestTokenize(TestCase):
+    def test_terms(self) -> None:
+        """한글은 글자 2-gram, 영어는 소문자 단어로 나누는지 테스트"""
+        self.assertEqual(sorted(tokenize("타자연습 Quick, FOX! 나")), sorted(["타자", "자연", "연습", "quick", "fox", "나"]))
+        self.assertEqual(sorted(tokenize("Python으로")), ["python", "으로"])
+        self.assertEqual(tokenize("ㅇㅕㄴㅅㅡㅂ"), ["연습"])   # 낱자모 입력도 음절로 조합
+
+class TestSearch(TestCase):
+    def setUp(self) -> None:
+        self.index = SearchIndex()
+        self.index.add_many(SENTENCES)
+
+    def test_phrase_ranked_first(self) -> None:
+        """검색어가 그대로 들어 있는 문장을 앞에 놓는지 테스트"""
+        hits = search(self.index, SENTENCES, "타자 연습")
+        self.assertEqual([hit.position for hit in hits], [3, 0])   # 둘 다 그대로 들어 있으면 짧은 문장 먼저
+        self.assertEqual([hit.position for hit in search(self.index, SENTENCES, "연습 타자")], [3, 0])
+        self.assertEqual([hit.position for hit in search(self.index, SENTENCES, "연습은 매일", min_should_match=0.5)],
+                         [0, 3])
+
+    def test_words_and_min_should_match(self) -> None:
+        """영어 단어 검색과 일부 term만 들어 있는 문장 처리 테스트"""
+        self.assertEqual({hit.position for hit in search(self.index, SENTENCES, "LAZY")}, {2, 4})
+        self.assertEqual([hit.position for hit in search(self.index, SENTENCES, "lazy fox")], [2])
+        hits = search(self.index, SENTENCES, "lazy fox", min_should_match=0.5)
+        self.assertEqual([hit.position for hit in hits][0], 2)
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(search(self.index, SENTENCES, "고양이"), [])
+        self.assertEqual(search(self.index, SENTENCES, "!!"), [])
+
+    def test_limit(self) -> None:
+        self.assertEqual(len(search(self.index, SENTENCES, "연습", limit=2)), 2)
+
+    def test_python_fallback(self) -> None:
+        """numpy 없이 계산해도 같은 결과를 내는지 테스트"""
+        queries = [("타자 연습", 0.75), ("연습은 매일", 0.5), ("lazy fox", 0.5), ("연습", 0.75)]
+        expected = [search(self.index, SENTENCES, query, min_should_match=msm) for query, msm in queries]
+        with patch("search_index.np", None):
+            actual = [search(self.index, SENTENCES, query, min_should_match=msm) for query, msm in queries]
+        self.assertEqual([[hit.position for hit in hits] for hits in actual],
+                         [[hit.position for hit in hits] for hits in expected])
+        for hits, other in zip(actual, expected):
+            for hit, hit2 in zip(hits, other):
+                self.assertAlmostEqual(hit.score, hit2.score)
+
+class TestCorpusIndex(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "test.corpus"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_stored_index_and_append(self) -> None:
+        """코퍼스에 저장한 색인으로 검색하고, 이어 쓸 때 새 문장만 더하는지 테스트"""
+        with CorpusWriter(self.path, block_size=4, index=SearchIndex()) as writer:
+            writer.add_many(SENTENCES[:5])
+        with CorpusReader(self.path) as reader:
+            self.assertIsNotNone(open_index(reader))
+            self.assertEqual([hit.position for hit in search_corpus(reader, "타자 연습")], [3, 0])
+
+        with CorpusWriter(self.path, append=True, index=SearchIndex()) as writer:
+            writer.add(SENTENCES[5])
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(list(reader), SENTENCES)
+            hits = search_corpus(reader, "연습")
+            self.assertEqual([hit.position for hit in hits], [5, 3, 0])
+            self.assertEqual(hits[0].sentence, SENTENCES[5])
+
+        # 색인 없이 이어 쓰면 오래된 색인 정보를 남기지 않음
+        with CorpusWriter(self.path, append=True) as writer:
+            writer.add("색인 없이 추가한 연습 문장")
+        with CorpusReader(self.path) as reader:
+            self.assertIsNone(open_index(reader))
+            self.assertEqual(len(search_corpus(reader, "연습")), 4)
+
+    def test_index_added_to_existing_corpus(self) -> None:
+        """색인 없이 만든 코퍼스에 색인을 붙여 이어 쓰는지 테스트"""
+        with CorpusWriter(self.path, block_size=4) as writer:
+            writer.add_many(SENTENCES[:5])
+        with CorpusWriter(self.path, append=True, index=SearchIndex()) as writer:
+            writer.add(SENTENCES[5])
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(len(open_index(reader)), len(SENTENCES))
+            self.assertEqual({hit.position for hit in search_corpus(reader, "lazy")}, {2, 4})
+
+    def test_add_block_with_shards(self) -> None:
+        """다른 프로세스에서 압축한 블록과 색인 조각을 이어 붙여도 같은 색인이 되는지 테스트"""
+        with CorpusWriter(self.path, block_size=4, index=SearchIndex()) as writer:
+            for start in range(0, len(SENTENCES), 4):
+                data, count, shard = process_block(SENTENCES[start:start + 4], writer.codec, True)
+                writer.add_block(data, count, pickle.loads(pickle.dumps(shard)))
+            with self.assertRaises(ValueError):
+                writer.add_block(data, count)
+        with CorpusReader(self.path) as reader:
+            self.assertEqual(list(reader), SENTENCES)
+            self.assertEqual([hit.position for hit in search_corpus(reader, "연습")], [5, 3, 0])
+            self.assertEqual({hit.position for hit in search_corpus(reader, "lazy")}, {2, 4})
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""입력한 문장 기록(Bloom 필터) 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from seen_filter import SeenFilter
+
+class TestSeenFilter(TestCase):
+    def test_no_false_negatives_and_bounded_error(self) -> None:
+        """기록한 문장은 항상 찾고, 오탐률과 크기가 설정 범위 안인지 테스트"""
+        seen = SeenFilter(capacity=500, error_rate=0.01)
+        typed = [f"입력한 문장 {i}번" for i in range(3000)]   # 용량을 넘겨 필터가 덧붙여짐
+        for sentence in typed:
+            seen.add(sentence)
+        self.assertTrue(all(sentence in seen for sentence in typed))
+        self.assertGreater(len(seen.layers), 1)
+        self.assertGreater(len(seen), 2900)                 # 오탐으로 이미 있다고 판단한 문장은 세지 않음
+        false_positives = sum(f"처음 보는 문장 {i}번" in seen for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)      # 0.01 / (1 - 0.5)
+        self.assertLess(seen.size_bytes / 3000, 2.5)        # 문장당 몇 바이트
+
+    def test_duplicates_and_whitespace(self) -> None:
+        seen = SeenFilter()
+        self.assertTrue(seen.add("타자 연습"))
+        self.assertFalse(seen.add("타자  연습 "))
+        self.assertEqual(len(seen), 1)
+
+    def test_prefer_unseen(self) -> None:
+        """이미 입력한 문장을 뒤로 미루거나 건너뛰는지 테스트"""
+        seen = SeenFilter()
+        seen.add("b")
+        seen.add("d")
+        self.assertEqual(list(seen.prefer_unseen(["a", "b", "c", "d"], "deprioritize")), ["a", "c", "b", "d"])
+        self.assertEqual(list(seen.prefer_unseen(["a", "b", "c", "d"], "skip")), ["a", "c"])
+        # 모두 입력한 문장이면 skip이어도 연습할 문장을 남김
+        self.assertEqual(list(seen.prefer_unseen(["b", "d"], "skip")), ["b", "d"])
+        self.assertEqual(list(seen.prefer_unseen(["b", "d", "e"], "skip", max_deferred=1)), ["e"])
+        with self.assertRaises(ValueError):
+            list(seen.prefer_unseen(["a"], "random"))
+
+    def test_state_round_trip(self) -> None:
+        seen = SeenFilter(capacity=10)
+        for i in range(25):
+            seen.add(f"문장 {i}")
+        restored = SeenFilter.from_state(seen.to_state())
+        self.assertEqual(restored.to_bytes(), seen.to_bytes())
+        self.assertIn("문장 24", restored)
+        self.assertEqual(len(SeenFilter.from_state(None)), 0)
+        with self.assertRaises(ValueError):
+            SeenFilter.from_bytes(seen.to_bytes()[:-3])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""세션 메모리 예산 테스트"""
+from unittest import TestCase, main
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from metrics import REGISTRY
+from session_pool import SessionPool, SpillStore
+from session_store import MemoryBackend, SessionStore, SQLiteBackend
+from typing_manager import TypingManager
+
+def make_manager(count: int) -> TypingManager:
+    manager = TypingManager()
+    manager.set_input_method("직접 입력")
+    manager.load_sentences([f"연습 문장 {i}번은 조금 길게 작성한 문장입니다." for i in range(count)])
+    return manager
+
+class TestSessionPool(TestCase):
+    def test_budget_evicts_least_recently_used(self) -> None:
+        """예산을 넘으면 오래 쓰이지 않은 세션부터 내보내고, 사용 중인 세션은 남기는지 테스트"""
+        probe = SessionPool()
+        probe.put("a", make_manager(100))
+        size = probe.total_bytes
+        probe.clear()
+
+        pool = SessionPool(budget_bytes=int(size * 2.5))
+        pool.put("a", make_manager(100))
+        pool.put("b", make_manager(100), pin=True)
+        pool.put("c", make_manager(100))
+        self.assertEqual(len(pool), 2)
+        self.assertNotIn("a", pool)
+
+        pool.get("c")                              # c를 최근에 사용
+        evicted = pool.put("d", make_manager(100))
+        self.assertEqual([session_id for session_id, _ in evicted], ["c"])  # b는 사용 중
+        self.assertEqual(pool.release("b"), [])
+        self.assertLessEqual(pool.total_bytes, pool.budget_bytes)
+
+    def test_accounting_follows_changes(self) -> None:
+        """문장이 늘거나 바뀌면 크기를 다시 재는지 테스트"""
+        pool = SessionPool()
+        manager = make_manager(10)
+        pool.put("a", manager, pin=True)
+        small = pool.size_of("a")
+        manager.current_sentences.extend(manager.current_sentences * 9)   # 스트리밍으로 추가된 경우
+        pool.release("a")
+        large = pool.size_of("a")
+        self.assertGreater(large - small, 90 * 100)  # 추가된 문장 90개
+        manager.reset_all()
+        pool.release("a")
+        self.assertLess(pool.size_of("a"), small)
+        self.assertEqual(pool.total_bytes, pool.size_of("a"))
+        pool.discard("a")
+        self.assertEqual(pool.total_bytes, 0)
+
+    def test_idle_sweep(self) -> None:
+        """오래 쓰이지 않은 세션만 내보내는지 테스트"""
+        pool = SessionPool(idle_ttl=60)
+        pool.put("idle", make_manager(5))
+        pool.put("busy", make_manager(5), pin=True)
+        later = time.monotonic() + 120
+        pool.put("recent", make_manager(5))
+        self.assertEqual([session_id for session_id, _ in pool.sweep(later - 90)], [])
+        self.assertEqual(sorted(session_id for session_id, _ in pool.sweep(later)), ["idle", "recent"])
+        self.assertIn("busy", pool)
+
+    def test_memory_gauge(self) -> None:
+        """세션 메모리 합계가 지표로 나가는지 테스트"""
+        before = REGISTRY.gauge("typing_session_memory_bytes", "").value()
+        pool = SessionPool()
+        pool.put("a", make_manager(20))
+        self.assertEqual(REGISTRY.gauge("typing_session_memory_bytes", "").value() - before, pool.total_bytes)
+        pool.clear()
+        self.assertEqual(REGISTRY.gauge("typing_session_memory_bytes", "").value(), before)
+
+class TestSpillStore(TestCase):
+    def test_memory_backend_spills_to_disk(self) -> None:
+        """memory 저장소를 쓸 때 내린 세션을 파일에 기록하고 다시 불러오는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(MemoryBackend())
+            spill = SpillStore(store, str(Path(temp_dir) / "spill.db"))
+            manager = make_manager(3)
+            manager.handle_input("연습 문장 0번은 조금 길게 작성한 문장입니다.")
+            # 메모리에 올라 있는 동안에는 memory 저장소에 복사본을 두지 않음
+            self.assertFalse(spill.save_resident("a", manager))
+            self.assertIsNone(store.load("a"))
+            store.save("a", manager)
+
+            spill.save([("a", manager)])
+            self.assertIsNone(store.load("a"))           # 프로세스 메모리에는 남지 않음
+            restored = spill.load("a")
+            self.assertEqual(restored.to_state(), manager.to_state())
+            self.assertIsNone(spill.spill.load("a"))
+
+            # 만료된 세션은 다음에 열 때 지움
+            spill.spill.backend.set(store.key_prefix + "old", b"\x01", -1)
+            spill.close()
+            spill = SpillStore(store, str(Path(temp_dir) / "spill.db"))
+            self.assertEqual(spill.spill.backend.purge_expired(), 0)
+            spill.close()
+
+    def test_persistent_backend_saves_resident(self) -> None:
+        """sqlite/redis 저장소는 메모리에 올라 있는 세션도 바뀌면 기록하는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(SQLiteBackend(str(Path(temp_dir) / "sessions.db")))
+            spill = SpillStore(store)
+            self.assertTrue(spill.save_resident("a", make_manager(3)))
+            self.assertIsNotNone(store.load("a"))
+            store.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""세션 저장소 테스트"""
+from unittest import TestCase, main
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from resp_server import RespServer
+from session_store import (
+    MemoryBackend, RedisBackend, SQLiteBackend, SessionStore,
+    STATE_VERSION, decode_state, encode_state
+)
+from typing_manager import TypingManager
+
+def make_manager() -> TypingManager:
+    manager = TypingManager()
+    manager.set_input_method("직접 입력")
+    manager.load_sentences(["첫 번째 연습 문장입니다.", "Second practice sentence."])
+    manager.handle_input("첫 번째 연습 문장이다.")
+    return manager
+
+class TestStateFormat(TestCase):
+    def test_round_trip(self) -> None:
+        """직렬화 후 복원한 세션이 원래 세션과 같은지 테스트"""
+        manager = make_manager()
+        restored = TypingManager.from_state(decode_state(encode_state(manager.to_state())))
+        self.assertEqual(restored.to_state(), manager.to_state())
+        self.assertEqual(restored.get_current_sentence(), "Second practice sentence.")
+        self.assertEqual(restored.to_dict(), manager.to_dict())
+
+    def test_version_byte(self) -> None:
+        """버전 바이트가 다르면 ValueError를 발생시키는지 테스트"""
+        data = encode_state(make_manager().to_state())
+        self.assertEqual(data[0], STATE_VERSION)
+        with self.assertRaises(ValueError):
+            decode_state(bytes([STATE_VERSION + 1]) + data[1:])
+        with self.assertRaises(ValueError):
+            decode_state(b"")
+
+class BackendTestMixin:
+    """모든 저장소가 같은 동작을 하는지 확인하는 공통 테스트"""
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self) -> None:
+        self.backend = self.make_backend()
+        self.store = SessionStore(self.backend)
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_save_and_load(self) -> None:
+        """저장한 세션을 다른 저장소 인스턴스(다른 앱 프로세스)에서 불러오는지 테스트"""
+        manager = make_manager()
+        self.assertTrue(self.store.save("abc", manager))
+        restored = SessionStore(self.backend).load("abc")
+        self.assertEqual(restored.to_state(), manager.to_state())
+        self.assertIsNone(self.store.load("missing"))
+
+    def test_dirty_only_write_back(self) -> None:
+        """상태가 바뀐 경우에만 저장소에 기록하는지 테스트"""
+        manager = make_manager()
+        self.assertTrue(self.store.save("abc", manager))
+        self.assertFalse(self.store.save("abc", manager))
+        manager.handle_input("Second practice sentence.")
+        self.assertTrue(self.store.save("abc", manager))
+        self.assertEqual(self.store.writes, 2)
+
+        # 불러온 직후의 세션은 바뀌지 않았으므로 다시 기록하지 않음
+        other = SessionStore(self.backend)
+        self.assertFalse(other.save("abc", other.load("abc")))
+
+        # 바뀌지 않은 세션은 직렬화하지 않음
+        with patch.object(manager, "to_state", side_effect=AssertionError("직렬화함")):
+            self.assertFalse(self.store.save("abc", manager))
+        manager.set_input_method("직접 입력")  # 같은 값이면 바뀌지 않음
+        self.assertFalse(self.store.save("abc", manager))
+
+    def test_expiry_and_delete(self) -> None:
+        """TTL이 지나거나 삭제한 세션은 불러오지 않는지 테스트"""
+        self.backend.set("expired", encode_state(make_manager().to_state()), -1)
+        self.assertIsNone(self.backend.get("expired"))
+        self.store.save("abc", make_manager())
+        self.store.delete("abc")
+        self.assertIsNone(self.store.load("abc"))
+
+    def test_periodic_purge(self) -> None:
+        """purge_every번 기록할 때마다 만료된 세션을 지우는지 테스트"""
+        store = SessionStore(self.backend, purge_every=2)
+        with patch.object(self.backend, "purge_expired", wraps=self.backend.purge_expired) as purge:
+            for session_id in "abcde":
+                store.save(session_id, make_manager())
+        self.assertEqual(purge.call_count, 2)
+
+    def test_corrupted_state(self) -> None:
+        """손상된 데이터는 없는 세션으로 처리하는지 테스트"""
+        self.backend.set(self.store.key_prefix + "bad", bytes([STATE_VERSION]) + b"broken", 60)
+        self.assertIsNone(self.store.load("bad"))
+
+class TestMemoryBackend(BackendTestMixin, TestCase):
+    def make_backend(self):
+        return MemoryBackend()
+
+    def test_purge_expired(self) -> None:
+        """다시 읽히지 않은 만료된 세션 정리 테스트"""
+        self.backend.set("old", b"\x01", -1)
+        self.backend.set("new", b"\x01", 60)
+        self.assertEqual(self.backend.purge_expired(), 1)
+        self.assertEqual(self.backend.purge_expired(), 0)
+
+class TestSQLiteBackend(BackendTestMixin, TestCase):
+    def make_backend(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        return SQLiteBackend(str(Path(self.temp_dir.name) / "sessions.db"))
+
+    def test_purge_expired(self) -> None:
+        """만료된 세션 정리 테스트"""
+        self.backend.set("old", b"\x01", -1)
+        self.backend.set("new", b"\x01", 60)
+        self.assertEqual(self.backend.purge_expired(), 1)
+
+class TestRedisBackend(BackendTestMixin, TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = RespServer(("127.0.0.1", 0))
+        cls.server.start_in_thread()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def make_backend(self):
+        self.server.store.execute([b"FLUSHDB"])
+        return RedisBackend(self.server.url)
+
+    def test_binary_values_and_ttl(self) -> None:
+        """바이너리 값과 만료 시간이 RESP로 그대로 전달되는지 테스트"""
+        value = bytes(range(256)) + b"\r\n"
+        self.backend.set("bin", value, 60)
+        self.assertEqual(self.backend.get("bin"), value)
+        self.assertTrue(0 < self.backend.execute("TTL", "bin") <= 60)
+        self.assertEqual(self.backend.execute("PING"), "PONG")
+
+    def test_reconnect(self) -> None:
+        """연결이 끊어져도 다시 연결하여 명령을 실행하는지 테스트"""
+        self.backend.set("key", b"value", 60)
+        self.backend._sock.close()
+        self.assertEqual(self.backend.get("key"), b"value")
+
+    def test_lazy_connection(self) -> None:
+        """처음 사용할 때까지 연결하지 않는지 테스트"""
+        backend = RedisBackend("redis://127.0.0.1:1/0")
+        self.assertIsNone(backend._sock)
+        with self.assertRaises(OSError):
+            backend.get("key")
+        self.assertIsNone(backend._sock)
+
+if __name__ == '__main__':
+    main()
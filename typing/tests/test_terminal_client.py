@@ -0,0 +1,78 @@
+"""터미널 클라이언트 테스트"""
+from unittest import TestCase, main
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from terminal_client import TerminalSession, load_manager, tail_cells, wrap_cells
+from typing_manager import TypingManager
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class TestTerminalSession(TestCase):
+    def setUp(self) -> None:
+        self.manager = TypingManager()
+        self.manager.set_input_method("직접 입력")
+        self.manager.load_sentences(["안녕하세요 반갑습니다.", "두 번째 문장입니다."])
+        self.clock = FakeClock()
+        self.session = TerminalSession(self.manager, self.clock)
+
+    def test_typing_and_submit(self) -> None:
+        """키 입력, 지우기, 제출과 첫 키부터 잰 시간 사용 테스트"""
+        self.manager.stats.restart(at=self.manager.stats.start_time - 10.0)   # 서버 기준 10초 경과
+        for key in "안녕하세요 반갑":
+            self.assertTrue(self.session.feed(key))
+        self.session.feed('\x7f')
+        self.assertEqual(self.session.typed, "안녕하세요 반")
+        self.session.feed('\x15')
+        self.assertEqual(self.session.typed, "")
+        for key in "안녕하세요 반갑습니다.":
+            self.session.feed(key)
+        self.clock.now = 6.0
+        self.session.feed('\r')
+        self.assertEqual(self.manager.current_index, 1)
+        self.assertEqual(list(self.manager.stats.elapsed_times), [6.0])
+        self.assertEqual(self.session.typed, "")
+        self.assertIn("문장 2/2", self.session.status_line())
+        self.assertIn("정확도 100.0%", self.session.stats_line())
+
+        self.session.feed('\n')     # 빈 입력은 제출하지 않음
+        self.assertEqual(self.session.submitted, 1)
+        self.assertFalse(self.session.feed('\x1b'))
+
+    def test_layout(self) -> None:
+        """전각 문자를 2칸으로 계산하여 줄을 나누는지 테스트"""
+        self.assertEqual(wrap_cells("가나다라 ab", 6), [(0, 3), (3, 7)])
+        self.assertEqual(tail_cells("> 가나다라", 5), "다라")
+        self.assertEqual(tail_cells("> ab", 10), "> ab")
+
+    def test_load_file(self) -> None:
+        """파일 모드에서 시작 위치와 문장 수를 적용하는지 테스트"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "book.txt"
+            path.write_text('\n'.join(f"문장 {i}번입니다." for i in range(10)), encoding='utf-8')
+            args = argparse.Namespace(file=str(path), text=None, start=3, count=2, sample=False, seed=None)
+            manager = load_manager(args)
+            self.assertEqual(manager.current_sentences, ["문장 3번입니다.", "문장 4번입니다."])
+            args.start = 20
+            with self.assertRaises(ValueError):
+                load_manager(args)
+
+            # 무작위 추출은 시작 위치와 관계없이 같은 시드면 같은 문장을 뽑음
+            args.sample, args.seed = True, 7
+            sampled = load_manager(args).current_sentences
+            self.assertEqual(len(sampled), 2)
+            self.assertEqual(load_manager(args).current_sentences, sampled)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""업로드 파일 디코딩 테스트"""
+from unittest import TestCase, main
+from unittest.mock import patch
+import codecs
+import io
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from config import DECODING_CONFIG
+from text_decoder import detect_encoding, iter_decoded_chunks, iter_decoded_lines
+
+KOREAN_TEXT = "타이핑 연습을 하는 어플입니다.\n한 문장씩 연습할 수 있습니다.\nPractice makes perfect.\n"
+
+class TestDetectEncoding(TestCase):
+    def test_bom(self) -> None:
+        """BOM으로 인코딩을 감지하는지 테스트"""
+        cases = {
+            'utf-8-sig': codecs.BOM_UTF8 + KOREAN_TEXT.encode('utf-8'),
+            'utf-16': KOREAN_TEXT.encode('utf-16'),
+        }
+        for expected, data in cases.items():
+            with self.subTest(encoding=expected):
+                self.assertEqual(detect_encoding(data), expected)
+
+    def test_utf8(self) -> None:
+        """UTF-8 텍스트 감지 테스트 (끝에서 잘린 문자 포함)"""
+        data = KOREAN_TEXT.encode('utf-8')
+        self.assertEqual(detect_encoding(data), 'utf-8')
+        self.assertEqual(detect_encoding(data[:4]), 'utf-8')
+
+    def test_cp949(self) -> None:
+        """CP949/EUC-KR 한국어 텍스트 감지 테스트"""
+        self.assertEqual(detect_encoding(KOREAN_TEXT.encode('cp949')), 'cp949')
+        self.assertEqual(detect_encoding(KOREAN_TEXT.encode('euc-kr')), 'cp949')
+
+    def test_fallback(self) -> None:
+        """알 수 없는 바이트는 기본 인코딩으로 처리하는지 테스트"""
+        self.assertEqual(detect_encoding(bytes([0xFF, 0xFE, 0xFD, 0x80] * 8)[2:]), 'utf-8')
+
+class TestStreamingDecode(TestCase):
+    def test_chunks_split_multibyte_characters(self) -> None:
+        """멀티바이트 문자가 조각 경계에서 잘려도 올바르게 디코딩되는지 테스트"""
+        for encoding in ('utf-8', 'cp949'):
+            with self.subTest(encoding=encoding):
+                stream = io.BytesIO(KOREAN_TEXT.encode(encoding))
+                text = ''.join(iter_decoded_chunks(stream, chunk_size=3))
+                self.assertEqual(text, KOREAN_TEXT)
+
+    def test_lines(self) -> None:
+        """줄 단위로 반환하는지 테스트"""
+        stream = io.BytesIO(KOREAN_TEXT.encode('cp949'))
+        lines = list(iter_decoded_lines(stream, chunk_size=5))
+        self.assertEqual(lines, KOREAN_TEXT.splitlines())
+
+    def test_crlf_and_missing_final_newline(self) -> None:
+        """CRLF 줄바꿈과 마지막 줄바꿈이 없는 경우 테스트"""
+        data = "첫 줄\r\n\r\n둘째 줄\r\n\n마지막 줄".encode('utf-8')
+        expected = ["첫 줄", "", "둘째 줄", "", "마지막 줄"]
+        # 조각 경계가 \r과 \n 사이에 오는 경우도 포함하여 빈 줄이 생기지 않는지 확인
+        for chunk_size in range(1, len(data) + 1):
+            with self.subTest(chunk_size=chunk_size), patch.dict(DECODING_CONFIG, {"sniff_bytes": 1}):
+                lines = list(iter_decoded_lines(io.BytesIO(data), chunk_size=chunk_size, encoding='utf-8'))
+                self.assertEqual(lines, expected)
+
+    def test_long_line_is_bounded(self) -> None:
+        """줄바꿈 없는 긴 줄이 max_line_chars 이하로 나뉘는지 테스트"""
+        text = ' '.join(["단어"] * 1000)
+        stream = io.BytesIO(text.encode('utf-8'))
+        lines = list(iter_decoded_lines(stream, chunk_size=64, max_line_chars=50))
+        self.assertTrue(all(len(line) <= 50 for line in lines))
+        self.assertEqual(' '.join(lines).split(), text.split())
+
+if __name__ == '__main__':
+    main()
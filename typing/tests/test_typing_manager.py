@@ -1,16 +1,16 @@
 import unittest
-from unittest.mock import patch, Mock  # unittest.mock 대신 직접 import
+from unittest.mock import ANY, patch, Mock  # unittest.mock 대신 직접 import
 import os
 import sys
+import threading
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from typing_manager import TypingStats, TypingManager, WordStats
+from typing_manager import PreparedSentence, TypingStats, TypingManager, WordStats, split_client_timing
 
 class TestWordStats(unittest.TestCase):
     def setUp(self):
@@ -116,6 +116,58 @@ class TestTypingStats(unittest.TestCase):
         self.assertEqual(stats_dict['cpm'], 300.0)
         self.assertEqual(stats_dict['accuracy'], 90.0)
 
+    def test_client_elapsed_accepted_within_server_window(self):
+        """브라우저 측정 시간이 서버 측정 범위 안이면 사용하고 차이를 지연으로 기록합니다."""
+        self.typing_stats.restart(at=self.typing_stats.start_time - 5.0)  # 서버 기준 5초 경과
+        self.typing_stats.update(["hello", "world"], ["hello", "world"], client_elapsed=4.0)
+        self.assertEqual(list(self.typing_stats.elapsed_times), [4.0])
+        self.assertAlmostEqual(self.typing_stats.get_latency_ms(), 1000.0, delta=50)
+
+        restored = TypingStats.from_state(self.typing_stats.to_state())
+        self.assertEqual(restored.get_latency_ms(), self.typing_stats.get_latency_ms())
+
+    def test_client_elapsed_rejected(self):
+        """서버 시간보다 길거나 사람이 칠 수 없는 속도면 서버 측정 시간을 사용합니다."""
+        self.typing_stats.restart(at=self.typing_stats.start_time - 2.0)
+        self.typing_stats.update(["hello"], ["hello"], client_elapsed=30.0)
+        self.typing_stats.restart(at=self.typing_stats.start_time - 2.0)
+        self.typing_stats.update(["hello"] * 20, ["hello"] * 20, client_elapsed=0.5)
+        for elapsed in self.typing_stats.elapsed_times:
+            self.assertAlmostEqual(elapsed, 2.0, delta=0.1)
+        self.assertEqual(self.typing_stats.get_latency_ms(), 0.0)
+
+    def test_restart_at(self):
+        """시작 시각은 restart(at=...)로만 바꾸고, 이후 시스템 시계가 바뀌어도 경과 시간은 단조 시계로 잽니다."""
+        with self.assertRaises(AttributeError):
+            self.typing_stats.start_time = 0.0
+        self.typing_stats.restart(at=self.typing_stats.start_time - 3.0)
+        with patch("typing_manager.time.time", return_value=0.0):   # 시스템 시계가 과거로 바뀜
+            self.assertAlmostEqual(self.typing_stats.server_elapsed(), 3.0, delta=0.1)
+        self.typing_stats.restart(at=self.typing_stats.start_time + 3600)
+        self.assertEqual(self.typing_stats.server_elapsed(), 0.0)   # 아직 시작 전
+
+        restored = TypingStats.from_state(self.typing_stats.to_state())
+        self.assertEqual(restored.start_time, self.typing_stats.start_time)
+        self.assertEqual(restored.server_elapsed(), 0.0)
+
+    def test_elapsed_times_bounded(self):
+        """오래 연습해도 문장별 시간은 최근 문장만 보관하고 속도는 전체 시간으로 계산합니다."""
+        with patch.dict("typing_manager.TIMING_CONFIG", {"recent_elapsed": 3}):
+            for _ in range(10):
+                self.typing_stats.restart(at=self.typing_stats.start_time - 6.0)
+                self.typing_stats.update(["hello"], ["hello"])
+        self.assertEqual(len(self.typing_stats.elapsed_times), 3)
+        self.assertIsInstance(self.typing_stats.to_state()['elapsed_times'], list)
+        self.assertAlmostEqual(self.typing_stats.elapsed_folded, 42.0, delta=0.5)
+        self.assertAlmostEqual(self.typing_stats.get_wpm(), 10.0, delta=0.1)
+        restored = TypingStats.from_state(self.typing_stats.to_state())
+        self.assertEqual(restored.get_wpm(), self.typing_stats.get_wpm())
+
+    def test_split_client_timing(self):
+        self.assertEqual(split_client_timing("안녕하세요\u20631234"), ("안녕하세요", 1.234))
+        self.assertEqual(split_client_timing("안녕하세요"), ("안녕하세요", None))
+        self.assertEqual(split_client_timing("안녕\u2063abc"), ("안녕", None))
+
 class TestTypingManager(unittest.TestCase):
     def setUp(self):
         self.manager = TypingManager()
@@ -150,6 +202,20 @@ class TestTypingManager(unittest.TestCase):
         self.assertEqual(self.manager.stats.word_stats.correct, 1)
         self.assertEqual(self.manager.stats.word_stats.incorrect, 1)
 
+    def test_handle_input_normalizes_hangul(self):
+        # NFD로 보내는 입력기와 낱자모 입력도 같은 문장으로 인정
+        import unicodedata
+        self.manager.load_sentences(["안녕 세상"])
+        self.manager.handle_input(unicodedata.normalize('NFD', "안녕") + " ㅅㅔㅅㅏㅇ")
+        self.assertEqual(self.manager.stats.word_stats.correct, 2)
+
+    def test_handle_input_strips_client_timing(self):
+        self.manager.load_sentences(["첫 번째 문장입니다."])
+        self.manager.stats.restart(at=self.manager.stats.start_time - 3.0)
+        self.assertTrue(self.manager.handle_input("첫 번째 문장입니다.\u20632500"))
+        self.assertEqual(self.manager.stats.word_stats.correct, 3)
+        self.assertEqual(list(self.manager.stats.elapsed_times), [2.5])
+
     def test_move_to_next(self):
         sentences = ["First", "Second", "Third"]
         self.manager.load_sentences(sentences)
@@ -176,6 +242,46 @@ class TestTypingManager(unittest.TestCase):
         self.assertEqual(self.manager.stats.total_keystrokes, 0)
         self.assertEqual(self.manager.current_sentences, [])
 
+    def test_prepared_sentences(self):
+        """불러올 때 준비한 단어/타자수/HTML을 채점과 표시에 재사용하는지 테스트"""
+        prepared = PreparedSentence("a<b & 한글")
+        self.assertEqual(prepared.words, ("a<b", "&", "한글"))
+        self.assertEqual(prepared.costs, (3, 1, 6))
+        self.assertIn('id="word-0">a&lt;b</span>', prepared.html)
+        self.assertIn('id="word-1">&amp;</span>', prepared.html)
+
+        self.manager.load_sentences(["안녕 세상", "두 번째"])
+        first = self.manager.get_prepared()
+        self.assertIs(self.manager.get_prepared(0), first)
+        self.assertIsNone(self.manager.get_prepared(2))
+        self.manager.handle_input("안녕 세계")
+        # 맞힌 단어는 준비한 타자수, 틀린 단어는 입력한 대로 셈
+        self.assertEqual(self.manager.stats.total_keystrokes, 6 + TypingStats.count_keystrokes("세계"))
+        # 문장 목록이 바뀌면 다시 준비
+        self.manager.current_sentences[0] = "바뀐 문장"
+        self.assertEqual(self.manager.get_prepared(0).words, ("바뀐", "문장"))
+        self.manager.reset_all()
+        self.assertEqual(self.manager.prepared_bytes, 0)
+
+    def test_typed_sentences_deprioritized(self):
+        """입력한 문장을 기억하여 다음에 불러올 때 뒤로 미루고 세션 상태에 함께 저장하는지 테스트"""
+        self.manager.load_sentences(["첫 번째 문장", "두 번째 문장"])
+        self.manager.handle_input("첫 번째 문장")
+        self.assertIn("첫 번째 문장", self.manager.seen)
+        self.assertNotIn("두 번째 문장", self.manager.seen)
+        text = "첫 번째 문장\n두 번째 문장\n세 번째 문장"
+        self.assertEqual(self.manager.process_input_text(text), ["두 번째 문장", "세 번째 문장", "첫 번째 문장"])
+        self.assertEqual(self.manager.take_unseen(["첫 번째 문장", "두 번째 문장", "세 번째 문장"], 2),
+                         ["두 번째 문장", "세 번째 문장"])
+
+        restored = TypingManager.from_state(self.manager.to_state())
+        self.assertIn("첫 번째 문장", restored.seen)
+        self.manager.reset_all()
+        self.assertIn("첫 번째 문장", self.manager.seen)   # 사용자 기록은 유지
+        state = self.manager.to_state()
+        del state['seen']                                 # 기록이 없던 예전 세션
+        self.assertEqual(len(TypingManager.from_state(state).seen), 0)
+
     def test_ai_mode_completion(self):
         self.manager.set_input_method("AI 생성 문장")
         sentences = ["First", "Second"]
@@ -184,6 +290,18 @@ class TestTypingManager(unittest.TestCase):
         result = self.manager.move_to_next()
         self.assertTrue(result)  # AI 모드에서는 문장 세트 완료 시 True 반환
 
+    def test_set_completed(self):
+        """문장 세트를 마친 입력에서만 set_completed가 켜지는지 테스트 (AI 모드는 마지막 문장에 머무름)"""
+        for method, index_after in (("AI 생성 문장", 1), ("직접 입력", 0)):
+            manager = TypingManager()
+            manager.set_input_method(method)
+            manager.load_sentences(["First", "Second"])
+            self.assertTrue(manager.handle_input("First"))
+            self.assertFalse(manager.set_completed)
+            self.assertTrue(manager.handle_input("Second"))
+            self.assertTrue(manager.set_completed)
+            self.assertEqual(manager.current_index, index_after)
+
     def test_process_input_text_normal(self):
         """일반 텍스트 처리 테스트"""
         text = "First line\nSecond line\n\nThird line"
@@ -210,9 +328,24 @@ class TestTypingManager(unittest.TestCase):
             result = self.manager.process_input_text(test_url)
             
             mock_is_url.assert_called_once_with(test_url)
-            mock_extract.assert_called_once_with(test_url)
+            mock_extract.assert_called_once_with(test_url, ANY)
             self.assertEqual(result, ["First paragraph", "Second paragraph"])
 
+    def test_duplicates_dropped(self):
+        """URL 문서에서 제외한 유사 중복 문장 수를 알리고, 다 읽으면 필터를 놓는지 테스트"""
+        html = ("<p>Subscribe to our newsletter for daily updates.</p>"
+                "<p>Subscribe to our newsletter for daily updates!</p>"
+                "<p>The river flows gently through the quiet valley.</p>")
+        with patch('url_processor.URLProcessor.iter_url_chunks', return_value=iter([html])):
+            sentences = self.manager.iter_input_sentences("https://example.com")
+            self.assertIsNotNone(self.manager.dedup_filter)
+            self.assertEqual(len(list(sentences)), 2)
+        self.assertEqual(self.manager.duplicates_dropped, 1)
+        self.assertIsNone(self.manager.dedup_filter)
+
+        self.manager.load_sentences(["직접 넣은 문장입니다."])
+        self.assertEqual(self.manager.duplicates_dropped, 0)
+
     def test_process_input_text_with_normal_text(self):
         """일반 텍스트 입력 처리 테스트"""
         test_text = "First line\nSecond line\n\nThird line"
@@ -298,5 +431,50 @@ class TestTypingManager(unittest.TestCase):
         self.assertEqual(progress['current_index'], 1)
         self.assertEqual(progress['completed_sentences'], 2)
 
+class TestSentenceStream(unittest.TestCase):
+    def setUp(self):
+        self.manager = TypingManager()
+        self.release = threading.Event()
+
+    def slow_source(self):
+        """첫 문장 뒤에서 release될 때까지 멈추는 문장 제너레이터"""
+        yield "First streamed sentence"
+        self.release.wait(5)
+        yield "Second streamed sentence"
+        yield "Third streamed sentence"
+
+    def test_first_sentence_before_source_finishes(self):
+        self.manager.load_sentence_stream(self.slow_source())
+        self.assertEqual(self.manager.get_current_sentence(), "First streamed sentence")
+        self.assertTrue(self.manager.is_loading)
+        self.assertEqual(len(self.manager.current_sentences), 1)
+
+        # 다음 문장으로 넘어갈 때는 처음으로 돌아가지 않고 수집을 기다림
+        self.release.set()
+        self.manager.handle_input("First streamed sentence")
+        self.assertEqual(self.manager.get_current_sentence(), "Second streamed sentence")
+        self.manager._feed.wait_for(3, 5)
+        self.assertFalse(self.manager.is_loading)
+        self.assertEqual(self.manager.to_state()['sentences'][-1], "Third streamed sentence")
+
+    def test_empty_and_failing_streams(self):
+        with self.assertRaises(ValueError):
+            self.manager.load_sentence_stream(iter([]))
+
+        def failing():
+            raise ValueError("URL에서 텍스트를 가져오는데 실패했습니다: 404")
+            yield
+
+        with self.assertRaises(ValueError) as context:
+            self.manager.load_sentence_stream(failing())
+        self.assertIn("404", str(context.exception))
+
+    def test_new_sentences_stop_previous_stream(self):
+        self.manager.load_sentence_stream(self.slow_source())
+        self.manager.load_sentences(["Replacement sentence"])
+        self.release.set()
+        self.assertFalse(self.manager.is_loading)
+        self.assertEqual(self.manager.current_sentences, ["Replacement sentence"])
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
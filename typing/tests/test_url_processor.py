@@ -8,6 +8,7 @@ from typing import List, Callable, TypeVar, Sequence
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from config import INGEST_CONFIG
 from url_processor import URLProcessor
 from tests.test_data import TEST_DATA, ErrorTestData
 
@@ -37,6 +38,50 @@ class TestURLProcessor(TestCase):
         text_lines = URLProcessor.extract_text_from_url(self.test_url).split('\n')
         self._verify_content(text_lines, TEST_DATA.html.expected, TEST_DATA.html.excluded)
 
+    def test_streaming_parser(self) -> None:
+        """태그 중간에서 잘린 조각도 문서 순서대로 파싱하는지 테스트"""
+        html = TEST_DATA.html.content + "<p>Unclosed paragraph that is long enough<p>Next paragraph is also long enough"
+        chunks = [html[i:i + 7] for i in range(0, len(html), 7)]
+        paragraphs = list(URLProcessor.iter_filtered(URLProcessor.iter_html_paragraphs(chunks)))
+        # 제목과 문단이 문서에 나온 순서 그대로
+        self.assertEqual(paragraphs, TEST_DATA.html.expected + ["Unclosed paragraph that is long enough",
+                                                                "Next paragraph is also long enough"])
+        for content in TEST_DATA.html.excluded:
+            self.assertNotIn(content, '\n'.join(paragraphs))
+
+    def test_split_sentences_bounded_memory(self) -> None:
+        """문장 분리 단계는 최근 문장만 기억하여 가까운 중복만 건너뛰는지 테스트"""
+        paragraphs = ["First repeated sentence here.", "Second sentence is different.",
+                      "First repeated sentence here.", "Third sentence pushes it out.",
+                      "First repeated sentence here."]
+        with patch.dict(INGEST_CONFIG, {"recent_sentences": 1}):
+            sentences = list(URLProcessor.iter_split_sentences(paragraphs))
+        self.assertEqual(sentences, paragraphs)
+        sentences = list(URLProcessor.iter_split_sentences(paragraphs))
+        self.assertEqual(sentences, paragraphs[:2] + paragraphs[3:4])
+
+    @patch('requests.get')
+    def test_sentences_stream_lazily(self, mock_get: Mock) -> None:
+        """첫 문단이 처리되면 나머지를 내려받기 전에 첫 문장을 반환하는지 테스트"""
+        downloaded = []
+
+        def iter_content(chunk_size):
+            for chunk in ["<p>첫 번째 문단의 문장입니다.</p>", "<p>Another paragraph arrives later.</p>"]:
+                downloaded.append(chunk)
+                yield chunk.encode('utf-8')
+
+        response = Mock()
+        response.headers = {"content-type": "text/html"}
+        response.iter_content = iter_content
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        mock_get.return_value = response
+
+        sentences = URLProcessor.iter_sentences_from_url(self.test_url)
+        self.assertEqual(next(sentences), "첫 번째 문단의 문장입니다.")
+        self.assertEqual(len(downloaded), 1)
+        self.assertEqual(list(sentences), ["Another paragraph arrives later."])
+
     def test_error_handling(self) -> None:
         """오류 처리 테스트"""
         for error_data in TEST_DATA.errors:
@@ -85,6 +130,7 @@ class TestURLProcessor(TestCase):
         """Mock 응답 설정"""
         mock_response = Mock()
         mock_response.text = html_content
+        mock_response.content = html_content.encode('utf-8')
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
 
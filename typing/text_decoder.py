@@ -0,0 +1,103 @@
+"""업로드 파일의 인코딩을 감지하고 스트리밍으로 디코딩하는 기능"""
+import codecs
+from typing import BinaryIO, Iterator, Optional
+from config import DECODING_CONFIG
+
+# BOM과 해당 인코딩 (긴 BOM을 먼저 검사)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# str.splitlines()가 줄 끝으로 인식하는 문자
+LINE_BREAKS = ('\n', '\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+
+
+def _decodes_cleanly(data: bytes, encoding: str) -> Optional[str]:
+    """data를 인코딩으로 디코딩해 봅니다. 끝에서 잘린 문자는 허용합니다."""
+    try:
+        return codecs.getincrementaldecoder(encoding)().decode(data, final=False)
+    except UnicodeDecodeError:
+        return None
+
+
+def _looks_korean(text: str) -> bool:
+    """ASCII가 아닌 문자 중 한글 음절의 비율로 한국어 텍스트인지 판단합니다."""
+    non_ascii = [char for char in text if ord(char) > 0x7F]
+    if not non_ascii:
+        return True
+    hangul = sum(1 for char in non_ascii if '가' <= char <= '힣')
+    return hangul / len(non_ascii) >= DECODING_CONFIG["min_hangul_ratio"]
+
+
+def detect_encoding(head: bytes) -> str:
+    """파일 앞부분으로 인코딩을 추정합니다.
+
+    BOM → UTF-8 유효성 → CP949(EUC-KR 상위 집합) 순으로 검사하며,
+    모두 맞지 않으면 기본 인코딩을 반환합니다.
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    if _decodes_cleanly(head, 'utf-8') is not None:
+        return 'utf-8'
+
+    text = _decodes_cleanly(head, 'cp949')
+    if text is not None and _looks_korean(text):
+        return 'cp949'
+
+    return DECODING_CONFIG["fallback_encoding"]
+
+
+def iter_decoded_chunks(stream: BinaryIO, chunk_size: int = DECODING_CONFIG["chunk_size"],
+                        encoding: Optional[str] = None) -> Iterator[str]:
+    """바이너리 스트림을 조금씩 읽어 디코딩된 문자열 조각을 반환합니다."""
+    head = stream.read(max(chunk_size, DECODING_CONFIG["sniff_bytes"]))
+    encoding = encoding or detect_encoding(head)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    chunk = head
+    while chunk:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+        chunk = stream.read(chunk_size)
+
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_decoded_lines(stream: BinaryIO, chunk_size: int = DECODING_CONFIG["chunk_size"],
+                       encoding: Optional[str] = None,
+                       max_line_chars: int = DECODING_CONFIG["max_line_chars"]) -> Iterator[str]:
+    """바이너리 스트림을 줄 단위 문자열로 반환합니다.
+
+    메모리에는 디코딩된 조각 하나와 아직 끝나지 않은 줄만 유지하며,
+    줄바꿈 없이 max_line_chars를 넘는 줄은 마지막 공백에서 나누어 반환합니다.
+    """
+    pending = ''
+    ends_with_cr = False
+    for text in iter_decoded_chunks(stream, chunk_size, encoding):
+        # 조각 경계에서 나뉜 \r\n은 줄바꿈 하나이므로 앞 조각에서 이미 끝낸 줄 뒤의 \n은 버립니다
+        if ends_with_cr and text.startswith('\n'):
+            text = text[1:]
+        combined = pending + text
+        ends_with_cr = combined.endswith('\r')
+        lines = combined.splitlines()
+        pending = lines.pop() if lines and not combined.endswith(LINE_BREAKS) else ''
+        yield from lines
+
+        while len(pending) > max_line_chars:
+            cut = pending.rfind(' ', 0, max_line_chars)
+            cut = cut if cut > 0 else max_line_chars
+            yield pending[:cut]
+            pending = pending[cut:].lstrip(' ')
+
+    if pending:
+        yield pending
+
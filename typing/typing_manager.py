@@ -1,9 +1,29 @@
 """타이핑 관련 핵심 로직"""
+import html
+import sys
+import threading
 import time
-from typing import List, Dict
+from collections import deque
+from itertools import count, islice
+from typing import Any, Deque, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 from dataclasses import dataclass
+from config import CSS_CLASSES, INGEST_CONFIG, SEEN_CONFIG, TIMING_CONFIG
+from dedup import NearDuplicateFilter
+from hangul import normalize
+from metrics import CLIENT_OVERHEAD_SECONDS, SENTENCES_LOADED, SENTENCES_TYPED
+from seen_filter import SeenFilter
 from url_processor import URLProcessor
 
+def split_client_timing(input_text: str) -> Tuple[str, Optional[float]]:
+    """입력 값 끝에 붙은 브라우저 측정 시간(초)을 분리합니다. (typing.js가 제출 직전에 붙임)"""
+    text, marker, value = input_text.rpartition(TIMING_CONFIG["marker"])
+    if not marker:
+        return input_text, None
+    try:
+        return text, float(value) / 1000
+    except ValueError:
+        return text, None
+
 @dataclass
 class WordStats:
     total: int = 0
@@ -36,17 +56,74 @@ class TypingStats:
     """타이핑 통계를 관리하는 클래스"""
     def __init__(self):
         self.word_stats = WordStats()
-        self.start_time = time.time()
-        self.elapsed_times: List[float] = []
+        # 최근 문장별 시간(초)과 그 이전 문장 시간의 합계 (오래 연습해도 크기가 늘지 않음)
+        self.elapsed_times: Deque[float] = deque()
+        self.elapsed_folded = 0.0
         self.total_keystrokes = 0
+        # 서버에서 잰 시간 중 브라우저 측정 시간을 뺀 나머지(왕복 지연, 화면 표시, 첫 입력 전 대기)
+        self.overhead_total = 0.0
+        self.client_timed = 0
+        self.restart()
 
-    def update(self, input_words: List[str], target_words: List[str]) -> None:
-        """단어 단위로 정확도를 체크하고 통계를 업데이트합니다."""
-        self.elapsed_times.append(time.time() - self.start_time)
-        self.start_time = time.time()
+    @property
+    def start_time(self) -> float:
+        """문장 시간 측정을 시작한 시각 (epoch 초). 바꿀 때는 restart(at=...)를 사용합니다."""
+        return self._start_time
+
+    def restart(self, at: Optional[float] = None) -> None:
+        """문장 시간 측정을 다시 시작합니다.
+
+        at(epoch 초)을 주면 그 시각에 시작한 것으로 합니다. (레이스 시작 시각, 다른 프로세스에서 저장한 시작 시각)
+        그 시각을 단조 시계 기준으로 한 번 바꿔 두므로 이후 시스템 시계가 바뀌어도 경과 시간은 영향을 받지 않습니다.
+        """
+        now = time.time()
+        self._start_time = now if at is None else at
+        self._monotonic_start = time.monotonic() - (now - self._start_time)
+
+    def server_elapsed(self) -> float:
+        """측정 시작 이후 서버에서 잰 시간(초). 시작 시각이 아직 오지 않았으면 0입니다."""
+        return max(0.0, time.monotonic() - self._monotonic_start)
+
+    def accepts_client_elapsed(self, client_elapsed: float, server_elapsed: float, keystrokes: int) -> bool:
+        """브라우저 측정 시간이 서버에서 잰 시간 범위 안에 있고 사람이 입력할 수 있는 속도인지 확인합니다."""
+        if not TIMING_CONFIG["min_elapsed"] <= client_elapsed <= server_elapsed + TIMING_CONFIG["tolerance"]:
+            return False
+        return keystrokes <= client_elapsed * TIMING_CONFIG["max_keystrokes_per_second"]
+
+    def update(self, input_words: List[str], target_words: Sequence[str],
+               client_elapsed: Optional[float] = None, target_costs: Optional[Sequence[int]] = None) -> None:
+        """단어 단위로 정확도를 체크하고 통계를 업데이트합니다.
+
+        client_elapsed(첫 입력부터 제출까지 브라우저에서 잰 시간)가 유효하면 그 값을 사용하고,
+        아니면 서버에서 잰 시간을 사용합니다. target_costs(목표 단어별 타자수)를 주면 목표 단어와
+        같은 입력 단어는 다시 세지 않습니다.
+        """
+        server_elapsed = self.server_elapsed()
+        if target_costs is None:
+            keystrokes = sum(map(self.count_keystrokes, input_words))
+        else:
+            keystrokes = sum(target_costs[i] if i < len(target_words) and word == target_words[i]
+                             else self.count_keystrokes(word) for i, word in enumerate(input_words))
+        if client_elapsed is not None and self.accepts_client_elapsed(client_elapsed, server_elapsed, keystrokes):
+            overhead = max(0.0, server_elapsed - client_elapsed)
+            self._record_elapsed(client_elapsed)
+            self.overhead_total += overhead
+            self.client_timed += 1
+            CLIENT_OVERHEAD_SECONDS.observe(overhead)
+            SENTENCES_TYPED.inc(timing="client")
+        else:
+            self._record_elapsed(server_elapsed)
+            SENTENCES_TYPED.inc(timing="server")
+        self.restart()
         
         self.word_stats.update(input_words, target_words)
-        self.total_keystrokes += sum(map(self.count_keystrokes, input_words))
+        self.total_keystrokes += keystrokes
+
+    def _record_elapsed(self, elapsed: float) -> None:
+        """문장 시간을 기록하고, 최근 문장 수를 넘은 시간은 합계로 옮깁니다."""
+        self.elapsed_times.append(elapsed)
+        if len(self.elapsed_times) > TIMING_CONFIG["recent_elapsed"]:
+            self.elapsed_folded += self.elapsed_times.popleft()
 
     def to_dict(self) -> Dict[str, float]:
         """통계를 딕셔너리 형태로 반환합니다."""
@@ -56,7 +133,8 @@ class TypingStats:
             'incorrect_words': self.word_stats.incorrect,
             'wpm': self.get_wpm(),
             'cpm': self.get_cpm(),
-            'accuracy': self.word_stats.accuracy
+            'accuracy': self.word_stats.accuracy,
+            'latency_ms': self.get_latency_ms()
         }
 
     def get_wpm(self) -> float:
@@ -69,16 +147,46 @@ class TypingStats:
         minutes = self._get_minutes()
         return round(self.total_keystrokes / minutes, 1) if minutes > 0 else 0.0
 
+    def get_latency_ms(self) -> float:
+        """브라우저 측정 문장의 평균 지연(서버 시간 - 브라우저 시간)을 ms로 반환합니다."""
+        return round(self.overhead_total / self.client_timed * 1000, 1) if self.client_timed else 0.0
+
     def reset(self) -> None:
         """통계를 초기화합니다."""
         self.word_stats.reset()
-        self.start_time = time.time()
+        self.restart()
         self.elapsed_times.clear()
+        self.elapsed_folded = 0.0
         self.total_keystrokes = 0
+        self.overhead_total = 0.0
+        self.client_timed = 0
+
+    def to_state(self) -> Dict[str, Any]:
+        """저장 가능한 상태 딕셔너리를 반환합니다."""
+        return {
+            'words': [self.word_stats.total, self.word_stats.correct, self.word_stats.incorrect],
+            'start_time': self.start_time,
+            'elapsed_times': list(self.elapsed_times),
+            'elapsed_folded': self.elapsed_folded,
+            'keystrokes': self.total_keystrokes,
+            'overhead': [self.overhead_total, self.client_timed]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TypingStats':
+        """상태 딕셔너리로 통계를 복원합니다."""
+        stats = cls()
+        stats.word_stats = WordStats(*state['words'])
+        stats.restart(at=state['start_time'])
+        stats.elapsed_times = deque(state['elapsed_times'])
+        stats.elapsed_folded = state.get('elapsed_folded', 0.0)
+        stats.total_keystrokes = state['keystrokes']
+        stats.overhead_total, stats.client_timed = state.get('overhead', (0.0, 0))
+        return stats
 
     def _get_minutes(self) -> float:
         """경과 시간을 분 단위로 반환합니다."""
-        return sum(self.elapsed_times) / 60 if self.elapsed_times else 0.0
+        return (self.elapsed_folded + sum(self.elapsed_times)) / 60
 
     @staticmethod
     def count_keystrokes(text: str) -> int:
@@ -94,29 +202,185 @@ class TypingStats:
                 total_strokes += 1
         return total_strokes
 
+class PreparedSentence:
+    """문장을 불러올 때 한 번만 계산해 두고 채점과 화면 표시에 재사용하는 정보
+
+    words는 정규화한 목표 단어, costs는 단어별 타자수, html은 이스케이프한 단어 span입니다.
+    """
+    __slots__ = ("text", "words", "costs", "html", "size_bytes")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.words = tuple(normalize(text).split())
+        self.costs = tuple(map(TypingStats.count_keystrokes, self.words))
+        self.html = ' '.join(f'<span class="{CSS_CLASSES["word"]}" id="word-{i}">{html.escape(word)}</span>'
+                             for i, word in enumerate(text.split()))
+        self.size_bytes = (sys.getsizeof(self) + sys.getsizeof(self.words) + sum(map(sys.getsizeof, self.words))
+                           + sys.getsizeof(self.costs) + sys.getsizeof(self.html))
+
+class SentenceFeed:
+    """문장 제너레이터를 백그라운드 스레드에서 소비하여 문장 목록을 채우는 클래스"""
+    def __init__(self, sentences: Iterable[str], max_sentences: int = INGEST_CONFIG["max_sentences"]):
+        self.sentences: List[str] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._source = iter(sentences)
+        self._max_sentences = max_sentences
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            for sentence in self._source:
+                with self._condition:
+                    if self._cancelled:
+                        break
+                    self.sentences.append(sentence)
+                    self._condition.notify_all()
+                if len(self.sentences) >= self._max_sentences:
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            close = getattr(self._source, 'close', None)
+            if close:
+                close()
+            with self._condition:
+                self.done = True
+                self._condition.notify_all()
+
+    def wait_for(self, count: int, timeout: Optional[float] = None) -> bool:
+        """문장이 count개 모이거나 수집이 끝날 때까지 기다리고, count개가 모였는지 반환합니다."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.sentences) >= count or self.done, timeout)
+            return len(self.sentences) >= count
+
+    def cancel(self) -> None:
+        """수집을 중단합니다. 이후에는 문장이 추가되지 않습니다."""
+        with self._condition:
+            self._cancelled = True
+
+# 프로세스 안에서 겹치지 않는 세션 상태 번호 (세션 저장소가 바뀌지 않은 세션을 직렬화 없이 건너뛰는 데 사용)
+_STATE_VERSIONS = count(1)
+
+
 class TypingManager:
     """타이핑 세션을 관리하는 클래스"""
     def __init__(self):
+        self._version = next(_STATE_VERSIONS)
         self.stats = TypingStats()
         self.current_index = 0
         self.current_sentences: List[str] = []
         self.total_sentences_completed = 0
         self.input_key = 0
         self.current_input_method = ""
+        # 마지막으로 처리한 입력으로 문장 세트를 마쳤는지 (AI 생성 문장 모드는 마지막 문장에 머무르므로 위치로 알 수 없음)
+        self.set_completed = False
+        # 이미 입력한 문장 기록. 별도의 사용자 계정이 없으므로 세션(세션 ID)마다 하나씩이며,
+        # 세션 상태와 함께 저장되므로 같은 세션 ID로 돌아오면 이어서 쓰지만 새 세션은 빈 기록으로 시작합니다
+        self.seen = SeenFilter()
+        # 불러오는 중인 URL 문서의 유사 중복 필터와, 다 불러온 뒤 남기는 제외한 문장 수
+        self.dedup_filter: Optional[NearDuplicateFilter] = None
+        self._duplicates_dropped = 0
+        self._feed: Optional[SentenceFeed] = None
+        # 문장 위치 -> 준비된 문장 (스트리밍으로 나중에 추가된 문장은 처음 쓸 때 준비)
+        self._prepared: Dict[int, PreparedSentence] = {}
+        self.prepared_bytes = 0
 
     def process_input_text(self, text: str) -> List[str]:
         """입력된 텍스트를 문장 리스트로 변환합니다."""
-        if URLProcessor.is_url(text):
-            text = URLProcessor.extract_text_from_url(text)
-        return [line.strip() for line in text.split('\n') if line.strip()]
-
-    def handle_input(self, input_text: str) -> bool:
-        """사용자 입력을 처리하고 성공 여부를 반환합니다."""
-        current_sentence = self.get_current_sentence()
-        if not input_text or not current_sentence:
+        return list(self.iter_input_sentences(text, stream=False))
+
+    def iter_input_sentences(self, text: str, stream: bool = True) -> Iterator[str]:
+        """입력된 텍스트(또는 URL)를 처리되는 대로 문장으로 하나씩 반환합니다.
+
+        URL 문서의 유사 중복 문장은 건너뛰고 그 수를 duplicates_dropped로 알립니다. 직접 입력한 텍스트는
+        유사 중복을 거르지 않지만, URL 문서와 마찬가지로 이미 입력한 문장은 prefer_unseen 정책에 따라
+        건너뛰거나 뒤로 미룹니다. stream이 False이면 URL 문서를 한 번에 내려받아 처리합니다.
+        """
+        if not URLProcessor.is_url(text):
+            self.duplicates_dropped = 0
+            return self.prefer_unseen(self.iter_sentences(text.split('\n')))
+        dedup_filter = URLProcessor.create_dedup_filter()
+        if stream:
+            sentences = self.iter_sentences(URLProcessor.iter_sentences_from_url(text, dedup_filter))
+        else:
+            text = URLProcessor.extract_text_from_url(text, dedup_filter)
+            sentences = self.iter_sentences(text.split('\n'))
+        return self.prefer_unseen(self.track_duplicates(sentences, dedup_filter))
+
+    def track_duplicates(self, sentences: Iterable[str],
+                         dedup_filter: Optional[NearDuplicateFilter]) -> Iterator[str]:
+        """sentences를 그대로 반환하면서, 다 읽을 때까지 dedup_filter가 제외한 문장 수를 duplicates_dropped로 알립니다.
+
+        다 읽으면 제외한 수만 남기고 필터(서명)는 놓아 세션 메모리를 차지하지 않게 합니다.
+        """
+        if dedup_filter is None:
+            self.duplicates_dropped = 0
+            return iter(sentences)
+        self.dedup_filter = dedup_filter
+
+        def track() -> Iterator[str]:
+            try:
+                yield from sentences
+            finally:
+                # 그사이 다른 문장을 불러오기 시작했으면 그쪽 수를 덮어쓰지 않습니다
+                if self.dedup_filter is dedup_filter:
+                    self.duplicates_dropped = dedup_filter.dropped
+        return track()
+
+    @property
+    def duplicates_dropped(self) -> int:
+        """마지막으로 불러온 URL 문서에서 제외한 유사 중복 문장 수 (불러오는 동안 계속 늘어남)"""
+        if self.dedup_filter is not None:
+            return self.dedup_filter.dropped
+        return self._duplicates_dropped
+
+    @duplicates_dropped.setter
+    def duplicates_dropped(self, count: int) -> None:
+        self.dedup_filter = None
+        self._duplicates_dropped = count
+
+    def prefer_unseen(self, sentences: Iterable[str]) -> Iterator[str]:
+        """이미 입력한 문장을 정책(SEEN_CONFIG["policy"])에 따라 건너뛰거나 뒤로 미룹니다."""
+        if not SEEN_CONFIG["enabled"]:
+            return iter(sentences)
+        return self.seen.prefer_unseen(sentences)
+
+    def take_unseen(self, sentences: Iterable[str], count: int) -> List[str]:
+        """앞에서부터 최대 count개의 문장을 고르되, 이미 입력한 문장은 건너뛰거나 뒤로 미룹니다.
+
+        처음 보는 문장을 찾느라 너무 멀리 읽지 않도록 count * SEEN_CONFIG["lookahead"]개까지만 살펴봅니다.
+        """
+        if SEEN_CONFIG["enabled"]:
+            sentences = islice(sentences, count * SEEN_CONFIG["lookahead"])
+        return list(islice(self.prefer_unseen(sentences), count))
+
+    def iter_sentences(self, lines: Iterable[str]) -> Iterator[str]:
+        """줄 단위 입력을 문장으로 변환하여 하나씩 반환합니다."""
+        for line in lines:
+            line = normalize(line)
+            if line:
+                SENTENCES_LOADED.inc()
+                yield line
+
+    def handle_input(self, input_text: str, client_elapsed: Optional[float] = None) -> bool:
+        """사용자 입력을 처리하고 성공 여부를 반환합니다.
+
+        client_elapsed가 없으면 입력 값 끝에 붙은 브라우저 측정 시간을 사용합니다.
+        """
+        input_text, marked_elapsed = split_client_timing(input_text or "")
+        prepared = self.get_prepared()
+        if not input_text or prepared is None:
             return False
 
-        self.stats.update(input_text.strip().split(), current_sentence.split())
+        # 입력기마다 다른 한글 표현(NFD, 낱자모)을 통일한 뒤 비교합니다
+        self.stats.update(normalize(input_text).split(), prepared.words,
+                          client_elapsed if client_elapsed is not None else marked_elapsed, prepared.costs)
+        if SEEN_CONFIG["enabled"]:
+            self.seen.add(prepared.text)
         return self.move_to_next()
 
     def get_current_sentence(self) -> str:
@@ -125,16 +389,45 @@ class TypingManager:
             return ""
         return self.current_sentences[self.current_index]
 
+    def get_prepared(self, index: Optional[int] = None) -> Optional[PreparedSentence]:
+        """문장(기본값: 현재 문장)의 준비된 정보를 반환합니다. 문장이 없으면 None입니다."""
+        index = self.current_index if index is None else index
+        if not 0 <= index < len(self.current_sentences):
+            return None
+        sentence = self.current_sentences[index]
+        prepared = self._prepared.get(index)
+        if prepared is None or prepared.text is not sentence:
+            prepared = self._prepare(index, sentence)
+        return prepared
+
+    def _prepare(self, index: int, sentence: str) -> PreparedSentence:
+        old = self._prepared.get(index)
+        if old is not None:
+            self.prepared_bytes -= old.size_bytes
+        prepared = self._prepared[index] = PreparedSentence(sentence)
+        self.prepared_bytes += prepared.size_bytes
+        return prepared
+
+    def _clear_prepared(self) -> None:
+        self._prepared = {}
+        self.prepared_bytes = 0
+
     def move_to_next(self) -> bool:
-        """다음 문장으로 이동하고 성공 여부를 반환합니다."""
+        """다음 문장으로 이동하고 성공 여부를 반환합니다. 문장 세트를 마쳤으면 set_completed가 True가 됩니다."""
+        self.touch()
+        self.set_completed = False
         if not self.current_sentences:
             return False
 
         self.input_key += 1
         next_index = self.current_index + 1
+        if next_index >= len(self.current_sentences) and self._feed is not None:
+            # 아직 수집 중이면 처음으로 돌아가기 전에 다음 문장을 기다립니다
+            self._feed.wait_for(next_index + 1, INGEST_CONFIG["first_sentence_timeout"])
         
         if next_index >= len(self.current_sentences):
             self.total_sentences_completed += len(self.current_sentences)
+            self.set_completed = True
             if self.current_input_method == "AI 생성 문장":
                 return True
             self.current_index = 0
@@ -155,25 +448,100 @@ class TypingManager:
         """문장 리스트를 로드합니다."""
         if not sentences:
             raise ValueError("문장이 비어있습니다.")
+        self._stop_feed()
+        # 이미 정리된 문장 목록을 받으므로 제외한 유사 중복 문장 수는 호출한 쪽이 다시 알립니다
+        self.duplicates_dropped = 0
         self.current_sentences = sentences
+        self._clear_prepared()
+        for index, sentence in enumerate(sentences):
+            self._prepare(index, sentence)
         self.reset_session()
 
+    def load_sentence_stream(self, sentences: Iterable[str],
+                             timeout: float = INGEST_CONFIG["first_sentence_timeout"]) -> None:
+        """문장 제너레이터를 백그라운드에서 소비하며, 첫 문장이 준비되면 바로 반환합니다.
+
+        나머지 문장은 연습하는 동안 current_sentences에 계속 추가됩니다.
+        """
+        self._stop_feed()
+        feed = SentenceFeed(sentences)
+        if not feed.wait_for(1, timeout):
+            feed.cancel()
+            if feed.error is not None:
+                raise feed.error
+            if not feed.done:
+                raise ValueError("첫 문장을 불러오는 시간이 초과되었습니다.")
+            raise ValueError("문장이 비어있습니다.")
+        self._feed = feed
+        self.current_sentences = feed.sentences
+        self._clear_prepared()
+        self.reset_session()
+
+    @property
+    def is_loading(self) -> bool:
+        """문장을 아직 불러오는 중인지 확인합니다."""
+        return self._feed is not None and not self._feed.done
+
+    def _stop_feed(self) -> None:
+        if self._feed is not None:
+            self._feed.cancel()
+            self._feed = None
+
     def set_input_method(self, method: str) -> None:
         """입력 방식을 설정합니다."""
+        if method != self.current_input_method:
+            self.touch()
         self.current_input_method = method
 
     def reset_session(self) -> None:
         """현재 세션의 상태를 초기화합니다."""
+        self.touch()
         self.current_index = self.input_key = 0
 
+    def touch(self) -> None:
+        """저장할 상태(to_state)가 바뀌었음을 알립니다. 상태를 바꾸는 메서드가 호출합니다."""
+        self._version = next(_STATE_VERSIONS)
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """상태가 바뀔 때마다 달라지는 값. 백그라운드에서 추가되는 문장은 문장 수로 반영합니다."""
+        return self._version, len(self.current_sentences)
+
     def reset_all(self) -> None:
-        """모든 상태를 초기화합니다."""
+        """모든 상태를 초기화합니다. 입력한 문장 기록은 사용자 기록이므로 남깁니다."""
+        self._stop_feed()
         self.reset_session()
         self.stats.reset()
         self.current_sentences.clear()
+        self._clear_prepared()
         self.total_sentences_completed = 0
         self.current_input_method = ""
 
     def to_dict(self) -> Dict[str, float]:
         """통계를 딕셔너리 형태로 반환합니다."""
-        return self.stats.to_dict() 
\ No newline at end of file
+        return self.stats.to_dict()
+
+    def to_state(self) -> Dict[str, Any]:
+        """세션 저장소에 저장할 상태 딕셔너리를 반환합니다."""
+        return {
+            'stats': self.stats.to_state(),
+            'index': self.current_index,
+            'sentences': list(self.current_sentences),
+            'completed': self.total_sentences_completed,
+            'input_key': self.input_key,
+            'method': self.current_input_method,
+            'seen': self.seen.to_state()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'TypingManager':
+        """상태 딕셔너리로 타이핑 세션을 복원합니다."""
+        manager = cls()
+        manager.stats = TypingStats.from_state(state['stats'])
+        manager.current_index = state['index']
+        manager.current_sentences = list(state['sentences'])
+        manager.total_sentences_completed = state['completed']
+        manager.input_key = state['input_key']
+        manager.current_input_method = state['method']
+        manager.seen = SeenFilter.from_state(state.get('seen'))
+        return manager 
\ No newline at end of file
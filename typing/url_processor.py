@@ -1,9 +1,67 @@
-"""URL에서 텍스트를 추출하는 기능"""
+"""URL에서 텍스트를 추출하는 기능
+
+가져오기 → HTML 파싱 → 필터링 → 문장 분리 → 중복 제거의 각 단계는 제너레이터로 연결되어,
+앞 문단이 처리되는 즉시 첫 문장을 사용할 수 있습니다 (`iter_sentences_from_url`).
+"""
+from html.parser import HTMLParser
 from urllib.parse import urlparse
-import requests
-from bs4 import BeautifulSoup
+import codecs
 import re
-from typing import List
+import time
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional, Tuple
+from config import DEDUP_CONFIG, INGEST_CONFIG
+from dedup import NearDuplicateFilter
+from metrics import NEAR_DUPLICATES_DROPPED, URL_FETCH_BYTES, URL_FETCH_ERRORS, URL_FETCH_SECONDS, URL_PARSE_SECONDS
+from text_decoder import detect_encoding
+
+
+class ParagraphParser(HTMLParser):
+    """HTML을 조각 단위로 받아 제목/문단 텍스트를 문서 순서대로 모으는 파서"""
+    def __init__(self, text_tags: Iterable[str], excluded_tags: Iterable[str]):
+        super().__init__(convert_charrefs=True)
+        self.text_tags = frozenset(text_tags)
+        self.excluded_tags = frozenset(excluded_tags)
+        self.paragraphs: List[str] = []
+        self._parts: List[str] = []
+        self._text_depth = 0
+        self._excluded_depth = 0
+
+    def _flush(self) -> None:
+        text = ''.join(self._parts).strip()
+        self._parts = []
+        if text:
+            self.paragraphs.append(text)
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in self.excluded_tags:
+            self._excluded_depth += 1
+        elif tag in self.text_tags:
+            # 닫는 태그 없이 다음 문단이 시작되면 앞 문단을 마칩니다
+            if self._text_depth:
+                self._flush()
+            self._text_depth = 1
+
+    def handle_endtag(self, tag) -> None:
+        if tag in self.excluded_tags:
+            self._excluded_depth = max(0, self._excluded_depth - 1)
+        elif tag in self.text_tags and self._text_depth:
+            self._text_depth = 0
+            self._flush()
+
+    def handle_data(self, data) -> None:
+        if self._text_depth and not self._excluded_depth:
+            self._parts.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def pop_paragraphs(self) -> List[str]:
+        """지금까지 완성된 문단을 반환하고 비웁니다."""
+        paragraphs, self.paragraphs = self.paragraphs, []
+        return paragraphs
+
 
 class URLProcessor:
     # 허용할 문자 범위 정의
@@ -75,40 +133,102 @@ class URLProcessor:
         return char in cls.ALLOWED_CHARS['punctuation']
 
     @classmethod
-    def extract_text_from_url(cls, url: str) -> str:
-        """URL에서 텍스트를 추출합니다."""
+    def extract_text_from_url(cls, url: str, dedup_filter: Optional[NearDuplicateFilter] = None) -> str:
+        """URL에서 텍스트를 추출합니다. dedup_filter를 주면 제외한 유사 중복 문장 수를 그 필터에 셉니다."""
+        import requests  # URL을 처리할 때만 불러옵니다 (터미널 클라이언트 시작 시간과 메모리)
         try:
-            response = requests.get(url)
+            with URL_FETCH_SECONDS.time():
+                response = requests.get(url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 불필요한 태그 제거
-            for tag in soup(cls.EXCLUDED_TAGS):
-                tag.decompose()
-            
-            text_content = []
-            
-            # 제목 태그들 먼저 처리 (h1-h6)
-            for tag_name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                for tag in soup.find_all(tag_name):
-                    text = tag.get_text().strip()
-                    filtered_text = cls.filter_text(text)
-                    if filtered_text:
-                        text_content.append(filtered_text)
-            
-            # 그 다음 문단 태그 처리
-            for tag in soup.find_all('p'):
-                text = tag.get_text().strip()
-                filtered_text = cls.filter_text(text)
-                if filtered_text:
-                    text_content.append(filtered_text)
-            
-            # 전체 텍스트를 문장 단위로 분리
-            return cls.split_into_sentences('\n'.join(text_content))
+            URL_FETCH_BYTES.inc(len(response.content))
+            with URL_PARSE_SECONDS.time():
+                return cls.extract_text_from_html(response.text, dedup_filter)
             
         except Exception as e:
+            URL_FETCH_ERRORS.inc()
+            raise ValueError(f"URL에서 텍스트를 가져오는데 실패했습니다: {str(e)}")
+
+    @classmethod
+    def iter_sentences_from_url(cls, url: str, dedup_filter: Optional[NearDuplicateFilter] = None) -> Iterator[str]:
+        """URL의 문서를 내려받는 대로 처리하여 문장을 하나씩 반환합니다."""
+        return cls.iter_sentences_from_html(cls.iter_url_chunks(url), dedup_filter)
+
+    @classmethod
+    def iter_url_chunks(cls, url: str) -> Iterator[str]:
+        """URL의 본문을 조금씩 내려받아 디코딩된 문자열 조각으로 반환합니다. (가져오기 단계)"""
+        import requests
+        started = time.perf_counter()
+        try:
+            response = requests.get(url, stream=True, timeout=INGEST_CONFIG["timeout"])
+            response.raise_for_status()
+        except Exception as e:
+            URL_FETCH_ERRORS.inc()
             raise ValueError(f"URL에서 텍스트를 가져오는데 실패했습니다: {str(e)}")
 
+        URL_FETCH_SECONDS.observe(time.perf_counter() - started)
+
+        with response:
+            decoder = None
+            try:
+                for chunk in response.iter_content(INGEST_CONFIG["chunk_size"]):
+                    URL_FETCH_BYTES.inc(len(chunk))
+                    if decoder is None:
+                        # 헤더에 문자셋이 있으면 그대로, 없으면 첫 조각으로 추정
+                        declared = 'charset' in response.headers.get('content-type', '').lower()
+                        encoding = response.encoding if declared else detect_encoding(chunk)
+                        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+            except requests.RequestException as e:
+                URL_FETCH_ERRORS.inc()
+                raise ValueError(f"URL에서 텍스트를 가져오는데 실패했습니다: {str(e)}")
+            if decoder is not None:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+
+    @classmethod
+    def extract_text_from_html(cls, html: str, dedup_filter: Optional[NearDuplicateFilter] = None) -> str:
+        """HTML 문서에서 텍스트를 추출하여 문장 단위로 반환합니다."""
+        return '\n'.join(cls.iter_sentences_from_html([html], dedup_filter))
+
+    @classmethod
+    def iter_sentences_from_html(cls, chunks: Iterable[str],
+                                 dedup_filter: Optional[NearDuplicateFilter] = None) -> Iterator[str]:
+        """HTML 조각들을 파싱, 필터링, 문장 분리, 중복 제거 단계에 차례로 통과시킵니다."""
+        paragraphs = cls.iter_filtered(cls.iter_html_paragraphs(chunks))
+        return cls.iter_deduplicated(cls.iter_split_sentences(paragraphs), dedup_filter)
+
+    @classmethod
+    def extract_paragraphs(cls, html: str) -> List[str]:
+        """HTML 문서에서 필터링된 제목/문단 텍스트를 추출합니다."""
+        return list(cls.iter_filtered(cls.iter_html_paragraphs([html])))
+
+    @classmethod
+    def iter_html_paragraphs(cls, chunks: Iterable[str]) -> Iterator[str]:
+        """HTML 조각을 받는 대로 파싱하여 완성된 제목/문단 텍스트를 문서 순서대로 반환합니다. (파싱 단계)"""
+        parser = ParagraphParser(cls.TEXT_TAGS, cls.EXCLUDED_TAGS)
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from parser.pop_paragraphs()
+        parser.close()
+        yield from parser.pop_paragraphs()
+
+    @classmethod
+    def iter_filtered(cls, paragraphs: Iterable[str]) -> Iterator[str]:
+        """허용 문자만 남기고 의미 없는 문단을 거릅니다. (필터링 단계)"""
+        for paragraph in paragraphs:
+            filtered_text = cls.filter_text(paragraph)
+            if filtered_text:
+                yield filtered_text
+
+    @classmethod
+    def extract_paragraphs_from_text(cls, text: str) -> List[str]:
+        """일반 텍스트의 각 줄을 필터링하여 문단 목록으로 반환합니다."""
+        paragraphs = (cls.filter_text(line.strip()) for line in text.splitlines())
+        return [paragraph for paragraph in paragraphs if paragraph]
+
     @classmethod
     def filter_text(cls, text: str) -> str:
         """텍스트를 필터링합니다."""
@@ -130,9 +250,51 @@ class URLProcessor:
             
         return filtered_text if len(filtered_text) > cls.MIN_SENTENCE_LENGTH else ''
 
+    @classmethod
+    def iter_split_sentences(cls, paragraphs: Iterable[str]) -> Iterator[str]:
+        """문단을 문장으로 나누고 이미 나온 문장은 건너뜁니다. (문장 분리 단계)
+
+        문서가 길어도 메모리가 일정하도록 최근 INGEST_CONFIG["recent_sentences"]개 문장만 기억하며,
+        그보다 멀리 떨어진 중복은 다음 중복 제거 단계가 거릅니다.
+        """
+        seen: OrderedDict = OrderedDict()
+        limit = INGEST_CONFIG["recent_sentences"]
+        for paragraph in paragraphs:
+            for sentence in cls.split_sentences(paragraph):
+                if sentence in seen:
+                    seen.move_to_end(sentence)
+                    continue
+                seen[sentence] = None
+                if len(seen) > limit:
+                    seen.popitem(last=False)
+                yield sentence
+
+    @classmethod
+    def iter_deduplicated(cls, sentences: Iterable[str],
+                          dedup_filter: Optional[NearDuplicateFilter] = None) -> Iterator[str]:
+        """유사 중복 문장을 거릅니다. (중복 제거 단계)
+
+        제외한 문장 수는 dedup_filter.dropped(불러오기 한 번)와 NEAR_DUPLICATES_DROPPED 지표(전체)에 셉니다.
+        """
+        if not DEDUP_CONFIG["enabled"]:
+            yield from sentences
+            return
+        dedup_filter = dedup_filter or cls.create_dedup_filter()
+        for sentence in sentences:
+            if dedup_filter.is_duplicate(sentence):
+                NEAR_DUPLICATES_DROPPED.inc()
+            else:
+                yield sentence
+
     @classmethod
     def split_into_sentences(cls, text: str) -> str:
-        """텍스트를 문장 단위로 분리합니다."""
+        """텍스트를 문장 단위로 분리합니다. 제외한 유사 중복 문장 수가 필요하면 remove_near_duplicates를 사용하세요."""
+        sentences, _ = cls.remove_near_duplicates(cls.split_sentences(text))
+        return '\n'.join(sentences)
+
+    @classmethod
+    def split_sentences(cls, text: str) -> List[str]:
+        """텍스트를 문장 리스트로 분리하고 완전히 같은 문장을 제거합니다."""
         # 초기 문장을 처리
         current_text = text.strip()
         
@@ -149,6 +311,24 @@ class URLProcessor:
         ]
         
         # 중복 제거
-        sentences = list(dict.fromkeys(sentences))
-        
-        return '\n'.join(sentences) 
\ No newline at end of file
+        return list(dict.fromkeys(sentences))
+
+    @classmethod
+    def remove_near_duplicates(cls, sentences: List[str]) -> Tuple[List[str], int]:
+        """유사 중복 문장을 제거하고, 남은 문장과 제거된 문장 수를 반환합니다."""
+        if not DEDUP_CONFIG["enabled"]:
+            return sentences, 0
+        dedup_filter = cls.create_dedup_filter()
+        kept = list(cls.iter_deduplicated(sentences, dedup_filter))
+        return kept, dedup_filter.dropped
+
+    @staticmethod
+    def create_dedup_filter() -> NearDuplicateFilter:
+        """설정값으로 유사 중복 필터를 생성합니다."""
+        return NearDuplicateFilter(
+            threshold=DEDUP_CONFIG["threshold"],
+            num_perm=DEDUP_CONFIG["num_perm"],
+            shingle_size=DEDUP_CONFIG["shingle_size"],
+            max_entries=DEDUP_CONFIG["max_entries"],
+            bucket_size=DEDUP_CONFIG["bucket_size"]
+        ) 
\ No newline at end of file